@@ -0,0 +1,144 @@
+"""add booking summary columns
+
+Revision ID: 285e3aa1bc77
+Revises: f86c6233ffc8
+Create Date: 2026-10-17 01:19:12.402117
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "285e3aa1bc77"
+down_revision: Union[str, Sequence[str], None] = "f86c6233ffc8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+booking = sa.table(
+    "booking",
+    sa.column("id", sa.Uuid()),
+    sa.column("amadeus_order_response", sa.JSON()),
+    sa.column("pnr", sa.String()),
+    sa.column("origin", sa.String()),
+    sa.column("destination", sa.String()),
+    sa.column("departure_at", sa.DateTime()),
+    sa.column("carrier_code", sa.String()),
+    sa.column("flight_number", sa.String()),
+    sa.column("passenger_count", sa.Integer()),
+)
+
+
+def _summary(order: dict | None) -> dict:
+    # Frozen copy of crud.bookings.order_summary as of this revision
+    order = order or {}
+    records = order.get("associatedRecords") or [{}]
+    offers = order.get("flightOffers") or [{}]
+    itineraries = offers[0].get("itineraries") or [{}]
+    segments = itineraries[0].get("segments") or [{}]
+    first, last = segments[0], segments[-1]
+    departure_at = None
+    if first.get("departure", {}).get("at"):
+        try:
+            departure_at = datetime.fromisoformat(first["departure"]["at"])
+        except (TypeError, ValueError):
+            pass
+    return {
+        "pnr": records[0].get("reference"),
+        "origin": first.get("departure", {}).get("iataCode"),
+        "destination": last.get("arrival", {}).get("iataCode"),
+        "departure_at": departure_at,
+        "carrier_code": first.get("carrierCode"),
+        "flight_number": first.get("number"),
+        "passenger_count": len(
+            order.get("travelers") or offers[0].get("travelerPricings") or []
+        ),
+    }
+
+
+def _backfill() -> None:
+    """Fill the summary columns from the stored order JSON, in id order."""
+    connection = op.get_bind()
+    update = (
+        booking.update()
+        .where(booking.c.id == sa.bindparam("booking_id"))
+        .values(
+            {
+                name: sa.bindparam(name)
+                for name in (
+                    "pnr",
+                    "origin",
+                    "destination",
+                    "departure_at",
+                    "carrier_code",
+                    "flight_number",
+                    "passenger_count",
+                )
+            }
+        )
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(booking.c.id, booking.c.amadeus_order_response)
+            .where(booking.c.amadeus_order_response.isnot(None))
+            .order_by(booking.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(booking.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+        connection.execute(
+            update,
+            [
+                {"booking_id": row.id, **_summary(row.amadeus_order_response)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("booking", sa.Column("pnr", sa.String(), nullable=True))
+    op.add_column("booking", sa.Column("origin", sa.String(), nullable=True))
+    op.add_column("booking", sa.Column("destination", sa.String(), nullable=True))
+    op.add_column("booking", sa.Column("departure_at", sa.DateTime(), nullable=True))
+    op.add_column("booking", sa.Column("carrier_code", sa.String(), nullable=True))
+    op.add_column("booking", sa.Column("flight_number", sa.String(), nullable=True))
+    op.add_column(
+        "booking",
+        sa.Column("passenger_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.alter_column("booking", "passenger_count", server_default=None)
+
+    _backfill()
+
+    op.create_index(op.f("ix_booking_pnr"), "booking", ["pnr"], unique=False)
+    op.create_index(
+        "ix_booking_route", "booking", ["origin", "destination"], unique=False
+    )
+    op.create_index(
+        "ix_booking_departure_at", "booking", ["departure_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_booking_departure_at", table_name="booking")
+    op.drop_index("ix_booking_route", table_name="booking")
+    op.drop_index(op.f("ix_booking_pnr"), table_name="booking")
+    op.drop_column("booking", "passenger_count")
+    op.drop_column("booking", "flight_number")
+    op.drop_column("booking", "carrier_code")
+    op.drop_column("booking", "departure_at")
+    op.drop_column("booking", "destination")
+    op.drop_column("booking", "origin")
+    op.drop_column("booking", "pnr")
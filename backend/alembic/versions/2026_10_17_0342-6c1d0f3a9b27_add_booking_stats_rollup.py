@@ -0,0 +1,54 @@
+"""add booking stats rollup
+
+Revision ID: 6c1d0f3a9b27
+Revises: 285e3aa1bc77
+Create Date: 2026-10-17 03:42:08.517304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "6c1d0f3a9b27"
+down_revision: Union[str, Sequence[str], None] = "285e3aa1bc77"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of crud.booking_stats.rebuild_booking_stats as of this revision
+BACKFILL = """
+INSERT INTO bookingstatsrollup
+    (period, bucket_start, status, bookings, revenue, new_users)
+SELECT :period, date_trunc(:period, b.created_at, 'UTC'), b.status, count(*),
+       coalesce(sum(b.total_price), 0), count(f.id)
+FROM booking b
+LEFT OUTER JOIN (
+    SELECT DISTINCT ON (user_id) id FROM booking
+    ORDER BY user_id, created_at, id
+) f ON f.id = b.id
+GROUP BY 2, 3
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "bookingstatsrollup",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("period", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("bookings", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("new_users", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("period", "bucket_start", "status"),
+    )
+    for period in ("hour", "day"):
+        op.get_bind().execute(sa.text(BACKFILL), {"period": period})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("bookingstatsrollup")
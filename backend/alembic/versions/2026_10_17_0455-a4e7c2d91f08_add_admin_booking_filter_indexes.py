@@ -0,0 +1,65 @@
+"""add admin booking filter indexes
+
+Revision ID: a4e7c2d91f08
+Revises: 6c1d0f3a9b27
+Create Date: 2026-10-17 04:55:31.804226
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e7c2d91f08"
+down_revision: Union[str, Sequence[str], None] = "6c1d0f3a9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so bookings can still be written meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_booking_status_cursor",
+            "booking",
+            ["status", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_booking_flight_order_id"),
+            "booking",
+            ["flight_order_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_userindb_email_prefix",
+            "userindb",
+            [sa.text("lower(email) text_pattern_ops")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_userindb_email_prefix",
+            table_name="userindb",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_booking_flight_order_id"),
+            table_name="booking",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_booking_status_cursor",
+            table_name="booking",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,165 @@
+"""
+Benchmark: filtered admin booking list pages at a million bookings.
+
+Seeds a scratch Postgres database as benchmarks.booking_stats does (with a
+rare refund_pending status mixed in), then fetches the first and fifth
+20-item page of get_all_bookings_cursor for each admin filter, twice:
+
+- indexed: with the filter indexes from migration a4e7c2d91f08
+  (ix_booking_status_cursor, ix_booking_flight_order_id and
+  ix_userindb_email_prefix)
+- before: the same queries after dropping those indexes
+
+Reports latency percentiles per page and the indexes the first page's
+plan used.
+
+The database named by --database is dropped and recreated; point
+DATABASE_URL at a server you can create databases on.
+
+Usage (from the repository root):
+    FLIGHT_SERVICE_PROVIDER=mock python -m backend.benchmarks.admin_booking_filters \
+        [--bookings 1000000] [--users 50000] [--runs 20]
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from sqlalchemy import event, text
+from sqlmodel import Session, SQLModel
+
+from backend.benchmarks.booking_stats import NOW, scratch_engine, seed
+from backend.crud.bookings import BookingFilters, get_all_bookings_cursor
+from backend.models.bookings import BookingStatus
+
+PAGE_SIZE = 20
+FILTER_INDEXES = (
+    "ix_booking_status_cursor",
+    "ix_booking_flight_order_id",
+    "ix_userindb_email_prefix",
+)
+SCENARIOS: dict[str, BookingFilters] = {
+    "no filter": {},
+    "status paid": {"statuses": [BookingStatus.PAID]},
+    "status rare": {"statuses": [BookingStatus.REFUND_PENDING]},
+    "status 2 rare": {
+        "statuses": [BookingStatus.REFUND_PENDING, BookingStatus.REVERSED]
+    },
+    "one day": {
+        "created_from": NOW - timedelta(days=100),
+        "created_to": NOW - timedelta(days=99),
+    },
+    "paid 30 days": {
+        "statuses": [BookingStatus.PAID],
+        "created_from": NOW - timedelta(days=30),
+    },
+    "pnr": {"pnr": "PNR123457"},
+    "order id": {"flight_order_id": "ORDER123457"},
+    "email prefix": {"email_prefix": "User123"},
+}
+
+
+def _indexes(plan: dict) -> set[str]:
+    own = {plan["Index Name"]} if "Index Name" in plan else set()
+    return own.union(*(_indexes(child) for child in plan.get("Plans", [])))
+
+
+def first_page_indexes(session: Session, filters: BookingFilters) -> set[str]:
+    """Indexes in the plan of the first page's query."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        get_all_bookings_cursor(session, limit=PAGE_SIZE, filters=filters)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    statement, parameters = statements[0]
+    plan = (
+        session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        .scalar()
+    )
+    return _indexes(plan[0]["Plan"])
+
+
+def run(engine, filters: BookingFilters, runs: int) -> tuple[list, list]:
+    """Latencies of the first and the fifth page."""
+    first, fifth = [], []
+    for _ in range(runs):
+        with Session(engine) as session:
+            cursor = None
+            for page in range(5):
+                start = time.perf_counter()
+                _, cursor, _, _ = get_all_bookings_cursor(
+                    session, cursor=cursor, limit=PAGE_SIZE, filters=filters
+                )
+                elapsed = time.perf_counter() - start
+                if page == 0:
+                    first.append(elapsed)
+                if page == 4:
+                    fifth.append(elapsed)
+                if cursor is None:
+                    break
+    return sorted(first), sorted(fifth)
+
+
+def _ms(latencies: list, quantile: float) -> str:
+    if not latencies:
+        return "-"
+    index = min(len(latencies) - 1, int(len(latencies) * quantile))
+    return f"{latencies[index] * 1000:.1f}"
+
+
+def report(engine, label: str, runs: int) -> None:
+    print(f"\n{label}")
+    print(
+        f"{'filter':<15}{'p50 ms':>9}{'p95 ms':>9}{'p5 p50':>9}{'p5 p95':>9}  indexes"
+    )
+    for name, filters in SCENARIOS.items():
+        # Warm the buffer cache, then measure
+        run(engine, filters, 1)
+        first, fifth = run(engine, filters, runs)
+        with Session(engine) as session:
+            indexes = ", ".join(sorted(first_page_indexes(session, filters)))
+        print(
+            f"{name:<15}{statistics.median(first) * 1000:>9.1f}"
+            f"{_ms(first, 0.95):>9}{_ms(fifth, 0.5):>9}{_ms(fifth, 0.95):>9}"
+            f"  {indexes}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--database", default="admin_booking_filter_benchmark")
+    args = parser.parse_args()
+
+    engine = scratch_engine(args.database)
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.bookings, args.users)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE booking SET status = :rare WHERE random() < 0.001"),
+            {"rare": BookingStatus.REFUND_PENDING},
+        )
+        conn.execute(text("ANALYZE"))
+    print(f"{args.bookings} bookings, {args.users} users, {PAGE_SIZE} per page")
+
+    report(engine, "indexed", args.runs)
+    with engine.begin() as conn:
+        for index in FILTER_INDEXES:
+            conn.execute(text(f"DROP INDEX {index}"))
+        conn.execute(text("ANALYZE"))
+    report(engine, "before (filter indexes dropped)", args.runs)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: exporting a million bookings as CSV.
+
+Seeds a scratch Postgres database as benchmarks.booking_stats does, then
+encodes every booking as CSV into a discarding sink three ways:
+
+- batched: export_bookings, keyset batches each streamed from a server-side
+  cursor in its own transaction
+- one cursor: the same query streamed from one server-side cursor in a
+  single transaction
+- buffered: the same query with every row fetched into Python first
+
+and reports throughput, how far each grew the process's peak resident
+memory (run in that order, so buffering cannot hide the others' growth) and
+the longest transaction each held open.
+
+The database named by --database is dropped and recreated; point
+DATABASE_URL at a server you can create databases on.
+
+Usage (from the repository root):
+    FLIGHT_SERVICE_PROVIDER=mock python -m backend.benchmarks.booking_export \
+        [--bookings 1000000] [--users 50000]
+"""
+
+import argparse
+import resource
+import time
+
+from sqlalchemy import event, select
+from sqlmodel import Session, SQLModel
+
+from backend.benchmarks.booking_stats import scratch_engine, seed
+from backend.crud.bookings import EXPORT_COLUMNS, export_bookings
+from backend.models.bookings import Booking
+from backend.models.users import UserInDB
+from backend.utils.booking_export import encode_rows
+from backend.utils.constants import ExportFormats
+
+COLUMNS = list(EXPORT_COLUMNS)
+
+
+def _query():
+    return (
+        select(*EXPORT_COLUMNS.values())
+        .join(UserInDB, UserInDB.id == Booking.user_id)
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
+    )
+
+
+def batched(session: Session):
+    return export_bookings(session, COLUMNS)
+
+
+def one_cursor(session: Session):
+    return session.execute(
+        _query().execution_options(stream_results=True, yield_per=1_000)
+    )
+
+
+def buffered(session: Session):
+    return session.execute(_query()).all()
+
+
+def run(engine, rows) -> tuple[int, float, float, float]:
+    """Rows, seconds, peak RSS growth in MB and longest transaction seconds."""
+    transactions = []
+
+    def begin(conn):
+        transactions.append([time.perf_counter(), None])
+
+    def end(conn):
+        transactions[-1][1] = time.perf_counter()
+
+    event.listen(engine, "begin", begin)
+    event.listen(engine, "commit", end)
+    event.listen(engine, "rollback", end)
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    count = 0
+    try:
+        with Session(engine) as session:
+            for chunk in encode_rows(ExportFormats.CSV, COLUMNS, rows(session)):
+                count += chunk.count("\n")
+        elapsed = time.perf_counter() - start
+    finally:
+        for name, listener in (("begin", begin), ("commit", end), ("rollback", end)):
+            event.remove(engine, name, listener)
+    # ru_maxrss is in kilobytes on Linux
+    growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1e3
+    longest = max((end or time.perf_counter()) - begin for begin, end in transactions)
+    # The header line
+    return count - 1, elapsed, growth, longest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--database", default="booking_export_benchmark")
+    args = parser.parse_args()
+
+    engine = scratch_engine(args.database)
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.bookings, args.users)
+    print(f"{args.bookings} bookings, {args.users} users, {len(COLUMNS)} columns")
+    print(
+        f"{'export':<12}{'rows':>9}{'seconds':>9}{'rows/s':>9}{'RSS +MB':>9}"
+        f"{'longest tx s':>14}"
+    )
+    for label, rows in (
+        ("batched", batched),
+        ("one cursor", one_cursor),
+        ("buffered", buffered),
+    ):
+        count, elapsed, growth, longest = run(engine, rows)
+        print(
+            f"{label:<12}{count:>9}{elapsed:>9.1f}{count / elapsed:>9.0f}"
+            f"{growth:>9.1f}{longest:>14.2f}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
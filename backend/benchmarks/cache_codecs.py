@@ -0,0 +1,90 @@
+"""
+Benchmark: encode/decode time and stored bytes per cache codec.
+
+Encodes every fixture in external_services/mock_data, plus a 250-offer
+flight search built from the search fixture, with each available codec and
+compression, and compares against the legacy plain json.dumps entries.
+Codecs whose optional package is not installed are skipped.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.cache_codecs [--iterations 500]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from backend.benchmarks.offer_results import synthetic_offers
+from backend.external_services.cache_codecs import (
+    CODECS,
+    COMPRESSIONS,
+    EntrySerializer,
+    ZlibCompression,
+)
+
+MOCK_DATA = Path(__file__).resolve().parent.parent / "external_services" / "mock_data"
+
+
+def payloads() -> dict[str, object]:
+    fixtures = {
+        path.stem: json.loads(path.read_text())
+        for path in sorted(MOCK_DATA.glob("*.json"))
+    }
+    fixtures["250 offers"] = synthetic_offers(250)
+    return fixtures
+
+
+def serializers() -> dict[str, EntrySerializer]:
+    variants = {}
+    for codec in CODECS:
+        for compression in COMPRESSIONS:
+            label = codec if compression == "none" else f"{codec}+{compression}"
+            variants[label] = EntrySerializer(codec, compression, threshold=1024)
+    if "zlib" in COMPRESSIONS:
+        serializer = EntrySerializer("json", "zlib", threshold=1024)
+        serializer.compression = ZlibCompression(level=6)
+        variants["json+zlib6"] = serializer
+    return variants
+
+
+def median_us(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, payload in payloads().items():
+        legacy = json.dumps(payload)
+        print(f"\n{name} (legacy json.dumps: {len(legacy):,} bytes)")
+        print(
+            f"{'codec':<16}{'encode µs':>11}{'decode µs':>11}{'bytes':>10}{'ratio':>8}"
+        )
+        print(
+            f"{'legacy':<16}"
+            f"{median_us(lambda: json.dumps(payload), args.iterations):>11.1f}"
+            f"{median_us(lambda: json.loads(legacy), args.iterations):>11.1f}"
+            f"{len(legacy):>10,}{1:>8.2f}"
+        )
+        for label, serializer in serializers().items():
+            entry = serializer.encode(payload)
+            assert serializer.decode(entry)[0] == json.loads(legacy)
+            encode = median_us(lambda: serializer.encode(payload), args.iterations)
+            decode = median_us(lambda: serializer.decode(entry), args.iterations)
+            print(
+                f"{label:<16}{encode:>11.1f}{decode:>11.1f}"
+                f"{len(entry):>10,}{len(entry) / len(legacy):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
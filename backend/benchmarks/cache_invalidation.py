@@ -0,0 +1,122 @@
+"""
+Benchmark: invalidating one user's booking pages, SCAN pattern vs tags.
+
+Fills Redis with filler keys plus a handful of tagged booking-list pages
+for one user, then times removing that user's pages with:
+
+- delete_pattern: SCAN over the whole keyspace, unlinking matches
+- invalidate_tags: unlinking the members of the user's tag set
+
+Usage (from the repository root):
+    python -m backend.benchmarks.cache_invalidation [--keys 1000000] [--rounds 5]
+
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT). All benchmark keys live
+under a "bench:" prefix and are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from backend.external_services.cache import RedisCache
+from backend.utils.cache_keys import build_cache_tag
+from backend.utils.constants import CacheTags
+
+PREFIX = "bench:invalidation"
+PAGES_PER_USER = 5
+FILL_BATCH = 10_000
+
+
+async def fill(cache: RedisCache, count: int) -> None:
+    """Write filler entries shaped like other users' cached pages."""
+    page = {"items": [], "has_more": False}
+    for start in range(0, count, FILL_BATCH):
+        await cache.set_many(
+            {
+                f"{PREFIX}:user_bookings:v1:filler{i}:{i}": page
+                for i in range(start, min(start + FILL_BATCH, count))
+            },
+            3600,
+        )
+
+
+async def cache_pages(cache: RedisCache, user: str) -> None:
+    tag = build_cache_tag(CacheTags.USER_BOOKINGS, f"{PREFIX}:{user}")
+    await cache.set_many(
+        {
+            f"{PREFIX}:user_bookings:v1:{user}:{page}": {"items": [], "has_more": False}
+            for page in range(PAGES_PER_USER)
+        },
+        3600,
+        tags=[tag],
+    )
+
+
+async def time_ms(fn) -> float:
+    start = time.perf_counter()
+    await fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+async def run(args: argparse.Namespace) -> None:
+    cache = RedisCache(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+    )
+    start = time.perf_counter()
+    await fill(cache, args.keys)
+    print(
+        f"Filled {args.keys:,} keys in {time.perf_counter() - start:.1f} s "
+        f"(dbsize {await cache.r.dbsize():,})"
+    )
+
+    try:
+        results: dict[str, list[float]] = {"delete_pattern": [], "invalidate_tags": []}
+        for round_number in range(args.rounds):
+            user = f"user{round_number}"
+
+            await cache_pages(cache, user)
+            pattern = f"{PREFIX}:user_bookings:v1:{user}:*"
+            results["delete_pattern"].append(
+                await time_ms(lambda: cache.delete_pattern(pattern))
+            )
+
+            await cache_pages(cache, user)
+            tag = build_cache_tag(CacheTags.USER_BOOKINGS, f"{PREFIX}:{user}")
+            results["invalidate_tags"].append(
+                await time_ms(lambda: cache.invalidate_tags(tag))
+            )
+            assert await cache.get(f"{PREFIX}:user_bookings:v1:{user}:0") is None
+
+        print(
+            f"\nInvalidate {PAGES_PER_USER} pages for one user ({args.rounds} rounds)"
+        )
+        print(f"{'method':<18}{'median ms':>11}{'max ms':>10}")
+        for method, samples in results.items():
+            print(
+                f"{method:<18}{statistics.median(samples):>11.3f}{max(samples):>10.3f}"
+            )
+    finally:
+        await cache.delete_pattern(f"{PREFIX}:*")
+        for round_number in range(args.rounds):
+            await cache.r.unlink(
+                cache.tag_key(
+                    build_cache_tag(
+                        CacheTags.USER_BOOKINGS, f"{PREFIX}:user{round_number}"
+                    )
+                )
+            )
+        await cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
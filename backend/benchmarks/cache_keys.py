@@ -0,0 +1,126 @@
+"""
+Benchmark: cache key construction cost and Redis memory per key.
+
+Compares the legacy insertion-ordered ``key:value`` join with the namespaced,
+versioned, digest-based keys from utils.cache_keys.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.cache_keys [--iterations 100000] [--keys 5000]
+
+The memory section needs a reachable Redis (REDIS_HOST / REDIS_PORT) and is
+skipped otherwise. Benchmark keys are written under a dedicated prefix and
+deleted afterwards.
+"""
+
+import argparse
+import os
+import timeit
+
+import redis
+
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+
+
+def legacy_key(data: dict) -> str:
+    """The previous build_redis_key implementation, kept for comparison."""
+    return "_".join(f"{key}:{value}" for key, value in data.items())
+
+
+SHORT_SEARCH = {
+    "originLocationCode": "NBO",
+    "destinationLocationCode": "LHR",
+    "departureDate": "2026-12-01",
+    "adults": 1,
+    "max": 5,
+    "currencyCode": "USD",
+}
+
+LONG_SEARCH = {
+    **SHORT_SEARCH,
+    "returnDate": "2026-12-15",
+    "children": 2,
+    "infants": 1,
+    "travelClass": "PREMIUM_ECONOMY",
+    "includedAirlineCodes": ",".join(["KQ", "BA", "EK", "QR", "ET", "TK", "LH", "AF"]),
+    "nonStop": False,
+    "maxPrice": 5000,
+}
+
+
+def bench_construction(iterations: int) -> None:
+    print(f"Key construction ({iterations:,} iterations, µs per key)")
+    print(
+        f"{'params':<14}{'legacy':>10}{'namespaced':>12}{'legacy len':>12}{'new len':>9}"
+    )
+    for label, params in (("short search", SHORT_SEARCH), ("long search", LONG_SEARCH)):
+        legacy = timeit.timeit(lambda: legacy_key(params), number=iterations)
+        namespaced = timeit.timeit(
+            lambda: build_cache_key(CacheNamespaces.FLIGHT_SEARCH, params),
+            number=iterations,
+        )
+        print(
+            f"{label:<14}"
+            f"{legacy / iterations * 1e6:>10.2f}"
+            f"{namespaced / iterations * 1e6:>12.2f}"
+            f"{len(legacy_key(params)):>12}"
+            f"{len(build_cache_key(CacheNamespaces.FLIGHT_SEARCH, params)):>9}"
+        )
+
+
+def bench_memory(client: redis.Redis, keys: int) -> None:
+    print(f"\nRedis memory per key ({keys:,} keys, bytes, value = '1')")
+    for label, params in (("short search", SHORT_SEARCH), ("long search", LONG_SEARCH)):
+        results = {}
+        for scheme, builder in (
+            ("legacy", legacy_key),
+            (
+                "namespaced",
+                lambda p: build_cache_key(CacheNamespaces.FLIGHT_SEARCH, p),
+            ),
+        ):
+            generated = [
+                "bench:" + builder({**params, "departureDate": f"2026-{i:06d}"})
+                for i in range(keys)
+            ]
+            pipe = client.pipeline(transaction=False)
+            for key in generated:
+                pipe.set(key, "1")
+            pipe.execute()
+
+            pipe = client.pipeline(transaction=False)
+            for key in generated:
+                pipe.memory_usage(key, samples=0)
+            usage = [size for size in pipe.execute() if size]
+            results[scheme] = sum(usage) / len(usage)
+
+            client.delete(*generated)
+
+        print(
+            f"{label:<14}legacy={results['legacy']:.0f}"
+            f"  namespaced={results['namespaced']:.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--keys", type=int, default=5_000)
+    args = parser.parse_args()
+
+    bench_construction(args.iterations)
+
+    client = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+    )
+    try:
+        client.ping()
+    except redis.exceptions.ConnectionError:
+        print("\nRedis not reachable; skipping memory benchmark")
+        return
+    bench_memory(client, args.keys)
+
+
+if __name__ == "__main__":
+    main()
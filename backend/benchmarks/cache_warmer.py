@@ -0,0 +1,163 @@
+"""
+Benchmark: flight search cache hit rate with and without the cache warmer.
+
+Simulates a morning of GET flight-offers searches. Routes are drawn from a
+long-tailed popularity distribution (the same one the synthetic booking
+history follows) and departure dates favour the coming days. The hit rate
+is measured twice, each time starting from an empty cache:
+
+- cold: searches fill the cache themselves, as today
+- warmed: after one cache warmer run over the booking history's hot routes
+
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT). Benchmark keys are
+written under their real namespaces and deleted afterwards.
+
+Usage (from the repository root):
+    FLIGHT_SERVICE_PROVIDER=mock python -m backend.benchmarks.cache_warmer \
+        [--searches 2000] [--routes 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+from datetime import date, timedelta
+
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache import RedisCache
+from backend.external_services.cache_warmer import CacheWarmer, Route, search_params
+from backend.external_services.location_index import LocationIndex
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.quota_scheduler import QuotaScheduler
+from backend.external_services.single_flight import SingleFlight
+from backend.schemas.locations import AirportCitySearchRequest
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+
+AIRPORTS = ["NBO", "LHR", "DXB", "JFK", "ADD", "LOS", "CDG", "AMS", "JNB", "DOH"]
+TODAY = date(2030, 1, 1)
+
+
+def route_popularity() -> list[tuple[tuple[str, str], float]]:
+    """Every airport pair, weighted 1/rank (Zipf)."""
+    pairs = [(a, b) for a in AIRPORTS for b in AIRPORTS if a != b]
+    random.Random(7).shuffle(pairs)
+    return [(pair, 1 / rank) for rank, pair in enumerate(pairs, start=1)]
+
+
+class BookedRoutesWarmer(CacheWarmer):
+    """Warmer whose booking history is synthesized instead of queried."""
+
+    def __init__(self, *args, bookings: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        rng = random.Random(11)
+        pairs, weights = zip(*route_popularity())
+        tally: dict[tuple[str, str], int] = {}
+        for pair in rng.choices(pairs, weights, k=bookings):
+            tally[pair] = tally.get(pair, 0) + 1
+        self.booked = [
+            Route(origin=origin, destination=destination, bookings=count)
+            for (origin, destination), count in sorted(
+                tally.items(), key=lambda item: -item[1]
+            )
+        ]
+
+    async def hot_routes(self, session) -> list[Route]:
+        return self.booked[: self.max_routes]
+
+
+async def morning(
+    cache: RedisCache, single_flight: SingleFlight, service, searches: int
+) -> tuple[float, set[str]]:
+    """Run the simulated searches; return the hit rate and the keys touched."""
+    rng = random.Random(5)
+    pairs, weights = zip(*route_popularity())
+    day_weights = [1 / offset for offset in range(1, 15)]
+    hits = 0
+    keys = set()
+    for _ in range(searches):
+        origin, destination = rng.choices(pairs, weights)[0]
+        offset = rng.choices(range(1, 15), day_weights)[0]
+        params = search_params(origin, destination, TODAY + timedelta(days=offset))
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, params)
+        keys.add(key)
+        if await cache.get(key):
+            hits += 1
+            continue
+        await single_flight.load(
+            key,
+            lambda: service.search_flights_get(params),
+            operation="search_flights_get",
+        )
+    return hits / searches, keys
+
+
+async def run(args: argparse.Namespace) -> None:
+    cache = RedisCache(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+    )
+    single_flight = SingleFlight(cache)
+    service = AsyncFlightService(
+        MockFlightService(), scheduler=QuotaScheduler(rate_per_second=0)
+    )
+    warmer = BookedRoutesWarmer(
+        service,
+        cache,
+        single_flight,
+        index=LocationIndex(),
+        max_routes=args.routes,
+        days_ahead=args.days_ahead,
+        today=lambda: TODAY,
+        bookings=args.bookings,
+    )
+    planned = warmer.planned_searches(warmer.booked[: args.routes])
+    locations = {
+        build_cache_key(
+            CacheNamespaces.LOCATIONS,
+            AirportCitySearchRequest(keyword=code).model_dump(),
+        )
+        for code in AIRPORTS
+    }
+    touched = set(planned) | locations
+
+    async def clear() -> None:
+        for key in touched:
+            await cache.delete(key)
+
+    try:
+        cold, keys = await morning(cache, single_flight, service, args.searches)
+        touched |= keys
+        await clear()
+
+        report = await warmer.run_once(session=None)
+        warm, keys = await morning(cache, single_flight, service, args.searches)
+        touched |= keys
+    finally:
+        await clear()
+        service.shutdown()
+        await cache.close()
+
+    print(
+        f"{args.searches} searches over {len(touched)} distinct searches; "
+        f"warming {report['routes']} routes x {args.days_ahead} days "
+        f"= {report['warmed']} upstream calls"
+    )
+    print(f"{'cache':<10}{'hit rate':>10}")
+    print(f"{'cold':<10}{cold:>10.1%}")
+    print(f"{'warmed':<10}{warm:>10.1%}")
+    print(f"warm coverage of planned searches: {report['coverage']:.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--routes", type=int, default=20)
+    parser.add_argument("--days-ahead", type=int, default=7)
+    parser.add_argument("--bookings", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: serial vs concurrent retrieval of a batch of flight orders.
+
+Wraps the mock provider with a fixed per-call latency and fetches 50 and 200
+orders:
+
+- serial: the provider's own get_flight_orders loop, one order after another
+- batch: AsyncFlightService.get_flight_orders_batch, one call per order with
+  bounded concurrency
+- batch (half stored): the same, with half the orders already held as stored
+  booking responses
+
+Quota scheduling is disabled, so only upstream latency is measured.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.flight_orders [--latency-ms 100] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import time
+
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.quota_scheduler import QuotaScheduler
+
+
+class SlowMockFlightService(MockFlightService):
+    """Mock provider whose order lookups take ``latency`` seconds each."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def get_flight_order(self, flight_orderId: str) -> dict:
+        time.sleep(self.latency)
+        return super().get_flight_order(flight_orderId)
+
+
+async def run(count: int, latency: float, concurrency: int) -> None:
+    provider = SlowMockFlightService(latency)
+    service = AsyncFlightService(provider, scheduler=QuotaScheduler(rate_per_second=0))
+    order_ids = [f"eJzTd9f3NjIJdgwDAAtXAmE{i}" for i in range(count)]
+    stored = {order_id: {"id": order_id} for order_id in order_ids[::2]}
+
+    start = time.perf_counter()
+    await service._run(provider.get_flight_orders, order_ids)
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = await service.get_flight_orders_batch(order_ids, concurrency=concurrency)
+    concurrent = time.perf_counter() - start
+    assert len(batch["orders"]) == count
+
+    start = time.perf_counter()
+    await service.get_flight_orders_batch(
+        order_ids, stored=stored, concurrency=concurrency
+    )
+    half_stored = time.perf_counter() - start
+    service.shutdown()
+
+    print(f"\n{count} orders, {latency * 1000:.0f} ms per call")
+    print(f"{'strategy':<22}{'seconds':>10}{'speedup':>10}")
+    for label, seconds in (
+        ("serial", serial),
+        (f"batch ({concurrency} at once)", concurrent),
+        ("batch (half stored)", half_stored),
+    ):
+        print(f"{label:<22}{seconds:>10.2f}{serial / seconds:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    for count in (50, 200):
+        asyncio.run(run(count, args.latency_ms / 1000, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: location autocomplete index build time and lookup latency.
+
+Builds a seeded synthetic dataset of Amadeus-shaped airport and city
+locations, loads it into LocationIndex and times type-ahead queries of
+different shapes (single letters, short prefixes, IATA codes, multi-word
+and misspelled names). "cold" clears the short-query memo before every
+lookup; "warm" is steady state.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.location_index [--locations 12000] [--queries 2000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from backend.external_services.location_index import LocationIndex
+
+SYLLABLES = [
+    "ba", "ka", "na", "ro", "bi", "lo", "don", "mo", "sa", "ta", "ri", "ne",
+    "po", "li", "ma", "ga", "te", "vi", "zu", "lu", "mi", "da", "ko", "re",
+]  # fmt: skip
+AIRPORT_WORDS = ["INTERNATIONAL", "REGIONAL", "MUNICIPAL", "FIELD", "AIRPORT"]
+COUNTRIES = [
+    "KENYA", "UNITED KINGDOM", "FRANCE", "GERMANY", "UGANDA", "TANZANIA",
+    "SOUTH AFRICA", "UNITED STATES", "BRAZIL", "INDIA", "JAPAN", "EGYPT",
+]  # fmt: skip
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).upper()
+
+
+def _code(rng: random.Random) -> str:
+    return "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(3))
+
+
+def synthetic_locations(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    locations = []
+    while len(locations) < count:
+        city = _word(rng)
+        city_code = _code(rng)
+        country = rng.choice(COUNTRIES)
+        address = {
+            "cityName": city,
+            "cityCode": city_code,
+            "countryName": country,
+            "countryCode": country[:2],
+            "regionCode": "XX",
+        }
+        locations.append(
+            {
+                "type": "location",
+                "subType": "CITY",
+                "name": city,
+                "detailedName": f"{city}/{country[:2]}",
+                "id": f"C{city_code}{len(locations)}",
+                "iataCode": city_code,
+                "address": address,
+            }
+        )
+        for _ in range(rng.randint(1, 3)):
+            name = f"{_word(rng)} {rng.choice(AIRPORT_WORDS)}"
+            iata = _code(rng)
+            locations.append(
+                {
+                    "type": "location",
+                    "subType": "AIRPORT",
+                    "name": name,
+                    "detailedName": f"{city}/{country[:2]}:{name}",
+                    "id": f"A{iata}{len(locations)}",
+                    "iataCode": iata,
+                    "address": address,
+                    "analytics": {"travelers": {"score": rng.randint(0, 100)}},
+                }
+            )
+    return locations[:count]
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+
+
+def query_sets(locations: list[dict], count: int) -> dict[str, list[str]]:
+    rng = random.Random(11)
+    sample = [rng.choice(locations) for _ in range(count)]
+    return {
+        "1 letter": [loc["name"][0] for loc in sample],
+        "3-letter prefix": [loc["name"][:3] for loc in sample],
+        "iata code": [loc["iataCode"] for loc in sample],
+        "full city": [loc["address"]["cityName"] for loc in sample],
+        "two words": [
+            f"{loc['address']['cityName'][:4]} {loc['name'].split()[0][:3]}"
+            for loc in sample
+        ],
+        "typo": [_typo(loc["address"]["cityName"], rng) for loc in sample],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locations", type=int, default=12_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+
+    locations = synthetic_locations(args.locations)
+    index = LocationIndex()
+    start = time.perf_counter()
+    index.load(locations)
+    print(
+        f"Loaded {len(index):,} locations in {(time.perf_counter() - start) * 1e3:.0f} ms"
+    )
+
+    extra = synthetic_locations(1_000, seed=99)
+    start = time.perf_counter()
+    index.add_many(extra)
+    print(
+        f"Incrementally added {len(extra):,} locations in "
+        f"{(time.perf_counter() - start) * 1e3:.0f} ms"
+    )
+
+    query_groups = query_sets(locations, args.queries)
+    for mode in ("cold", "warm"):
+        print(f"\nLookup latency, {mode} ({args.queries:,} queries each, µs)")
+        print(f"{'query':<17}{'p50':>9}{'p99':>9}{'max':>9}{'avg hits':>10}")
+        for label, queries in query_groups.items():
+            samples = []
+            hits = 0
+            for query in queries:
+                if mode == "cold":
+                    # Drop memoized short-prefix results
+                    index._memo.clear()
+                start = time.perf_counter()
+                hits += len(index.search(query))
+                samples.append(time.perf_counter() - start)
+            cuts = statistics.quantiles(samples, n=100)
+            print(
+                f"{label:<17}{cuts[49] * 1e6:>9.1f}{cuts[98] * 1e6:>9.1f}"
+                f"{max(samples) * 1e6:>9.1f}{hits / len(queries):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: "page 2 sorted by duration" through a result handle vs the full search.
+
+Synthesizes a search result of Amadeus-shaped offers from the mock provider's
+fixture and compares response size and server-side latency of:
+
+- full: reading the cached search from Redis and returning every offer (the
+  client then sorts and pages itself)
+- handle (redis): slicing a result set loaded from Redis
+- handle (local): slicing the worker's materialized copy
+
+Usage (from the repository root):
+    python -m backend.benchmarks.offer_results [--offers 250] [--iterations 2000]
+
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT). Benchmark keys are
+written under their real namespaces and deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend.external_services.cache import RedisCache
+from backend.external_services.offer_results import OfferResultStore
+from backend.schemas.offer_results import OfferSliceParams
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+
+MOCK_DATA = Path(__file__).resolve().parent.parent / "external_services" / "mock_data"
+
+
+def synthetic_offers(count: int, seed: int = 3) -> list[dict]:
+    """Vary price, departure time and duration of the fixture offers."""
+    rng = random.Random(seed)
+    templates = json.loads((MOCK_DATA / "flight_search_results.json").read_text())
+    offers = []
+    for index in range(count):
+        offer = copy.deepcopy(templates[index % len(templates)])
+        offer["id"] = str(index + 1)
+        offer["price"]["grandTotal"] = f"{rng.uniform(300, 1500):.2f}"
+        shift = timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        for itinerary in offer["itineraries"]:
+            minutes = rng.randrange(420, 1500, 5)
+            itinerary["duration"] = f"PT{minutes // 60}H{minutes % 60}M"
+            for segment in itinerary["segments"]:
+                for end in ("departure", "arrival"):
+                    at = datetime.fromisoformat(segment[end]["at"]) + shift
+                    segment[end]["at"] = at.isoformat()
+        offers.append(offer)
+    return offers
+
+
+async def timed(fn, iterations: int) -> tuple[float, float, int]:
+    """Return (p50 µs, p99 µs, response bytes)."""
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(await fn())
+        samples.append(time.perf_counter() - start)
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49] * 1e6, cuts[98] * 1e6, size
+
+
+async def run(args: argparse.Namespace) -> None:
+    cache = RedisCache(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+    )
+    store = OfferResultStore(cache)
+    offers = synthetic_offers(args.offers)
+    search_key = build_cache_key(
+        CacheNamespaces.FLIGHT_SEARCH, {"bench": "offer_results", "n": args.offers}
+    )
+    await cache.set(search_key, offers)
+
+    start = time.perf_counter()
+    handle = (await store.ingest(search_key, offers)).handle
+    ingest_ms = (time.perf_counter() - start) * 1e3
+
+    async def full() -> bytes:
+        return json.dumps(await cache.get(search_key)).encode()
+
+    def sliced(view: str, from_redis: bool):
+        params = OfferSliceParams(sort="duration", offset=20, limit=20, view=view)
+
+        async def read() -> bytes:
+            if from_redis:
+                store.local.clear()
+            result_set = await store.get(handle)
+            return result_set.slice(params).model_dump_json().encode()
+
+        return read
+
+    cases = {
+        "full result": full,
+        "handle, redis": sliced("full", True),
+        "handle, local": sliced("full", False),
+        "summary, redis": sliced("summary", True),
+        "summary, local": sliced("summary", False),
+    }
+
+    print(f"{args.offers} offers, ingest {ingest_ms:.1f} ms")
+    print(f"{'page 2 by duration':<20}{'p50 µs':>10}{'p99 µs':>10}{'bytes':>11}")
+    try:
+        for label, fn in cases.items():
+            p50, p99, size = await timed(fn, args.iterations)
+            print(f"{label:<20}{p50:>10.1f}{p99:>10.1f}{size:>11,}")
+    finally:
+        await cache.delete(search_key)
+        await cache.delete(store.key_for(handle))
+        await cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--offers", type=int, default=250)
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
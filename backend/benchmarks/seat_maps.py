@@ -0,0 +1,113 @@
+"""
+Benchmark: payload size and latency of full vs compact seat map responses.
+
+Measures the mock seat map fixture, plus a full-size 30-row, 9-abreast deck
+built from its seats, as returned today (full) and with ?format=compact:
+serialized bytes, time to encode the compact form, and time to produce the
+JSON body either way.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.seat_maps [--iterations 500]
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import statistics
+import time
+from pathlib import Path
+
+from backend.external_services.seat_maps import (
+    AVAILABLE,
+    BLOCKED,
+    expand_seat_map,
+    render_seat_maps,
+)
+
+SEAT_MAP_FIXTURE = (
+    Path(__file__).resolve().parent.parent
+    / "external_services"
+    / "mock_data"
+    / "seat_map.json"
+)
+LETTERS = "ABC DEF GHK"
+
+
+def fixture_seat_maps() -> list[dict]:
+    return json.loads(SEAT_MAP_FIXTURE.read_text())
+
+
+def synthetic_seat_maps(rows: int) -> list[dict]:
+    """The fixture's seat map with ``rows`` full rows of 9 seats."""
+    seat_maps = fixture_seat_maps()
+    template = seat_maps[0]["decks"][0]["seats"][0]
+    seats = []
+    for x in range(rows):
+        for y, letter in enumerate(LETTERS):
+            if letter == " ":
+                continue
+            seat = copy.deepcopy(template)
+            seat["number"] = f"{10 + x}{letter}"
+            seat["coordinates"] = {"x": x + 1, "y": y}
+            for pricing in seat["travelerPricing"]:
+                pricing["seatAvailabilityStatus"] = (
+                    BLOCKED if (x + y) % 3 == 0 else AVAILABLE
+                )
+            seats.append(seat)
+    seat_maps[0]["decks"][0]["seats"] = seats
+    return seat_maps
+
+
+def median_us(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    cases = {
+        "seat_map.json": fixture_seat_maps(),
+        "30 rows x 9 seats": synthetic_seat_maps(30),
+    }
+    for name, seat_maps in cases.items():
+        compact = render_seat_maps(seat_maps, "compact")
+        assert [expand_seat_map(seat_map) for seat_map in compact] == seat_maps
+        full_body = json.dumps(seat_maps).encode()
+        compact_body = json.dumps(compact).encode()
+        print(f"\n{name}")
+        print(
+            f"{'format':<10}{'bytes':>10}{'gzip bytes':>12}"
+            f"{'encode µs':>11}{'serve µs':>11}"
+        )
+        full_serve = median_us(
+            lambda: json.dumps(render_seat_maps(seat_maps, "full")), args.iterations
+        )
+        compact_encode = median_us(
+            lambda: render_seat_maps(seat_maps, "compact"), args.iterations
+        )
+        compact_serve = median_us(
+            lambda: json.dumps(render_seat_maps(seat_maps, "compact")),
+            args.iterations,
+        )
+        print(
+            f"{'full':<10}{len(full_body):>10,}"
+            f"{len(gzip.compress(full_body)):>12,}{0:>11.1f}{full_serve:>11.1f}"
+        )
+        print(
+            f"{'compact':<10}{len(compact_body):>10,}"
+            f"{len(gzip.compress(compact_body)):>12,}"
+            f"{compact_encode:>11.1f}{compact_serve:>11.1f}"
+        )
+        print(f"compact/full bytes: {len(compact_body) / len(full_body):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark: flight searches against the synthetic provider, cached and uncached.
+
+Runs a burst of concurrent GET flight-offers searches over long-tailed route
+popularity with SyntheticFlightService as the upstream, so responses have
+production-like sizes (up to 250 multi-segment offers), latencies and
+failure rates:
+
+- uncached: every search calls the provider
+- cached (cold / warm): searches go through the Redis cache and
+  single-flight loader, as the search route does, first from an empty cache
+  and then repeated against the filled one
+
+Reports latency percentiles, upstream calls, failures and payload sizes.
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT). Benchmark keys are
+written under their real namespaces and deleted afterwards.
+
+Usage (from the repository root):
+    FLIGHT_SERVICE_PROVIDER=mock python -m backend.benchmarks.synthetic_provider \
+        [--searches 400] [--concurrency 20] [--latency-scale 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache import RedisCache
+from backend.external_services.quota_scheduler import QuotaScheduler
+from backend.external_services.single_flight import SingleFlight
+from backend.external_services.synthetic_flight_service import (
+    SyntheticFlightService,
+)
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+
+AIRPORTS = ["NBO", "LHR", "DXB", "JFK", "ADD", "LOS", "CDG", "AMS", "JNB", "DOH"]
+TODAY = date(2030, 1, 1)
+
+
+def searches(count: int) -> list[dict]:
+    """Searches over Zipf-weighted routes, dates and party sizes."""
+    rng = random.Random(5)
+    pairs = [(a, b) for a in AIRPORTS for b in AIRPORTS if a != b]
+    rng.shuffle(pairs)
+    weights = [1 / rank for rank in range(1, len(pairs) + 1)]
+    params = []
+    for _ in range(count):
+        origin, destination = rng.choices(pairs, weights)[0]
+        departure = TODAY + timedelta(days=rng.randint(1, 14))
+        search = {
+            "originLocationCode": origin,
+            "destinationLocationCode": destination,
+            "departureDate": departure.isoformat(),
+            "adults": rng.choices([1, 2, 3, 4], [6, 3, 1, 1])[0],
+            "max": 250,
+        }
+        if rng.random() < 0.6:
+            search["returnDate"] = (departure + timedelta(days=7)).isoformat()
+        params.append(search)
+    return params
+
+
+async def burst(label: str, run_search, params: list[dict], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    sizes = []
+    failures = 0
+
+    async def one(search: dict) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                offers = await run_search(search)
+            except Exception:
+                failures += 1
+                return
+            finally:
+                latencies.append(time.perf_counter() - start)
+            sizes.append(len(json.dumps(offers)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(search) for search in params))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(
+        f"{label:<10}{elapsed:>9.2f}{statistics.median(latencies) * 1000:>9.0f}"
+        f"{p95 * 1000:>9.0f}{failures:>10}{statistics.mean(sizes) / 1e3:>10.0f}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    cache = RedisCache(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+    )
+    single_flight = SingleFlight(cache)
+    provider = SyntheticFlightService(latency_scale=args.latency_scale)
+    service = AsyncFlightService(
+        provider, scheduler=QuotaScheduler(rate_per_second=0), max_workers=64
+    )
+    params = searches(args.searches)
+    keys = {build_cache_key(CacheNamespaces.FLIGHT_SEARCH, p) for p in params}
+    calls = 0
+
+    async def uncached(search: dict) -> list[dict]:
+        nonlocal calls
+        calls += 1
+        return await service.search_flights_get(search)
+
+    async def cached(search: dict) -> list[dict]:
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, search)
+        offers = await cache.get(key)
+        if offers is not None:
+            return offers
+        return await single_flight.load(
+            key, lambda: uncached(search), operation="search_flights_get"
+        )
+
+    print(
+        f"{args.searches} searches ({len(keys)} distinct), {args.concurrency} at "
+        f"once, latency scale {args.latency_scale}"
+    )
+    print(
+        f"{'mode':<10}{'seconds':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'failures':>10}{'avg kB':>10}"
+    )
+    try:
+        await burst("uncached", uncached, params, args.concurrency)
+        uncached_calls, calls = calls, 0
+        await burst("cold", cached, params, args.concurrency)
+        await burst("warm", cached, params, args.concurrency)
+    finally:
+        for key in keys:
+            await cache.delete(key)
+        service.shutdown()
+        await cache.close()
+    print(f"upstream calls: uncached {uncached_calls}, cold + warm {calls}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--searches", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-scale", type=float, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: read latency of L1 hits, L2 (Redis) hits and misses.
+
+Uses the mock provider's location search and flight search fixtures as
+payloads, so decode cost matches real cached responses.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.tiered_cache [--iterations 5000]
+
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT). Benchmark keys are written
+under their real namespaces with a "bench" parameter and deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import redis
+
+from backend.external_services.cache import RedisCache, TieredCache
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+
+MOCK_DATA = Path(__file__).resolve().parent.parent / "external_services" / "mock_data"
+
+PAYLOADS = {
+    "locations": (CacheNamespaces.LOCATIONS, "airport_search.json"),
+    "flight search": (CacheNamespaces.FLIGHT_SEARCH, "flight_search_results.json"),
+}
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    """Return (p50, p99) in microseconds."""
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49] * 1e6, cuts[98] * 1e6
+
+
+async def measure(read, iterations: int, before=None) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        await read()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = int(os.getenv("REDIS_PORT", 6379))
+    try:
+        redis.Redis(host=host, port=port).ping()
+    except redis.exceptions.ConnectionError:
+        print("Redis not reachable; nothing to benchmark")
+        return
+
+    tiered = TieredCache(host, port)
+    plain = RedisCache(host, port)
+
+    print(f"Read latency ({args.iterations:,} reads each, µs)")
+    print(f"{'payload':<15}{'bytes':>9}{'tier':>10}{'p50':>10}{'p99':>10}")
+    for label, (namespace, fixture) in PAYLOADS.items():
+        payload = json.loads((MOCK_DATA / fixture).read_text())
+        key = build_cache_key(namespace, {"bench": label})
+        missing = build_cache_key(namespace, {"bench": f"{label}-missing"})
+        await tiered.set(key, payload, 600)
+
+        results = {
+            "l1 hit": await measure(lambda: tiered.get(key), args.iterations),
+            "l2 hit": await measure(
+                lambda: tiered.get(key),
+                args.iterations,
+                before=lambda: tiered.local.delete(key),
+            ),
+            "no l1": await measure(lambda: plain.get(key), args.iterations),
+            "miss": await measure(lambda: tiered.get(missing), args.iterations),
+        }
+        size = len(json.dumps(payload))
+        for tier, samples in results.items():
+            p50, p99 = percentiles(samples)
+            print(f"{label:<15}{size:>9}{tier:>10}{p50:>10.1f}{p99:>10.1f}")
+
+        await tiered.delete(key)
+
+    print(f"\nL1 hit ratio over the run: {tiered.hit_ratios()['l1']:.2%}")
+    await tiered.close()
+    await plain.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Booking statistics for the admin dashboard, from aggregate SQL and rollups
+
+Every booking is counted in one BookingStatsRollup row per StatsPeriod, keyed
+by the UTC hour or day it was created in and its current status. The rows are
+kept in the same transaction as the booking writes (create_booking and
+update_booking_status), so reading the dashboard touches one row per day and
+status rather than every booking. rebuild_booking_stats recomputes them from
+the booking table.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import TypedDict
+
+from sqlalchemy import delete, distinct, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session
+from backend.models.booking_stats import BookingStatsRollup, StatsPeriod
+from backend.models.bookings import Booking, BookingStatus
+from backend.models.users import UserInDB
+
+PERIOD_LENGTHS = {
+    StatsPeriod.HOUR: timedelta(hours=1),
+    StatsPeriod.DAY: timedelta(days=1),
+}
+
+
+class BookingStats(TypedDict):
+    total_bookings: int
+    total_revenue: float
+    active_users: int
+    bookings_today: int
+    bookings_this_week: int
+
+
+def bucket_start(moment: datetime, period: str) -> datetime:
+    """
+    Start of the UTC hour or day a moment falls in
+
+    Args:
+        moment: Timestamp; naive values are taken as UTC
+        period: StatsPeriod.HOUR or StatsPeriod.DAY
+
+    Returns:
+        Aware UTC datetime truncated to the period
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc)
+    if period == StatsPeriod.DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_end(moment: datetime, period: str) -> datetime:
+    """The first bucket boundary at or after a moment."""
+    start = bucket_start(moment, period)
+    return start if start == moment else start + PERIOD_LENGTHS[period]
+
+
+def _bump(
+    session: Session,
+    created_at: datetime,
+    status: str,
+    bookings: int,
+    revenue: float,
+    new_users: int = 0,
+) -> None:
+    """Add to the counters of every period bucket a booking falls in."""
+    rollup = BookingStatsRollup.__table__
+    statement = pg_insert(rollup).values(
+        [
+            {
+                "period": period,
+                "bucket_start": bucket_start(created_at, period),
+                "status": status,
+                "bookings": bookings,
+                "revenue": revenue,
+                "new_users": new_users,
+            }
+            for period in PERIOD_LENGTHS
+        ]
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[rollup.c.period, rollup.c.bucket_start, rollup.c.status],
+            set_={
+                "bookings": rollup.c.bookings + statement.excluded.bookings,
+                "revenue": rollup.c.revenue + statement.excluded.revenue,
+                "new_users": rollup.c.new_users + statement.excluded.new_users,
+            },
+        )
+    )
+
+
+def record_booking_created(session: Session, booking: Booking) -> None:
+    """
+    Count a newly inserted booking; the caller commits
+
+    Args:
+        session: Database session the booking was flushed in
+        booking: The new booking, with created_at set
+    """
+    # Locks the user so concurrent first bookings can't both count as new
+    earlier = session.execute(
+        select(
+            select(Booking.id)
+            .where(Booking.user_id == booking.user_id)
+            .where(Booking.id != booking.id)
+            .exists()
+        )
+        .where(UserInDB.id == booking.user_id)
+        .with_for_update(of=UserInDB)
+    ).scalar()
+    _bump(
+        session,
+        booking.created_at,
+        booking.status,
+        1,
+        booking.total_price,
+        new_users=0 if earlier else 1,
+    )
+
+
+def record_status_change(session: Session, booking: Booking, old_status: str) -> None:
+    """
+    Move a booking's counters from its old status to its current one
+
+    Args:
+        session: Database session the status change is written in
+        booking: Booking with its new status
+        old_status: Status the booking is counted under so far
+    """
+    if old_status == booking.status:
+        return
+    _bump(session, booking.created_at, old_status, -1, -booking.total_price)
+    _bump(session, booking.created_at, booking.status, 1, booking.total_price)
+
+
+def rebuild_booking_stats(session: Session) -> int:
+    """
+    Recompute every rollup row from the booking table and commit
+
+    Args:
+        session: Database session
+
+    Returns:
+        Number of rollup rows written
+    """
+    session.execute(delete(BookingStatsRollup))
+    first_bookings = (
+        select(Booking.id)
+        .distinct(Booking.user_id)
+        .order_by(Booking.user_id, Booking.created_at, Booking.id)
+        .subquery()
+    )
+    written = 0
+    for period in PERIOD_LENGTHS:
+        bucket = func.date_trunc(period, Booking.created_at, "UTC")
+        query = (
+            select(
+                literal(period),
+                bucket,
+                Booking.status,
+                func.count(),
+                func.coalesce(func.sum(Booking.total_price), 0.0),
+                func.count(first_bookings.c.id),
+            )
+            .outerjoin(first_bookings, first_bookings.c.id == Booking.id)
+            .group_by(bucket, Booking.status)
+        )
+        written += session.execute(
+            insert(BookingStatsRollup).from_select(
+                [
+                    "period",
+                    "bucket_start",
+                    "status",
+                    "bookings",
+                    "revenue",
+                    "new_users",
+                ],
+                query,
+            )
+        ).rowcount
+    session.commit()
+    return written
+
+
+def _windows(now: datetime) -> tuple[datetime, datetime]:
+    today_start = bucket_start(now, StatsPeriod.DAY)
+    return today_start, now - timedelta(days=7)
+
+
+def booking_stats_from_bookings(
+    session: Session, now: datetime | None = None
+) -> BookingStats:
+    """
+    Compute booking statistics with one aggregate query over the booking table
+
+    Args:
+        session: Database session
+        now: Current time (defaults to now, UTC)
+
+    Returns:
+        The dashboard statistics
+    """
+    today_start, one_week_ago = _windows(now or datetime.now(timezone.utc))
+    row = session.execute(
+        select(
+            func.count(),
+            func.coalesce(
+                func.sum(Booking.total_price).filter(
+                    Booking.status == BookingStatus.PAID
+                ),
+                0.0,
+            ),
+            func.count(distinct(Booking.user_id)),
+            func.count().filter(Booking.created_at >= today_start),
+            func.count().filter(Booking.created_at >= one_week_ago),
+        )
+    ).one()
+    return BookingStats(
+        total_bookings=row[0],
+        total_revenue=row[1],
+        active_users=row[2],
+        bookings_today=row[3],
+        bookings_this_week=row[4],
+    )
+
+
+def get_booking_stats(session: Session, now: datetime | None = None) -> BookingStats:
+    """
+    Read booking statistics from the rollup
+
+    Totals and today come from daily rows. The last seven days start
+    mid-day, so they are whole days after the cutoff, plus the hours before
+    the first of those days, plus the bookings before the first whole hour
+    (an index range on created_at).
+
+    Args:
+        session: Database session
+        now: Current time (defaults to now, UTC)
+
+    Returns:
+        The dashboard statistics
+    """
+    today_start, one_week_ago = _windows(now or datetime.now(timezone.utc))
+    week_hours = _bucket_end(one_week_ago, StatsPeriod.HOUR)
+    week_days = _bucket_end(one_week_ago, StatsPeriod.DAY)
+    rollup = BookingStatsRollup
+
+    def total(column, *conditions):
+        return func.coalesce(func.sum(column).filter(*conditions), 0)
+
+    days = session.execute(
+        select(
+            total(rollup.bookings),
+            total(rollup.revenue, rollup.status == BookingStatus.PAID),
+            total(rollup.new_users),
+            total(rollup.bookings, rollup.bucket_start >= today_start),
+            total(rollup.bookings, rollup.bucket_start >= week_days),
+        ).where(rollup.period == StatsPeriod.DAY)
+    ).one()
+    hours = session.execute(
+        select(func.coalesce(func.sum(rollup.bookings), 0))
+        .where(rollup.period == StatsPeriod.HOUR)
+        .where(rollup.bucket_start >= week_hours)
+        .where(rollup.bucket_start < week_days)
+    ).scalar()
+    minutes = session.execute(
+        select(func.count())
+        .select_from(Booking)
+        .where(Booking.created_at >= one_week_ago)
+        .where(Booking.created_at < week_hours)
+    ).scalar()
+    return BookingStats(
+        total_bookings=int(days[0]),
+        total_revenue=float(days[1]),
+        active_users=int(days[2]),
+        bookings_today=int(days[3]),
+        bookings_this_week=int(days[4] + hours + minutes),
+    )
@@ -1,15 +1,169 @@
 """CRUD operations for bookings"""
 
 import uuid
+from datetime import datetime
+from typing import Iterator, TypedDict
+
+from sqlalchemy import Select, func, union_all
+from sqlalchemy.orm import joinedload, load_only
 from sqlmodel import Session, select
+from backend.crud.booking_stats import record_booking_created, record_status_change
 from backend.models.bookings import Booking
+from backend.models.users import UserInDB
 from backend.utils.pagination import (
     CursorPaginator,
+    encode_cursor,
     get_total_count,
 )
 
 MAX_PAGINATION_LIMIT = 100
 
+# Columns list endpoints read; amadeus_order_response is left out and raises
+# if accessed, so a page never pulls the order JSON from the database
+BOOKING_LIST_COLUMNS = (
+    Booking.id,
+    Booking.user_id,
+    Booking.flight_order_id,
+    Booking.status,
+    Booking.created_at,
+    Booking.total_price,
+    Booking.ticket_url,
+    Booking.pnr,
+    Booking.origin,
+    Booking.destination,
+    Booking.departure_at,
+    Booking.carrier_code,
+    Booking.flight_number,
+    Booking.passenger_count,
+)
+
+
+# The booking's user as admin views show it, joined into the booking query
+# instead of lazy-loaded one row at a time
+BOOKING_USER_COLUMNS = (UserInDB.id, UserInDB.email)
+
+
+def _with_user():
+    return joinedload(Booking.user, innerjoin=True).load_only(
+        *BOOKING_USER_COLUMNS, raiseload=True
+    )
+
+
+# Columns a booking export can select, by name
+EXPORT_COLUMNS = {
+    "id": Booking.id,
+    "created_at": Booking.created_at,
+    "status": Booking.status,
+    "total_price": Booking.total_price,
+    "flight_order_id": Booking.flight_order_id,
+    "pnr": Booking.pnr,
+    "origin": Booking.origin,
+    "destination": Booking.destination,
+    "departure_at": Booking.departure_at,
+    "carrier_code": Booking.carrier_code,
+    "flight_number": Booking.flight_number,
+    "passenger_count": Booking.passenger_count,
+    "ticket_url": Booking.ticket_url,
+    "user_id": Booking.user_id,
+    "user_email": UserInDB.email,
+}
+EXPORT_BATCH_SIZE = 10_000
+EXPORT_FETCH_SIZE = 1_000
+
+
+class BookingFilters(TypedDict, total=False):
+    """Admin booking list filters; omitted or None filters match everything"""
+
+    statuses: list[str] | None
+    created_from: datetime | None
+    created_to: datetime | None
+    pnr: str | None
+    flight_order_id: str | None
+    email_prefix: str | None
+
+
+def apply_booking_filters(query: Select, filters: BookingFilters | None) -> Select:
+    """
+    Restrict a booking query to the bookings matching the filters
+
+    Each filter is served by an index: statuses by ix_booking_status_cursor,
+    the created_at range by ix_booking_cursor, PNR and flight order ID by
+    their own indexes, and the email prefix (case-insensitive) by
+    ix_userindb_email_prefix and then ix_booking_user_cursor.
+
+    Args:
+        query: Query selecting from Booking
+        filters: Filters to apply, if any
+
+    Returns:
+        The filtered query
+    """
+    filters = filters or {}
+    if filters.get("statuses"):
+        query = query.where(Booking.status.in_(filters["statuses"]))
+    if filters.get("created_from"):
+        query = query.where(Booking.created_at >= filters["created_from"])
+    if filters.get("created_to"):
+        query = query.where(Booking.created_at < filters["created_to"])
+    if filters.get("pnr"):
+        query = query.where(Booking.pnr == filters["pnr"])
+    if filters.get("flight_order_id"):
+        query = query.where(Booking.flight_order_id == filters["flight_order_id"])
+    if filters.get("email_prefix"):
+        users = select(UserInDB.id).where(
+            func.lower(UserInDB.email).startswith(
+                filters["email_prefix"].lower(), autoescape=True
+            )
+        )
+        query = query.where(Booking.user_id.in_(users))
+    return query
+
+
+class OrderSummary(TypedDict):
+    pnr: str | None
+    origin: str | None
+    destination: str | None
+    departure_at: datetime | None
+    carrier_code: str | None
+    flight_number: str | None
+    passenger_count: int
+
+
+def order_summary(order: dict | None) -> OrderSummary:
+    """
+    Extract the booking summary columns from an Amadeus order response
+
+    Args:
+        order: Amadeus flight order response, if any
+
+    Returns:
+        PNR, outbound route, departure time, carrier and passenger count;
+        fields missing from the order are None (0 passengers)
+    """
+    order = order or {}
+    records = order.get("associatedRecords") or [{}]
+    offers = order.get("flightOffers") or [{}]
+    itineraries = offers[0].get("itineraries") or [{}]
+    segments = itineraries[0].get("segments") or [{}]
+    first, last = segments[0], segments[-1]
+    departure_at = None
+    if first.get("departure", {}).get("at"):
+        try:
+            departure_at = datetime.fromisoformat(first["departure"]["at"])
+        except (TypeError, ValueError):
+            pass
+    return OrderSummary(
+        pnr=records[0].get("reference"),
+        origin=first.get("departure", {}).get("iataCode"),
+        destination=last.get("arrival", {}).get("iataCode"),
+        departure_at=departure_at,
+        carrier_code=first.get("carrierCode"),
+        flight_number=first.get("number"),
+        passenger_count=len(
+            order.get("travelers") or offers[0].get("travelerPricings") or []
+        ),
+    )
+
 
 def _booking_cursor_fields(booking: Booking) -> dict:
     """Extract cursor fields from a booking."""
@@ -34,7 +188,9 @@ def get_user_bookings_cursor(
         include_count: Whether to include total count (can be expensive)
 
     Returns:
-        Tuple of (list of Booking objects, next_cursor or None, has_more, total_count or None)
+        Tuple of (list of Booking objects, next_cursor or None, has_more, total_count or None);
+        the bookings only have BOOKING_LIST_COLUMNS loaded, and their user
+        BOOKING_USER_COLUMNS, fetched in the same statement
     """
     paginator = CursorPaginator(
         cursor=cursor,
@@ -44,12 +200,16 @@ def get_user_bookings_cursor(
     )
 
     # Build base query
-    query = select(Booking).where(Booking.user_id == user_id)
+    query = (
+        select(Booking)
+        .options(load_only(*BOOKING_LIST_COLUMNS, raiseload=True))
+        .where(Booking.user_id == user_id)
+    )
 
     # Get total count if requested (before applying cursor/limit)
     total_count = None
     if include_count:
-        count_query = select(Booking).where(Booking.user_id == user_id)
+        count_query = select(Booking.id).where(Booking.user_id == user_id)
         total_count = get_total_count(session, count_query)
 
     # Apply pagination
@@ -65,11 +225,33 @@ def get_user_bookings_cursor(
     return items, next_cursor, has_more, total_count
 
 
+def _page_ids_per_status(
+    paginator: CursorPaginator, filters: BookingFilters, statuses: list[str]
+) -> Select:
+    """
+    IDs of the page for each status on its own, which together hold the page
+
+    ix_booking_status_cursor is in created_at order for one status only, so
+    with several statuses Postgres would otherwise sort all their matches or
+    walk ix_booking_cursor past every other status.
+    """
+    pages = []
+    for status in statuses:
+        page = apply_booking_filters(
+            select(Booking.id, Booking.created_at), {**filters, "statuses": [status]}
+        )
+        page = paginator.apply_cursor_filter(page, Booking)
+        page = paginator.apply_limit(paginator.apply_ordering(page, Booking))
+        pages.append(select(page.subquery().c.id))
+    return union_all(*pages)
+
+
 def get_all_bookings_cursor(
     session: Session,
     cursor: str | None = None,
     limit: int = 20,
     include_count: bool = False,
+    filters: BookingFilters | None = None,
 ) -> tuple[list[Booking], str | None, bool, int | None]:
     """
     Get cursor-paginated bookings (admin view).
@@ -79,9 +261,12 @@ def get_all_bookings_cursor(
         cursor: Cursor for pagination (None for first page)
         limit: Maximum number of records to return (capped at MAX_PAGINATION_LIMIT)
         include_count: Whether to include total count (can be expensive)
+        filters: Only list bookings matching these (see apply_booking_filters)
 
     Returns:
-        Tuple of (list of Booking objects, next_cursor or None, has_more, total_count or None)
+        Tuple of (list of Booking objects, next_cursor or None, has_more, total_count or None);
+        the bookings only have BOOKING_LIST_COLUMNS loaded, and their user
+        BOOKING_USER_COLUMNS
     """
     paginator = CursorPaginator(
         cursor=cursor,
@@ -91,12 +276,22 @@ def get_all_bookings_cursor(
     )
 
     # Build base query
-    query = select(Booking)
+    query = select(Booking).options(
+        load_only(*BOOKING_LIST_COLUMNS, raiseload=True), _with_user()
+    )
+    query = apply_booking_filters(query, filters)
+    statuses = (filters or {}).get("statuses") or []
+    if len(statuses) > 1:
+        query = query.where(
+            Booking.id.in_(_page_ids_per_status(paginator, filters, statuses))
+        )
 
     # Get total count if requested
     total_count = None
     if include_count:
-        total_count = get_total_count(session, select(Booking))
+        total_count = get_total_count(
+            session, apply_booking_filters(select(Booking.id), filters)
+        )
 
     # Apply pagination
     query = paginator.apply_cursor_filter(query, Booking)
@@ -111,6 +306,62 @@ def get_all_bookings_cursor(
     return items, next_cursor, has_more, total_count
 
 
+def export_bookings(
+    session: Session,
+    columns: list[str],
+    filters: BookingFilters | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[tuple]:
+    """
+    Stream bookings for export, newest first
+
+    Rows are read in keyset batches of ``batch_size``, each from a
+    server-side cursor in its own short read transaction, so memory stays
+    constant and no transaction is held open for the whole export. Bookings
+    created while an export runs are newer than its keyset, so they are left
+    out.
+
+    Args:
+        session: Database session without pending changes; it is committed
+            after each batch and must stay open until the rows are consumed
+        columns: Names from EXPORT_COLUMNS, in output order
+        filters: Only export bookings matching these (see apply_booking_filters)
+        batch_size: Rows per read transaction
+
+    Yields:
+        One tuple of column values per booking
+    """
+    selected = [EXPORT_COLUMNS[name] for name in columns]
+    cursor = None
+    while True:
+        paginator = CursorPaginator(
+            cursor=cursor, limit=1, order_fields=["created_at", "id"]
+        )
+        query = select(Booking.created_at, Booking.id, *selected)
+        if "user_email" in columns:
+            query = query.join(UserInDB, UserInDB.id == Booking.user_id)
+        query = apply_booking_filters(query, filters)
+        query = paginator.apply_ordering(
+            paginator.apply_cursor_filter(query, Booking), Booking
+        ).limit(batch_size)
+        result = session.execute(
+            query.execution_options(stream_results=True, yield_per=EXPORT_FETCH_SIZE)
+        )
+        count = 0
+        try:
+            for row in result:
+                count += 1
+                last = row
+                yield tuple(row[2:])
+        finally:
+            result.close()
+            # Ends the batch's read transaction
+            session.commit()
+        if count < batch_size:
+            return
+        cursor = encode_cursor({"created_at": last[0], "id": last[1]})
+
+
 def get_booking_by_id(session: Session, booking_id: str) -> Booking | None:
     """
     Get a booking by its ID
@@ -127,6 +378,21 @@ def get_booking_by_id(session: Session, booking_id: str) -> Booking | None:
     return booking
 
 
+def get_booking_with_user(session: Session, booking_id: str) -> Booking | None:
+    """
+    Get a booking by its ID with its user's BOOKING_USER_COLUMNS joined in
+
+    Args:
+        session: Database session
+        booking_id: Booking ID to search for
+
+    Returns:
+        Booking object if found, None otherwise
+    """
+    statement = select(Booking).where(Booking.id == booking_id).options(_with_user())
+    return session.exec(statement).first()
+
+
 def create_booking(session: Session, booking: Booking) -> Booking:
     """
     Create a new booking
@@ -139,6 +405,8 @@ def create_booking(session: Session, booking: Booking) -> Booking:
         Created booking object
     """
     session.add(booking)
+    session.flush()
+    record_booking_created(session, booking)
     session.commit()
     session.refresh(booking)
     return booking
@@ -158,10 +426,20 @@ def update_booking_status(
     Returns:
         Updated booking object if found, None otherwise
     """
-    booking = get_booking_by_id(session, booking_id)
+    # Lock the row so concurrent updates move its stats counters one at a time,
+    # and reload it: a copy the session already holds may predate the last
+    # committed status change
+    booking = session.exec(
+        select(Booking)
+        .where(Booking.id == booking_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).first()
     if booking:
+        old_status = booking.status
         booking.status = status
         session.add(booking)
+        record_status_change(session, booking, old_status)
         session.commit()
         session.refresh(booking)
     return booking
@@ -188,3 +466,54 @@ def update_booking_ticket_url(
         session.commit()
         session.refresh(booking)
     return booking
+
+
+def get_stored_flight_orders(
+    session: Session, flight_order_ids: list[str]
+) -> dict[str, dict]:
+    """
+    Get the stored Amadeus order responses for flight orders
+
+    Args:
+        session: Database session
+        flight_order_ids: Amadeus flight order IDs
+
+    Returns:
+        Order responses keyed by flight order ID, for bookings that have one
+    """
+    if not flight_order_ids:
+        return {}
+    statement = select(Booking.flight_order_id, Booking.amadeus_order_response).where(
+        Booking.flight_order_id.in_(flight_order_ids)
+    )
+    return {
+        flight_order_id: response
+        for flight_order_id, response in session.exec(statement).all()
+        if response
+    }
+
+
+def update_stored_flight_orders(session: Session, orders: dict[str, dict]) -> int:
+    """
+    Replace the stored Amadeus order responses with freshly fetched ones
+
+    Args:
+        session: Database session
+        orders: Order responses keyed by flight order ID
+
+    Returns:
+        Number of bookings whose stored response changed
+    """
+    if not orders:
+        return 0
+    statement = select(Booking).where(Booking.flight_order_id.in_(list(orders)))
+    updated = 0
+    for booking in session.exec(statement).all():
+        order = orders[booking.flight_order_id]
+        if booking.amadeus_order_response != order:
+            booking.amadeus_order_response = order
+            booking.sqlmodel_update(order_summary(order))
+            session.add(booking)
+            updated += 1
+    session.commit()
+    return updated
@@ -0,0 +1,218 @@
+"""
+Async adapter for synchronous flight service providers.
+
+The Amadeus SDK (and the mock provider that mirrors it) is blocking. Calling it
+directly from an ``async def`` handler stalls the event loop, so every other
+request in the worker — SSE streams included — waits for the slowest upstream
+call. This adapter runs each provider call on a bounded, dedicated thread pool
+so handlers can ``await`` it while the loop keeps serving other requests.
+
+Each call runs under an UpstreamGuard (see resilience): adaptive timeouts, a
+per-operation circuit breaker, and hedging for idempotent reads. Once the
+circuit breaker lets a call through, it takes a token from the QuotaScheduler
+(see quota_scheduler), so bookings and pricing go ahead of searches when quota
+is scarce and calls failed fast by an open circuit cost no quota.
+
+Batches of flight orders are fetched one call per order with bounded
+concurrency (see get_flight_orders_batch), rather than by the provider's
+serial get_flight_orders loop.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypedDict
+
+from amadeus.client.errors import ClientError
+
+from backend.external_services.interface import FlightServiceProtocol
+from backend.external_services.quota_scheduler import QuotaScheduler
+from backend.external_services.resilience import UpstreamGuard
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.getenv("FLIGHT_SERVICE_MAX_WORKERS", 32))
+# Orders fetched at once per batch; kept below the pool size so one batch
+# cannot starve searches and bookings of worker threads
+FLIGHT_ORDER_BATCH_CONCURRENCY = int(os.getenv("FLIGHT_ORDER_BATCH_CONCURRENCY", 8))
+
+# Reads safe to send twice when the first call is slow
+HEDGED_OPERATIONS = {
+    "search_flights",
+    "search_flights_get",
+    "airport_city_search",
+    "view_seat_map_get",
+    "view_seat_map_post",
+}
+# Calls with side effects; never abandoned on timeout, since they may still
+# complete upstream
+NON_IDEMPOTENT_OPERATIONS = {"create_flight_order", "cancel_flight_order"}
+
+
+class FlightOrderBatch(TypedDict):
+    """Result of get_flight_orders_batch, keyed by flight order ID."""
+
+    orders: dict[str, dict]
+    errors: dict[str, str]
+    # IDs answered from stored order responses instead of the provider
+    stored: list[str]
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Client errors (4xx) mean the provider answered; they do not trip circuits."""
+    return not isinstance(error, ClientError)
+
+
+class AsyncFlightService:
+    """
+    Awaitable facade over a synchronous FlightServiceProtocol implementation.
+
+    The executor is dedicated to upstream flight calls so slow provider requests
+    cannot exhaust the default loop executor used by FastAPI for sync handlers.
+    ``max_workers`` caps the number of in-flight provider calls per worker.
+    """
+
+    def __init__(
+        self,
+        service: FlightServiceProtocol,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        guard: UpstreamGuard | None = None,
+        scheduler: QuotaScheduler | None = None,
+    ):
+        self.service = service
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self.guard = guard or UpstreamGuard(is_failure=is_upstream_failure)
+        self.scheduler = scheduler or QuotaScheduler()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so the pool can be restarted after an app lifespan shutdown
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="flight-service"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    async def _call(self, operation: str, *args) -> Any:
+        """Run a provider method on the executor under quota and the guard."""
+        func = getattr(self.service, operation)
+        return await self.guard.call(
+            operation,
+            lambda: self._run(func, *args),
+            idempotent=operation not in NON_IDEMPOTENT_OPERATIONS,
+            hedge=operation in HEDGED_OPERATIONS,
+            acquire=lambda: self.scheduler.acquire(operation),
+            try_acquire=lambda: self.scheduler.try_acquire(operation),
+        )
+
+    async def search_flights(self, request_body: dict) -> dict:
+        return await self._call("search_flights", request_body)
+
+    async def search_flights_get(self, request_body: dict) -> dict:
+        return await self._call("search_flights_get", request_body)
+
+    async def confirm_price(self, request_body: dict) -> dict:
+        return await self._call("confirm_price", request_body)
+
+    async def create_flight_order(self, request_body: dict) -> dict:
+        return await self._call("create_flight_order", request_body)
+
+    async def view_seat_map_get(self, flightorderId: str) -> dict:
+        return await self._call("view_seat_map_get", flightorderId)
+
+    async def view_seat_map_post(self, flight_offer: dict) -> dict:
+        return await self._call("view_seat_map_post", flight_offer)
+
+    async def get_flight_order(self, flight_orderId: str) -> dict:
+        return await self._call("get_flight_order", flight_orderId)
+
+    async def cancel_flight_order(self, flight_orderId: str) -> dict:
+        return await self._call("cancel_flight_order", flight_orderId)
+
+    async def airport_city_search(self, request_body: dict) -> dict:
+        return await self._call("airport_city_search", request_body)
+
+    async def get_flight_orders(self, flight_order_ids: list[str]) -> list:
+        """Fetch orders concurrently, in request order; any failure raises."""
+        semaphore = asyncio.Semaphore(FLIGHT_ORDER_BATCH_CONCURRENCY)
+
+        async def fetch(order_id: str) -> dict:
+            async with semaphore:
+                return await self.get_flight_order(order_id)
+
+        return list(await asyncio.gather(*(fetch(i) for i in flight_order_ids)))
+
+    async def get_flight_orders_batch(
+        self,
+        flight_order_ids: list[str],
+        stored: dict[str, dict] | None = None,
+        concurrency: int = FLIGHT_ORDER_BATCH_CONCURRENCY,
+    ) -> FlightOrderBatch:
+        """
+        Fetch many flight orders, isolating failures per order.
+
+        Each order is its own provider call, at most ``concurrency`` at a
+        time, so a failing or slow order neither aborts nor serializes the
+        rest of the batch.
+
+        Args:
+            flight_order_ids: Flight order IDs; duplicates are fetched once
+            stored: Order responses already held (e.g. from
+                Booking.amadeus_order_response), returned without a call
+            concurrency: Maximum provider calls in flight for this batch
+
+        Returns:
+            Orders and error messages keyed by ID, both in request order
+        """
+        stored = stored or {}
+        order_ids = list(dict.fromkeys(flight_order_ids))
+        batch = FlightOrderBatch(orders={}, errors={}, stored=[])
+        fetched: dict[str, dict] = {}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(order_id: str) -> None:
+            async with semaphore:
+                try:
+                    fetched[order_id] = await self.get_flight_order(order_id)
+                except Exception as e:
+                    logger.warning(f"Failed to fetch flight order {order_id}: {e!r}")
+                    batch["errors"][order_id] = str(e) or type(e).__name__
+
+        await asyncio.gather(*(fetch(i) for i in order_ids if not stored.get(i)))
+
+        for order_id in order_ids:
+            if stored.get(order_id):
+                batch["orders"][order_id] = stored[order_id]
+                batch["stored"].append(order_id)
+            elif order_id in fetched:
+                batch["orders"][order_id] = fetched[order_id]
+        batch["errors"] = {
+            i: batch["errors"][i] for i in order_ids if i in batch["errors"]
+        }
+        return batch
+
+    async def get_most_travelled_destinations(
+        self, origin_city_code: str, period: str
+    ) -> list[dict]:
+        return await self._call(
+            "get_most_travelled_destinations", origin_city_code, period
+        )
+
+    async def get_amadeus_access_token(self) -> str:
+        return await self._run(self.service.get_amadeus_access_token)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the worker threads; the pool is recreated on the next call."""
+        if self._executor is None:
+            return
+        logger.info("Shutting down flight service executor")
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
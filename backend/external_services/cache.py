@@ -1,30 +1,386 @@
-import redis
+import asyncio
 import json
 import os
+import time
+import uuid
+from typing import Any, Callable, Iterable, TypedDict
+
+import redis
+from redis import asyncio as aioredis
+
+from prometheus_client import Counter
+
+from backend.external_services.cache_codecs import (
+    CacheCodecError,
+    EntrySerializer,
+    default_serializer,
+)
+from backend.external_services.local_cache import LocalCache
+from backend.utils.cache_keys import L1_TTL_SECONDS
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+# Deletes a lease only if it is still held by the caller's token
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Writes an entry and registers it in each tag's member set. A tag's TTL is
+# only ever extended, so it outlives every entry registered under it
+SET_WITH_TAGS_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+redis.call("setex", KEYS[1], ttl, ARGV[2])
+for i = 2, #KEYS do
+    redis.call("sadd", KEYS[i], KEYS[1])
+    if redis.call("ttl", KEYS[i]) < ttl then
+        redis.call("expire", KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+# Unlinks every member of the given tags and the tags themselves, returning
+# the member keys. Runs atomically, so an entry tagged concurrently is either
+# unlinked here or registered in a fresh tag set; work is proportional to
+# the tags' members, not to the size of the keyspace
+INVALIDATE_TAGS_SCRIPT = """
+local removed = {}
+for i = 1, #KEYS do
+    local members = redis.call("smembers", KEYS[i])
+    for j = 1, #members, 500 do
+        redis.call("unlink", unpack(members, j, math.min(j + 499, #members)))
+    end
+    for _, member in ipairs(members) do
+        removed[#removed + 1] = member
+    end
+    redis.call("unlink", KEYS[i])
+end
+return removed
+"""
+
+# Takes one token from every bucket in KEYS, or from none of them. Buckets
+# refill continuously at their rate up to their capacity; a bucket only
+# gives a token while more than its reserve would be left, so lower
+# priority callers cannot drain the last tokens. Returns "0" when the
+# tokens were taken, otherwise the seconds until they would be available
+# (as a string, since Redis truncates Lua numbers to integers)
+TAKE_TOKENS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local capacity = tonumber(ARGV[i * 3])
+    local reserve = tonumber(ARGV[i * 3 + 1])
+    local state = redis.call("hmget", KEYS[i], "tokens", "at")
+    local tokens = tonumber(state[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+    tokens = math.min(capacity, tokens + elapsed * rate)
+    levels[i] = tokens
+    if tokens < reserve + 1 then
+        wait = math.max(wait, (reserve + 1 - tokens) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local capacity = tonumber(ARGV[i * 3])
+    redis.call("hset", KEYS[i], "tokens", tostring(levels[i] - 1), "at", tostring(now))
+    redis.call("pexpire", KEYS[i], math.ceil(capacity / rate * 1000) + 1000)
+end
+return "0"
+"""
+
+# Prefix of the Redis sets holding each tag's member keys
+TAG_KEY_PREFIX = "tag:"
+
+# Keys unlinked per round trip by delete_pattern
+DELETE_BATCH_SIZE = 500
+
+# Pub/sub channel carrying L1 invalidations between workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Longest the invalidation listener waits for a message before polling again;
+# a quiet channel is an idle tick, not a connection error
+INVALIDATION_POLL_SECONDS = 5.0
+
+# Connections shared by all cache calls in a worker; callers wait for a free
+# connection instead of opening unbounded new ones
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+# Upper bound on one cache round trip; a slow Redis then looks like a miss
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2))
+
+# Errors after which cache calls fall back instead of failing the request
+REDIS_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+L1_CACHE_ENABLED = os.getenv("L1_CACHE_ENABLED", "false").lower() == "true"
+L1_CACHE_MAX_ENTRIES = int(os.getenv("L1_CACHE_MAX_ENTRIES", 10_000))
+L1_CACHE_MAX_BYTES = int(os.getenv("L1_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+cache_lookups = Counter(
+    "cache_lookups_total",
+    "Cache lookups per tier (l1 = in-process, l2 = Redis)",
+    ["tier", "namespace", "result"],
+)
+
+
+class TokenBucket(TypedDict):
+    key: str
+    # Tokens added per second, up to capacity
+    rate: float
+    capacity: float
+    # Tokens the caller must leave in the bucket
+    reserve: float
+
+
+def key_namespace(key: str) -> str:
+    """Return the namespace segment of a key built by build_cache_key."""
+    return key.split(":", 1)[0]
+
+
+def encode_entry(value, stale_at: float | None = None) -> bytes:
+    """Encode a value with the configured codec (see cache_codecs)."""
+    return entry_serializer.encode(value, stale_at)
+
+
+def decode_entry(entry: bytes | str) -> tuple[Any, float | None]:
+    """Decode an entry written with any codec, or a legacy JSON entry."""
+    return EntrySerializer.decode(entry)
+
+
+entry_serializer = default_serializer()
 
 
 class RedisCache:
-    def __init__(self, host: str, port: int):
-        self.r = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+    """
+    Response cache on an async, pooled Redis client.
+
+    Every method is a coroutine, so a slow Redis never blocks the event
+    loop. get_many and set_many read or write many entries in one round
+    trip.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        clock: Callable[[], float] = time.time,
+        serializer: EntrySerializer | None = None,
+        max_connections: int = REDIS_MAX_CONNECTIONS,
+        socket_timeout: float = REDIS_SOCKET_TIMEOUT,
+    ):
+        pool = aioredis.BlockingConnectionPool(
+            host=host,
+            port=int(port),
+            db=0,
+            max_connections=max_connections,
+            timeout=socket_timeout,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout,
+        )
+        # Entries are binary (see cache_codecs), so responses stay as bytes
+        self.r = aioredis.Redis(connection_pool=pool, decode_responses=False)
+        self._release_lease = self.r.register_script(RELEASE_LEASE_SCRIPT)
+        self._set_with_tags = self.r.register_script(SET_WITH_TAGS_SCRIPT)
+        self._invalidate_tags = self.r.register_script(INVALIDATE_TAGS_SCRIPT)
+        self._take_tokens = self.r.register_script(TAKE_TOKENS_SCRIPT)
+        # Wall clock, so soft expiry agrees across workers sharing Redis
+        self.clock = clock
+        self.serializer = serializer or entry_serializer
+
+    async def close(self) -> None:
+        """Close the pooled connections; call on shutdown."""
+        await self.r.aclose(close_connection_pool=True)
+
+    async def set(
+        self,
+        key: str,
+        value,
+        expiration_seconds: int = 300,
+        stale_after_seconds: int | None = None,
+        tags: list[str] | None = None,
+    ):
+        """
+        Store a value in Redis cache
 
-    def set(self, key: str, value, expiration_seconds: int = 300):
+        Args:
+            key: The cache key
+            value: Any JSON-serializable value
+            expiration_seconds: Hard TTL; Redis drops the entry after this
+            stale_after_seconds: Optional soft TTL; after this the entry is
+                still returned but get_with_staleness reports it as stale
+            tags: Optional tags (see build_cache_tag) the entry is registered
+                under, so invalidate_tags can remove it
+        """
         try:
-            json_value = json.dumps(value)
-            self.r.setex(key, expiration_seconds, json_value)
-        except redis.exceptions.ConnectionError as e:
+            entry = self.serializer.encode(value, self._stale_at(stale_after_seconds))
+            await self._write(self.r, key, entry, expiration_seconds, tags)
+        except REDIS_ERRORS as e:
             print(f"Redis connection error: {e}")
 
-    def get(self, key: str):
+    async def set_many(
+        self,
+        values: dict[str, Any],
+        expiration_seconds: int = 300,
+        stale_after_seconds: int | None = None,
+        tags: list[str] | None = None,
+    ):
+        """
+        Store several values in one pipelined round trip
+
+        Args:
+            values: Values keyed by cache key
+            expiration_seconds: Hard TTL applied to every entry
+            stale_after_seconds: Optional soft TTL applied to every entry
+            tags: Optional tags every entry is registered under
+        """
+        if not values:
+            return
         try:
-            json_value = self.r.get(key)
-            if json_value:
-                return json.loads(json_value)
+            stale_at = self._stale_at(stale_after_seconds)
+            async with self.r.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    entry = self.serializer.encode(value, stale_at)
+                    await self._write(pipe, key, entry, expiration_seconds, tags)
+                await pipe.execute()
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+
+    async def _write(
+        self,
+        client,
+        key: str,
+        entry: bytes,
+        expiration_seconds: int,
+        tags: list[str] | None,
+    ) -> None:
+        """Queue (pipeline) or run (client) the write of one encoded entry."""
+        if not tags:
+            await client.setex(key, expiration_seconds, entry)
+            return
+        await self._set_with_tags(
+            keys=[key, *(self.tag_key(tag) for tag in tags)],
+            args=[expiration_seconds, entry],
+            client=client,
+        )
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        return f"{TAG_KEY_PREFIX}{tag}"
+
+    def _stale_at(self, stale_after_seconds: int | None) -> float | None:
+        if stale_after_seconds is None:
             return None
-        except redis.exceptions.ConnectionError as e:
+        return self.clock() + stale_after_seconds
+
+    async def get(self, key: str):
+        entry = await self.get_with_staleness(key)
+        if entry is None:
+            return None
+        value, _ = entry
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> list[Any]:
+        """
+        Get several values in one round trip (MGET)
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in key order, None for missing keys
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        try:
+            entries = await self._read_entries(keys)
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return [None] * len(keys)
+        return [None if entry is None else entry[0] for entry in entries]
+
+    async def remaining_ttls(self, keys: Iterable[str]) -> list[float | None]:
+        """
+        Get the seconds left before several keys expire, in one round trip
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Seconds to expiry in key order, None for missing keys or keys
+            without an expiry; all None if Redis is unreachable
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        try:
+            async with self.r.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.pttl(key)
+                ttls = await pipe.execute()
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return [None] * len(keys)
+        return [ttl / 1000 if ttl >= 0 else None for ttl in ttls]
+
+    async def get_with_staleness(self, key: str) -> tuple[Any, bool] | None:
+        """
+        Get a value from Redis cache along with whether its soft TTL has passed
+
+        Args:
+            key: The cache key
+
+        Returns:
+            (value, is_stale) if the key exists, None otherwise. Entries
+            written without a soft TTL are never stale.
+        """
+        try:
+            entry = await self._read_entry(key)
+        except REDIS_ERRORS as e:
             print(f"Redis connection error: {e}")
             return None
+        if entry is None:
+            return None
+        value, stale_at, _ = entry
+        return value, stale_at is not None and self.clock() >= stale_at
+
+    async def _read_entry(self, key: str) -> tuple[Any, float | None, int] | None:
+        """Read and decode an entry as (value, stale_at, payload size)."""
+        return self._decode(key, await self.r.get(key))
 
-    def delete(self, key: str) -> bool:
+    async def _read_entries(
+        self, keys: list[str]
+    ) -> list[tuple[Any, float | None, int] | None]:
+        """Read and decode several entries with one MGET."""
+        return [
+            self._decode(key, entry)
+            for key, entry in zip(keys, await self.r.mget(keys))
+        ]
+
+    def _decode(
+        self, key: str, entry: bytes | None
+    ) -> tuple[Any, float | None, int] | None:
+        result = "hit" if entry else "miss"
+        cache_lookups.labels(
+            tier="l2", namespace=key_namespace(key), result=result
+        ).inc()
+        if not entry:
+            return None
+        try:
+            value, stale_at = self.serializer.decode(entry)
+        except (CacheCodecError, json.JSONDecodeError) as e:
+            # Written by a worker with a codec this one lacks; treat as a miss
+            logger.warning(f"Could not decode cache entry {key}: {e}")
+            return None
+        return value, stale_at, len(entry)
+
+    async def delete(self, key: str) -> bool:
         """
         Delete a key from Redis cache
 
@@ -35,15 +391,45 @@ class RedisCache:
             True if key was deleted, False otherwise
         """
         try:
-            return self.r.delete(key) > 0
-        except redis.exceptions.ConnectionError as e:
+            return await self.r.delete(key) > 0
+        except REDIS_ERRORS as e:
             print(f"Redis connection error: {e}")
             return False
 
-    def delete_pattern(self, pattern: str) -> int:
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every entry registered under any of the given tags
+
+        Args:
+            tags: Tags passed to set()
+
+        Returns:
+            Number of entries removed (including ones that had already expired)
+        """
+        try:
+            return len(await self._unlink_tag_members(tags))
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return 0
+
+    async def _unlink_tag_members(self, tags: tuple[str, ...]) -> list[str]:
+        if not tags:
+            return []
+        removed = await self._invalidate_tags(keys=[self.tag_key(tag) for tag in tags])
+        # An entry under several of the tags is listed once per tag
+        return list(
+            dict.fromkeys(
+                key.decode() if isinstance(key, bytes) else key for key in removed
+            )
+        )
+
+    async def delete_pattern(self, pattern: str) -> int:
         """
         Delete keys from Redis cache matching a pattern
 
+        Walks the whole keyspace with SCAN, so prefer tags and
+        invalidate_tags for invalidation on request paths.
+
         Args:
             pattern: The pattern to match keys against
 
@@ -52,15 +438,337 @@ class RedisCache:
         """
         try:
             count = 0
-            for key in self.r.scan_iter(match=pattern):
-                self.r.delete(key)
-                count += 1
+            batch = []
+            async for key in self.r.scan_iter(match=pattern, count=DELETE_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    count += await self.r.unlink(*batch)
+                    batch = []
+            if batch:
+                count += await self.r.unlink(*batch)
             return count
-        except redis.exceptions.ConnectionError as e:
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return 0
+
+    async def acquire_lease(self, key: str, token: str, lease_seconds: float) -> bool:
+        """
+        Try to acquire a short-lived lease (a lock that expires on its own)
+
+        Args:
+            key: The lease key
+            token: Unique value identifying the holder
+            lease_seconds: Lease lifetime; bounds how long a crashed holder blocks others
+
+        Returns:
+            True if the lease was acquired, or if Redis is unreachable so
+            callers fall back to doing the work themselves
+        """
+        try:
+            return bool(
+                await self.r.set(key, token, nx=True, px=int(lease_seconds * 1000))
+            )
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return True
+
+    async def release_lease(self, key: str, token: str) -> bool:
+        """
+        Release a lease if it is still held by the given token
+
+        Args:
+            key: The lease key
+            token: The value used when acquiring the lease
+
+        Returns:
+            True if the lease was released, False otherwise
+        """
+        try:
+            return await self._release_lease(keys=[key], args=[token]) == 1
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return False
+
+    async def lease_exists(self, key: str) -> bool:
+        """
+        Check whether a lease is currently held by anyone
+
+        Args:
+            key: The lease key
+
+        Returns:
+            True if the lease exists, False otherwise
+        """
+        try:
+            return await self.r.exists(key) > 0
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return False
+
+    async def take_tokens(self, buckets: list[TokenBucket], now: float) -> float:
+        """
+        Atomically take one token from each bucket, or from none of them
+
+        Args:
+            buckets: Token buckets shared by every worker
+            now: Current wall-clock time, used to refill the buckets
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they would
+            be; 0 if Redis is unreachable, so callers are not blocked
+        """
+        args = [now]
+        for bucket in buckets:
+            args += [bucket["rate"], bucket["capacity"], bucket["reserve"]]
+        try:
+            wait = await self._take_tokens(
+                keys=[bucket["key"] for bucket in buckets], args=args
+            )
+            return float(wait)
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            return 0.0
+
+
+class TieredCache(RedisCache):
+    """
+    RedisCache with an in-process L1 tier for hot keys.
+
+    Reads check L1 first and fall back to Redis, filling L1 on the way back.
+    Only namespaces listed in L1_TTL_SECONDS are cached in L1, and for no
+    longer than their L1 TTL, which is kept well below the Redis TTL.
+
+    Writes and deletes go to Redis, update the local L1 and are broadcast on
+    INVALIDATION_CHANNEL so every other worker evicts its L1 copy. If the
+    pub/sub connection drops, invalidations may have been missed, so L1 is
+    cleared.
+
+    Call start_invalidation_listener() on startup and
+    stop_invalidation_listener() on shutdown.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        clock: Callable[[], float] = time.time,
+        local: LocalCache | None = None,
+        serializer: EntrySerializer | None = None,
+    ):
+        super().__init__(host, port, clock, serializer)
+        if local is None:
+            local = LocalCache(L1_CACHE_MAX_ENTRIES, L1_CACHE_MAX_BYTES)
+        self.local = local
+        # Identifies this worker's own broadcasts so it does not evict
+        # entries it has just written
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._listener = None
+
+    async def set(
+        self,
+        key: str,
+        value,
+        expiration_seconds: int = 300,
+        stale_after_seconds: int | None = None,
+        tags: list[str] | None = None,
+    ):
+        stale_at = self._stale_at(stale_after_seconds)
+        entry = self.serializer.encode(value, stale_at)
+        try:
+            await self._write(self.r, key, entry, expiration_seconds, tags)
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            self.local.delete(key)
+            return
+
+        await self._publish_invalidation({"keys": [key]})
+        self._remember(key, value, expiration_seconds, len(entry), stale_at)
+
+    async def set_many(
+        self,
+        values: dict[str, Any],
+        expiration_seconds: int = 300,
+        stale_after_seconds: int | None = None,
+        tags: list[str] | None = None,
+    ):
+        if not values:
+            return
+        stale_at = self._stale_at(stale_after_seconds)
+        entries = {
+            key: self.serializer.encode(value, stale_at)
+            for key, value in values.items()
+        }
+        try:
+            async with self.r.pipeline(transaction=False) as pipe:
+                for key, entry in entries.items():
+                    await self._write(pipe, key, entry, expiration_seconds, tags)
+                await pipe.execute()
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+            for key in entries:
+                self.local.delete(key)
+            return
+
+        await self._publish_invalidation({"keys": list(entries)})
+        for key, value in values.items():
+            self._remember(key, value, expiration_seconds, len(entries[key]), stale_at)
+
+    def _remember(
+        self,
+        key: str,
+        value,
+        expiration_seconds: int,
+        size: int,
+        stale_at: float | None,
+    ) -> None:
+        l1_ttl = L1_TTL_SECONDS.get(key_namespace(key))
+        if l1_ttl:
+            self.local.set(key, value, min(l1_ttl, expiration_seconds), size, stale_at)
+
+    async def delete(self, key: str) -> bool:
+        self.local.delete(key)
+        deleted = await super().delete(key)
+        await self._publish_invalidation({"keys": [key]})
+        return deleted
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        try:
+            keys = await self._unlink_tag_members(tags)
+        except REDIS_ERRORS as e:
             print(f"Redis connection error: {e}")
             return 0
+        for key in keys:
+            self.local.delete(key)
+        if keys:
+            await self._publish_invalidation({"keys": keys})
+        return len(keys)
+
+    async def delete_pattern(self, pattern: str) -> int:
+        self.local.delete_pattern(pattern)
+        count = await super().delete_pattern(pattern)
+        await self._publish_invalidation({"pattern": pattern})
+        return count
+
+    async def _read_entry(self, key: str) -> tuple[Any, float | None, int] | None:
+        if not L1_TTL_SECONDS.get(key_namespace(key)):
+            return await super()._read_entry(key)
+
+        entry = self._read_local(key)
+        if entry is None:
+            entry = await super()._read_entry(key)
+            self._fill_local(key, entry)
+        return entry
+
+    async def _read_entries(
+        self, keys: list[str]
+    ) -> list[tuple[Any, float | None, int] | None]:
+        """Serve what L1 holds and fetch only the rest with one MGET."""
+        entries = [
+            self._read_local(key) if L1_TTL_SECONDS.get(key_namespace(key)) else None
+            for key in keys
+        ]
+        misses = [index for index, entry in enumerate(entries) if entry is None]
+        if not misses:
+            return entries
+
+        fetched = await super()._read_entries([keys[index] for index in misses])
+        for index, entry in zip(misses, fetched):
+            entries[index] = entry
+            self._fill_local(keys[index], entry)
+        return entries
+
+    def _read_local(self, key: str) -> tuple[Any, float | None, int] | None:
+        local_entry = self.local.get(key)
+        cache_lookups.labels(
+            tier="l1",
+            namespace=key_namespace(key),
+            result="hit" if local_entry else "miss",
+        ).inc()
+        if local_entry is None:
+            return None
+        return local_entry.value, local_entry.stale_at, local_entry.size
+
+    def _fill_local(
+        self, key: str, entry: tuple[Any, float | None, int] | None
+    ) -> None:
+        l1_ttl = L1_TTL_SECONDS.get(key_namespace(key))
+        if entry is not None and l1_ttl:
+            value, stale_at, size = entry
+            self.local.set(key, value, l1_ttl, size, stale_at)
+
+    def hit_ratios(self) -> dict[str, float]:
+        """
+        Hit ratio of this worker's L1 since startup.
+
+        Per-tier ratios across all workers come from cache_lookups_total.
+        """
+        return {"l1": self.local.hit_ratio()}
+
+    async def start_invalidation_listener(self) -> None:
+        """Subscribe to L1 invalidations from other workers on a background task."""
+        if self._listener is not None:
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            self._pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+            try:
+                await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+                while True:
+                    # An explicit timeout replaces the pool's socket timeout
+                    # and returns None when no message arrived, where listen()
+                    # would raise TimeoutError on every quiet stretch
+                    message = await self._pubsub.get_message(
+                        timeout=INVALIDATION_POLL_SECONDS
+                    )
+                    if message is not None and message["type"] == "message":
+                        self._on_invalidation(message)
+            except REDIS_ERRORS as e:
+                await self._on_listener_error(e)
+            finally:
+                await self._pubsub.aclose()
+                self._pubsub = None
+
+    async def _publish_invalidation(self, message: dict) -> None:
+        try:
+            await self.r.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"origin": self.instance_id, **message}),
+            )
+        except REDIS_ERRORS as e:
+            print(f"Redis connection error: {e}")
+
+    def _on_invalidation(self, message: dict) -> None:
+        payload = json.loads(message["data"])
+        if payload.get("origin") == self.instance_id:
+            return
+        for key in payload.get("keys", []):
+            self.local.delete(key)
+        if payload.get("pattern"):
+            self.local.delete_pattern(payload["pattern"])
+
+    async def _on_listener_error(self, error: Exception) -> None:
+        logger.warning(f"L1 invalidation listener error, clearing L1: {error}")
+        self.local.clear()
+        # Back off before reconnecting and resubscribing
+        await asyncio.sleep(1)
 
 
 host = os.getenv("REDIS_HOST", "redis")
 port = os.getenv("REDIS_PORT", 6379)
-redis_cache = RedisCache(host, port)
+if L1_CACHE_ENABLED:
+    redis_cache = TieredCache(host, port)
+else:
+    redis_cache = RedisCache(host, port)
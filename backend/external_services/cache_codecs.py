@@ -0,0 +1,263 @@
+"""
+Pluggable serialization for Redis cache entries.
+
+Every entry written by RedisCache starts with a fixed header recording the
+codec and compression used and the entry's soft-TTL timestamp, so the
+configured codec can change at any time without flushing Redis: readers
+decode each entry with whatever it was written with.
+
+    magic (0x00) | version | codec id | compression id | stale_at (float64, NaN = none)
+
+Entries without the header are plain JSON written before codecs existed and
+are still readable, including the old soft-TTL envelope.
+
+Codecs:
+- json: stdlib json, compact separators
+- orjson: faster JSON
+- msgpack: binary
+
+Compression (only for payloads of at least CACHE_COMPRESSION_THRESHOLD bytes):
+- zlib: stdlib
+- zstd: zstandard
+
+Configured through CACHE_CODEC, CACHE_COMPRESSION, CACHE_COMPRESSION_LEVEL
+and CACHE_COMPRESSION_THRESHOLD. orjson, msgpack and zstandard are project
+dependencies; in an install without them, a configured codec whose package
+is missing falls back to json (or no compression) with a warning.
+"""
+
+import json
+import math
+import os
+import struct
+import zlib
+from typing import Any
+
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+CACHE_CODEC = os.getenv("CACHE_CODEC", "json")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib")
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", 1))
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", 1024))
+
+# Legacy soft-TTL envelope written before entry headers existed
+STALE_AT_FIELD = "__stale_at__"
+
+# A JSON document never starts with a NUL byte, so the magic byte tells
+# headered entries apart from legacy plain-JSON ones
+ENTRY_MAGIC = 0
+ENTRY_VERSION = 1
+ENTRY_HEADER = struct.Struct(">BBBBd")
+
+
+class CacheCodecError(ValueError):
+    """Raised when an entry cannot be decoded with the codecs available here."""
+
+
+class JsonCodec:
+    id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    id = 2
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackCodec:
+    id = 3
+    name = "msgpack"
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class NoCompression:
+    id = 0
+    name = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompression:
+    id = 1
+    name = "zlib"
+
+    def __init__(self, level: int = CACHE_COMPRESSION_LEVEL):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompression:
+    id = 2
+    name = "zstd"
+
+    def __init__(self, level: int = CACHE_COMPRESSION_LEVEL):
+        import zstandard
+
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+def _available(classes: list[type]) -> dict[str, Any]:
+    """Instantiate the classes whose optional package is installed."""
+    available = {}
+    for cls in classes:
+        try:
+            available[cls.name] = cls()
+        except ImportError:
+            continue
+    return available
+
+
+CODECS = _available([JsonCodec, OrjsonCodec, MsgpackCodec])
+COMPRESSIONS = _available([NoCompression, ZlibCompression, ZstdCompression])
+CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+COMPRESSIONS_BY_ID = {
+    compression.id: compression for compression in COMPRESSIONS.values()
+}
+
+
+class EntrySerializer:
+    """Encodes cache values with a codec, compressing large payloads."""
+
+    def __init__(
+        self,
+        codec: str = "json",
+        compression: str = "none",
+        threshold: int = CACHE_COMPRESSION_THRESHOLD,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f"Cache codec not available: {codec}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Cache compression not available: {compression}")
+        self.codec = CODECS[codec]
+        self.compression = COMPRESSIONS[compression]
+        self.threshold = threshold
+
+    def encode(self, value: Any, stale_at: float | None = None) -> bytes:
+        """
+        Serialize a value into a headered entry.
+
+        Args:
+            value: Any JSON-serializable value
+            stale_at: Optional wall-clock time after which the entry is stale
+
+        Returns:
+            Entry bytes to store in Redis
+        """
+        payload = self.codec.dumps(value)
+        compression = COMPRESSIONS["none"]
+        if len(payload) >= self.threshold:
+            compression = self.compression
+            payload = compression.compress(payload)
+
+        header = ENTRY_HEADER.pack(
+            ENTRY_MAGIC,
+            ENTRY_VERSION,
+            self.codec.id,
+            compression.id,
+            math.nan if stale_at is None else stale_at,
+        )
+        return header + payload
+
+    @staticmethod
+    def decode(entry: bytes | str) -> tuple[Any, float | None]:
+        """
+        Deserialize an entry written by any codec, or a legacy JSON entry.
+
+        Args:
+            entry: Raw entry from Redis
+
+        Returns:
+            (value, stale_at) where stale_at is None for entries without a soft TTL
+
+        Raises:
+            CacheCodecError: If the entry's codec or compression is unknown here
+        """
+        if isinstance(entry, str):
+            entry = entry.encode()
+
+        if not entry or entry[0] != ENTRY_MAGIC:
+            value = json.loads(entry)
+            if isinstance(value, dict) and STALE_AT_FIELD in value:
+                return value["value"], value[STALE_AT_FIELD]
+            return value, None
+
+        try:
+            _, version, codec_id, compression_id, stale_at = ENTRY_HEADER.unpack_from(
+                entry
+            )
+        except struct.error as e:
+            raise CacheCodecError(f"Truncated cache entry header: {e}")
+        if version != ENTRY_VERSION:
+            raise CacheCodecError(f"Unsupported cache entry version: {version}")
+        if codec_id not in CODECS_BY_ID:
+            raise CacheCodecError(f"Cache codec not available: {codec_id}")
+        if compression_id not in COMPRESSIONS_BY_ID:
+            raise CacheCodecError(f"Cache compression not available: {compression_id}")
+
+        try:
+            payload = COMPRESSIONS_BY_ID[compression_id].decompress(
+                entry[ENTRY_HEADER.size :]
+            )
+            value = CODECS_BY_ID[codec_id].loads(payload)
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt cache entry: {e}")
+        return value, None if math.isnan(stale_at) else stale_at
+
+
+def default_serializer() -> EntrySerializer:
+    """Build the serializer configured through the environment."""
+    codec = CACHE_CODEC
+    if codec not in CODECS:
+        logger.warning(f"Cache codec {codec} is not installed, using json")
+        codec = "json"
+    compression = CACHE_COMPRESSION
+    if compression not in COMPRESSIONS:
+        logger.warning(f"Cache compression {compression} is not installed, disabling")
+        compression = "none"
+    return EntrySerializer(codec, compression)
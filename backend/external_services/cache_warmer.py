@@ -0,0 +1,427 @@
+"""
+Background warming of flight search and location caches for popular routes.
+
+Without it the first user of the day on a popular route pays the full Amadeus
+latency, because nothing is cached yet. Each run:
+- ranks hot routes from recent bookings (their outbound Booking.origin and
+  Booking.destination), topped up with the most travelled destinations from
+  the most booked origins
+- plans the default GET flight-offers search (the one
+  GET /shopping/flight-offers and the price calendar share) for each hot
+  route and each of the next CACHE_WARMER_DAYS_AHEAD departure dates
+- re-runs the searches whose entry is missing or expires before the next
+  run, nearest dates first and, per date, most popular routes first
+- warms location lookups for route airports, unless a complete location
+  index answers them
+
+Warming calls run under their own operation class (see
+quota_scheduler.scheduled_as). That class only draws from the top
+CACHE_WARMER_QUOTA_SHARE of each quota bucket, and its calls are shed rather
+than queued. A run also makes at most that share of the calls the quota
+allows over one interval, so user traffic keeps its quota.
+
+Run it once with ``manage.py warm-cache`` (e.g. from cron), or set
+CACHE_WARMER_ENABLED to run it in the API process. In the API process, one
+worker per interval wins a Redis lease and warms.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, TypedDict
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.external_services.flight import amadeus_flight_service
+from backend.external_services.location_index import LocationIndex, location_index
+from backend.external_services.quota_scheduler import (
+    MONTH_SECONDS,
+    OperationClass,
+    QuotaExceededError,
+    scheduled_as,
+)
+from backend.external_services.single_flight import (
+    LEASE_KEY_PREFIX,
+    SingleFlight,
+    upstream_single_flight,
+)
+from backend.models.bookings import Booking
+from backend.schemas.flight_search import FlightSearchRequestGet
+from backend.schemas.locations import AirportCitySearchRequest
+from backend.utils.cache_keys import CACHE_TTL_POLICIES, build_cache_key
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+CACHE_WARMER_ENABLED = os.getenv("CACHE_WARMER_ENABLED", "false").lower() == "true"
+# Kept below the GET search TTL (300s) so warm entries are refreshed before
+# they expire
+CACHE_WARMER_INTERVAL_SECONDS = int(os.getenv("CACHE_WARMER_INTERVAL_SECONDS", 240))
+CACHE_WARMER_QUOTA_SHARE = float(os.getenv("CACHE_WARMER_QUOTA_SHARE", 0.2))
+CACHE_WARMER_MAX_ROUTES = int(os.getenv("CACHE_WARMER_MAX_ROUTES", 20))
+CACHE_WARMER_DAYS_AHEAD = int(os.getenv("CACHE_WARMER_DAYS_AHEAD", 7))
+CACHE_WARMER_LOOKBACK_DAYS = int(os.getenv("CACHE_WARMER_LOOKBACK_DAYS", 30))
+CACHE_WARMER_CONCURRENCY = int(os.getenv("CACHE_WARMER_CONCURRENCY", 2))
+
+WARMER_LEASE_KEY = f"{LEASE_KEY_PREFIX}:cache_warmer"
+
+cache_warmer_entries = Counter(
+    "cache_warmer_entries_total",
+    "Cache entries considered by the cache warmer, by outcome",
+    ["namespace", "result"],
+)
+cache_warm_coverage = Gauge(
+    "cache_warm_coverage",
+    "Share of planned hot-route searches cached after the last warmer run",
+)
+
+
+class Route(TypedDict):
+    origin: str
+    destination: str
+    # Bookings in the lookback window; 0 for routes from travel analytics
+    bookings: int
+
+
+class WarmReport(TypedDict):
+    routes: int
+    # Searches planned for the hot routes, and what happened to them
+    searches: int
+    fresh: int
+    warmed: int
+    failed: int
+    skipped: int
+    locations_warmed: int
+    # Share of planned searches cached once the run finished
+    coverage: float
+    # Whether the run stopped early because its quota share was used up
+    quota_exhausted: bool
+
+
+def warming_class(quota_share: float) -> OperationClass:
+    """Lowest priority class that leaves (1 - quota_share) of every bucket."""
+    return OperationClass(
+        name="warming",
+        priority=5,
+        reserve=max(0.0, 1 - quota_share),
+        max_wait_seconds=0,
+    )
+
+
+def booked_routes(
+    session: Session, since: datetime, limit: int | None = None
+) -> list[Route]:
+    """
+    Outbound routes booked since ``since``, most booked first.
+
+    Counted in the database from the Booking.origin and destination summary
+    columns, so the stored order JSON is never loaded.
+
+    Args:
+        session: Database session
+        since: Start of the lookback window
+        limit: Most routes to return
+
+    Returns:
+        Routes with their booking counts
+    """
+    bookings = func.count().label("bookings")
+    rows = session.exec(
+        select(Booking.origin, Booking.destination, bookings)
+        .where(
+            Booking.created_at >= since,
+            Booking.origin.is_not(None),
+            Booking.destination.is_not(None),
+            Booking.origin != Booking.destination,
+        )
+        .group_by(Booking.origin, Booking.destination)
+        .order_by(bookings.desc(), Booking.origin, Booking.destination)
+        .limit(limit)
+    ).all()
+    return [
+        Route(origin=origin, destination=destination, bookings=count)
+        for origin, destination, count in rows
+    ]
+
+
+def search_params(origin: str, destination: str, day: date) -> dict:
+    """
+    Default GET flight-offers parameters for a route and date.
+
+    Built through FlightSearchRequestGet so the cache key matches the one
+    GET /shopping/flight-offers uses for the same search.
+    """
+    search = FlightSearchRequestGet(
+        originLocationCode=origin,
+        destinationLocationCode=destination,
+        departureDate=day.isoformat(),
+    )
+    return search.model_dump(exclude_none=True)
+
+
+class CacheWarmer:
+    """Keeps searches and locations for hot routes cached ahead of demand."""
+
+    def __init__(
+        self,
+        service: AsyncFlightService,
+        cache: RedisCache,
+        single_flight: SingleFlight,
+        index: LocationIndex = location_index,
+        interval_seconds: int = CACHE_WARMER_INTERVAL_SECONDS,
+        quota_share: float = CACHE_WARMER_QUOTA_SHARE,
+        max_routes: int = CACHE_WARMER_MAX_ROUTES,
+        days_ahead: int = CACHE_WARMER_DAYS_AHEAD,
+        lookback_days: int = CACHE_WARMER_LOOKBACK_DAYS,
+        concurrency: int = CACHE_WARMER_CONCURRENCY,
+        today: Callable[[], date] = date.today,
+    ):
+        self.service = service
+        self.cache = cache
+        self.single_flight = single_flight
+        self.index = index
+        self.interval_seconds = interval_seconds
+        self.quota_share = quota_share
+        self.max_routes = max_routes
+        self.days_ahead = days_ahead
+        self.lookback_days = lookback_days
+        self.concurrency = concurrency
+        self.today = today
+        self._task: asyncio.Task | None = None
+
+    def call_budget(self) -> int | None:
+        """
+        Most upstream calls one run may make: the quota share of what the
+        per-second and monthly limits allow over one interval. None when
+        upstream calls are not scheduled (no quota to share).
+        """
+        scheduler = self.service.scheduler
+        if not scheduler.rate_per_second:
+            return None
+        allowed = scheduler.rate_per_second * self.interval_seconds
+        if scheduler.monthly_quota:
+            allowed = min(
+                allowed,
+                scheduler.monthly_quota * self.interval_seconds / MONTH_SECONDS,
+            )
+        return max(1, int(allowed * self.quota_share))
+
+    async def hot_routes(self, session: Session) -> list[Route]:
+        """
+        Booked routes, topped up with the most travelled destinations from
+        the most booked origins, up to max_routes.
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
+        # A blocking query; kept off the event loop
+        routes = await asyncio.to_thread(booked_routes, session, since, self.max_routes)
+        seen = {(route["origin"], route["destination"]) for route in routes}
+        origins = list(dict.fromkeys(route["origin"] for route in routes))
+        for origin in origins:
+            if len(routes) >= self.max_routes:
+                break
+            for destination in await self._travelled_destinations(origin):
+                if len(routes) >= self.max_routes:
+                    break
+                if (origin, destination) not in seen and origin != destination:
+                    seen.add((origin, destination))
+                    routes.append(
+                        Route(origin=origin, destination=destination, bookings=0)
+                    )
+        return routes
+
+    async def _travelled_destinations(self, origin: str) -> list[str]:
+        # Analytics are published per month; last month is the latest full one
+        period = (self.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+        key = build_cache_key(
+            CacheNamespaces.DESTINATIONS,
+            {"origin_city_code": origin, "period": period},
+        )
+        try:
+            destinations = await self.single_flight.load_with_revalidation(
+                key,
+                lambda: self.service.get_most_travelled_destinations(origin, period),
+                operation="get_most_travelled_destinations",
+                ttl_policy=CACHE_TTL_POLICIES[CacheNamespaces.DESTINATIONS],
+            )
+        except Exception as e:
+            logger.warning(f"Could not load travelled destinations for {origin}: {e}")
+            return []
+        return [
+            item["destination"]
+            for item in destinations or []
+            if item.get("destination")
+        ]
+
+    def planned_searches(self, routes: list[Route]) -> dict[str, dict]:
+        """GET search parameters by cache key, in warming order."""
+        days = [
+            self.today() + timedelta(days=offset)
+            for offset in range(1, self.days_ahead + 1)
+        ]
+        searches = {}
+        for day in days:
+            for route in routes:
+                params = search_params(route["origin"], route["destination"], day)
+                searches[build_cache_key(CacheNamespaces.FLIGHT_SEARCH, params)] = (
+                    params
+                )
+        return searches
+
+    async def run_once(self, session: Session) -> WarmReport:
+        """
+        Warm the caches for the current hot routes.
+
+        Args:
+            session: Database session used to read booking history
+
+        Returns:
+            What was planned and done, including the resulting coverage
+        """
+        with scheduled_as(warming_class(self.quota_share)):
+            routes = await self.hot_routes(session)
+            searches = self.planned_searches(routes)
+            ttls = await self.cache.remaining_ttls(searches)
+            # Entries that would expire before the next run are refreshed now
+            stale = [
+                key
+                for key, ttl in zip(searches, ttls)
+                if ttl is None or ttl <= self.interval_seconds
+            ]
+            report = WarmReport(
+                routes=len(routes),
+                searches=len(searches),
+                fresh=len(searches) - len(stale),
+                warmed=0,
+                failed=0,
+                skipped=0,
+                locations_warmed=0,
+                coverage=0.0,
+                quota_exhausted=False,
+            )
+            budget = self.call_budget()
+            if budget is not None:
+                report["skipped"] = max(0, len(stale) - budget)
+            await self._warm_searches(
+                {key: searches[key] for key in stale[:budget]}, report
+            )
+            if budget is not None:
+                budget -= report["warmed"] + report["failed"]
+            if not report["quota_exhausted"]:
+                await self._warm_locations(routes, report, budget)
+
+        for result in ("fresh", "warmed", "failed", "skipped"):
+            cache_warmer_entries.labels(
+                namespace=CacheNamespaces.FLIGHT_SEARCH, result=result
+            ).inc(report[result])
+        if searches:
+            report["coverage"] = (report["fresh"] + report["warmed"]) / len(searches)
+        cache_warm_coverage.set(report["coverage"])
+        logger.info(f"Cache warmer run finished: {report}")
+        return report
+
+    async def _warm_searches(self, searches: dict[str, dict], report: WarmReport):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(key: str, params: dict) -> None:
+            async with semaphore:
+                if report["quota_exhausted"]:
+                    report["skipped"] += 1
+                    return
+                try:
+                    await self.single_flight.load(
+                        key,
+                        lambda: self.service.search_flights_get(params),
+                        operation="search_flights_get",
+                    )
+                    report["warmed"] += 1
+                except QuotaExceededError:
+                    # User traffic needs the rest of the quota; try next run
+                    report["quota_exhausted"] = True
+                    report["skipped"] += 1
+                except Exception as e:
+                    logger.warning(f"Cache warmer search {params} failed: {e}")
+                    report["failed"] += 1
+
+        await asyncio.gather(*(warm(key, params) for key, params in searches.items()))
+
+    async def _warm_locations(
+        self, routes: list[Route], report: WarmReport, budget: int | None
+    ):
+        airports = dict.fromkeys(
+            code for route in routes for code in (route["origin"], route["destination"])
+        )
+        for code in airports:
+            request = AirportCitySearchRequest(keyword=code)
+            if self.index.complete and self.index.search(
+                request.keyword, request.sub_type
+            ):
+                continue
+            request_body = request.model_dump()
+            key = build_cache_key(CacheNamespaces.LOCATIONS, request_body)
+            cached = await self.cache.get_with_staleness(key)
+            if cached is not None and not cached[1]:
+                continue
+            if budget is not None and budget <= 0:
+                return
+            if budget is not None:
+                budget -= 1
+            policy = CACHE_TTL_POLICIES[CacheNamespaces.LOCATIONS]
+            try:
+                locations = await self.single_flight.load(
+                    key,
+                    lambda: self.service.airport_city_search(request_body),
+                    operation="airport_city_search",
+                    ttl_seconds=policy["hard_ttl_seconds"],
+                    stale_after_seconds=policy["soft_ttl_seconds"],
+                )
+            except QuotaExceededError:
+                report["quota_exhausted"] = True
+                return
+            except Exception as e:
+                logger.warning(f"Cache warmer location lookup {code} failed: {e}")
+                continue
+            self.index.add_many(locations)
+            report["locations_warmed"] += 1
+
+    async def run_forever(self, session_factory: Callable[[], Session]) -> None:
+        """
+        Warm every interval_seconds; only the worker holding the lease warms.
+
+        Args:
+            session_factory: Returns a new database session per run
+        """
+        while True:
+            lease = uuid.uuid4().hex
+            if await self.cache.acquire_lease(
+                WARMER_LEASE_KEY, lease, self.interval_seconds
+            ):
+                try:
+                    with session_factory() as session:
+                        await self.run_once(session)
+                except Exception:
+                    logger.exception("Cache warmer run failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Run the warmer in the background of the current event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+cache_warmer = CacheWarmer(amadeus_flight_service, redis_cache, upstream_single_flight)
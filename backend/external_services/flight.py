@@ -3,6 +3,10 @@ from amadeus import Client, ResponseError
 from dotenv import load_dotenv
 import requests
 from amadeus import Location
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.interface import FlightServiceProtocol
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.synthetic_flight_service import SyntheticFlightService
 
 load_dotenv()
 
@@ -204,4 +208,20 @@ class AmadeusFlightService:
             raise error
 
 
-amadeus_flight_service = AmadeusFlightService()
+def get_flight_provider() -> FlightServiceProtocol:
+    """
+    Select the synchronous flight provider from FLIGHT_SERVICE_PROVIDER.
+
+    Returns:
+        MockFlightService when the provider is "mock", SyntheticFlightService
+        when it is "synthetic", AmadeusFlightService otherwise.
+    """
+    provider = os.getenv("FLIGHT_SERVICE_PROVIDER", "amadeus").lower()
+    if provider == "mock":
+        return MockFlightService()
+    if provider == "synthetic":
+        return SyntheticFlightService()
+    return AmadeusFlightService()
+
+
+amadeus_flight_service = AsyncFlightService(get_flight_provider())
@@ -0,0 +1,92 @@
+"""
+Response cache for POST flight-offers searches.
+
+Search bodies are reduced to a canonical fingerprint (see utils.cache_keys) so
+identical searches from different clients share one Redis entry, whatever the
+JSON field order or the order of unordered lists.
+"""
+
+import os
+
+from prometheus_client import Counter
+
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.schemas.flight_search import FlightSearchRequestPost
+from backend.utils.cache_keys import build_cache_key, canonicalize_flight_search
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+FLIGHT_SEARCH_CACHE_TTL = int(os.getenv("FLIGHT_SEARCH_CACHE_TTL", 300))
+
+flight_search_cache_requests = Counter(
+    "flight_search_cache_requests_total",
+    "POST flight-offers search cache lookups",
+    ["result"],
+)
+
+
+def search_response_payload(response) -> dict:
+    """
+    Convert a provider search response into a JSON-serializable payload.
+
+    The Amadeus SDK returns a Response object whose ``result`` holds the full
+    body, while the mock provider only exposes ``data``.
+
+    Args:
+        response: Provider response object or dictionary
+
+    Returns:
+        Dictionary shaped like FlightSearchResponse
+    """
+    if isinstance(response, dict):
+        return response
+
+    result = getattr(response, "result", None) or {}
+    return {
+        "data": getattr(response, "data", None) or [],
+        "dictionaries": result.get("dictionaries"),
+        "meta": result.get("meta"),
+    }
+
+
+class FlightSearchCache:
+    """Caches POST flight search payloads keyed by canonical request fingerprint."""
+
+    def __init__(self, cache: RedisCache, ttl_seconds: int = FLIGHT_SEARCH_CACHE_TTL):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+
+    def key_for(self, request: FlightSearchRequestPost) -> str:
+        return build_cache_key(
+            CacheNamespaces.FLIGHT_SEARCH_POST, canonicalize_flight_search(request)
+        )
+
+    async def get(self, request: FlightSearchRequestPost) -> dict | None:
+        """
+        Look up a cached search payload and record a hit or miss.
+
+        Args:
+            request: Validated flight search request body
+
+        Returns:
+            The cached payload, or None on a miss
+        """
+        key = self.key_for(request)
+        payload = await self.cache.get(key)
+        if payload:
+            flight_search_cache_requests.labels(result="hit").inc()
+            logger.info(f"Flight search cache hit for key: {key}")
+            return payload
+
+        flight_search_cache_requests.labels(result="miss").inc()
+        return None
+
+    @staticmethod
+    def is_cacheable(payload: dict) -> bool:
+        """Empty result sets are not cached."""
+        return bool(payload.get("data"))
+
+
+flight_search_cache = FlightSearchCache(redis_cache)
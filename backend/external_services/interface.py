@@ -61,3 +61,34 @@ class FlightServiceProtocol(Protocol):
     def get_amadeus_access_token(self) -> str:
         """Retrieve an API access token (or mock equivalent)."""
         ...
+
+
+@runtime_checkable
+class AsyncFlightServiceProtocol(Protocol):
+    """Awaitable counterpart of FlightServiceProtocol used by the routers."""
+
+    async def search_flights(self, request_body: dict) -> dict: ...
+
+    async def search_flights_get(self, request_body: dict) -> dict: ...
+
+    async def confirm_price(self, request_body: dict) -> dict: ...
+
+    async def create_flight_order(self, request_body: dict) -> dict: ...
+
+    async def view_seat_map_get(self, flightorderId: str) -> dict: ...
+
+    async def view_seat_map_post(self, flight_offer: dict) -> dict: ...
+
+    async def get_flight_order(self, flight_orderId: str) -> dict: ...
+
+    async def cancel_flight_order(self, flight_orderId: str) -> dict: ...
+
+    async def airport_city_search(self, request_body: dict) -> dict: ...
+
+    async def get_flight_orders(self, flight_order_ids: list[str]) -> list: ...
+
+    async def get_most_travelled_destinations(
+        self, origin_city_code: str, period: str
+    ) -> list[dict]: ...
+
+    async def get_amadeus_access_token(self) -> str: ...
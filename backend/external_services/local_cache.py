@@ -0,0 +1,152 @@
+"""
+In-process LRU cache with per-entry TTLs and a memory budget.
+
+Used as the L1 tier in front of Redis (see TieredCache in cache.py). Entries
+are kept decoded, so an L1 hit skips both the Redis round trip and
+``json.loads``. Memory is bounded by entry count and by an approximate byte
+budget (the size of each entry's JSON payload); least recently used entries
+are evicted first.
+
+Callers (request handlers, and TieredCache's invalidation listener, which is
+an asyncio task) share the worker's event loop, and no method awaits, so
+they never interleave inside one. The lock keeps the cache safe for callers
+on other threads as well, such as code run in the threadpool.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Callable, NamedTuple
+
+
+class LocalEntry(NamedTuple):
+    value: Any
+    # Wall-clock time after which the value is stale (soft TTL), if any
+    stale_at: float | None
+    # Monotonic time after which the entry is dropped from L1
+    expires_at: float
+    size: int
+
+
+class LocalCache:
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, LocalEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> LocalEntry | None:
+        """
+        Get an entry, refreshing its LRU position
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The entry if present and not expired, None otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() >= entry.expires_at:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: float,
+        size: int,
+        stale_at: float | None = None,
+    ) -> None:
+        """
+        Store an entry, evicting least recently used entries to stay in budget
+
+        Args:
+            key: The cache key
+            value: The decoded value
+            ttl_seconds: How long the entry may be served from L1
+            size: Approximate size in bytes (length of the JSON payload)
+            stale_at: Wall-clock soft expiry carried over from Redis, if any
+        """
+        if size > self.max_bytes:
+            # Would evict everything else; leave it to Redis
+            self.delete(key)
+            return
+
+        entry = LocalEntry(value, stale_at, self.clock() + ttl_seconds, size)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self.size_bytes += size
+            while (
+                len(self._entries) > self.max_entries
+                or self.size_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove a key
+
+        Args:
+            key: The cache key
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self._lock:
+            return self._remove(key)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Remove keys matching a Redis-style glob pattern
+
+        Args:
+            pattern: The pattern to match keys against
+
+        Returns:
+            Number of keys removed
+        """
+        with self._lock:
+            matches = [key for key in self._entries if fnmatchcase(key, pattern)]
+            for key in matches:
+                self._remove(key)
+            return len(matches)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= entry.size
+        return True
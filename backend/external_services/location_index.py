@@ -0,0 +1,422 @@
+"""
+In-memory airport/city autocomplete index.
+
+Serves ``GET /reference-data/locations`` type-ahead lookups without a network
+call. Locations are stored in the Amadeus location shape and indexed by IATA
+code, city, name and country:
+
+- prefix matching: tokens are kept sorted, so all tokens starting with the
+  query are found with a binary search
+- token matching: every query word must match some word of the location,
+  in any order ("kenyatta nairobi" finds JOMO KENYATTA INTERNATIONAL)
+- light fuzzy matching: a query word of 4+ characters with no exact or
+  prefix match is matched against words one edit away (insertion,
+  deletion, substitution or transposition) via a deletion-neighbourhood map
+
+Results are ranked by the field matched (IATA code > city > name > country),
+the match quality (exact > prefix > fuzzy) and Amadeus traveler analytics.
+
+The index can be loaded from a dataset file (LOCATION_INDEX_DATASET, a JSON
+list of Amadeus location objects) and is updated incrementally with every
+Amadeus locations response the app sees. Only a loaded dataset marks it
+complete: until then it holds just the locations earlier lookups returned,
+so a miss or a partial match says nothing about what Amadeus would return
+and lookups must still go upstream.
+"""
+
+import heapq
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from pathlib import Path
+
+from prometheus_client import Counter
+
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+LOCATION_INDEX_DATASET = os.getenv("LOCATION_INDEX_DATASET")
+LOCATION_INDEX_RESULT_LIMIT = 10
+
+# Weight of a match by the field it was found in
+FIELD_WEIGHTS = {
+    "iataCode": 1.0,
+    "cityCode": 0.9,
+    "cityName": 0.8,
+    "name": 0.7,
+    "detailedName": 0.6,
+    "countryName": 0.4,
+}
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75
+FUZZY_MATCH = 0.5
+FUZZY_MIN_LENGTH = 4
+# Traveler score (0-100) only breaks ties between otherwise equal matches
+POPULARITY_WEIGHT = 0.001
+# Below this many candidates, remaining query words are checked per candidate
+VERIFY_CANDIDATES_BELOW = 500
+# Results of short single-word queries, which match large parts of the
+# index, are memoized until a location with a word starting with that
+# query is added, changed or removed
+MEMO_MAX_QUERY_LENGTH = 3
+MEMO_MAX_ENTRIES = 4096
+
+SUB_TYPES = {"AIRPORT", "CITY"}
+
+_NON_ALPHANUMERIC = re.compile(r"[^A-Z0-9]+")
+
+location_index_lookups = Counter(
+    "location_index_lookups_total",
+    "Location autocomplete lookups by whether the in-memory index answered",
+    ["result"],
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into upper-case ASCII words.
+
+    Args:
+        text: Free text such as a location name or a search keyword
+
+    Returns:
+        Words with accents and punctuation stripped
+    """
+    ascii_text = (
+        unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    )
+    return [token for token in _NON_ALPHANUMERIC.split(ascii_text.upper()) if token]
+
+
+def _deletes(token: str) -> set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insertion, deletion,
+    substitution or adjacent transposition."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) <= 1:
+            return True
+        i, j = diffs[0], diffs[-1]
+        return len(diffs) == 2 and j == i + 1 and a[i] == b[j] and a[j] == b[i]
+    shorter, longer = sorted((a, b), key=len)
+    return any(longer[:i] + longer[i + 1 :] == shorter for i in range(len(longer)))
+
+
+def _location_fields(location: dict) -> dict[str, str]:
+    address = location.get("address") or {}
+    return {
+        "iataCode": location.get("iataCode") or "",
+        "cityCode": address.get("cityCode") or "",
+        "cityName": address.get("cityName") or "",
+        "name": location.get("name") or "",
+        "detailedName": location.get("detailedName") or "",
+        "countryName": address.get("countryName") or "",
+    }
+
+
+def _popularity(location: dict) -> float:
+    analytics = location.get("analytics") or {}
+    return (analytics.get("travelers") or {}).get("score") or 0
+
+
+def parse_sub_types(sub_type: str | None) -> set[str]:
+    """
+    Parse an Amadeus subType value ("AIRPORT", "CITY", "AIRPORT,CITY", "ANY").
+
+    Returns:
+        The set of sub types to include
+    """
+    requested = {part.strip().upper() for part in (sub_type or "").split(",")}
+    return requested & SUB_TYPES or set(SUB_TYPES)
+
+
+class LocationIndex:
+    def __init__(self):
+        self._locations: dict[str, dict] = {}
+        # location id -> {token: best field weight}
+        self._location_tokens: dict[str, dict[str, float]] = {}
+        # token -> {location id: best field weight}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._sorted_tokens: list[str] = []
+        # token with one character removed -> tokens it came from
+        self._deletes: dict[str, set[str]] = {}
+        # word -> {(sub types, limit): ranked location ids}
+        self._memo: dict[str, dict[tuple[frozenset[str], int], list[str]]] = {}
+        # Set once a full dataset is loaded; until then the index only holds
+        # what earlier lookups returned and cannot stand in for Amadeus
+        self.complete = False
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def load(self, locations: list[dict]) -> None:
+        """
+        Replace the index contents with a full dataset and mark it complete.
+
+        Args:
+            locations: Amadeus location objects
+        """
+        self._locations.clear()
+        self._location_tokens.clear()
+        self._postings.clear()
+        self._deletes.clear()
+        self._memo.clear()
+        for location in locations:
+            if location.get("id"):
+                self._unindex(location["id"])
+                self._index(location)
+        # Built unsorted above; sort once instead of inserting in order
+        self._sorted_tokens = sorted(self._postings)
+        self.complete = True
+
+    def add_many(self, locations: list[dict]) -> int:
+        """
+        Insert or update locations, e.g. from an Amadeus response.
+
+        Args:
+            locations: Amadeus location objects
+
+        Returns:
+            Number of locations that were new or changed
+        """
+        changed = 0
+        for location in locations:
+            location_id = location.get("id")
+            if not location_id or self._locations.get(location_id) == location:
+                continue
+            self._unindex(location_id)
+            for token in self._index(location):
+                position = bisect_left(self._sorted_tokens, token)
+                if (
+                    position == len(self._sorted_tokens)
+                    or self._sorted_tokens[position] != token
+                ):
+                    insort(self._sorted_tokens, token)
+            changed += 1
+        return changed
+
+    def search(
+        self,
+        keyword: str,
+        sub_type: str | None = None,
+        limit: int = LOCATION_INDEX_RESULT_LIMIT,
+    ) -> list[dict]:
+        """
+        Find locations matching a type-ahead keyword.
+
+        Args:
+            keyword: Search text; every word must match
+            sub_type: Amadeus subType filter ("AIRPORT", "CITY" or both)
+            limit: Maximum number of results
+
+        Returns:
+            Matching locations, best first
+        """
+        # Longest words are the most selective, so match them first
+        query_tokens = sorted(dict.fromkeys(tokenize(keyword)), key=len, reverse=True)
+        if not query_tokens:
+            return []
+
+        sub_types = parse_sub_types(sub_type)
+        memo = None
+        memo_key = (frozenset(sub_types), limit)
+        if len(query_tokens) == 1 and len(query_tokens[0]) <= MEMO_MAX_QUERY_LENGTH:
+            memo = self._memo.get(query_tokens[0])
+            if memo is None:
+                if len(self._memo) >= MEMO_MAX_ENTRIES:
+                    self._memo.clear()
+                memo = self._memo[query_tokens[0]] = {}
+            if memo_key in memo:
+                return [self._locations[location_id] for location_id in memo[memo_key]]
+
+        scores = self._match_token(query_tokens[0])
+        for query_token in query_tokens[1:]:
+            if not scores:
+                return []
+            if len(scores) <= VERIFY_CANDIDATES_BELOW:
+                # Cheaper to check the few candidates' own words than to
+                # expand the query word over the whole index
+                allow_fuzzy = self._allows_fuzzy(query_token)
+                candidate_scores = {}
+                for location_id, score in scores.items():
+                    match = self._match_location(location_id, query_token, allow_fuzzy)
+                    if match:
+                        candidate_scores[location_id] = score + match
+                scores = candidate_scores
+            else:
+                matches = self._match_token(query_token)
+                scores = {
+                    location_id: score + matches[location_id]
+                    for location_id, score in scores.items()
+                    if location_id in matches
+                }
+
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (
+                    -(score + POPULARITY_WEIGHT * _popularity(location)),
+                    location.get("name") or "",
+                    location_id,
+                )
+                for location_id, score in scores.items()
+                if (location := self._locations[location_id]).get("subType")
+                in sub_types
+            ),
+        )
+        location_ids = [location_id for _, _, location_id in ranked]
+        if memo is not None:
+            memo[memo_key] = location_ids
+        return [self._locations[location_id] for location_id in location_ids]
+
+    def _match_token(self, query_token: str) -> dict[str, float]:
+        """Score every location having a word that matches one query word."""
+        matches: dict[str, float] = {}
+
+        position = bisect_left(self._sorted_tokens, query_token)
+        while position < len(self._sorted_tokens):
+            token = self._sorted_tokens[position]
+            if not token.startswith(query_token):
+                break
+            factor = EXACT_MATCH if token == query_token else PREFIX_MATCH
+            self._collect(matches, token, factor)
+            position += 1
+
+        if not matches and len(query_token) >= FUZZY_MIN_LENGTH:
+            for token in self._fuzzy_candidates(query_token):
+                self._collect(matches, token, FUZZY_MATCH)
+
+        return matches
+
+    def _allows_fuzzy(self, query_token: str) -> bool:
+        """Fuzzy matching applies only to words that prefix-match nothing."""
+        if len(query_token) < FUZZY_MIN_LENGTH:
+            return False
+        position = bisect_left(self._sorted_tokens, query_token)
+        return position == len(self._sorted_tokens) or not self._sorted_tokens[
+            position
+        ].startswith(query_token)
+
+    def _match_location(
+        self, location_id: str, query_token: str, allow_fuzzy: bool
+    ) -> float:
+        """Best score of one query word against a single location's words."""
+        best = 0.0
+        for token, weight in self._location_tokens[location_id].items():
+            if token == query_token:
+                score = weight * EXACT_MATCH
+            elif token.startswith(query_token):
+                score = weight * PREFIX_MATCH
+            elif allow_fuzzy and _within_one_edit(query_token, token):
+                score = weight * FUZZY_MATCH
+            else:
+                continue
+            best = max(best, score)
+        return best
+
+    def _collect(self, matches: dict[str, float], token: str, factor: float) -> None:
+        for location_id, weight in self._postings[token].items():
+            score = weight * factor
+            if score > matches.get(location_id, 0):
+                matches[location_id] = score
+
+    def _fuzzy_candidates(self, query_token: str) -> set[str]:
+        candidates = set(self._deletes.get(query_token, ()))
+        for variant in _deletes(query_token):
+            if variant in self._postings:
+                candidates.add(variant)
+            candidates.update(self._deletes.get(variant, ()))
+        return {token for token in candidates if _within_one_edit(query_token, token)}
+
+    def _index(self, location: dict) -> list[str]:
+        """Index a location and return the tokens that are new to the index."""
+        location_id = location["id"]
+        tokens: dict[str, float] = {}
+        for field, text in _location_fields(location).items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                if weight > tokens.get(token, 0):
+                    tokens[token] = weight
+
+        new_tokens = []
+        for token, weight in tokens.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                new_tokens.append(token)
+                if len(token) >= FUZZY_MIN_LENGTH:
+                    for variant in _deletes(token):
+                        self._deletes.setdefault(variant, set()).add(token)
+            postings[location_id] = weight
+
+        self._locations[location_id] = location
+        self._location_tokens[location_id] = tokens
+        self._forget_memo(tokens)
+        return new_tokens
+
+    def _forget_memo(self, tokens: dict[str, float]) -> None:
+        """Drop memoized results for every short query these words match."""
+        if not self._memo:
+            return
+        for token in tokens:
+            for length in range(1, MEMO_MAX_QUERY_LENGTH + 1):
+                self._memo.pop(token[:length], None)
+
+    def _unindex(self, location_id: str) -> None:
+        tokens = self._location_tokens.pop(location_id, None)
+        if tokens is None:
+            return
+        del self._locations[location_id]
+        self._forget_memo(tokens)
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[location_id]
+            if postings:
+                continue
+            del self._postings[token]
+            position = bisect_left(self._sorted_tokens, token)
+            if (
+                position < len(self._sorted_tokens)
+                and self._sorted_tokens[position] == token
+            ):
+                del self._sorted_tokens[position]
+            if len(token) >= FUZZY_MIN_LENGTH:
+                for variant in _deletes(token):
+                    sources = self._deletes.get(variant)
+                    if sources is not None:
+                        sources.discard(token)
+                        if not sources:
+                            del self._deletes[variant]
+
+
+def load_location_index(path: str | None = LOCATION_INDEX_DATASET) -> int:
+    """
+    Load the shared index from a dataset file, if one is configured.
+
+    Args:
+        path: JSON file holding a list of Amadeus location objects
+
+    Returns:
+        Number of locations loaded
+    """
+    if not path:
+        return 0
+    try:
+        locations = json.loads(Path(path).read_text())
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load location dataset {path}: {e}")
+        return 0
+    location_index.load(locations)
+    logger.info(f"Loaded {len(location_index)} locations from {path}")
+    return len(location_index)
+
+
+location_index = LocationIndex()
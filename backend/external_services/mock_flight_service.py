@@ -12,6 +12,7 @@ from datetime import datetime
 from pathlib import Path
 
 from backend.utils.log_manager import get_app_logger
+from backend.external_services.location_index import LocationIndex
 
 logger = get_app_logger(__name__)
 
@@ -41,6 +42,8 @@ class MockFlightService:
         self._flight_order = _load_fixture("flight_order.json")
         self._seat_map = _load_fixture("seat_map.json")
         self._airport_search = _load_fixture("airport_search.json")
+        self._location_index = LocationIndex()
+        self._location_index.load(self._airport_search)
         self._destinations = _load_fixture("destinations.json")
 
         self._created_orders: dict[str, dict] = {}
@@ -143,22 +146,15 @@ class MockFlightService:
         """Return mock airport/city search results, filtered by keyword."""
         keyword = request_body.get("keyword", "").upper()
         logger.info(f"[mock] airport_city_search called — keyword: {keyword or 'all'}")
-        results = copy.deepcopy(self._airport_search)
 
         if keyword:
-            filtered = [
-                loc
-                for loc in results
-                if keyword in loc.get("name", "").upper()
-                or keyword in loc.get("iataCode", "").upper()
-                or keyword
-                in loc.get("address", {}).get("cityName", "").upper()
-                or keyword
-                in loc.get("address", {}).get("countryName", "").upper()
-            ]
-            return filtered if filtered else results
+            filtered = self._location_index.search(
+                keyword, request_body.get("sub_type"), limit=len(self._airport_search)
+            )
+            if filtered:
+                return copy.deepcopy(filtered)
 
-        return results
+        return copy.deepcopy(self._airport_search)
 
     def get_flight_orders(self, flight_order_ids: list[str]) -> list:
         """Retrieve multiple mock flight orders."""
@@ -0,0 +1,441 @@
+"""
+Server-side slicing of cached flight-offers search results.
+
+A search result is ingested once per search fingerprint into an
+OfferResultSet: the offers plus compact per-attribute columns (price,
+duration, departure/arrival time, stops, carrier) extracted up front.
+Follow-up requests sort, filter and page through the result by handle
+without re-querying the provider or walking nested offer dicts.
+
+- a handle is derived from the search cache key, so repeated searches for
+  the same parameters reuse one result set
+- result sets are stored in Redis for OFFER_RESULTS_TTL seconds and kept
+  materialized (columns and sort orders) in a small per-worker LRU
+- sort orders are computed once per result set and sort key; a slice is
+  one pass over the order checking a filter mask built column by column
+"""
+
+import os
+import re
+from array import array
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from prometheus_client import Counter
+
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.external_services.local_cache import LocalCache
+from backend.schemas.offer_results import (
+    OfferResultsPage,
+    OfferSliceParams,
+    OfferSummary,
+)
+from backend.utils.cache_keys import KEY_DIGEST_LENGTH, digest, namespace_prefix
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+OFFER_RESULTS_TTL = int(os.getenv("OFFER_RESULTS_TTL", 600))
+OFFER_RESULTS_LOCAL_TTL = int(os.getenv("OFFER_RESULTS_LOCAL_TTL", 60))
+OFFER_RESULTS_LOCAL_ENTRIES = int(os.getenv("OFFER_RESULTS_LOCAL_ENTRIES", 256))
+
+# Column sentinels for attributes an offer does not carry; they sort last
+MISSING_PRICE = float("inf")
+MISSING_MINUTES = 2**31 - 1
+MISSING_STOPS = 255
+NO_CARRIER = 0
+
+HANDLE_PATTERN = re.compile(rf"^[0-9a-f]{{{KEY_DIGEST_LENGTH}}}$")
+DURATION_PATTERN = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?")
+EPOCH = datetime(1970, 1, 1)
+MINUTES_PER_DAY = 24 * 60
+
+offer_results_lookups = Counter(
+    "offer_results_lookups_total",
+    "Offer result set lookups by tier",
+    ["result"],
+)
+
+
+def parse_duration_minutes(duration: str | None) -> int:
+    """
+    Convert an ISO-8601 duration such as "PT8H30M" to minutes.
+
+    Args:
+        duration: Amadeus itinerary duration
+
+    Returns:
+        Minutes, or MISSING_MINUTES if the duration is absent or malformed
+    """
+    match = DURATION_PATTERN.match(duration or "")
+    if not match or not any(match.groups()):
+        return MISSING_MINUTES
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    return (days * 24 + hours) * 60 + minutes
+
+
+def parse_local_minutes(timestamp: str | None) -> int:
+    """
+    Convert an airport-local ISO timestamp to minutes since 1970-01-01.
+
+    Amadeus times carry no offset, so values are only comparable for sorting
+    and time-of-day filtering, not as absolute instants.
+    """
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return MISSING_MINUTES
+    return int((moment.replace(tzinfo=None) - EPOCH).total_seconds()) // 60
+
+
+def _minute_of_day(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _in_window(minutes: int, after: time | None, before: time | None) -> bool:
+    if minutes == MISSING_MINUTES:
+        return False
+    minute = minutes % MINUTES_PER_DAY
+    start = _minute_of_day(after) if after else 0
+    end = _minute_of_day(before) if before else MINUTES_PER_DAY
+    if start <= end:
+        return start <= minute <= end
+    # Window wraps past midnight, e.g. after 22:00 and before 02:00
+    return minute >= start or minute <= end
+
+
+def _format_minutes(minutes: int) -> str | None:
+    if minutes == MISSING_MINUTES:
+        return None
+    return (EPOCH + timedelta(minutes=minutes)).isoformat()
+
+
+def _stops(itineraries: list[dict]) -> int:
+    """Stops on the itinerary with the most, counting technical stops."""
+    stops = [
+        len(segments) - 1 + sum(s.get("numberOfStops", 0) for s in segments)
+        for segments in (itinerary.get("segments") or [] for itinerary in itineraries)
+        if segments
+    ]
+    return min(max(stops), MISSING_STOPS) if stops else MISSING_STOPS
+
+
+class OfferResultSet:
+    """A search result with column-oriented offer attributes."""
+
+    COLUMNS = {
+        "price": "d",
+        "duration": "l",
+        "departure": "l",
+        "arrival": "l",
+        "stops": "B",
+        "carrier": "H",
+    }
+
+    def __init__(
+        self,
+        handle: str,
+        offers: list[dict],
+        columns: dict[str, array],
+        carriers: list[str | None],
+        currency: str | None = None,
+    ):
+        self.handle = handle
+        self.offers = offers
+        self.columns = columns
+        # Index 0 is reserved for offers without a validating carrier
+        self.carriers = carriers
+        self.currency = currency
+        self._orders: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    @classmethod
+    def from_offers(cls, handle: str, offers: list[dict]) -> "OfferResultSet":
+        """
+        Extract the sortable and filterable attributes of every offer.
+
+        Args:
+            handle: Result handle
+            offers: Amadeus flight offers
+
+        Returns:
+            A result set ready to slice
+        """
+        columns = {name: array(code) for name, code in cls.COLUMNS.items()}
+        carriers: list[str | None] = [None]
+        carrier_ids: dict[str, int] = {}
+        currency = None
+
+        for offer in offers:
+            price = offer.get("price") or {}
+            try:
+                columns["price"].append(float(price["grandTotal"]))
+                currency = currency or price.get("currency")
+            except (KeyError, TypeError, ValueError):
+                columns["price"].append(MISSING_PRICE)
+
+            itineraries = offer.get("itineraries") or []
+            durations = [parse_duration_minutes(i.get("duration")) for i in itineraries]
+            columns["duration"].append(
+                sum(durations)
+                if durations and MISSING_MINUTES not in durations
+                else MISSING_MINUTES
+            )
+
+            outbound = (itineraries[0].get("segments") or []) if itineraries else []
+            columns["departure"].append(
+                parse_local_minutes((outbound[0].get("departure") or {}).get("at"))
+                if outbound
+                else MISSING_MINUTES
+            )
+            columns["arrival"].append(
+                parse_local_minutes((outbound[-1].get("arrival") or {}).get("at"))
+                if outbound
+                else MISSING_MINUTES
+            )
+            columns["stops"].append(_stops(itineraries))
+
+            codes = offer.get("validatingAirlineCodes") or [
+                segment.get("carrierCode") for segment in outbound[:1]
+            ]
+            code = codes[0] if codes else None
+            if code is None:
+                columns["carrier"].append(NO_CARRIER)
+            else:
+                if code not in carrier_ids:
+                    carrier_ids[code] = len(carriers)
+                    carriers.append(code)
+                columns["carrier"].append(carrier_ids[code])
+
+        return cls(handle, offers, columns, carriers, currency)
+
+    def to_payload(self) -> dict:
+        """JSON-serializable form stored in Redis."""
+        return {
+            "offers": self.offers,
+            # Sentinels become null; infinity is not valid in every codec
+            "columns": {
+                name: [
+                    None if value in (MISSING_PRICE, MISSING_MINUTES) else value
+                    for value in column
+                ]
+                for name, column in self.columns.items()
+            },
+            "carriers": self.carriers,
+            "currency": self.currency,
+        }
+
+    @classmethod
+    def from_payload(cls, handle: str, payload: dict) -> "OfferResultSet":
+        missing = {"d": MISSING_PRICE, "l": MISSING_MINUTES}
+        columns = {
+            name: array(
+                code,
+                [
+                    missing[code] if value is None else value
+                    for value in payload["columns"][name]
+                ],
+            )
+            for name, code in cls.COLUMNS.items()
+        }
+        return cls(
+            handle,
+            payload["offers"],
+            columns,
+            payload["carriers"],
+            payload.get("currency"),
+        )
+
+    def order(self, sort: str, descending: bool = False) -> array:
+        """
+        Offer indexes ordered by a sort key, ties broken by price.
+
+        Computed once per result set and key; offers missing the attribute
+        sort last in both directions.
+        """
+        name = f"-{sort}" if descending else sort
+        if name not in self._orders:
+            column = self.columns[sort]
+            prices = self.columns["price"]
+            missing = MISSING_PRICE if sort == "price" else MISSING_MINUTES
+            present = [i for i in range(len(self)) if column[i] != missing]
+            present.sort(key=lambda i: (column[i], prices[i]), reverse=descending)
+            absent = [i for i in range(len(self)) if column[i] == missing]
+            self._orders[name] = array("l", present + absent)
+        return self._orders[name]
+
+    def mask(self, params: OfferSliceParams) -> bytearray | None:
+        """
+        Build a per-offer keep mask for the filters in params.
+
+        Returns:
+            Mask with 1 for offers that pass every filter, None if no filter is set
+        """
+        keep = None
+
+        def narrow(passed) -> None:
+            nonlocal keep
+            passed = bytearray(passed)
+            keep = (
+                passed
+                if keep is None
+                else bytearray(a & b for a, b in zip(keep, passed))
+            )
+
+        if params.max_stops is not None:
+            narrow(stops <= params.max_stops for stops in self.columns["stops"])
+        if params.max_price is not None:
+            narrow(price <= params.max_price for price in self.columns["price"])
+        if params.carriers:
+            wanted = {code.strip().upper() for code in params.carriers.split(",")}
+            ids = {i for i, code in enumerate(self.carriers) if code in wanted}
+            narrow(carrier in ids for carrier in self.columns["carrier"])
+        if params.departure_after or params.departure_before:
+            narrow(
+                _in_window(minutes, params.departure_after, params.departure_before)
+                for minutes in self.columns["departure"]
+            )
+        if params.arrival_after or params.arrival_before:
+            narrow(
+                _in_window(minutes, params.arrival_after, params.arrival_before)
+                for minutes in self.columns["arrival"]
+            )
+        return keep
+
+    def summary(self, index: int) -> dict:
+        price = self.columns["price"][index]
+        duration = self.columns["duration"][index]
+        stops = self.columns["stops"][index]
+        return OfferSummary(
+            id=self.offers[index].get("id"),
+            price=None if price == MISSING_PRICE else price,
+            currency=self.currency,
+            duration_minutes=None if duration == MISSING_MINUTES else duration,
+            departure_at=_format_minutes(self.columns["departure"][index]),
+            arrival_at=_format_minutes(self.columns["arrival"][index]),
+            stops=None if stops == MISSING_STOPS else stops,
+            carrier=self.carriers[self.columns["carrier"][index]],
+        ).model_dump()
+
+    def slice(self, params: OfferSliceParams) -> OfferResultsPage:
+        """
+        Sort, filter and page the result set.
+
+        Args:
+            params: Slice options
+
+        Returns:
+            One page of offers (or summary rows) with the matching total
+        """
+        order = self.order(params.sort, params.order == "desc")
+        keep = self.mask(params)
+        matched = order if keep is None else [i for i in order if keep[i]]
+
+        page = islice(matched, params.offset, params.offset + params.limit)
+        if params.view == "summary":
+            items = [self.summary(i) for i in page]
+        else:
+            items = [self.offers[i] for i in page]
+
+        return OfferResultsPage(
+            handle=self.handle,
+            items=items,
+            total_count=len(matched),
+            result_count=len(self),
+            offset=params.offset,
+            limit=params.limit,
+            has_more=params.offset + params.limit < len(matched),
+        )
+
+
+def handle_for(search_key: str) -> str:
+    """Derive the result handle for a search cache key."""
+    return digest(search_key)[:KEY_DIGEST_LENGTH]
+
+
+def is_valid_handle(handle: str) -> bool:
+    return bool(HANDLE_PATTERN.match(handle))
+
+
+class OfferResultStore:
+    """Stores result sets in Redis with a per-worker LRU of materialized sets."""
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        ttl_seconds: int = OFFER_RESULTS_TTL,
+        local: LocalCache | None = None,
+        local_ttl_seconds: int = OFFER_RESULTS_LOCAL_TTL,
+    ):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        if local is None:
+            local = LocalCache(
+                max_entries=OFFER_RESULTS_LOCAL_ENTRIES, max_bytes=256 * 1024 * 1024
+            )
+        self.local = local
+        self.local_ttl_seconds = min(local_ttl_seconds, ttl_seconds)
+
+    @staticmethod
+    def key_for(handle: str) -> str:
+        return f"{namespace_prefix(CacheNamespaces.OFFER_RESULTS)}:{handle}"
+
+    async def get(self, handle: str) -> OfferResultSet | None:
+        """
+        Look up a result set, trying this worker's copy before Redis.
+
+        Args:
+            handle: Result handle
+
+        Returns:
+            The result set, or None if it expired or never existed
+        """
+        if not is_valid_handle(handle):
+            return None
+
+        entry = self.local.get(handle)
+        if entry is not None:
+            offer_results_lookups.labels(result="local_hit").inc()
+            return entry.value
+
+        payload = await self.cache.get(self.key_for(handle))
+        if not payload:
+            offer_results_lookups.labels(result="miss").inc()
+            return None
+
+        offer_results_lookups.labels(result="hit").inc()
+        result_set = OfferResultSet.from_payload(handle, payload)
+        self._remember(result_set)
+        return result_set
+
+    async def ingest(self, search_key: str, offers: list[dict]) -> OfferResultSet:
+        """
+        Build and store the result set for a search's offers.
+
+        Args:
+            search_key: Cache key of the search that produced the offers
+            offers: Amadeus flight offers
+
+        Returns:
+            The stored result set
+        """
+        result_set = OfferResultSet.from_offers(handle_for(search_key), offers)
+        if offers:
+            await self.cache.set(
+                self.key_for(result_set.handle),
+                result_set.to_payload(),
+                self.ttl_seconds,
+            )
+            self._remember(result_set)
+        return result_set
+
+    def _remember(self, result_set: OfferResultSet) -> None:
+        # Rough footprint: offers dominate and average a couple of KB each
+        size = 2048 * len(result_set) + 64
+        self.local.set(result_set.handle, result_set, self.local_ttl_seconds, size)
+
+
+offer_result_store = OfferResultStore(redis_cache)
@@ -5,9 +5,10 @@ Docs: https://developer.pesapal.com/
 
 import os
 import httpx
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any
 from dotenv import load_dotenv
+from backend.external_services.token_manager import TokenManager, TokenResponse
 from backend.utils.log_manager import get_app_logger
 
 # Load environment variables
@@ -16,6 +17,9 @@ load_dotenv()
 # Initialize logger
 logger = get_app_logger(__name__)
 
+# Pesapal tokens are valid for 5 minutes from issue
+PESAPAL_TOKEN_TTL_SECONDS = 300
+
 
 class PesapalClient:
     def __init__(self):
@@ -25,25 +29,28 @@ class PesapalClient:
             "PESAPAL_BASE_URL", "https://cybqa.pesapal.com/pesapalv3"
         )
         self.ipn_id = os.getenv("PESAPAL_IPN_ID")  # IPN Notification ID
-        self._access_token: str | None = None
-        self._token_expiry: datetime | None = None
+        self.token_manager = TokenManager(
+            "pesapal", self._request_access_token, client_id=self.consumer_key
+        )
 
     async def _get_access_token(self) -> str:
         """
-        Get OAuth2 access token from Pesapal
+        Get the shared OAuth2 access token, refreshed before it expires
+
+        Returns:
+            Access token string
+        """
+        return await self.token_manager.get_token()
+
+    async def _request_access_token(self) -> TokenResponse:
+        """
+        Request a new OAuth2 access token from Pesapal
 
         POST /api/Auth/RequestToken
 
         Returns:
-            Access token string valid for 5 minutes
+            Token response; Pesapal tokens are valid for 5 minutes
         """
-        if (
-            self._access_token
-            and self._token_expiry
-            and datetime.now(timezone.utc) < self._token_expiry
-        ):
-            return self._access_token
-
         payload = {
             "consumer_key": self.consumer_key,
             "consumer_secret": self.consumer_secret,
@@ -86,12 +93,11 @@ class PesapalClient:
                     f"Authentication failed: No token in response. Response: {data}"
                 )
 
-            self._access_token = data["token"]
             logger.info("Pesapal authentication successful")
 
-            self._token_expiry = datetime.now(timezone.utc) + timedelta(minutes=4)
-
-            return self._access_token
+            return TokenResponse(
+                access_token=data["token"], expires_in=PESAPAL_TOKEN_TTL_SECONDS
+            )
 
     async def submit_order_request(
         self,
@@ -0,0 +1,243 @@
+"""
+Flexible-date price calendar.
+
+Fans out one GET flight-offers search per date in a window around the
+requested departure date and reduces each to its cheapest offer.
+
+- per-date searches share cache keys with GET /shopping/flight-offers, so
+  dates somebody already searched are answered from Redis, and calendar
+  results warm the cache for the regular search
+- at most PRICE_CALENDAR_MAX_CONCURRENCY searches run at once per calendar
+- each search has a PRICE_CALENDAR_CALL_TIMEOUT deadline; a date that
+  misses it is reported as "timeout" while the upstream call keeps running
+  in the background (single-flight) and fills the cache for a retry
+- days are yielded as they complete, so callers can stream partial results
+"""
+
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import AsyncIterator
+
+from prometheus_client import Counter
+
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.external_services.flight import amadeus_flight_service
+from backend.external_services.single_flight import (
+    SingleFlight,
+    upstream_single_flight,
+)
+from backend.schemas.flight_search import FlightSearchRequestGet
+from backend.schemas.price_calendar import (
+    PriceCalendarDay,
+    PriceCalendarRequest,
+    PriceCalendarResponse,
+)
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+PRICE_CALENDAR_MAX_CONCURRENCY = int(os.getenv("PRICE_CALENDAR_MAX_CONCURRENCY", 4))
+PRICE_CALENDAR_CALL_TIMEOUT = float(os.getenv("PRICE_CALENDAR_CALL_TIMEOUT", 8))
+
+price_calendar_days = Counter(
+    "price_calendar_days_total",
+    "Price calendar dates by outcome",
+    ["status"],
+)
+
+
+def cheapest_offer(offers: list[dict]) -> dict | None:
+    """
+    Pick the offer with the lowest grand total.
+
+    Args:
+        offers: Amadeus flight offers
+
+    Returns:
+        The cheapest offer, or None if no offer has a usable price
+    """
+    best = None
+    best_price = None
+    for offer in offers or []:
+        try:
+            price = float(offer["price"]["grandTotal"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if best_price is None or price < best_price:
+            best, best_price = offer, price
+    return best
+
+
+def summarize_day(day: date, offers: list[dict]) -> PriceCalendarDay:
+    """Reduce one date's offers to its compact calendar entry."""
+    offer = cheapest_offer(offers)
+    if offer is None:
+        return PriceCalendarDay(date=day, status="no_flights")
+
+    segments = (offer.get("itineraries") or [{}])[0].get("segments") or []
+    carriers = offer.get("validatingAirlineCodes") or [
+        segment.get("carrierCode") for segment in segments[:1]
+    ]
+    return PriceCalendarDay(
+        date=day,
+        status="ok",
+        price=float(offer["price"]["grandTotal"]),
+        currency=offer["price"].get("currency"),
+        carrier=carriers[0] if carriers else None,
+        stops=max(len(segments) - 1, 0),
+    )
+
+
+class PriceCalendar:
+    def __init__(
+        self,
+        service: AsyncFlightService,
+        cache: RedisCache,
+        single_flight: SingleFlight,
+        max_concurrency: int = PRICE_CALENDAR_MAX_CONCURRENCY,
+        call_timeout: float = PRICE_CALENDAR_CALL_TIMEOUT,
+    ):
+        self.service = service
+        self.cache = cache
+        self.single_flight = single_flight
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+
+    @staticmethod
+    def dates(request: PriceCalendarRequest, today: date | None = None) -> list[date]:
+        """
+        Dates in the window around the requested departure, skipping past dates.
+
+        Args:
+            request: Calendar request
+            today: Reference date, defaults to the current date
+
+        Returns:
+            Dates in ascending order
+        """
+        today = today or date.today()
+        centre = request.departureDate
+        return [
+            day
+            for offset in range(-request.window, request.window + 1)
+            if (day := centre + timedelta(days=offset)) >= today
+        ]
+
+    @staticmethod
+    def search_params(request: PriceCalendarRequest, day: date) -> dict:
+        """
+        GET flight-offers parameters for one date.
+
+        Built through FlightSearchRequestGet so the cache key matches the one
+        GET /shopping/flight-offers uses for the same search.
+        """
+        search = FlightSearchRequestGet(
+            originLocationCode=request.originLocationCode.upper(),
+            destinationLocationCode=request.destinationLocationCode.upper(),
+            departureDate=day.isoformat(),
+            adults=request.adults,
+            travelClass=request.travelClass,
+            nonStop=request.nonStop,
+            currencyCode=request.currencyCode.upper(),
+        )
+        return search.model_dump(exclude_none=True)
+
+    @classmethod
+    def cache_key(cls, request: PriceCalendarRequest, day: date) -> str:
+        return build_cache_key(
+            CacheNamespaces.FLIGHT_SEARCH, cls.search_params(request, day)
+        )
+
+    async def search_day(self, request: PriceCalendarRequest, day: date) -> list:
+        params = self.search_params(request, day)
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, params)
+        offers = await self.cache.get(key)
+        if offers:
+            return offers
+
+        return await self.single_flight.load(
+            key,
+            lambda: self.service.search_flights_get(params),
+            operation="search_flights_get",
+        )
+
+    async def iter_days(
+        self, request: PriceCalendarRequest, today: date | None = None
+    ) -> AsyncIterator[PriceCalendarDay]:
+        """
+        Search every date in the window and yield days as they complete.
+
+        Dates already cached are read with a single MGET and yielded first;
+        only the rest are searched.
+
+        Yields:
+            PriceCalendarDay in completion order
+        """
+        days = self.dates(request, today)
+        cached = await self.cache.get_many(self.cache_key(request, day) for day in days)
+        uncached = []
+        for day, offers in zip(days, cached):
+            if offers:
+                result = summarize_day(day, offers)
+                price_calendar_days.labels(status=result.status).inc()
+                yield result
+            else:
+                uncached.append(day)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def price_day(day: date) -> PriceCalendarDay:
+            async with semaphore:
+                try:
+                    offers = await asyncio.wait_for(
+                        self.search_day(request, day), timeout=self.call_timeout
+                    )
+                    result = summarize_day(day, offers)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Price calendar search for {day} timed out")
+                    result = PriceCalendarDay(date=day, status="timeout")
+                except Exception as e:
+                    logger.error(f"Price calendar search for {day} failed: {e}")
+                    result = PriceCalendarDay(date=day, status="error")
+            price_calendar_days.labels(status=result.status).inc()
+            return result
+
+        tasks = [asyncio.ensure_future(price_day(day)) for day in uncached]
+        try:
+            for next_day in asyncio.as_completed(tasks):
+                yield await next_day
+        finally:
+            # Client went away before every date finished
+            for task in tasks:
+                task.cancel()
+
+    async def build(
+        self, request: PriceCalendarRequest, today: date | None = None
+    ) -> PriceCalendarResponse:
+        """Search the whole window and return the calendar in date order."""
+        days = [day async for day in self.iter_days(request, today)]
+        return self.response(request, days)
+
+    @staticmethod
+    def response(
+        request: PriceCalendarRequest, days: list[PriceCalendarDay]
+    ) -> PriceCalendarResponse:
+        days = sorted(days, key=lambda day: day.date)
+        priced = [day for day in days if day.price is not None]
+        cheapest = min(priced, key=lambda day: day.price, default=None)
+        return PriceCalendarResponse(
+            origin=request.originLocationCode.upper(),
+            destination=request.destinationLocationCode.upper(),
+            days=days,
+            cheapest_date=cheapest.date if cheapest else None,
+            complete=all(day.status in ("ok", "no_flights") for day in days),
+        )
+
+
+price_calendar = PriceCalendar(
+    amadeus_flight_service, redis_cache, upstream_single_flight
+)
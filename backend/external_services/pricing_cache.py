@@ -0,0 +1,192 @@
+"""
+Short-lived cache of flight offer pricing confirmations.
+
+Users re-open the review page and frontends retry pricing for the same offer;
+each of those used to be a full Amadeus pricing call. Confirmations are now
+cached under a fingerprint of the offer's pricing-relevant fields (see
+canonicalize_flight_offer), and concurrent confirmations of one offer share a
+single upstream call (see single_flight).
+
+A search offer and the priced offer returned for it share a fingerprint, so
+booking can look up the confirmed offer without pricing it again. Entries
+live for PRICING_CACHE_TTL seconds at most, and never past the offer's last
+ticketing time.
+"""
+
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter
+
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.external_services.single_flight import SingleFlight, upstream_single_flight
+from backend.utils.cache_keys import build_cache_key, canonicalize_flight_offer
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+# Amadeus prices are only guaranteed briefly, so keep this short
+PRICING_CACHE_TTL = int(os.getenv("PRICING_CACHE_TTL", 120))
+
+pricing_cache_requests = Counter(
+    "pricing_cache_requests_total",
+    "Flight offer pricing cache lookups",
+    ["result"],
+)
+
+
+def pricing_response_payload(response) -> dict:
+    """
+    Convert a provider pricing response into a JSON-serializable payload.
+
+    Args:
+        response: Provider response object or dictionary
+
+    Returns:
+        Dictionary shaped like FlightPricingResponse
+    """
+    if isinstance(response, dict):
+        return response
+
+    return {
+        "data": getattr(response, "data", None),
+        "result": getattr(response, "result", None),
+    }
+
+
+def priced_offers(payload: dict) -> list[dict]:
+    """The priced flight offers in a pricing payload."""
+    data = payload.get("data") or {}
+    if not isinstance(data, dict):
+        return []
+    return data.get("flightOffers") or []
+
+
+def offer_expires_at(offer: dict) -> float | None:
+    """
+    Return when an offer can no longer be ticketed, as a UTC timestamp.
+
+    Uses lastTicketingDateTime, falling back to the end of lastTicketingDate;
+    times without an offset are read as UTC.
+
+    Args:
+        offer: Flight offer dictionary
+
+    Returns:
+        Timestamp, or None if the offer carries no (parseable) deadline
+    """
+    value = offer.get("lastTicketingDateTime") or offer.get("lastTicketingDate")
+    if not value:
+        return None
+    try:
+        if "T" in value:
+            expires = datetime.fromisoformat(value)
+        else:
+            # A bare date is ticketable until the end of that day
+            expires = datetime.combine(date.fromisoformat(value), datetime.max.time())
+    except ValueError:
+        logger.warning(f"Unparseable ticketing deadline on offer: {value}")
+        return None
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires.timestamp()
+
+
+class PricingCache:
+    """Caches pricing confirmations keyed by flight offer fingerprint."""
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        single_flight: SingleFlight = upstream_single_flight,
+        ttl_seconds: int = PRICING_CACHE_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.cache = cache
+        self.single_flight = single_flight
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    def key_for(self, offer: dict) -> str:
+        return build_cache_key(
+            CacheNamespaces.FLIGHT_PRICING, canonicalize_flight_offer(offer)
+        )
+
+    def ttl_for(self, offer: dict) -> int:
+        """Seconds a confirmation of ``offer`` may be cached; 0 if expired."""
+        expires_at = offer_expires_at(offer)
+        if expires_at is None:
+            return self.ttl_seconds
+        return max(0, min(self.ttl_seconds, int(expires_at - self.clock())))
+
+    @staticmethod
+    def is_cacheable(payload: dict) -> bool:
+        """Only confirmations that priced an offer are cached."""
+        return bool(priced_offers(payload))
+
+    async def get(self, offer: dict) -> dict | None:
+        """
+        Look up a cached confirmation and record a hit or miss.
+
+        Args:
+            offer: Flight offer being priced
+
+        Returns:
+            The cached pricing payload, or None on a miss
+        """
+        payload = await self.cache.get(self.key_for(offer))
+        if payload:
+            pricing_cache_requests.labels(result="hit").inc()
+            return payload
+
+        pricing_cache_requests.labels(result="miss").inc()
+        return None
+
+    async def confirm(self, offer: dict, fetch: Callable[[], Awaitable[Any]]) -> dict:
+        """
+        Return the pricing confirmation for ``offer``, cached or fresh.
+
+        Args:
+            offer: Flight offer being priced
+            fetch: Coroutine factory making the pricing call and returning
+                its payload (see pricing_response_payload)
+
+        Returns:
+            Pricing payload shaped like FlightPricingResponse
+        """
+        payload = await self.get(offer)
+        if payload:
+            return payload
+
+        ttl_seconds = self.ttl_for(offer)
+        return await self.single_flight.load(
+            self.key_for(offer),
+            fetch,
+            operation="confirm_price",
+            ttl_seconds=max(1, ttl_seconds),
+            cacheable=lambda result: ttl_seconds > 0 and self.is_cacheable(result),
+        )
+
+    async def priced_offer(self, offer: dict) -> dict | None:
+        """
+        Return the confirmed version of ``offer`` if it was priced recently.
+
+        Args:
+            offer: Search or priced flight offer
+
+        Returns:
+            The priced offer from the cached confirmation, or None
+        """
+        payload = await self.get(offer)
+        offers = priced_offers(payload or {})
+        return offers[0] if offers else None
+
+    async def invalidate(self, offer: dict) -> None:
+        """Drop the confirmation for ``offer``, e.g. once it has been booked."""
+        await self.cache.delete(self.key_for(offer))
+
+
+pricing_cache = PricingCache(redis_cache)
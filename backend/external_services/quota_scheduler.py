@@ -0,0 +1,265 @@
+"""
+Client-side scheduling of upstream calls against the provider's quotas.
+
+Amadeus enforces a per-second rate limit and a monthly call quota per API
+key. Without coordination a burst of anonymous searches can use up both and
+leave bookings and price confirmations failing with 429s. The QuotaScheduler
+makes each provider call the circuit breaker lets through take a token first:
+- tokens come from buckets in Redis shared by every worker: one refilling
+  at the per-second limit and, when configured, one holding the monthly
+  quota
+- each operation class leaves a reserve in the buckets, so lower priority
+  calls (searches, analytics) stop drawing before the last tokens are gone
+  and bookings and pricing always find some
+- within a worker, waiting calls form a priority queue; only the highest
+  priority waiter asks Redis for a token
+- a call that would wait longer than its class's budget is shed right away
+  with QuotaExceededError, which routers turn into a 429
+- a hedge (see resilience.UpstreamGuard) only takes a token that is free
+  right away (try_acquire); otherwise the call is not hedged
+- background jobs can run their calls under a class of their own with
+  scheduled_as (see cache_warmer)
+
+Redis errors let calls through, so a cache outage does not stop bookings.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, TypedDict
+
+from prometheus_client import Counter, Gauge
+
+from backend.external_services.cache import RedisCache, TokenBucket, redis_cache
+from backend.external_services.resilience import UpstreamUnavailableError
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+# Amadeus allows 10 transactions per second in test and 40 in production;
+# 0 disables scheduling
+UPSTREAM_RATE_LIMIT_PER_SECOND = float(os.getenv("UPSTREAM_RATE_LIMIT_PER_SECOND", 10))
+UPSTREAM_RATE_LIMIT_BURST = float(os.getenv("UPSTREAM_RATE_LIMIT_BURST", 10))
+# Calls allowed per month; 0 disables the monthly bucket
+UPSTREAM_MONTHLY_QUOTA = int(os.getenv("UPSTREAM_MONTHLY_QUOTA", 0))
+MONTH_SECONDS = 30 * 24 * 3600
+
+QUOTA_KEY_PREFIX = "quota"
+
+
+class OperationClass(TypedDict):
+    name: str
+    # Lower values are served first within a worker
+    priority: int
+    # Share of each bucket's capacity this class must leave for others
+    reserve: float
+    # Longest a call may queue for a token before it is shed
+    max_wait_seconds: float
+
+
+BOOKING = OperationClass(name="booking", priority=0, reserve=0.0, max_wait_seconds=30)
+PRICING = OperationClass(name="pricing", priority=1, reserve=0.0, max_wait_seconds=10)
+ORDERS = OperationClass(name="orders", priority=2, reserve=0.1, max_wait_seconds=5)
+SEARCH = OperationClass(name="search", priority=3, reserve=0.2, max_wait_seconds=2)
+ANALYTICS = OperationClass(
+    name="analytics", priority=4, reserve=0.4, max_wait_seconds=1
+)
+
+OPERATION_CLASSES: dict[str, OperationClass] = {
+    "create_flight_order": BOOKING,
+    "cancel_flight_order": BOOKING,
+    "confirm_price": PRICING,
+    "get_flight_order": ORDERS,
+    "get_flight_orders": ORDERS,
+    "view_seat_map_get": ORDERS,
+    "view_seat_map_post": ORDERS,
+    "search_flights": SEARCH,
+    "search_flights_get": SEARCH,
+    "airport_city_search": SEARCH,
+    "get_most_travelled_destinations": ANALYTICS,
+}
+# Class overriding OPERATION_CLASSES for the current task (see scheduled_as)
+_scheduled_class: ContextVar[OperationClass | None] = ContextVar(
+    "scheduled_class", default=None
+)
+
+queued_calls = Gauge(
+    "upstream_queued_calls",
+    "Upstream calls waiting for a quota token in this worker",
+    ["operation_class"],
+)
+shed_calls = Counter(
+    "upstream_shed_calls_total",
+    "Upstream calls rejected because they would wait too long for quota",
+    ["operation_class"],
+)
+
+
+class QuotaExceededError(UpstreamUnavailableError):
+    pass
+
+
+@contextmanager
+def scheduled_as(operation_class: OperationClass) -> Iterator[None]:
+    """
+    Schedule every provider call made inside the block as ``operation_class``.
+
+    Tasks created inside the block (e.g. single-flight loads) inherit it.
+    """
+    token = _scheduled_class.set(operation_class)
+    try:
+        yield
+    finally:
+        _scheduled_class.reset(token)
+
+
+class _Waiter:
+    """A queued call; ordered by priority, then arrival."""
+
+    def __init__(self, priority: int, sequence: int):
+        self.order = (priority, sequence)
+        self.wake = asyncio.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.order < other.order
+
+
+class QuotaScheduler:
+    """
+    Hands out provider quota to upstream calls in priority order.
+
+    Example:
+        await scheduler.acquire("confirm_price")
+        result = await call_provider()
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = redis_cache,
+        provider: str = "amadeus",
+        rate_per_second: float = UPSTREAM_RATE_LIMIT_PER_SECOND,
+        burst: float = UPSTREAM_RATE_LIMIT_BURST,
+        monthly_quota: int = UPSTREAM_MONTHLY_QUOTA,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.cache = cache
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.monthly_quota = monthly_quota
+        # Wall clock, so bucket refills agree across workers sharing Redis
+        self.clock = clock
+        self.second_key = f"{QUOTA_KEY_PREFIX}:{provider}:second"
+        self.month_key = f"{QUOTA_KEY_PREFIX}:{provider}:month"
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+
+    def buckets(self, operation_class: OperationClass) -> list[TokenBucket]:
+        """The shared buckets a call of this class takes tokens from."""
+        buckets = [
+            self._bucket(
+                self.second_key, self.rate_per_second, self.burst, operation_class
+            )
+        ]
+        if self.monthly_quota:
+            buckets.append(
+                self._bucket(
+                    self.month_key,
+                    self.monthly_quota / MONTH_SECONDS,
+                    self.monthly_quota,
+                    operation_class,
+                )
+            )
+        return buckets
+
+    @staticmethod
+    def _bucket(
+        key: str, rate: float, capacity: float, operation_class: OperationClass
+    ) -> TokenBucket:
+        # A full bucket always has a token for every class
+        reserve = min(capacity - 1, capacity * operation_class["reserve"])
+        return TokenBucket(key=key, rate=rate, capacity=capacity, reserve=reserve)
+
+    async def acquire(self, operation: str) -> None:
+        """
+        Wait for a quota token for one call of ``operation``.
+
+        Args:
+            operation: Provider method name (see OPERATION_CLASSES); unknown
+                operations are scheduled as searches, and calls inside
+                scheduled_as use its class instead
+
+        Raises:
+            QuotaExceededError: The call would wait longer than its class allows
+        """
+        if not self.rate_per_second:
+            return
+        operation_class = self._operation_class(operation)
+        buckets = self.buckets(operation_class)
+        deadline = self.clock() + operation_class["max_wait_seconds"]
+        waiter = _Waiter(operation_class["priority"], next(self._sequence))
+        heapq.heappush(self._waiters, waiter)
+        queued_calls.labels(operation_class=operation_class["name"]).inc()
+        try:
+            while True:
+                if self._waiters[0] is waiter:
+                    wait = await self.cache.take_tokens(buckets, self.clock())
+                    if wait <= 0:
+                        return
+                    if wait > deadline - self.clock():
+                        self._shed(operation_class, wait)
+                else:
+                    # Woken early when it reaches the head of the queue
+                    wait = deadline - self.clock()
+                    if wait <= 0:
+                        self._shed(operation_class, 1)
+                waiter.wake.clear()
+                try:
+                    await asyncio.wait_for(waiter.wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            queued_calls.labels(operation_class=operation_class["name"]).dec()
+            self._remove(waiter)
+
+    async def try_acquire(self, operation: str) -> bool:
+        """
+        Take a quota token for one call of ``operation`` only if one is free now.
+
+        For optional calls (e.g. hedges) that are skipped rather than queued;
+        calls already waiting in this worker keep their place.
+
+        Args:
+            operation: Provider method name, as for acquire
+
+        Returns:
+            Whether the call may go ahead
+        """
+        if not self.rate_per_second:
+            return True
+        if self._waiters:
+            return False
+        buckets = self.buckets(self._operation_class(operation))
+        return await self.cache.take_tokens(buckets, self.clock()) <= 0
+
+    @staticmethod
+    def _operation_class(operation: str) -> OperationClass:
+        return _scheduled_class.get() or OPERATION_CLASSES.get(operation, SEARCH)
+
+    def _shed(self, operation_class: OperationClass, wait: float) -> None:
+        shed_calls.labels(operation_class=operation_class["name"]).inc()
+        raise QuotaExceededError(
+            f"Upstream quota exhausted for {operation_class['name']} calls",
+            max(1, math.ceil(wait)),
+        )
+
+    def _remove(self, waiter: _Waiter) -> None:
+        was_head = self._waiters[0] is waiter
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        if was_head and self._waiters:
+            self._waiters[0].wake.set()
@@ -0,0 +1,394 @@
+"""
+Resilience policies for upstream flight provider calls.
+
+Every provider call made through AsyncFlightService runs under an
+UpstreamGuard, which keeps per-operation state:
+- a latency window; once it has enough samples, calls time out after
+  ``timeout_multiplier`` x their observed p99 (clamped to a min/max) instead
+  of waiting for the SDK's own timeouts
+- a circuit breaker; when the error rate over the last ``window`` calls
+  crosses ``error_threshold`` the operation fails fast for
+  ``open_seconds``, then a single probe call decides whether to close it
+- optional hedging for idempotent reads; a call still running after the
+  operation's p95 gets a second, identical call and the first result wins
+
+Failing fast raises UpstreamUnavailableError, which routers turn into a 503.
+Cached reads keep working while a breaker is open: stale-while-revalidate
+entries are still served, and their background refreshes fail immediately.
+
+Provider calls run on executor threads, so a timed-out call only frees the
+caller; its thread finishes in the background.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter, Gauge
+
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+UPSTREAM_LATENCY_WINDOW = int(os.getenv("UPSTREAM_LATENCY_WINDOW", 200))
+UPSTREAM_LATENCY_MIN_SAMPLES = int(os.getenv("UPSTREAM_LATENCY_MIN_SAMPLES", 20))
+UPSTREAM_TIMEOUT_DEFAULT_SECONDS = float(
+    os.getenv("UPSTREAM_TIMEOUT_DEFAULT_SECONDS", 20)
+)
+UPSTREAM_TIMEOUT_MIN_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_MIN_SECONDS", 2))
+UPSTREAM_TIMEOUT_MAX_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_MAX_SECONDS", 30))
+UPSTREAM_TIMEOUT_MULTIPLIER = float(os.getenv("UPSTREAM_TIMEOUT_MULTIPLIER", 3))
+
+CIRCUIT_ERROR_THRESHOLD = float(os.getenv("CIRCUIT_ERROR_THRESHOLD", 0.5))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", 10))
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", 50))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", 30))
+
+UPSTREAM_HEDGING_ENABLED = (
+    os.getenv("UPSTREAM_HEDGING_ENABLED", "false").lower() == "true"
+)
+
+circuit_state = Gauge(
+    "upstream_circuit_state",
+    "Upstream circuit breaker state (0 = closed, 1 = half-open, 2 = open)",
+    ["operation"],
+)
+circuit_rejections = Counter(
+    "upstream_circuit_rejections_total",
+    "Upstream calls failed fast because the circuit was open",
+    ["operation"],
+)
+upstream_timeouts = Counter(
+    "upstream_timeouts_total",
+    "Upstream calls abandoned after their adaptive timeout",
+    ["operation"],
+)
+upstream_timeout_seconds = Gauge(
+    "upstream_timeout_seconds",
+    "Current adaptive timeout per upstream operation",
+    ["operation"],
+)
+hedged_requests = Counter(
+    "upstream_hedged_requests_total",
+    "Hedged second requests sent, by which request returned first",
+    ["operation", "winner"],
+)
+
+
+class UpstreamUnavailableError(Exception):
+    """An upstream call was not made, or abandoned, to protect the worker."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        # Seconds a client should wait before retrying
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    pass
+
+
+class UpstreamTimeoutError(UpstreamUnavailableError):
+    pass
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one operation."""
+
+    def __init__(
+        self,
+        window: int = UPSTREAM_LATENCY_WINDOW,
+        min_samples: int = UPSTREAM_LATENCY_MIN_SAMPLES,
+    ):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    @property
+    def ready(self) -> bool:
+        """Whether there are enough samples to trust the percentiles."""
+        return len(self.samples) >= self.min_samples
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def timeout(
+        self,
+        default: float = UPSTREAM_TIMEOUT_DEFAULT_SECONDS,
+        multiplier: float = UPSTREAM_TIMEOUT_MULTIPLIER,
+        minimum: float = UPSTREAM_TIMEOUT_MIN_SECONDS,
+        maximum: float = UPSTREAM_TIMEOUT_MAX_SECONDS,
+    ) -> float:
+        """Timeout derived from the observed p99, or ``default`` until ready."""
+        if not self.ready:
+            return default
+        return min(maximum, max(minimum, self.percentile(0.99) * multiplier))
+
+
+class CircuitBreaker:
+    """
+    Count-based circuit breaker for one operation.
+
+    closed: calls pass; the last ``window`` outcomes are kept and the circuit
+    opens once at least ``min_calls`` of them have an error rate of
+    ``error_threshold`` or more.
+    open: calls are rejected until ``open_seconds`` have passed.
+    half-open: one probe call is let through; success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        operation: str,
+        error_threshold: float = CIRCUIT_ERROR_THRESHOLD,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window: int = CIRCUIT_WINDOW,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.operation = operation
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probing = False
+        self._set_state(self.CLOSED)
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; claims the probe when half-open."""
+        if self.state == self.OPEN:
+            if self.clock() < self.opened_at + self.open_seconds:
+                return False
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state == self.OPEN:
+            # A call that started before the circuit opened
+            return
+        if self.state == self.HALF_OPEN:
+            logger.info(f"Circuit for {self.operation} closed")
+            self.outcomes.clear()
+            self._set_state(self.CLOSED)
+            return
+        self.outcomes.append(False)
+
+    def record_failure(self) -> None:
+        if self.state == self.OPEN:
+            return
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self.outcomes.append(True)
+        if (
+            len(self.outcomes) >= self.min_calls
+            and self.error_rate >= self.error_threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Give up a probe that ended without an outcome (e.g. cancelled)."""
+        self.probing = False
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    @property
+    def retry_after(self) -> int:
+        remaining = self.opened_at + self.open_seconds - self.clock()
+        return max(1, int(remaining + 0.999))
+
+    def _open(self) -> None:
+        logger.warning(
+            f"Circuit for {self.operation} opened "
+            f"(error rate {self.error_rate:.0%} over {len(self.outcomes)} calls)"
+        )
+        self.opened_at = self.clock()
+        self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.probing = False
+        circuit_state.labels(operation=self.operation).set(self.GAUGE_VALUES[state])
+
+
+class UpstreamGuard:
+    """
+    Applies adaptive timeouts, circuit breaking and hedging per operation.
+
+    Example:
+        result = await guard.call(
+            "search_flights_get",
+            lambda: run_in_executor(service.search_flights_get, params),
+            hedge=True,
+        )
+    """
+
+    def __init__(
+        self,
+        hedging_enabled: bool = UPSTREAM_HEDGING_ENABLED,
+        is_failure: Callable[[BaseException], bool] = lambda error: True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.hedging_enabled = hedging_enabled
+        # Decides which errors count against the circuit (e.g. not 4xx)
+        self.is_failure = is_failure
+        self.clock = clock
+        self.latencies: dict[str, LatencyTracker] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def latency(self, operation: str) -> LatencyTracker:
+        if operation not in self.latencies:
+            self.latencies[operation] = LatencyTracker()
+        return self.latencies[operation]
+
+    def breaker(self, operation: str) -> CircuitBreaker:
+        if operation not in self.breakers:
+            self.breakers[operation] = CircuitBreaker(operation, clock=self.clock)
+        return self.breakers[operation]
+
+    async def call(
+        self,
+        operation: str,
+        start: Callable[[], Awaitable[Any]],
+        idempotent: bool = True,
+        hedge: bool = False,
+        acquire: Callable[[], Awaitable[None]] | None = None,
+        try_acquire: Callable[[], Awaitable[bool]] | None = None,
+    ) -> Any:
+        """
+        Run one upstream call under the operation's policies.
+
+        Args:
+            operation: Operation name used for state and metrics labels
+            start: Factory starting the upstream call; called twice if hedged
+            idempotent: Whether the call may be abandoned on timeout; calls
+                with side effects (bookings) only get the circuit breaker
+            hedge: Whether a slow call may be hedged with a second one
+            acquire: Awaited once the circuit lets the call through, before
+                it starts (e.g. taking quota), so rejected calls cost nothing
+            try_acquire: Awaited before a hedge starts; returns whether it may
+                go ahead without waiting (e.g. quota is free now), otherwise
+                the call is not hedged
+
+        Returns:
+            The upstream result
+
+        Raises:
+            CircuitOpenError: The operation's circuit is open
+            UpstreamTimeoutError: The call exceeded its adaptive timeout
+            Whatever the upstream call raises otherwise
+        """
+        breaker = self.breaker(operation)
+        if not breaker.allow():
+            circuit_rejections.labels(operation=operation).inc()
+            raise CircuitOpenError(
+                f"{operation} is temporarily unavailable", breaker.retry_after
+            )
+        if acquire is not None:
+            try:
+                await acquire()
+            except BaseException:
+                # Nothing went upstream, so a half-open probe is not used up
+                breaker.release()
+                raise
+
+        latency = self.latency(operation)
+        timeout = latency.timeout() if idempotent else None
+        if timeout is not None:
+            upstream_timeout_seconds.labels(operation=operation).set(timeout)
+        began = self.clock()
+        try:
+            if hedge and idempotent and self.hedging_enabled and latency.ready:
+                result = await self._hedged(
+                    operation, start, latency.percentile(0.95), timeout, try_acquire
+                )
+            else:
+                result = await asyncio.wait_for(start(), timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            if timeout is None:
+                raise
+            upstream_timeouts.labels(operation=operation).inc()
+            raise UpstreamTimeoutError(
+                f"{operation} timed out after {timeout:.1f}s",
+                max(1, int(timeout)),
+            )
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                breaker.record_failure()
+            else:
+                # The upstream answered (e.g. a 4xx), so it is healthy
+                breaker.record_success()
+            raise
+
+        breaker.record_success()
+        latency.record(self.clock() - began)
+        return result
+
+    async def _hedged(
+        self,
+        operation: str,
+        start: Callable[[], Awaitable[Any]],
+        hedge_after: float,
+        timeout: float,
+        try_acquire: Callable[[], Awaitable[bool]] | None = None,
+    ) -> Any:
+        """Hedge a slow call with a second one; the first success wins."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        primary = asyncio.ensure_future(start())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                return primary.result()
+            if try_acquire is not None and not await try_acquire():
+                # No quota to spare: keep waiting for the first call alone
+                return await asyncio.wait_for(primary, deadline - loop.time())
+
+            tasks.add(asyncio.ensure_future(start()))
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending and loop.time() < deadline:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=deadline - loop.time(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = "primary" if task is primary else "hedge"
+                        hedged_requests.labels(operation=operation, winner=winner).inc()
+                        return task.result()
+                    error = task.exception()
+
+            hedged_requests.labels(operation=operation, winner="none").inc()
+            if not pending and error is not None:
+                raise error
+            raise asyncio.TimeoutError()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,291 @@
+"""
+Seat map cache keys and the compact seat map encoding.
+
+Seat maps are cached for SEAT_MAP_CACHE_TTL seconds, per flight order (GET)
+or per flight offer fingerprint (POST, see canonicalize_flight_offer), so
+page views within that window do not call Amadeus again.
+
+Amadeus seat maps are dominated by one dictionary per seat repeating the
+cabin, characteristics and per-traveler price. ``?format=compact`` returns
+each seat map with ``"encoding": "grid"`` and its decks encoded as:
+
+- rows / rowX: label and x coordinate of every row that has seats
+- grid: one string per row, indexed by y; the seat's column letter at its
+  position, a space where there is no seat. Seats are numbered in grid order
+  (rows top to bottom, then y), and seat i's number is its row label followed
+  by its letter
+- cabins / characteristics: per seat, an index into the seat map's
+  ``cabins`` / ``characteristics`` tables
+- travelers: per traveler id, ``available`` and ``blocked`` bitmaps (base64,
+  bit i = seat i, most significant bit first; seats in neither are
+  occupied) and ``prices``, per seat an index into the ``prices`` table or
+  -1 when the seat has no price
+
+Everything else (deck configuration, facilities, flight details) is passed
+through unchanged. expand_seat_map reverses the encoding; seat maps that do
+not fit it are returned in full.
+"""
+
+import base64
+import os
+from typing import Literal, TypedDict
+
+from backend.utils.cache_keys import build_cache_key, canonicalize_flight_offer
+from backend.utils.constants import CacheNamespaces
+
+# Short, since availability changes as other travelers pick seats
+SEAT_MAP_CACHE_TTL = int(os.getenv("SEAT_MAP_CACHE_TTL", 60))
+
+SEAT_FIELDS = {
+    "cabin",
+    "number",
+    "characteristicsCodes",
+    "travelerPricing",
+    "coordinates",
+}
+AVAILABLE = "AVAILABLE"
+BLOCKED = "BLOCKED"
+OCCUPIED = "OCCUPIED"
+
+
+SeatMapFormat = Literal["full", "compact"]
+
+
+class CompactTravelerSeats(TypedDict):
+    available: str
+    blocked: str
+    prices: list[int]
+
+
+class CompactDeck(TypedDict, total=False):
+    deckType: str
+    deckConfiguration: dict
+    facilities: list[dict]
+    rows: list[str]
+    rowX: list[int]
+    grid: list[str]
+    cabins: list[int]
+    characteristics: list[int]
+    travelers: dict[str, CompactTravelerSeats]
+
+
+def seat_map_order_key(flight_order_id: str) -> str:
+    """Cache key for the seat maps of a booked flight order."""
+    return build_cache_key(
+        CacheNamespaces.SEAT_MAPS, {"flightOrderId": flight_order_id}
+    )
+
+
+def seat_map_offer_key(offer: dict) -> str:
+    """Cache key for the seat maps of a flight offer."""
+    return build_cache_key(
+        CacheNamespaces.SEAT_MAPS, {"offer": canonicalize_flight_offer(offer)}
+    )
+
+
+def render_seat_maps(seat_maps, format: SeatMapFormat = "full"):
+    """
+    Return seat maps in the requested response format.
+
+    Args:
+        seat_maps: Seat maps as returned by the provider
+        format: "full" for the provider's shape, "compact" for grids
+
+    Returns:
+        The seat maps unchanged, or compact-encoded where possible
+    """
+    if format != "compact" or not isinstance(seat_maps, list):
+        return seat_maps
+    return [_compact_or_full(seat_map) for seat_map in seat_maps]
+
+
+def _compact_or_full(seat_map: dict) -> dict:
+    try:
+        return compact_seat_map(seat_map)
+    except (ValueError, KeyError, TypeError):
+        return seat_map
+
+
+class _Table:
+    """Deduplicates values into a list, handing out their indexes."""
+
+    def __init__(self):
+        self.values: list = []
+        self._indexes: dict[str, int] = {}
+
+    def index(self, value) -> int:
+        # repr is much cheaper than stable_json; the same value with its keys
+        # in another order only costs a duplicate table entry
+        key = repr(value)
+        if key not in self._indexes:
+            self._indexes[key] = len(self.values)
+            self.values.append(value)
+        return self._indexes[key]
+
+
+def compact_seat_map(seat_map: dict) -> dict:
+    """
+    Encode one seat map's decks as grids, bitmaps and shared tables.
+
+    Args:
+        seat_map: One Amadeus seat map
+
+    Returns:
+        The compact seat map (see module docstring)
+
+    Raises:
+        ValueError: The seat map cannot be encoded without losing data
+    """
+    cabins, characteristics, prices = _Table(), _Table(), _Table()
+    decks = [
+        _compact_deck(deck, cabins, characteristics, prices)
+        for deck in seat_map.get("decks") or []
+    ]
+    compact = {key: value for key, value in seat_map.items() if key != "decks"}
+    compact.update(
+        encoding="grid",
+        decks=decks,
+        cabins=cabins.values,
+        characteristics=characteristics.values,
+        prices=prices.values,
+    )
+    return compact
+
+
+def _compact_deck(
+    deck: dict, cabins: _Table, characteristics: _Table, prices: _Table
+) -> CompactDeck:
+    seats = sorted(
+        deck.get("seats") or [],
+        key=lambda seat: (seat["coordinates"]["x"], seat["coordinates"]["y"]),
+    )
+    width = max((seat["coordinates"]["y"] for seat in seats), default=-1) + 1
+    traveler_ids = (
+        [pricing["id"] for pricing in seats[0]["travelerPricing"]] if seats else []
+    )
+
+    compact = CompactDeck(**{k: v for k, v in deck.items() if k != "seats"})
+    compact.update(rows=[], rowX=[], cabins=[], characteristics=[])
+    statuses: dict[str, list[str]] = {traveler: [] for traveler in traveler_ids}
+    seat_prices: dict[str, list[int]] = {traveler: [] for traveler in traveler_ids}
+    grid: list[list[str]] = []
+    for seat in seats:
+        if set(seat) != SEAT_FIELDS:
+            raise ValueError(f"Seat {seat.get('number')} has unexpected fields")
+        x, y = seat["coordinates"]["x"], seat["coordinates"]["y"]
+        label, letter = seat["number"][:-1], seat["number"][-1:]
+        if not compact["rowX"] or compact["rowX"][-1] != x:
+            compact["rows"].append(label)
+            compact["rowX"].append(x)
+            grid.append([" "] * width)
+        if label != compact["rows"][-1] or grid[-1][y] != " " or letter == " ":
+            raise ValueError(f"Seat {seat['number']} does not fit the row grid")
+        grid[-1][y] = letter
+
+        compact["cabins"].append(cabins.index(seat.get("cabin")))
+        compact["characteristics"].append(
+            characteristics.index(seat.get("characteristicsCodes"))
+        )
+        pricings = {pricing["id"]: pricing for pricing in seat["travelerPricing"]}
+        if set(pricings) != set(traveler_ids):
+            raise ValueError(f"Seat {seat['number']} is not priced for every traveler")
+        for traveler, pricing in pricings.items():
+            if set(pricing) - {"id", "seatAvailabilityStatus", "price"}:
+                raise ValueError(f"Seat {seat['number']} has unsupported pricing")
+            if pricing["seatAvailabilityStatus"] not in (AVAILABLE, BLOCKED, OCCUPIED):
+                raise ValueError(f"Unknown seat status on {seat['number']}")
+            statuses[traveler].append(pricing["seatAvailabilityStatus"])
+            seat_prices[traveler].append(
+                prices.index(pricing["price"]) if "price" in pricing else -1
+            )
+
+    compact["grid"] = ["".join(row).rstrip() for row in grid]
+    compact["travelers"] = {
+        traveler: CompactTravelerSeats(
+            available=_bitmap([status == AVAILABLE for status in statuses[traveler]]),
+            blocked=_bitmap([status == BLOCKED for status in statuses[traveler]]),
+            prices=seat_prices[traveler],
+        )
+        for traveler in traveler_ids
+    }
+    return compact
+
+
+def expand_seat_map(compact: dict) -> dict:
+    """
+    Decode a compact seat map back into the Amadeus shape.
+
+    Seats come back ordered by their coordinates.
+
+    Args:
+        compact: Seat map produced by compact_seat_map
+
+    Returns:
+        The seat map with per-seat dictionaries
+    """
+    seat_map = {
+        key: value
+        for key, value in compact.items()
+        if key not in ("encoding", "decks", "cabins", "characteristics", "prices")
+    }
+    seat_map["decks"] = [_expand_deck(deck, compact) for deck in compact["decks"]]
+    return seat_map
+
+
+def _expand_deck(compact_deck: dict, compact: dict) -> dict:
+    encoded = {"rows", "rowX", "grid", "cabins", "characteristics", "travelers"}
+    deck = {key: value for key, value in compact_deck.items() if key not in encoded}
+    travelers = {
+        traveler: (
+            _bits(seats["available"], len(seats["prices"])),
+            _bits(seats["blocked"], len(seats["prices"])),
+            seats["prices"],
+        )
+        for traveler, seats in compact_deck["travelers"].items()
+    }
+    deck["seats"] = []
+    for label, x, line in zip(
+        compact_deck["rows"], compact_deck["rowX"], compact_deck["grid"]
+    ):
+        for y, letter in enumerate(line):
+            if letter == " ":
+                continue
+            i = len(deck["seats"])
+            seat = {
+                "cabin": compact["cabins"][compact_deck["cabins"][i]],
+                "number": f"{label}{letter}",
+                "characteristicsCodes": compact["characteristics"][
+                    compact_deck["characteristics"][i]
+                ],
+                "travelerPricing": [],
+                "coordinates": {"x": x, "y": y},
+            }
+            for traveler, (available, blocked, prices) in travelers.items():
+                pricing = {
+                    "id": traveler,
+                    "seatAvailabilityStatus": (
+                        AVAILABLE
+                        if available[i]
+                        else BLOCKED
+                        if blocked[i]
+                        else OCCUPIED
+                    ),
+                }
+                if prices[i] >= 0:
+                    pricing["price"] = compact["prices"][prices[i]]
+                seat["travelerPricing"].append(pricing)
+            deck["seats"].append(seat)
+    return deck
+
+
+def _bitmap(flags: list[bool]) -> str:
+    value = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            value[i // 8] |= 0x80 >> (i % 8)
+    return base64.b64encode(bytes(value)).decode("ascii")
+
+
+def _bits(bitmap: str, count: int) -> list[bool]:
+    value = base64.b64decode(bitmap)
+    return [bool(value[i // 8] & (0x80 >> (i % 8))) for i in range(count)]
@@ -0,0 +1,313 @@
+"""
+Single-flight request coalescing for upstream flight provider calls.
+
+When many users miss the cache for the same key at once, only one upstream
+call is made:
+- within a worker, concurrent callers share one in-flight task
+- across workers, a Redis lease elects one leader; the others wait for the
+  leader to publish its result to the cache instead of calling upstream
+
+The leader stores the result in RedisCache before releasing its lease, so
+followers in other workers pick it up with a cache read.
+
+load_with_revalidation adds stale-while-revalidate on top: entries past their
+soft TTL are returned immediately while one background task (per key, across
+workers) refreshes them; callers only wait on upstream once the hard TTL has
+dropped the entry.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter
+
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.utils.cache_keys import CacheTTLPolicy
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+SINGLE_FLIGHT_LEASE_SECONDS = float(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", 15))
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", 15))
+SINGLE_FLIGHT_POLL_SECONDS = 0.05
+LEASE_KEY_PREFIX = "lease"
+
+upstream_calls = Counter(
+    "upstream_calls_total",
+    "Upstream flight provider calls made through single-flight",
+    ["operation"],
+)
+upstream_calls_coalesced = Counter(
+    "upstream_calls_coalesced_total",
+    "Upstream flight provider calls saved by single-flight coalescing",
+    ["operation", "scope"],
+)
+stale_cache_reads = Counter(
+    "stale_cache_reads_total",
+    "Stale cache entries served while a background refresh runs",
+    ["operation"],
+)
+background_refresh_failures = Counter(
+    "background_refresh_failures_total",
+    "Background cache refreshes that failed, leaving the stale entry in place",
+    ["operation"],
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same cache key into one upstream call.
+
+    Example:
+        result = await upstream_single_flight.load(
+            key,
+            lambda: amadeus_flight_service.airport_city_search(request_body),
+            operation="airport_city_search",
+        )
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        lease_seconds: float = SINGLE_FLIGHT_LEASE_SECONDS,
+        wait_seconds: float = SINGLE_FLIGHT_WAIT_SECONDS,
+        poll_seconds: float = SINGLE_FLIGHT_POLL_SECONDS,
+    ):
+        self.cache = cache
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def load(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_seconds: int = 300,
+        cacheable: Callable[[Any], bool] = bool,
+        stale_after_seconds: int | None = None,
+    ) -> Any:
+        """
+        Return the result for ``key``, calling ``fetch`` at most once per key
+        across all concurrent callers.
+
+        Callers are expected to have checked the cache already; this is the
+        miss path.
+
+        Args:
+            key: Cache key the result is stored under
+            fetch: Coroutine factory performing the upstream call
+            operation: Operation name used for metrics labels
+            ttl_seconds: Cache TTL for the stored result
+            cacheable: Predicate deciding whether a result is stored
+            stale_after_seconds: Optional soft TTL for the stored result
+
+        Returns:
+            The upstream (or coalesced) result
+
+        Raises:
+            Whatever ``fetch`` raises; errors are shared with coalesced
+            callers but never cached.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            upstream_calls_coalesced.labels(operation=operation, scope="local").inc()
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(
+            self._load_once(
+                key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+            )
+        )
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def load_with_revalidation(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_policy: CacheTTLPolicy,
+        cacheable: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Return the cached result for ``key`` using stale-while-revalidate.
+
+        - fresh entry: returned as is
+        - stale entry (past the soft TTL): returned as is, and a background
+          refresh is started unless one is already running
+        - no entry (never cached, or past the hard TTL): loaded through
+          ``load`` so concurrent callers still share one upstream call
+
+        A failed background refresh is logged and the stale entry keeps being
+        served until its hard TTL.
+
+        Args:
+            key: Cache key the result is stored under
+            fetch: Coroutine factory performing the upstream call
+            operation: Operation name used for metrics labels
+            ttl_policy: Soft and hard TTL for the namespace
+            cacheable: Predicate deciding whether a result is stored
+
+        Returns:
+            The cached (possibly stale) or freshly loaded result
+
+        Example:
+            return await upstream_single_flight.load_with_revalidation(
+                key,
+                lambda: amadeus_flight_service.airport_city_search(request_body),
+                operation="airport_city_search",
+                ttl_policy=CACHE_TTL_POLICIES[CacheNamespaces.LOCATIONS],
+            )
+        """
+        ttl_seconds = ttl_policy["hard_ttl_seconds"]
+        stale_after_seconds = ttl_policy["soft_ttl_seconds"]
+
+        entry = await self.cache.get_with_staleness(key)
+        if entry is not None:
+            value, is_stale = entry
+            if is_stale:
+                stale_cache_reads.labels(operation=operation).inc()
+                self._start_refresh(
+                    key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+                )
+            return value
+
+        return await self.load(
+            key,
+            fetch,
+            operation,
+            ttl_seconds=ttl_seconds,
+            cacheable=cacheable,
+            stale_after_seconds=stale_after_seconds,
+        )
+
+    def _start_refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_seconds: int,
+        cacheable: Callable[[Any], bool],
+        stale_after_seconds: int,
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        # Held in _refreshing until done so the task is not garbage collected
+        task = asyncio.ensure_future(
+            self._refresh(
+                key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+            )
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done, self._refreshing))
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_seconds: int,
+        cacheable: Callable[[Any], bool],
+        stale_after_seconds: int,
+    ) -> None:
+        lease_key = f"{LEASE_KEY_PREFIX}:{key}"
+        token = uuid.uuid4().hex
+
+        if not await self.cache.acquire_lease(lease_key, token, self.lease_seconds):
+            # Another worker is already refreshing this entry
+            return
+
+        try:
+            await self._fetch_and_store(
+                key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+            )
+        except Exception as e:
+            background_refresh_failures.labels(operation=operation).inc()
+            logger.warning(f"Background refresh of {key} failed; serving stale: {e}")
+        finally:
+            await self.cache.release_lease(lease_key, token)
+
+    def _forget(
+        self,
+        key: str,
+        task: asyncio.Task,
+        tasks: dict[str, asyncio.Task] | None = None,
+    ) -> None:
+        tasks = self._in_flight if tasks is None else tasks
+        if tasks.get(key) is task:
+            del tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter was cancelled
+            task.exception()
+
+    async def _load_once(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_seconds: int,
+        cacheable: Callable[[Any], bool],
+        stale_after_seconds: int | None,
+    ) -> Any:
+        lease_key = f"{LEASE_KEY_PREFIX}:{key}"
+        token = uuid.uuid4().hex
+
+        if await self.cache.acquire_lease(lease_key, token, self.lease_seconds):
+            try:
+                return await self._fetch_and_store(
+                    key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+                )
+            finally:
+                await self.cache.release_lease(lease_key, token)
+
+        result = await self._wait_for_leader(key, lease_key)
+        if result is not None:
+            upstream_calls_coalesced.labels(
+                operation=operation, scope="distributed"
+            ).inc()
+            return result
+
+        logger.info(f"Single-flight leader for {key} produced no result; fetching")
+        return await self._fetch_and_store(
+            key, fetch, operation, ttl_seconds, cacheable, stale_after_seconds
+        )
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        ttl_seconds: int,
+        cacheable: Callable[[Any], bool],
+        stale_after_seconds: int | None,
+    ) -> Any:
+        upstream_calls.labels(operation=operation).inc()
+        result = await fetch()
+        if cacheable(result):
+            await self.cache.set(key, result, ttl_seconds, stale_after_seconds)
+        return result
+
+    async def _wait_for_leader(self, key: str, lease_key: str) -> Any | None:
+        """Poll the cache until another worker's leader publishes the result."""
+        deadline = time.monotonic() + self.wait_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_seconds)
+            result = await self.cache.get(key)
+            if result:
+                return result
+            if not await self.cache.lease_exists(lease_key):
+                # Leader finished (or died) without a cacheable result
+                return await self.cache.get(key) or None
+        return None
+
+
+upstream_single_flight = SingleFlight(redis_cache)
@@ -0,0 +1,492 @@
+"""
+Synthetic high-volume flight provider for load testing.
+
+MockFlightService replays a three-offer fixture, which says nothing about
+how the API and cache layers behave under real payloads. The
+SyntheticFlightService generates production-shaped responses instead:
+- flight offer searches return offer sets generated from a seed and the
+  search parameters, so the same search always yields the same offers
+  (and cache keys, hit rates and payload sizes are reproducible)
+- each route gets a deterministic scale factor on SYNTHETIC_OFFERS_PER_ROUTE,
+  itineraries connect through hubs (up to two stops), and offers without
+  enough bookable seats for the requested travelers are dropped; every
+  offer carries one traveler pricing per passenger
+- like Amadeus, searches return at most ``max`` (GET) or
+  ``searchCriteria.maxFlightOffers`` (POST) offers; ask for 250 to get the
+  full set
+- every operation sleeps for a lognormal latency and fails at configurable
+  error and timeout rates (see OperationProfile), raising the same SDK
+  errors as the real provider
+
+Other operations (orders, seat maps, locations) serve the mock fixtures
+under the same latency and failure profiles.
+
+Activated by setting FLIGHT_SERVICE_PROVIDER=synthetic. SYNTHETIC_PROFILES
+takes a JSON object of per-operation overrides, e.g.
+``{"search_flights_get": {"error_rate": 0.05}}``; SYNTHETIC_LATENCY_SCALE
+multiplies every latency and timeout (0 disables sleeping).
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Callable, TypedDict
+
+from amadeus import NetworkError, ServerError
+
+from backend.external_services.mock_flight_service import (
+    MockFlightService,
+    _MockResponse,
+)
+from backend.utils.cache_keys import stable_json
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", 42))
+SYNTHETIC_OFFERS_PER_ROUTE = int(os.getenv("SYNTHETIC_OFFERS_PER_ROUTE", 250))
+SYNTHETIC_LATENCY_SCALE = float(os.getenv("SYNTHETIC_LATENCY_SCALE", 1))
+
+
+class OperationProfile(TypedDict):
+    # Median latency; samples follow a lognormal distribution around it
+    latency_ms: float
+    # Lognormal shape; 0.5 puts p99 at about 3.2x the median
+    latency_sigma: float
+    # Share of calls failing with a 500 after their latency
+    error_rate: float
+    # Share of calls hanging for timeout_seconds, then failing
+    timeout_rate: float
+    timeout_seconds: float
+
+
+def _profile(
+    latency_ms: float,
+    latency_sigma: float = 0.5,
+    error_rate: float = 0.01,
+    timeout_rate: float = 0.002,
+    timeout_seconds: float = 30,
+) -> OperationProfile:
+    return OperationProfile(
+        latency_ms=latency_ms,
+        latency_sigma=latency_sigma,
+        error_rate=error_rate,
+        timeout_rate=timeout_rate,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+DEFAULT_PROFILES: dict[str, OperationProfile] = {
+    "search_flights": _profile(1200, latency_sigma=0.6),
+    "search_flights_get": _profile(900, latency_sigma=0.6),
+    "confirm_price": _profile(600),
+    "create_flight_order": _profile(1500, error_rate=0.02),
+    "view_seat_map_get": _profile(500),
+    "view_seat_map_post": _profile(700),
+    "get_flight_order": _profile(300),
+    "cancel_flight_order": _profile(400),
+    "airport_city_search": _profile(150, latency_sigma=0.3),
+    "get_most_travelled_destinations": _profile(400),
+}
+NO_PROFILE = _profile(0, latency_sigma=0, error_rate=0, timeout_rate=0)
+
+# (carrier, hub) pairs; connections are built through the hubs
+CARRIERS = [
+    ("EK", "DXB"),
+    ("QR", "DOH"),
+    ("TK", "IST"),
+    ("LH", "FRA"),
+    ("KL", "AMS"),
+    ("AF", "CDG"),
+    ("BA", "LHR"),
+    ("ET", "ADD"),
+    ("SA", "JNB"),
+    ("KQ", "NBO"),
+    ("SQ", "SIN"),
+    ("AA", "JFK"),
+]
+AIRCRAFT = ["320", "321", "738", "789", "788", "77W", "359", "388"]
+CABINS = {"ECONOMY": 1.0, "PREMIUM_ECONOMY": 1.6, "BUSINESS": 3.5, "FIRST": 6.0}
+BOOKING_CLASSES = {
+    "ECONOMY": "Y",
+    "PREMIUM_ECONOMY": "W",
+    "BUSINESS": "J",
+    "FIRST": "F",
+}
+TRAVELER_FARES = {"ADULT": 1.0, "CHILD": 0.75, "HELD_INFANT": 0.1}
+# Offers with 0, 1 and 2 stops
+STOP_WEIGHTS = [0.25, 0.55, 0.2]
+
+
+def load_profiles(overrides: str | None = None) -> dict[str, OperationProfile]:
+    """
+    Merge per-operation overrides into DEFAULT_PROFILES.
+
+    Args:
+        overrides (str | None): JSON object mapping operation names to partial
+            OperationProfile dicts; defaults to SYNTHETIC_PROFILES.
+    Returns:
+        dict[str, OperationProfile]: A profile for every operation.
+    """
+    if overrides is None:
+        overrides = os.getenv("SYNTHETIC_PROFILES", "")
+    profiles = {name: dict(profile) for name, profile in DEFAULT_PROFILES.items()}
+    for name, override in (json.loads(overrides) if overrides else {}).items():
+        profiles[name] = _profile(**{**profiles.get(name, NO_PROFILE), **override})
+    return profiles
+
+
+def _duration(minutes: int) -> str:
+    return f"PT{minutes // 60}H{minutes % 60}M"
+
+
+@lru_cache(maxsize=4096)
+def _leg_minutes(origin: str, destination: str) -> int:
+    """Block time between two airports; fixed per pair, the same both ways."""
+    pair = "".join(sorted((origin, destination)))
+    return 60 + random.Random(pair).randrange(0, 660, 5)
+
+
+def search_legs(params: dict) -> list[tuple[str, str, str]]:
+    """
+    Extract (origin, destination, date) legs from GET or POST search params.
+
+    Args:
+        params (dict): A GET query or POST flight-offers search body.
+    Returns:
+        list[tuple[str, str, str]]: One entry per requested itinerary.
+    """
+    if "originDestinations" in params:
+        return [
+            (
+                od["originLocationCode"],
+                od["destinationLocationCode"],
+                od["departureDateTimeRange"]["date"],
+            )
+            for od in params["originDestinations"]
+        ]
+    origin = params["originLocationCode"]
+    destination = params["destinationLocationCode"]
+    departure = params.get("departureDate") or date.today().isoformat()
+    legs = [(origin, destination, departure)]
+    if params.get("returnDate"):
+        legs.append((destination, origin, params["returnDate"]))
+    return legs
+
+
+def search_travelers(params: dict) -> list[str]:
+    """Traveler types for GET or POST search params, one per passenger."""
+    if "travelers" in params:
+        return [traveler["travelerType"] for traveler in params["travelers"]]
+    return (
+        ["ADULT"] * int(params.get("adults") or 1)
+        + ["CHILD"] * int(params.get("children") or 0)
+        + ["HELD_INFANT"] * int(params.get("infants") or 0)
+    )
+
+
+def search_limit(params: dict) -> int:
+    """The most offers a search asks for; Amadeus caps it at 250."""
+    if "searchCriteria" in params:
+        return int(params["searchCriteria"].get("maxFlightOffers") or 250)
+    return int(params.get("max") or 250)
+
+
+def route_offer_count(legs: list[tuple[str, str, str]], base: int) -> int:
+    """Offers a route supports: ``base`` scaled by 0.4-1.6 per route."""
+    route = "".join(f"{origin}{destination}" for origin, destination, _ in legs)
+    return max(1, round(base * random.Random(route).uniform(0.4, 1.6)))
+
+
+def generate_offers(
+    params: dict, seed: int = SYNTHETIC_SEED, base: int = SYNTHETIC_OFFERS_PER_ROUTE
+) -> list[dict]:
+    """
+    Generate the flight offers for a search.
+
+    Args:
+        params (dict): A GET query or POST flight-offers search body.
+        seed (int): Generator seed; the same seed and params give the same offers.
+        base (int): Average number of offers generated per route.
+    Returns:
+        list[dict]: Flight offers in the Amadeus shape, cheapest first.
+    """
+    legs = search_legs(params)
+    travelers = search_travelers(params)
+    cabin = params.get("travelClass") or "ECONOMY"
+    currency = params.get("currencyCode") or "USD"
+    seats_needed = sum(1 for kind in travelers if kind != "HELD_INFANT")
+    non_stop = str(params.get("nonStop")).lower() == "true"
+    # Seeded by what the flights depend on, not by the travelers: larger
+    # parties see the same flights, minus those without enough seats
+    rng = random.Random(f"{seed}:{stable_json([legs, cabin, currency, non_stop])}")
+
+    offers = []
+    for _ in range(route_offer_count(legs, base)):
+        seats = rng.randint(1, 9)
+        itineraries = [
+            _itinerary(rng, origin, destination, departure, non_stop)
+            for origin, destination, departure in legs
+        ]
+        offer = _offer(rng, itineraries, travelers, cabin, currency, seats=seats)
+        if seats >= seats_needed:
+            offers.append(offer)
+
+    offers.sort(key=lambda offer: float(offer["price"]["grandTotal"]))
+    offers = offers[: search_limit(params)]
+    for number, offer in enumerate(offers, start=1):
+        offer["id"] = str(number)
+    return offers
+
+
+def _itinerary(
+    rng: random.Random, origin: str, destination: str, departure: str, non_stop: bool
+) -> dict:
+    stops = 0 if non_stop else rng.choices(range(3), STOP_WEIGHTS)[0]
+    hubs = [hub for _, hub in CARRIERS if hub not in (origin, destination)]
+    airports = [origin, *rng.sample(hubs, stops), destination]
+
+    at = datetime.fromisoformat(departure) + timedelta(
+        minutes=rng.randrange(0, 1440, 5)
+    )
+    start = at
+    segments = []
+    for leg_origin, leg_destination in zip(airports, airports[1:]):
+        if segments:
+            at += timedelta(minutes=rng.randrange(60, 360, 5))
+        minutes = _leg_minutes(leg_origin, leg_destination)
+        carrier = rng.choice(CARRIERS)[0]
+        arrival = at + timedelta(minutes=minutes)
+        segments.append(
+            {
+                "departure": {
+                    "iataCode": leg_origin,
+                    "terminal": str(rng.randint(1, 5)),
+                    "at": at.isoformat(),
+                },
+                "arrival": {
+                    "iataCode": leg_destination,
+                    "terminal": str(rng.randint(1, 5)),
+                    "at": arrival.isoformat(),
+                },
+                "carrierCode": carrier,
+                "number": str(rng.randint(1, 9999)),
+                "aircraft": {"code": rng.choice(AIRCRAFT)},
+                "operating": {"carrierCode": carrier},
+                "duration": _duration(minutes),
+                "id": "",
+                "numberOfStops": 0,
+                "blacklistedInEU": False,
+            }
+        )
+        at = arrival
+    return {
+        "duration": _duration(int((at - start).total_seconds()) // 60),
+        "segments": segments,
+    }
+
+
+def _offer(
+    rng: random.Random,
+    itineraries: list[dict],
+    travelers: list[str],
+    cabin: str,
+    currency: str,
+    seats: int,
+) -> dict:
+    segments = [s for itinerary in itineraries for s in itinerary["segments"]]
+    for number, segment in enumerate(segments, start=1):
+        segment["id"] = str(number)
+    flown = sum(
+        _leg_minutes(s["departure"]["iataCode"], s["arrival"]["iataCode"])
+        for s in segments
+    )
+    # Connections are cheaper per minute flown than non-stops
+    fare = (
+        flown
+        * rng.uniform(0.8, 1.6)
+        * CABINS.get(cabin, 1.0)
+        * (1 - 0.08 * (len(segments) - len(itineraries)))
+    )
+    ticketing = datetime.fromisoformat(segments[0]["departure"]["at"]).date()
+    fare_basis = (
+        f"{BOOKING_CLASSES.get(cabin, 'Y')}{rng.choice('LMNQSTV')}{rng.randint(1, 9)}"
+    )
+
+    traveler_pricings = []
+    total = base = 0.0
+    for number, kind in enumerate(travelers, start=1):
+        traveler_base = round(fare * TRAVELER_FARES.get(kind, 1.0), 2)
+        traveler_total = round(traveler_base * 1.12, 2)
+        base += traveler_base
+        total += traveler_total
+        traveler_pricings.append(
+            {
+                "travelerId": str(number),
+                "fareOption": "STANDARD",
+                "travelerType": kind,
+                "price": {
+                    "currency": currency,
+                    "total": f"{traveler_total:.2f}",
+                    "base": f"{traveler_base:.2f}",
+                },
+                "fareDetailsBySegment": [
+                    {
+                        "segmentId": segment["id"],
+                        "cabin": cabin,
+                        "fareBasis": fare_basis,
+                        "class": BOOKING_CLASSES.get(cabin, "Y"),
+                        "includedCheckedBags": {"weight": 23, "weightUnit": "KG"},
+                    }
+                    for segment in segments
+                ],
+            }
+        )
+
+    return {
+        "type": "flight-offer",
+        "id": "",
+        "source": "GDS",
+        "instantTicketingRequired": False,
+        "nonHomogeneous": False,
+        "oneWay": len(itineraries) == 1,
+        "isUpsellOffer": False,
+        "lastTicketingDate": (ticketing - timedelta(days=1)).isoformat(),
+        "lastTicketingDateTime": (ticketing - timedelta(days=1)).isoformat(),
+        "numberOfBookableSeats": seats,
+        "itineraries": itineraries,
+        "price": {
+            "currency": currency,
+            "total": f"{total:.2f}",
+            "base": f"{base:.2f}",
+            "fees": [
+                {"amount": "0.00", "type": "SUPPLIER"},
+                {"amount": "0.00", "type": "TICKETING"},
+            ],
+            "grandTotal": f"{total:.2f}",
+        },
+        "pricingOptions": {"fareType": ["PUBLISHED"], "includedCheckedBagsOnly": True},
+        "validatingAirlineCodes": [segments[0]["carrierCode"]],
+        "travelerPricings": traveler_pricings,
+    }
+
+
+class _ErrorResponse(_MockResponse):
+    """Just enough of an SDK response for amadeus errors to describe."""
+
+    def __init__(self, status_code: int, detail: str):
+        result = {"errors": [{"status": status_code, "detail": detail}]}
+        super().__init__(data=result, status_code=status_code)
+        self.parsed = True
+        self.result = result
+
+
+class SyntheticFlightService(MockFlightService):
+    """
+    Mock provider generating production-sized, seeded responses.
+
+    Implements the same interface as AmadeusFlightService; selected with
+    FLIGHT_SERVICE_PROVIDER=synthetic.
+    """
+
+    def __init__(
+        self,
+        seed: int = SYNTHETIC_SEED,
+        offers_per_route: int = SYNTHETIC_OFFERS_PER_ROUTE,
+        profiles: dict[str, OperationProfile] | None = None,
+        latency_scale: float = SYNTHETIC_LATENCY_SCALE,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__()
+        self.seed = seed
+        self.offers_per_route = offers_per_route
+        self.profiles = load_profiles() if profiles is None else profiles
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+        # Latency and failure draws; seeded so a single-threaded run repeats
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        logger.info(
+            f"SyntheticFlightService initialized — seed {seed}, "
+            f"{offers_per_route} offers per route"
+        )
+
+    def _simulate(self, operation: str) -> None:
+        """
+        Sleep for the operation's latency and fail at its configured rates.
+
+        Raises:
+            NetworkError: The call timed out
+            ServerError: The call failed upstream
+        """
+        profile = self.profiles.get(operation, NO_PROFILE)
+        with self._rng_lock:
+            draw = self._rng.random()
+            latency = (
+                profile["latency_ms"]
+                / 1000
+                * math.exp(profile["latency_sigma"] * self._rng.gauss(0, 1))
+            )
+
+        if draw < profile["timeout_rate"]:
+            self.sleep(profile["timeout_seconds"] * self.latency_scale)
+            raise NetworkError(_ErrorResponse(0, f"{operation} timed out"))
+        self.sleep(latency * self.latency_scale)
+        if draw < profile["timeout_rate"] + profile["error_rate"]:
+            raise ServerError(_ErrorResponse(500, f"{operation} failed"))
+
+    def search_flights(self, request_body: dict) -> dict:
+        """Return generated flight offers (POST variant)."""
+        self._simulate("search_flights")
+        return _MockResponse(
+            data=generate_offers(request_body, self.seed, self.offers_per_route)
+        )
+
+    def search_flights_get(self, request_body: dict) -> dict:
+        """Return generated flight offers (GET variant)."""
+        self._simulate("search_flights_get")
+        return generate_offers(request_body, self.seed, self.offers_per_route)
+
+    def confirm_price(self, request_body: dict) -> dict:
+        """Confirm the requested offer at its quoted price."""
+        self._simulate("confirm_price")
+        if "itineraries" not in request_body:
+            return super().confirm_price(request_body)
+        return _MockResponse(
+            data={"type": "flight-offers-pricing", "flightOffers": [request_body]}
+        )
+
+    def create_flight_order(self, request_body: dict) -> dict:
+        self._simulate("create_flight_order")
+        return super().create_flight_order(request_body)
+
+    def view_seat_map_get(self, flightorderId: str) -> dict:
+        self._simulate("view_seat_map_get")
+        return super().view_seat_map_get(flightorderId)
+
+    def view_seat_map_post(self, flight_offer: dict) -> dict:
+        self._simulate("view_seat_map_post")
+        return super().view_seat_map_post(flight_offer)
+
+    def get_flight_order(self, flight_orderId: str) -> dict:
+        self._simulate("get_flight_order")
+        return super().get_flight_order(flight_orderId)
+
+    def cancel_flight_order(self, flight_orderId: str) -> dict:
+        self._simulate("cancel_flight_order")
+        return super().cancel_flight_order(flight_orderId)
+
+    def airport_city_search(self, request_body: dict) -> dict:
+        self._simulate("airport_city_search")
+        return super().airport_city_search(request_body)
+
+    def get_most_travelled_destinations(
+        self, origin_city_code: str, period: str
+    ) -> list[dict]:
+        self._simulate("get_most_travelled_destinations")
+        return super().get_most_travelled_destinations(origin_city_code, period)
@@ -0,0 +1,209 @@
+"""
+Shared OAuth access tokens for upstream providers.
+
+A TokenManager keeps one provider token per worker and shares it with every
+other worker through Redis, so a fleet fetches roughly one token per expiry
+period instead of one per request (or per worker):
+- a cached token is used until shortly before it expires
+- once it is within ``refresh_before_seconds`` of expiry, callers keep using
+  it while one background task refreshes it
+- only an expired (or missing) token makes callers wait for a refresh
+- concurrent refreshes share one task within a worker; across workers a
+  Redis lease elects one refresher and the others wait for it to publish
+  the new token to the cache
+
+Fetchers return the standard OAuth2 token response fields (see
+TokenResponse); providers with a different response shape adapt it.
+
+Pesapal uses it. Amadeus does not: its SDK client fetches and refreshes its
+own token for every request it sends.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, TypedDict
+
+from prometheus_client import Counter
+
+from backend.external_services.cache import RedisCache, redis_cache
+from backend.external_services.single_flight import LEASE_KEY_PREFIX
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+from backend.utils.log_manager import get_app_logger
+
+logger = get_app_logger(__name__)
+
+TOKEN_REFRESH_BEFORE_SECONDS = float(os.getenv("TOKEN_REFRESH_BEFORE_SECONDS", 60))
+TOKEN_LEASE_SECONDS = float(os.getenv("TOKEN_LEASE_SECONDS", 10))
+TOKEN_WAIT_SECONDS = float(os.getenv("TOKEN_WAIT_SECONDS", 10))
+TOKEN_POLL_SECONDS = 0.05
+
+token_fetches = Counter(
+    "access_token_fetches_total",
+    "Access tokens requested from a provider's auth endpoint",
+    ["provider"],
+)
+token_refresh_failures = Counter(
+    "access_token_refresh_failures_total",
+    "Access token refreshes that failed",
+    ["provider"],
+)
+
+
+class TokenResponse(TypedDict):
+    access_token: str
+    # Seconds the token stays valid from the time it was issued
+    expires_in: float
+
+
+class AccessToken(TypedDict):
+    access_token: str
+    # Wall-clock time the token expires, shared by every worker
+    expires_at: float
+
+
+class TokenManager:
+    """
+    Caches and proactively refreshes one provider's access token.
+
+    Example:
+        token_manager = TokenManager("pesapal", fetch_pesapal_token)
+        token = await token_manager.get_token()
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        fetch: Callable[[], Awaitable[TokenResponse]],
+        cache: RedisCache = redis_cache,
+        client_id: str | None = None,
+        refresh_before_seconds: float = TOKEN_REFRESH_BEFORE_SECONDS,
+        lease_seconds: float = TOKEN_LEASE_SECONDS,
+        wait_seconds: float = TOKEN_WAIT_SECONDS,
+        poll_seconds: float = TOKEN_POLL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.provider = provider
+        self.fetch = fetch
+        self.cache = cache
+        self.refresh_before_seconds = refresh_before_seconds
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        # Wall clock, so expiry agrees across workers sharing Redis
+        self.clock = clock
+        # Separate credentials for the same provider get separate tokens
+        self.key = build_cache_key(
+            CacheNamespaces.ACCESS_TOKENS,
+            {"provider": provider, "client_id": client_id or ""},
+        )
+        self._token: AccessToken | None = None
+        self._refreshing: asyncio.Task | None = None
+
+    async def get_token(self) -> str:
+        """
+        Return a valid access token, fetching one only when none is cached.
+
+        Returns:
+            The access token string
+
+        Raises:
+            Whatever ``fetch`` raises when no valid token is available.
+        """
+        token = self._token
+        if token is not None and not self._expired(token):
+            if self._due(token):
+                self._start_refresh()
+            return token["access_token"]
+
+        task = self._start_refresh()
+        # Shielded so one cancelled caller does not cancel the shared refresh
+        return (await asyncio.shield(task))["access_token"]
+
+    def invalidate(self) -> None:
+        """Drop this worker's token, e.g. after the provider rejected it."""
+        self._token = None
+
+    def _expired(self, token: AccessToken) -> bool:
+        return self.clock() >= token["expires_at"]
+
+    def _due(self, token: AccessToken) -> bool:
+        return self.clock() >= token["expires_at"] - self.refresh_before_seconds
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh(self._token))
+            self._refreshing.add_done_callback(self._forget)
+        return self._refreshing
+
+    def _forget(self, task: asyncio.Task) -> None:
+        if self._refreshing is task:
+            self._refreshing = None
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            token_refresh_failures.labels(provider=self.provider).inc()
+            logger.warning(f"Refreshing {self.provider} access token failed: {error}")
+
+    async def _refresh(self, current: AccessToken | None) -> AccessToken:
+        shared = await self._read_shared()
+        if shared is not None and not self._due(shared):
+            # Another worker already refreshed it
+            self._token = shared
+            return shared
+
+        lease_key = f"{LEASE_KEY_PREFIX}:{self.key}"
+        lease = uuid.uuid4().hex
+        if await self.cache.acquire_lease(lease_key, lease, self.lease_seconds):
+            try:
+                return await self._fetch_and_share()
+            finally:
+                await self.cache.release_lease(lease_key, lease)
+
+        shared = await self._wait_for_leader(lease_key)
+        if shared is not None:
+            self._token = shared
+            return shared
+        if current is not None and not self._expired(current):
+            # Keep the still-valid token; the next caller will try again
+            return current
+
+        logger.info(f"{self.provider} token refresh leader published no token")
+        return await self._fetch_and_share()
+
+    async def _fetch_and_share(self) -> AccessToken:
+        token_fetches.labels(provider=self.provider).inc()
+        issued_at = self.clock()
+        response = await self.fetch()
+        token = AccessToken(
+            access_token=response["access_token"],
+            expires_at=issued_at + float(response["expires_in"]),
+        )
+        self._token = token
+        ttl_seconds = int(token["expires_at"] - self.clock())
+        if ttl_seconds > 0:
+            await self.cache.set(self.key, token, ttl_seconds)
+        return token
+
+    async def _read_shared(self) -> AccessToken | None:
+        token = await self.cache.get(self.key)
+        if not token or self._expired(token):
+            return None
+        return token
+
+    async def _wait_for_leader(self, lease_key: str) -> AccessToken | None:
+        """Poll the cache until another worker publishes a fresh token."""
+        deadline = time.monotonic() + self.wait_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_seconds)
+            shared = await self._read_shared()
+            if shared is not None and not self._due(shared):
+                return shared
+            if not await self.cache.lease_exists(lease_key):
+                # Leader finished (or died) without a usable token
+                shared = await self._read_shared()
+                return None if shared is None or self._due(shared) else shared
+        return None
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routers import users, oauth
-from backend.crud.database import init_db
+from backend.crud.database import engine, init_db
 from backend.routers import flights, payments, admin, tickets, notifications, health
 from dotenv import load_dotenv
 import os
@@ -9,6 +9,10 @@ from guard.middleware import SecurityMiddleware
 from guard.models import SecurityConfig
 from contextlib import asynccontextmanager
 from backend.utils.kafka import kafka_producer
+from backend.external_services.flight import amadeus_flight_service
+from backend.external_services.cache import TieredCache, redis_cache
+from backend.external_services.location_index import load_location_index
+from backend.external_services.cache_warmer import CACHE_WARMER_ENABLED, cache_warmer
 from backend.utils.dependencies import notification_consumer
 from backend.consumers.user_notifications import process_user_notifications
 from backend.consumers.booking_notifications import process_booking_notifications
@@ -16,6 +20,7 @@ from backend.consumers.payment_notifications import process_payment_notification
 from backend.consumers.ticket_notifications import process_ticket_notifications
 from backend.utils.constants import KafkaTopics
 from prometheus_fastapi_instrumentator import Instrumentator
+from sqlmodel import Session
 import asyncio
 
 load_dotenv()
@@ -26,6 +31,8 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
 
+    load_location_index()
+
     kafka_producer.start()
 
     notification_consumer.register_handler(
@@ -45,11 +52,24 @@ async def lifespan(app: FastAPI):
 
     notification_consumer.start(loop)
 
+    if isinstance(redis_cache, TieredCache):
+        await redis_cache.start_invalidation_listener()
+
+    if CACHE_WARMER_ENABLED:
+        cache_warmer.start(lambda: Session(engine))
+
     yield
     # Shutdown
 
+    await cache_warmer.stop()
+
+    if isinstance(redis_cache, TieredCache):
+        await redis_cache.stop_invalidation_listener()
+    await redis_cache.close()
+
     notification_consumer.stop()
     kafka_producer.stop()
+    amadeus_flight_service.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
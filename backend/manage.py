@@ -1,3 +1,4 @@
+import asyncio
 import typer
 import sys
 from pathlib import Path
@@ -8,6 +9,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlmodel import Session
 from pydantic import EmailStr, ValidationError
+from backend.crud.booking_stats import rebuild_booking_stats
+from backend.crud.bookings import EXPORT_COLUMNS, BookingFilters, export_bookings
 from backend.crud.database import engine
 from backend.crud.users import get_user_by_email, create_user
 from backend.crud.permissions import GroupCRUD, PermissionCRUD, UserPermissionCRUD
@@ -18,6 +21,9 @@ from backend.models.constants import (
     ADMIN_PERMISSIONS,
     MIN_PASSWORD_LENGTH,
 )
+from backend.utils.booking_export import encode_rows
+from backend.utils.constants import ExportFormats
+from datetime import datetime
 from getpass import getpass
 
 app = typer.Typer()
@@ -179,5 +185,103 @@ def createadminuser():
         typer.echo(f"User has been assigned to the '{ADMIN_GROUP_NAME}' group.")
 
 
+@app.command(name="warm-cache")
+def warmcache():
+    """Warm flight search and location caches for popular routes once."""
+    # Imported here so the user commands do not need the flight provider
+    from backend.external_services.cache import redis_cache
+    from backend.external_services.cache_warmer import cache_warmer
+    from backend.external_services.flight import amadeus_flight_service
+
+    async def run_once():
+        try:
+            with Session(engine) as session:
+                return await cache_warmer.run_once(session)
+        finally:
+            await redis_cache.close()
+            amadeus_flight_service.shutdown()
+
+    report = asyncio.run(run_once())
+    typer.echo(
+        f"Warmed {report['warmed']} of {report['searches']} searches for "
+        f"{report['routes']} routes ({report['fresh']} already fresh, "
+        f"{report['failed']} failed, {report['skipped']} skipped), "
+        f"{report['locations_warmed']} locations"
+    )
+    typer.echo(f"Coverage: {report['coverage']:.0%}")
+    if report["quota_exhausted"]:
+        typer.echo("Stopped early: the warming quota share was used up")
+
+
+@app.command(name="rebuild-booking-stats")
+def rebuildbookingstats():
+    """Recompute the booking stats rollup from the booking table."""
+    with Session(engine) as session:
+        rows = rebuild_booking_stats(session)
+    typer.echo(f"Rebuilt booking stats: {rows} rollup rows")
+
+
+@app.command(name="export-bookings")
+def exportbookings(
+    export_format: str = typer.Option(
+        ExportFormats.CSV, "--format", help="csv or ndjson"
+    ),
+    columns: str = typer.Option(
+        None, help="Comma-separated columns to export, in order (default: all)"
+    ),
+    status: list[str] = typer.Option(
+        None, help="Only bookings with this status (repeatable)"
+    ),
+    created_from: datetime = typer.Option(
+        None, help="Only bookings created at or after this time"
+    ),
+    created_to: datetime = typer.Option(
+        None, help="Only bookings created before this time"
+    ),
+    pnr: str = typer.Option(None, help="Only the booking with this PNR"),
+    flight_order_id: str = typer.Option(
+        None, help="Only the booking with this flight order ID"
+    ),
+    email: str = typer.Option(
+        None, help="Only bookings by users whose email starts with this"
+    ),
+    output: Path = typer.Option(None, help="File to write (default: stdout)"),
+):
+    """Stream bookings as CSV or NDJSON, newest first."""
+    if export_format not in (ExportFormats.CSV, ExportFormats.NDJSON):
+        typer.echo(f"Unknown format: {export_format}", err=True)
+        raise typer.Exit(code=1)
+    names = (
+        [name.strip() for name in columns.split(",")]
+        if columns
+        else list(EXPORT_COLUMNS)
+    )
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown:
+        typer.echo(f"Unknown export columns: {', '.join(unknown)}", err=True)
+        raise typer.Exit(code=1)
+    filters = BookingFilters(
+        statuses=status or None,
+        created_from=created_from,
+        created_to=created_to,
+        pnr=pnr,
+        flight_order_id=flight_order_id,
+        email_prefix=email,
+    )
+
+    # The engine echoes SQL to stdout, which would end up in the export
+    engine.echo = False
+    stream = open(output, "w", newline="") if output else sys.stdout
+    try:
+        with Session(engine) as session:
+            for chunk in encode_rows(
+                export_format, names, export_bookings(session, names, filters)
+            ):
+                stream.write(chunk)
+    finally:
+        if output:
+            stream.close()
+
+
 if __name__ == "__main__":
     app()
@@ -1,5 +1,6 @@
 from .users import UserInDB
 from .bookings import Booking, BookingStatus
+from .booking_stats import BookingStatsRollup, StatsPeriod
 from .permissions import Permission, Group, GroupPermission, UserGroup, UserPermission
 from .notifications import Notification, NotificationType
 
@@ -7,6 +8,8 @@ __all__ = [
     "UserInDB",
     "Booking",
     "BookingStatus",
+    "BookingStatsRollup",
+    "StatsPeriod",
     "Permission",
     "Group",
     "GroupPermission",
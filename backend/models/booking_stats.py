@@ -0,0 +1,25 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, DateTime
+from datetime import datetime
+
+
+class StatsPeriod:
+    # Values are date_trunc() field names
+    HOUR = "hour"
+    DAY = "day"
+
+
+class BookingStatsRollup(SQLModel, table=True):
+    """Booking counters per UTC hour or day and status (see crud.booking_stats)"""
+
+    period: str = Field(primary_key=True)
+    # Start of the UTC hour or day the bookings were created in
+    bucket_start: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), primary_key=True)
+    )
+    status: str = Field(primary_key=True)
+    bookings: int = Field(default=0, nullable=False)
+    revenue: float = Field(default=0.0, nullable=False)
+    # Users whose first booking was created in this bucket; counted under the
+    # status that booking was created with and never moved
+    new_users: int = Field(default=0, nullable=False)
@@ -24,7 +24,7 @@ class Booking(SQLModel, table=True):
         default_factory=uuid.uuid4, primary_key=True, index=True, nullable=False
     )
     user_id: uuid.UUID = Field(foreign_key="userindb.id", nullable=False)
-    flight_order_id: str = Field(nullable=False)
+    flight_order_id: str = Field(nullable=False, index=True)
 
     status: str = Field(default=BookingStatus.CONFIRMED, nullable=False)
     created_at: datetime = Field(
@@ -40,7 +40,23 @@ class Booking(SQLModel, table=True):
     amadeus_order_response: dict | None = Field(default=None, sa_column=Column(JSON))
     ticket_url: str | None = Field(default=None, nullable=True)
 
+    # Summary of amadeus_order_response, written alongside it (see
+    # crud.bookings.order_summary) so list queries can skip the JSON
+    pnr: str | None = Field(default=None, nullable=True, index=True)
+    origin: str | None = Field(default=None, nullable=True)
+    destination: str | None = Field(default=None, nullable=True)
+    # Local time at the origin airport, as the order gives it
+    departure_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=False), nullable=True)
+    )
+    carrier_code: str | None = Field(default=None, nullable=True)
+    flight_number: str | None = Field(default=None, nullable=True)
+    passenger_count: int = Field(default=0, nullable=False)
+
     __table_args__ = (
         Index("ix_booking_cursor", "created_at", "id"),
         Index("ix_booking_user_cursor", "user_id", "created_at", "id"),
+        Index("ix_booking_status_cursor", "status", "created_at", "id"),
+        Index("ix_booking_route", "origin", "destination"),
+        Index("ix_booking_departure_at", "departure_at"),
     )
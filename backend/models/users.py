@@ -1,7 +1,7 @@
 from pydantic import EmailStr
 import uuid
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index, column, func
 from typing import TYPE_CHECKING
 from datetime import datetime
 
@@ -31,3 +31,12 @@ class UserInDB(SQLModel, table=True):
         back_populates="users", link_model=UserPermission
     )
     notifications: list["Notification"] = Relationship(back_populates="user")
+
+    __table_args__ = (
+        # Case-insensitive email prefix search (LIKE 'abc%') in admin filters
+        Index(
+            "ix_userindb_email_prefix",
+            func.lower(column("email")).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+    )
@@ -1,18 +1,32 @@
+from datetime import datetime
+from typing import Iterator, Literal
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
-from datetime import datetime, timedelta, timezone
-from backend.crud.database import get_session
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from backend.crud.database import engine, get_session
+from backend.crud import booking_stats
 from backend.crud.bookings import (
+    EXPORT_COLUMNS,
+    BookingFilters,
+    export_bookings as crud_export_bookings,
     get_all_bookings_cursor,
+    get_booking_with_user,
+    get_stored_flight_orders,
+    update_stored_flight_orders,
 )
+from backend.external_services.flight import amadeus_flight_service
 from backend.utils.pagination import MAX_PAGINATION_LIMIT
-from backend.models.bookings import Booking, BookingStatus
 from backend.models.constants import ADMIN_GROUP_NAME
 from backend.schemas.admin import (
     BookingStatsResponse,
     AdminBookingResponse,
+    AdminBookingSummaryResponse,
     CursorPaginatedAdminBookingResponse,
+    FlightOrderBatchRequest,
+    FlightOrderBatchResponse,
 )
+from backend.utils.booking_export import MEDIA_TYPES, encode_rows
+from backend.utils.constants import ExportFormats
 from backend.utils.dependencies import GroupDependency
 from backend.utils.log_manager import get_app_logger
 
@@ -30,11 +44,12 @@ async def get_booking_stats(
     session: Session = Depends(get_session),
 ):
     """
-    Get booking statistics for admin dashboard.
+    Get booking statistics for admin dashboard, read from the booking stats
+    rollup rather than the booking table.
 
     Returns:
         - Total bookings count
-        - Total revenue (sum of all booking amounts)
+        - Total revenue (sum of paid booking amounts)
         - Active users count (users who have made bookings)
         - Bookings today count
         - Bookings this week count
@@ -42,39 +57,7 @@ async def get_booking_stats(
     logger.info("Calculating booking statistics")
 
     try:
-        bookings = session.exec(select(Booking)).all()
-
-        total_bookings = len(bookings)
-
-        total_revenue = sum(
-            booking.total_price 
-            for booking in bookings 
-            if booking.status == BookingStatus.PAID and booking.status != BookingStatus.CANCELLED
-        )
-
-        # Calculate active users (unique users who have made bookings)
-        unique_user_ids = set(booking.user_id for booking in bookings)
-        active_users = len(unique_user_ids)
-
-        now = datetime.now(timezone.utc)
-        today_start = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
-        bookings_today = sum(
-            1 for booking in bookings if booking.created_at >= today_start
-        )
-
-        # Calculate bookings this week (last 7 days)
-        one_week_ago = now - timedelta(days=7)
-        bookings_this_week = sum(
-            1 for booking in bookings if booking.created_at >= one_week_ago
-        )
-
-        stats = BookingStatsResponse(
-            total_bookings=total_bookings,
-            total_revenue=total_revenue,
-            active_users=active_users,
-            bookings_today=bookings_today,
-            bookings_this_week=bookings_this_week,
-        )
+        stats = BookingStatsResponse(**booking_stats.get_booking_stats(session))
 
         logger.info(f"Successfully calculated booking statistics: {stats.model_dump()}")
         return stats
@@ -87,6 +70,52 @@ async def get_booking_stats(
         )
 
 
+def booking_filters(
+    status: list[str] | None = Query(
+        None, description="Only bookings with one of these statuses (repeatable)"
+    ),
+    created_from: datetime | None = Query(
+        None, description="Only bookings created at or after this time"
+    ),
+    created_to: datetime | None = Query(
+        None, description="Only bookings created before this time"
+    ),
+    pnr: str | None = Query(None, description="Only the booking with this PNR"),
+    flight_order_id: str | None = Query(
+        None, description="Only the booking with this flight order ID"
+    ),
+    email: str | None = Query(
+        None,
+        min_length=1,
+        description="Only bookings by users whose email starts with this "
+        "(case-insensitive)",
+    ),
+) -> BookingFilters:
+    """
+    Admin booking filters from the query string, shared by the list and export
+    endpoints
+
+    Args:
+        status: Statuses to include
+        created_from: Earliest creation time to include
+        created_to: Creation time to stop before
+        pnr: PNR to match exactly
+        flight_order_id: Flight order ID to match exactly
+        email: User email prefix
+
+    Returns:
+        The filters, for apply_booking_filters
+    """
+    return BookingFilters(
+        statuses=status,
+        created_from=created_from,
+        created_to=created_to,
+        pnr=pnr,
+        flight_order_id=flight_order_id,
+        email_prefix=email,
+    )
+
+
 @router.get(
     "/bookings",
     response_model=CursorPaginatedAdminBookingResponse,
@@ -104,31 +133,40 @@ async def get_all_bookings(
         False,
         description="Include total_count in response (may be slower)",
     ),
+    filters: BookingFilters = Depends(booking_filters),
     session: Session = Depends(get_session),
 ):
     """
     Get cursor-paginated bookings with user information for admin dashboard.
 
+    Filters combine; pass the same filters with each page's cursor.
+
     Args:
         cursor: Cursor for pagination (None for first page)
         limit: Maximum number of records to return (default: 20, max: 100)
+        filters: Booking filters from the query string (see booking_filters)
 
     Returns:
         Cursor-paginated list of bookings with associated user data
     """
     logger.info(
-        f"Fetching bookings for admin dashboard with cursor={cursor}, limit={limit}"
+        f"Fetching bookings for admin dashboard with cursor={cursor}, limit={limit}, "
+        f"filters={filters}"
     )
 
     try:
         bookings, next_cursor, has_more, total_count = get_all_bookings_cursor(
-            session, cursor=cursor, limit=limit, include_count=include_count
+            session,
+            cursor=cursor,
+            limit=limit,
+            include_count=include_count,
+            filters=filters,
         )
 
         items = []
         for booking in bookings:
             items.append(
-                AdminBookingResponse(
+                AdminBookingSummaryResponse(
                     id=booking.id,
                     flight_order_id=booking.flight_order_id,
                     status=booking.status,
@@ -139,7 +177,13 @@ async def get_all_bookings(
                         "id": booking.user.id,
                         "email": booking.user.email,
                     },
-                    amadeus_order_response=booking.amadeus_order_response,
+                    pnr=booking.pnr,
+                    origin=booking.origin,
+                    destination=booking.destination,
+                    departure_at=booking.departure_at,
+                    carrier_code=booking.carrier_code,
+                    flight_number=booking.flight_number,
+                    passenger_count=booking.passenger_count,
                 )
             )
 
@@ -164,6 +208,80 @@ async def get_all_bookings(
         )
 
 
+def _exported_rows(names: list[str], filters: BookingFilters) -> Iterator[tuple]:
+    """
+    Export rows read through a session of their own.
+
+    FastAPI closes yield dependencies such as get_session before a
+    StreamingResponse body is sent, so the body cannot use the request's
+    session. A sync generator, so Starlette reads the database from its
+    threadpool.
+    """
+    session = Session(engine)
+    try:
+        yield from crud_export_bookings(session, names, filters)
+    finally:
+        session.close()
+
+
+@router.get(
+    "/bookings/export",
+    dependencies=[Depends(GroupDependency(ADMIN_GROUP_NAME))],
+)
+async def export_bookings(
+    export_format: Literal["csv", "ndjson"] = Query(
+        ExportFormats.CSV, alias="format", description="csv or ndjson"
+    ),
+    columns: str | None = Query(
+        None,
+        description="Comma-separated columns to export, in order (default: all)",
+    ),
+    filters: BookingFilters = Depends(booking_filters),
+):
+    """
+    Stream every booking matching the filters as a CSV or NDJSON download,
+    newest first.
+
+    Rows are read in short keyset-batched transactions from a server-side
+    cursor and written out as they arrive, so exports of any size take
+    constant memory and do not hold a transaction open for their whole run.
+
+    Args:
+        export_format: ExportFormats.CSV (with a header row) or
+            ExportFormats.NDJSON
+        columns: Names from EXPORT_COLUMNS (default: all of them)
+        filters: Booking filters from the query string (see booking_filters)
+
+    Returns:
+        Streaming attachment response
+
+    Raises:
+        HTTPException: 400 if a column is unknown
+    """
+    names = (
+        [name.strip() for name in columns.split(",")]
+        if columns
+        else list(EXPORT_COLUMNS)
+    )
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown export columns: {', '.join(unknown)}",
+        )
+    logger.info(
+        f"Exporting bookings as {export_format} with columns={names}, filters={filters}"
+    )
+
+    return StreamingResponse(
+        encode_rows(export_format, names, _exported_rows(names, filters)),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="bookings.{export_format}"'
+        },
+    )
+
+
 @router.get(
     "/bookings/{booking_id}",
     response_model=AdminBookingResponse,
@@ -188,8 +306,7 @@ async def get_booking(
     logger.info(f"Fetching booking {booking_id} for admin")
 
     try:
-        statement = select(Booking).where(Booking.id == booking_id)
-        booking = session.exec(statement).first()
+        booking = get_booking_with_user(session, booking_id)
 
         if not booking:
             logger.warning(f"Booking {booking_id} not found")
@@ -206,6 +323,13 @@ async def get_booking(
                 "id": booking.user.id,
                 "email": booking.user.email,
             },
+            pnr=booking.pnr,
+            origin=booking.origin,
+            destination=booking.destination,
+            departure_at=booking.departure_at,
+            carrier_code=booking.carrier_code,
+            flight_number=booking.flight_number,
+            passenger_count=booking.passenger_count,
             amadeus_order_response=booking.amadeus_order_response,
         )
 
@@ -219,3 +343,56 @@ async def get_booking(
         raise HTTPException(
             status_code=500, detail="An error occurred while fetching the booking"
         )
+
+
+@router.post(
+    "/bookings/flight-orders",
+    response_model=FlightOrderBatchResponse,
+    dependencies=[Depends(GroupDependency(ADMIN_GROUP_NAME))],
+)
+async def get_flight_orders_batch(
+    request: FlightOrderBatchRequest,
+    session: Session = Depends(get_session),
+):
+    """
+    Fetch many flight orders at once for admin review and reconciliation.
+
+    Orders with a stored Amadeus response are answered from the database
+    unless refresh is set; the rest are fetched concurrently. Orders that
+    fail are reported in errors without failing the batch.
+
+    Args:
+        request: Flight order IDs, and whether to refresh stored responses
+
+    Returns:
+        Orders and per-order errors keyed by flight order ID
+    """
+    logger.info(
+        f"Fetching {len(request.flight_order_ids)} flight orders (refresh={request.refresh})"
+    )
+
+    try:
+        stored = (
+            {}
+            if request.refresh
+            else get_stored_flight_orders(session, request.flight_order_ids)
+        )
+        batch = await amadeus_flight_service.get_flight_orders_batch(
+            request.flight_order_ids, stored=stored
+        )
+
+        updated = 0
+        if request.refresh:
+            updated = update_stored_flight_orders(session, batch["orders"])
+
+        logger.info(
+            f"Fetched {len(batch['orders'])} flight orders "
+            f"({len(batch['stored'])} stored, {len(batch['errors'])} failed, {updated} updated)"
+        )
+        return FlightOrderBatchResponse(**batch, updated=updated)
+
+    except Exception:
+        logger.exception("Error fetching flight orders for admin")
+        raise HTTPException(
+            status_code=500, detail="An error occurred while fetching flight orders"
+        )
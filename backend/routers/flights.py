@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
 
 from backend.external_services.flight import amadeus_flight_service
 from backend.schemas.flights import (
@@ -11,12 +12,52 @@ from backend.schemas.flight_search import (
     FlightSearchRequestPost,
 )
 from backend.schemas.flight_price_confirm import FlightOffer
+from backend.schemas.offer_results import (
+    OfferResultsPage,
+    OfferResultsSearchRequest,
+    OfferSliceParams,
+)
+from backend.schemas.price_calendar import (
+    PriceCalendarRequest,
+    PriceCalendarResponse,
+)
 from backend.schemas.flight_order import FlightOrderRequestBody
 from backend.utils.security import get_current_user
 from backend.models.users import UserInDB
 from amadeus.client.errors import ClientError
 from backend.external_services.cache import redis_cache
-from backend.utils.helpers import build_redis_key
+from backend.external_services.flight_search_cache import (
+    flight_search_cache,
+    search_response_payload,
+)
+from backend.external_services.single_flight import upstream_single_flight
+from backend.external_services.price_calendar import price_calendar
+from backend.external_services.pricing_cache import (
+    pricing_cache,
+    pricing_response_payload,
+)
+from backend.external_services.resilience import UpstreamUnavailableError
+from backend.external_services.seat_maps import (
+    SEAT_MAP_CACHE_TTL,
+    SeatMapFormat,
+    render_seat_maps,
+    seat_map_offer_key,
+    seat_map_order_key,
+)
+from backend.external_services.quota_scheduler import QuotaExceededError
+from backend.external_services.offer_results import (
+    handle_for,
+    offer_result_store,
+)
+from backend.external_services.location_index import (
+    location_index,
+    location_index_lookups,
+)
+from backend.utils.cache_keys import (
+    CACHE_TTL_POLICIES,
+    build_cache_key,
+    build_cache_tag,
+)
 from backend.schemas.locations import (
     AirportCitySearchRequest,
     AirportCitySearchResponse,
@@ -30,7 +71,10 @@ from backend.schemas.bookings import (
 )
 from backend.crud.database import get_session
 from backend.crud.bookings import (
+    create_booking,
     get_user_bookings_cursor,
+    order_summary,
+    update_booking_status,
 )
 from backend.utils.pagination import MAX_PAGINATION_LIMIT
 from backend.utils.log_manager import get_app_logger
@@ -38,7 +82,12 @@ from sqlmodel import Session, select
 from backend.utils.kafka import kafka_producer
 import uuid as uuid_module
 
-from backend.utils.constants import KafkaTopics, KafkaEventTypes
+from backend.utils.constants import (
+    KafkaTopics,
+    KafkaEventTypes,
+    CacheNamespaces,
+    CacheTags,
+)
 
 
 logger = get_app_logger(__name__)
@@ -56,15 +105,28 @@ async def search_flights(request: FlightSearchRequestPost):
     from the Amadeus API. The request is validated using Pydantic models.
     """
     try:
+        cached_response = await flight_search_cache.get(request)
+        if cached_response:
+            return cached_response
+
         request_body = request.model_dump()
 
-        # TO DO: Search in cache first (REDIS)
+        async def fetch_search() -> dict:
+            response = await amadeus_flight_service.search_flights(request_body)
+            return search_response_payload(response)
 
-        response = amadeus_flight_service.search_flights(request_body)
-        return response
+        return await upstream_single_flight.load(
+            flight_search_cache.key_for(request),
+            fetch_search,
+            operation="search_flights",
+            ttl_seconds=flight_search_cache.ttl_seconds,
+            cacheable=flight_search_cache.is_cacheable,
+        )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Flight search failed: {str(e)}")
 
@@ -74,23 +136,123 @@ async def search_flights2(request: Annotated[FlightSearchRequestGet, Query()]):
     try:
         request_body = request.model_dump(exclude_none=True)
 
-        key = build_redis_key(request_body)
-        flight_data = redis_cache.get(key)
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, request_body)
+        flight_data = await redis_cache.get(key)
         if flight_data:
             return flight_data
 
-        response = amadeus_flight_service.search_flights_get(request_body)
-        redis_cache.set(key, response)
+        return await upstream_single_flight.load(
+            key,
+            lambda: amadeus_flight_service.search_flights_get(request_body),
+            operation="search_flights_get",
+        )
+    except ClientError:
+        raise HTTPException(status_code=400, detail="Invalid request parameters")
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except Exception:
+        raise HTTPException(
+            status_code=500, detail="An error occurred while searching for flights"
+        )
 
-        return response
+
+@router.get("/shopping/flight-offers/results", response_model=OfferResultsPage)
+async def search_flight_results(
+    request: Annotated[OfferResultsSearchRequest, Query()],
+):
+    """
+    Run (or reuse) a GET flight-offers search and return one sorted, filtered page.
+
+    The full result is cached under a handle; pass it to
+    /shopping/flight-offers/results/{handle} to fetch other pages, sort orders
+    or filters without searching again.
+    """
+    try:
+        request_body = request.search_params()
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, request_body)
+
+        result_set = await offer_result_store.get(handle_for(key))
+        if result_set is None:
+            offers = await redis_cache.get(key)
+            if not offers:
+                offers = await upstream_single_flight.load(
+                    key,
+                    lambda: amadeus_flight_service.search_flights_get(request_body),
+                    operation="search_flights_get",
+                )
+            result_set = await offer_result_store.ingest(key, offers or [])
+
+        return result_set.slice(request.slice_params())
     except ClientError:
         raise HTTPException(status_code=400, detail="Invalid request parameters")
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception:
         raise HTTPException(
             status_code=500, detail="An error occurred while searching for flights"
         )
 
 
+@router.get("/shopping/flight-offers/results/{handle}", response_model=OfferResultsPage)
+async def slice_flight_results(
+    handle: str, params: Annotated[OfferSliceParams, Query()]
+):
+    """Sort, filter and page a cached search result by its handle."""
+    result_set = await offer_result_store.get(handle)
+    if result_set is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Search results not found or expired, run the search again",
+        )
+    return result_set.slice(params)
+
+
+@router.get("/shopping/price-calendar", response_model=PriceCalendarResponse)
+async def get_price_calendar(request: Annotated[PriceCalendarRequest, Query()]):
+    """
+    Cheapest price per departure date in a window around departureDate.
+
+    Per-date searches run concurrently (bounded) and reuse cached
+    GET /shopping/flight-offers results. Dates that time out or fail are
+    reported with their status and complete=false instead of failing the
+    whole calendar. Use /shopping/price-calendar/stream to receive dates
+    as they complete.
+    """
+    return await price_calendar.build(request)
+
+
+@router.get("/shopping/price-calendar/stream")
+async def stream_price_calendar(request: Annotated[PriceCalendarRequest, Query()]):
+    """
+    SSE variant of the price calendar.
+
+    The stream includes:
+    - A day event per date, in completion order
+    - A complete event with the full calendar in date order
+
+    Returns:
+        StreamingResponse with SSE content type
+    """
+
+    async def calendar_events():
+        days = []
+        async for day in price_calendar.iter_days(request):
+            days.append(day)
+            yield f"event: day\ndata: {day.model_dump_json()}\n\n"
+        calendar = price_calendar.response(request, days)
+        yield f"event: complete\ndata: {calendar.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        calendar_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.post("/shopping/flight-offers/pricing", response_model=FlightPricingResponse)
 async def confirm_price(request: FlightOffer):
     """
@@ -101,11 +263,17 @@ async def confirm_price(request: FlightOffer):
     """
     try:
         request_body = request.model_dump()
-        response = amadeus_flight_service.confirm_price(request_body)
-        return response
+
+        async def fetch_pricing() -> dict:
+            response = await amadeus_flight_service.confirm_price(request_body)
+            return pricing_response_payload(response)
+
+        return await pricing_cache.confirm(request_body, fetch_pricing)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Price confirmation failed: {str(e)}"
@@ -130,8 +298,15 @@ async def flight_order(
 
     try:
         request_body = request.model_dump(by_alias=True)
-
-        response = amadeus_flight_service.create_flight_order(request_body)
+        flight_offer = request_body["flight_offer"]
+        priced_offer = await pricing_cache.priced_offer(flight_offer)
+        if priced_offer is not None:
+            # Book the offer as the provider confirmed it, not the client's copy
+            request_body["flight_offer"] = priced_offer
+
+        response = await amadeus_flight_service.create_flight_order(request_body)
+        # Seats are taken, so the next pricing of this offer must go upstream
+        await pricing_cache.invalidate(flight_offer)
         flight_order_id = response.get("id")
         total_price = 0.0
         if response:
@@ -150,9 +325,9 @@ async def flight_order(
             flight_order_id=flight_order_id,
             amadeus_order_response=response,
             total_price=total_price,
+            **order_summary(response),
         )
-        session.add(booking)
-        session.commit()
+        create_booking(session, booking)
 
         booking_id = booking.id
         booking_flight_order_id = booking.flight_order_id
@@ -163,8 +338,9 @@ async def flight_order(
         pnr = response.get("associatedRecords", [{}])[0].get("reference", "N/A")
 
         # Invalidate user's booking cache list following a new booking
-        pattern = f"user_bookings:{str(current_user.id)}*"
-        redis_cache.delete_pattern(pattern)
+        await redis_cache.invalidate_tags(
+            build_cache_tag(CacheTags.USER_BOOKINGS, str(current_user.id))
+        )
 
         kafka_producer.send(
             KafkaTopics.BOOKING_EVENTS,
@@ -202,6 +378,10 @@ async def flight_order(
         error_detail = _parse_amadeus_client_error(e)
         raise HTTPException(status_code=400, detail=error_detail)
 
+    except UpstreamUnavailableError as e:
+        # Refused before reaching the provider, so no order was placed
+        raise upstream_unavailable(e)
+
     except Exception:
         logger.exception(
             f"Unexpected error during flight order creation for user_id: {current_user.id}"
@@ -216,9 +396,15 @@ async def flight_order(
 @router.get("/shopping/seatmaps")
 async def view_seat_map_get(
     flightorderId: Annotated[str, Query()],
+    format: Annotated[SeatMapFormat, Query()] = "full",
     current_user: UserInDB = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
+    """
+    Seat maps for a booked flight order, cached briefly per order.
+
+    Pass format=compact for grid-encoded decks (see seat_maps).
+    """
     try:
         amadeus_order_id = flightorderId
         # Check if flightorderId is a database UUID
@@ -247,15 +433,25 @@ async def view_seat_map_get(
         logger.info(
             f"Final Amadeus Flight Order ID for seatmap retrieval: {amadeus_order_id}"
         )
-        response = amadeus_flight_service.view_seat_map_get(
-            flightorderId=amadeus_order_id
-        )
-        return response
+        key = seat_map_order_key(amadeus_order_id)
+        seat_maps = await redis_cache.get(key)
+        if not seat_maps:
+            seat_maps = await upstream_single_flight.load(
+                key,
+                lambda: amadeus_flight_service.view_seat_map_get(
+                    flightorderId=amadeus_order_id
+                ),
+                operation="view_seat_map_get",
+                ttl_seconds=SEAT_MAP_CACHE_TTL,
+            )
+        return render_seat_maps(seat_maps, format)
     except ClientError as e:
         error_detail = _parse_amadeus_client_error(e)
         raise HTTPException(status_code=400, detail=error_detail)
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         logger.exception(f"Failed to retrieve seat map for ID: {flightorderId}")
         raise HTTPException(
@@ -264,14 +460,31 @@ async def view_seat_map_get(
 
 
 @router.post("/shopping/seatmaps")
-async def view_seat_map_post(request: FlightOffer):
+async def view_seat_map_post(
+    request: FlightOffer, format: Annotated[SeatMapFormat, Query()] = "full"
+):
+    """
+    Seat maps for a flight offer, cached briefly per offer fingerprint.
+
+    Pass format=compact for grid-encoded decks (see seat_maps).
+    """
     try:
         request_body = request.model_dump()
-        response = amadeus_flight_service.view_seat_map_post(request_body)
-        return response
+        key = seat_map_offer_key(request_body)
+        seat_maps = await redis_cache.get(key)
+        if not seat_maps:
+            seat_maps = await upstream_single_flight.load(
+                key,
+                lambda: amadeus_flight_service.view_seat_map_post(request_body),
+                operation="view_seat_map_post",
+                ttl_seconds=SEAT_MAP_CACHE_TTL,
+            )
+        return render_seat_maps(seat_maps, format)
     except ClientError as e:
         error_detail = _parse_amadeus_client_error(e)
         raise HTTPException(status_code=400, detail=error_detail)
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve seat map: {str(e)}"
@@ -429,7 +642,9 @@ async def cancel_flight_order(
         # 5. Cancel flight order in Amadeus (if flight_order_id exists)
         if booking.flight_order_id:
             try:
-                amadeus_flight_service.cancel_flight_order(booking.flight_order_id)
+                await amadeus_flight_service.cancel_flight_order(
+                    booking.flight_order_id
+                )
                 logger.info(
                     f"Successfully cancelled flight order in Amadeus: {booking.flight_order_id}"
                 )
@@ -439,14 +654,12 @@ async def cancel_flight_order(
                 # This handles cases where the order was already cancelled externally
 
         # 6. Update booking status in database
-        booking.status = BookingStatus.CANCELLED
-        session.add(booking)
-        session.commit()
-        session.refresh(booking)
+        booking = update_booking_status(session, booking.id, BookingStatus.CANCELLED)
 
         # 7. Invalidate user's booking cache
-        pattern = f"user_bookings:{str(current_user.id)}*"
-        redis_cache.delete_pattern(pattern)
+        await redis_cache.invalidate_tags(
+            build_cache_tag(CacheTags.USER_BOOKINGS, str(current_user.id))
+        )
 
         # 8. Send Kafka event for notification (user and admins)
         kafka_producer.send(
@@ -486,23 +699,52 @@ async def cancel_flight_order(
 @router.get("/reference-data/locations", response_model=list[AirportCitySearchResponse])
 async def airport_city_search(request: Annotated[AirportCitySearchRequest, Query()]):
     try:
-        request_body = request.model_dump()
-
-        key = build_redis_key(request_body)
-        data = redis_cache.get(key)
-        if data:
-            return data
+        # A partial index only knows earlier lookups' results, so it cannot
+        # answer on its own
+        if location_index.complete:
+            indexed = location_index.search(request.keyword, request.sub_type)
+            if indexed:
+                location_index_lookups.labels(result="hit").inc()
+                return indexed
+        location_index_lookups.labels(result="miss").inc()
 
-        response = amadeus_flight_service.airport_city_search(request_body)
-        redis_cache.set(key, response)
-        return response
+        request_body = request.model_dump()
+        key = build_cache_key(CacheNamespaces.LOCATIONS, request_body)
+        locations = await upstream_single_flight.load_with_revalidation(
+            key,
+            lambda: amadeus_flight_service.airport_city_search(request_body),
+            operation="airport_city_search",
+            ttl_policy=CACHE_TTL_POLICIES[CacheNamespaces.LOCATIONS],
+        )
+        location_index.add_many(locations)
+        return locations
 
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception:
         raise HTTPException(
             status_code=500, detail="An error occurred while searching for a location"
         )
 
 
+def upstream_unavailable(error: UpstreamUnavailableError) -> HTTPException:
+    """
+    503 (or 429 when shed for quota) telling the client when to retry a call
+    the upstream guard or quota scheduler refused.
+    """
+    if isinstance(error, QuotaExceededError):
+        return HTTPException(
+            status_code=429,
+            detail="Too many flight requests right now, please retry shortly",
+            headers={"Retry-After": str(error.retry_after)},
+        )
+    return HTTPException(
+        status_code=503,
+        detail="The flight provider is temporarily unavailable, please retry shortly",
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
 def _parse_amadeus_client_error(error: ClientError) -> str:
     """
     Parse Amadeus ClientError and return user-friendly error message.
@@ -611,10 +853,12 @@ async def get_user_bookings(
         Cursor-paginated list of bookings with id, pnr, status, created_at, and ticket_url
     """
     try:
-        cache_key = build_redis_key(
-            {"user_bookings": str(user.id), "cursor": cursor or "first", "limit": limit}
+        cache_key = build_cache_key(
+            CacheNamespaces.USER_BOOKINGS,
+            {"cursor": cursor, "limit": limit, "include_count": include_count},
+            scope=str(user.id),
         )
-        cached_response = redis_cache.get(cache_key)
+        cached_response = await redis_cache.get(cache_key)
         if cached_response:
             logger.info(
                 f"Returning cached bookings for user_id: {user.id}, cursor: {cursor}, limit: {limit}"
@@ -631,18 +875,10 @@ async def get_user_bookings(
 
         items = []
         for booking in bookings:
-            pnr = None
-            if booking.amadeus_order_response:
-                associated_records = booking.amadeus_order_response.get(
-                    "associatedRecords", []
-                )
-                if associated_records:
-                    pnr = associated_records[0].get("reference")
-
             items.append(
                 UserBookingResponse(
                     id=booking.id,
-                    pnr=pnr,
+                    pnr=booking.pnr,
                     status=booking.status,
                     created_at=booking.created_at,
                     ticket_url=booking.ticket_url,
@@ -658,7 +894,11 @@ async def get_user_bookings(
             limit=limit,
         )
 
-        redis_cache.set(cache_key, response.model_dump(mode="json"))
+        await redis_cache.set(
+            cache_key,
+            response.model_dump(mode="json"),
+            tags=[build_cache_tag(CacheTags.USER_BOOKINGS, str(user.id))],
+        )
 
         logger.info(
             f"Successfully fetched {len(items)} bookings for user_id: {user.id} (has_more: {has_more})"
@@ -673,20 +913,21 @@ async def get_user_bookings(
 
 
 @router.get("/analytics/most-travelled-destinations")
-def get_most_travelled_destinations(origin_city_code: str, period: str):
+async def get_most_travelled_destinations(origin_city_code: str, period: str):
     try:
-        key = build_redis_key({"city_code_period": f"{origin_city_code}{period}"})
-        destinations = redis_cache.get(key)
-        if destinations:
-            return destinations
-
-        response = amadeus_flight_service.get_most_travelled_destinations(
-            origin_city_code, period
+        key = build_cache_key(
+            CacheNamespaces.DESTINATIONS,
+            {"origin_city_code": origin_city_code, "period": period},
         )
-
-        if len(response) > 0:
-            redis_cache.set(key, response)
-
-        return response
+        return await upstream_single_flight.load_with_revalidation(
+            key,
+            lambda: amadeus_flight_service.get_most_travelled_destinations(
+                origin_city_code, period
+            ),
+            operation="get_most_travelled_destinations",
+            ttl_policy=CACHE_TTL_POLICIES[CacheNamespaces.DESTINATIONS],
+        )
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
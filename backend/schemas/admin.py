@@ -10,8 +10,8 @@ class AdminUserInfo(BaseModel):
     email: str
 
 
-class AdminBookingResponse(BaseModel):
-    """Response model for individual booking in admin dashboard"""
+class AdminBookingSummaryResponse(BaseModel):
+    """Response model for a booking in the admin booking list"""
 
     id: uuid.UUID
     flight_order_id: str
@@ -20,16 +20,28 @@ class AdminBookingResponse(BaseModel):
     ticket_url: str | None
     total_price: float
     user: AdminUserInfo
-    amadeus_order_response: dict | None
+    pnr: str | None = None
+    origin: str | None = None
+    destination: str | None = None
+    departure_at: datetime | None = None
+    carrier_code: str | None = None
+    flight_number: str | None = None
+    passenger_count: int = 0
 
     class Config:
         from_attributes = True
 
 
+class AdminBookingResponse(AdminBookingSummaryResponse):
+    """Response model for individual booking in admin dashboard"""
+
+    amadeus_order_response: dict | None
+
+
 class CursorPaginatedAdminBookingResponse(BaseModel):
     """Cursor-based paginated response model for admin booking list"""
 
-    items: list[AdminBookingResponse]
+    items: list[AdminBookingSummaryResponse]
     next_cursor: str | None = Field(
         description="Cursor for the next page, null if no more pages"
     )
@@ -66,3 +78,32 @@ class BookingStatsResponse(BaseModel):
                 "bookings_this_week": 23,
             }
         }
+
+
+MAX_FLIGHT_ORDER_BATCH = 200
+
+
+class FlightOrderBatchRequest(BaseModel):
+    """Request model for fetching many flight orders at once"""
+
+    flight_order_ids: list[str] = Field(min_length=1, max_length=MAX_FLIGHT_ORDER_BATCH)
+    refresh: bool = Field(
+        default=False,
+        description="Fetch every order from the provider and update the stored "
+        "responses, instead of returning stored responses where available",
+    )
+
+
+class FlightOrderBatchResponse(BaseModel):
+    """Response model for a flight order batch; failed orders are listed in errors"""
+
+    orders: dict[str, dict] = Field(description="Orders keyed by flight order ID")
+    errors: dict[str, str] = Field(
+        description="Error message per flight order ID that could not be fetched"
+    )
+    stored: list[str] = Field(
+        description="Flight order IDs answered from stored order responses"
+    )
+    updated: int = Field(
+        default=0, description="Bookings whose stored response was refreshed"
+    )
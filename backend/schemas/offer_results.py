@@ -0,0 +1,69 @@
+from datetime import time
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from backend.schemas.flight_search import FlightSearchRequestGet
+
+
+OFFER_RESULTS_MAX_PAGE_SIZE = 50
+
+
+class OfferSliceParams(BaseModel):
+    """Sort, filter and page options applied to a cached search result"""
+
+    sort: Literal["price", "duration", "departure"] = "price"
+    order: Literal["asc", "desc"] = "asc"
+    max_stops: int | None = Field(default=None, ge=0)
+    max_price: float | None = Field(default=None, gt=0)
+    carriers: str | None = Field(
+        default=None, description="Comma-separated validating carrier codes"
+    )
+    departure_after: time | None = None
+    departure_before: time | None = None
+    arrival_after: time | None = None
+    arrival_before: time | None = None
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=20, ge=1, le=OFFER_RESULTS_MAX_PAGE_SIZE)
+    view: Literal["full", "summary"] = Field(
+        default="full",
+        description="summary returns one compact row per offer instead of the offer",
+    )
+
+
+class OfferResultsSearchRequest(FlightSearchRequestGet, OfferSliceParams):
+    """GET flight-offers search parameters plus the first slice to return"""
+
+    def search_params(self) -> dict:
+        """Search parameters only, as GET /shopping/flight-offers dumps them."""
+        return self.model_dump(
+            include=set(FlightSearchRequestGet.model_fields), exclude_none=True
+        )
+
+    def slice_params(self) -> OfferSliceParams:
+        return OfferSliceParams(
+            **self.model_dump(include=set(OfferSliceParams.model_fields))
+        )
+
+
+class OfferSummary(BaseModel):
+    """Compact offer row; times are local to the departure/arrival airports"""
+
+    id: str | None
+    price: float | None
+    currency: str | None
+    duration_minutes: int | None
+    departure_at: str | None
+    arrival_at: str | None
+    stops: int | None
+    carrier: str | None
+
+
+class OfferResultsPage(BaseModel):
+    handle: str = Field(description="Pass to /shopping/flight-offers/results/{handle}")
+    items: list[dict[str, Any]]
+    total_count: int = Field(description="Offers matching the filters")
+    result_count: int = Field(description="Offers in the cached search result")
+    offset: int
+    limit: int
+    has_more: bool
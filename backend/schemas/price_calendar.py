@@ -0,0 +1,46 @@
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+PRICE_CALENDAR_MAX_WINDOW = 7
+
+
+class PriceCalendarRequest(BaseModel):
+    originLocationCode: str = Field(min_length=3, max_length=3)
+    destinationLocationCode: str = Field(min_length=3, max_length=3)
+    departureDate: date = Field(description="Centre of the date window")
+    window: int = Field(
+        default=3,
+        ge=0,
+        le=PRICE_CALENDAR_MAX_WINDOW,
+        description="Days searched either side of departureDate",
+    )
+    adults: int = Field(default=1, ge=1, le=9)
+    travelClass: str | None = None
+    nonStop: bool | None = None
+    currencyCode: str = Field(default="USD")
+
+
+class PriceCalendarDay(BaseModel):
+    """Cheapest offer found for one departure date"""
+
+    date: date
+    status: Literal["ok", "no_flights", "timeout", "error"]
+    price: float | None = None
+    currency: str | None = None
+    carrier: str | None = None
+    stops: int | None = None
+
+
+class PriceCalendarResponse(BaseModel):
+    origin: str
+    destination: str
+    days: list[PriceCalendarDay] = Field(description="One entry per date, in order")
+    cheapest_date: date | None = Field(
+        default=None, description="Date with the lowest price, null if none found"
+    )
+    complete: bool = Field(
+        description="False if some dates timed out or failed and may be retried"
+    )
@@ -18,6 +18,9 @@ if TEST_URL.endswith("/postgres"):
     TEST_URL = TEST_URL.rsplit("/postgres", 1)[0] + f"/{TEST_DB_NAME}"
 
 os.environ["DATABASE_URL"] = TEST_URL
+# Tests would otherwise share one Redis quota bucket; test_quota_scheduler
+# builds its own schedulers
+os.environ["UPSTREAM_RATE_LIMIT_PER_SECOND"] = "0"
 
 from backend.main import app  # noqa: E402
 from backend.crud.database import get_session  # noqa: E402
@@ -63,3 +66,145 @@ def client(session):
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+async def async_iter(items):
+    """Async iterator over items, for mocking redis.asyncio scan_iter."""
+    for item in items:
+        yield item
+
+
+class FakeClock:
+    """Manually advanced clock for simulating cache expiry."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class InMemoryRedisCache:
+    """
+    In-process stand-in for RedisCache used by cache-layer tests.
+
+    Mirrors the RedisCache method surface without needing a Redis server;
+    sharing one instance between components simulates several workers
+    talking to the same Redis. Hard and soft TTLs are evaluated against
+    ``clock`` so tests can advance time.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or FakeClock()
+        self.store = {}
+        self.ttls = {}
+        self.expires_at = {}
+        self.stale_at = {}
+        self.leases = {}
+        self.tags = {}
+        self.buckets = {}
+
+    def _expire(self, key):
+        if key in self.store and self.clock() >= self.expires_at[key]:
+            self._delete(key)
+
+    def _delete(self, key):
+        self.expires_at.pop(key, None)
+        self.stale_at.pop(key, None)
+        return self.store.pop(key, None) is not None
+
+    async def get(self, key):
+        self._expire(key)
+        return self.store.get(key)
+
+    async def get_many(self, keys):
+        return [await self.get(key) for key in keys]
+
+    async def remaining_ttls(self, keys):
+        ttls = []
+        for key in keys:
+            self._expire(key)
+            ttls.append(
+                self.expires_at[key] - self.clock() if key in self.store else None
+            )
+        return ttls
+
+    async def get_with_staleness(self, key):
+        self._expire(key)
+        if key not in self.store:
+            return None
+        stale_at = self.stale_at.get(key)
+        return self.store[key], stale_at is not None and self.clock() >= stale_at
+
+    async def set(
+        self, key, value, expiration_seconds=300, stale_after_seconds=None, tags=None
+    ):
+        for tag in tags or []:
+            self.tags.setdefault(tag, set()).add(key)
+        self.store[key] = value
+        self.ttls[key] = expiration_seconds
+        self.expires_at[key] = self.clock() + expiration_seconds
+        if stale_after_seconds is None:
+            self.stale_at.pop(key, None)
+        else:
+            self.stale_at[key] = self.clock() + stale_after_seconds
+
+    async def set_many(
+        self, values, expiration_seconds=300, stale_after_seconds=None, tags=None
+    ):
+        for key, value in values.items():
+            await self.set(key, value, expiration_seconds, stale_after_seconds, tags)
+
+    async def delete(self, key):
+        return self._delete(key)
+
+    async def invalidate_tags(self, *tags):
+        keys = set().union(*(self.tags.pop(tag, set()) for tag in tags))
+        for key in keys:
+            self._delete(key)
+        return len(keys)
+
+    async def acquire_lease(self, key, token, lease_seconds):
+        if key in self.leases:
+            return False
+        self.leases[key] = token
+        return True
+
+    async def release_lease(self, key, token):
+        if self.leases.get(key) != token:
+            return False
+        del self.leases[key]
+        return True
+
+    async def lease_exists(self, key):
+        return key in self.leases
+
+    async def take_tokens(self, buckets, now):
+        levels = []
+        wait = 0.0
+        for bucket in buckets:
+            tokens, at = self.buckets.get(bucket["key"], (bucket["capacity"], now))
+            tokens = min(
+                bucket["capacity"], tokens + max(0.0, now - at) * bucket["rate"]
+            )
+            levels.append(tokens)
+            if tokens < bucket["reserve"] + 1:
+                wait = max(wait, (bucket["reserve"] + 1 - tokens) / bucket["rate"])
+        if wait > 0:
+            return wait
+        for bucket, tokens in zip(buckets, levels):
+            self.buckets[bucket["key"]] = (tokens - 1, now)
+        return 0.0
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def memory_cache(fake_clock):
+    return InMemoryRedisCache(clock=fake_clock)
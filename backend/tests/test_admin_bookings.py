@@ -0,0 +1,267 @@
+"""Tests for the admin booking list and detail endpoints."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError
+from backend.crud.bookings import (
+    BookingFilters,
+    create_booking,
+    get_all_bookings_cursor,
+)
+from backend.models.bookings import Booking, BookingStatus
+from conftest import API_V1_PREFIX
+
+
+@pytest.fixture
+def admin(client, session):
+    from backend.crud.permissions import GroupCRUD, UserPermissionCRUD
+    from backend.crud.users import create_user
+    from backend.models.constants import ADMIN_GROUP_NAME
+    from backend.utils.security import get_current_user
+
+    user = create_user(session, "admin@example.com", "password")
+    group = GroupCRUD.create_group(session, ADMIN_GROUP_NAME)
+    UserPermissionCRUD.assign_group_to_user(session, user.id, group.id)
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    return user
+
+
+def _book(session, count: int, first: int = 0) -> list[Booking]:
+    """One booking each for ``count`` new users."""
+    from backend.crud.users import create_user
+
+    return [
+        create_booking(
+            session,
+            Booking(
+                user_id=create_user(session, f"u{index}@example.com", "pw").id,
+                flight_order_id=f"ORDER{index}",
+            ),
+        )
+        for index in range(first, first + count)
+    ]
+
+
+@contextmanager
+def _statements(session, parameters: bool = False):
+    statements = []
+
+    def record(conn, cursor, statement, params, *args):
+        statements.append((statement, params) if parameters else statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _forget_all_but(session, admin) -> None:
+    """Empty the identity map, so related users can only come from queries."""
+    session.expunge_all()
+    session.add(admin)
+
+
+def _list_page(client, session, admin) -> tuple[list[dict], int]:
+    _forget_all_but(session, admin)
+    with _statements(session) as statements:
+        response = client.get(f"{API_V1_PREFIX}/admin/bookings?limit=100")
+    assert response.status_code == 200
+    return response.json()["items"], len(statements)
+
+
+def test_list_query_joins_the_user(session):
+    _book(session, 3)
+    session.expunge_all()
+
+    with _statements(session) as statements:
+        bookings, *_ = get_all_bookings_cursor(session, limit=100)
+        emails = {booking.user.email for booking in bookings}
+
+    assert emails == {"u0@example.com", "u1@example.com", "u2@example.com"}
+    assert len(statements) == 1
+    with pytest.raises(InvalidRequestError):
+        bookings[0].user.password
+
+
+def test_list_page_query_count_is_independent_of_page_size(client, session, admin):
+    _book(session, 2)
+    items, small_page = _list_page(client, session, admin)
+    assert len(items) == 2
+
+    _book(session, 30, first=2)
+    items, large_page = _list_page(client, session, admin)
+
+    assert len(items) == 32
+    assert large_page == small_page
+    assert len({item["user"]["email"] for item in items}) == 32
+
+
+def test_detail_loads_the_user_with_the_booking(client, session, admin):
+    (booking,) = _book(session, 1)
+    _forget_all_but(session, admin)
+
+    with _statements(session) as statements:
+        response = client.get(f"{API_V1_PREFIX}/admin/bookings/{booking.id}")
+
+    assert response.json()["user"]["email"] == "u0@example.com"
+    (index,) = [i for i, sql in enumerate(statements) if "FROM booking" in sql]
+    assert "JOIN userindb" in statements[index]
+    assert statements[index + 1 :] == []
+
+
+@pytest.fixture
+def filterable(session):
+    """Bookings over three users, two days and three statuses."""
+    from backend.crud.users import create_user
+
+    day = datetime(2030, 5, 1, tzinfo=timezone.utc)
+    users = [
+        create_user(session, email, "pw")
+        for email in ("Ann@example.com", "annie@example.com", "bob@example.com")
+    ]
+    rows = [
+        (0, BookingStatus.PAID, day),
+        (0, BookingStatus.PENDING, day + timedelta(hours=1)),
+        (1, BookingStatus.PAID, day + timedelta(hours=2)),
+        (1, BookingStatus.CANCELLED, day + timedelta(days=1)),
+        (2, BookingStatus.PAID, day + timedelta(days=1, hours=1)),
+        (2, BookingStatus.PENDING, day + timedelta(days=1, hours=2)),
+    ]
+    return [
+        create_booking(
+            session,
+            Booking(
+                user_id=users[user].id,
+                flight_order_id=f"ORDER{index}",
+                pnr=f"PNR{index}",
+                status=status,
+                created_at=created_at,
+            ),
+        )
+        for index, (user, status, created_at) in enumerate(rows)
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({}, [0, 1, 2, 3, 4, 5]),
+        ({"statuses": [BookingStatus.PAID, BookingStatus.PENDING]}, [0, 1, 2, 4, 5]),
+        (
+            {
+                "created_from": datetime(2030, 5, 1, 1, tzinfo=timezone.utc),
+                "created_to": datetime(2030, 5, 2, 1, tzinfo=timezone.utc),
+            },
+            [1, 2, 3],
+        ),
+        ({"pnr": "PNR3"}, [3]),
+        ({"flight_order_id": "ORDER4"}, [4]),
+        ({"email_prefix": "ANN"}, [0, 1, 2, 3]),
+        ({"email_prefix": "ann%"}, []),
+        ({"email_prefix": "ann", "statuses": [BookingStatus.PAID]}, [0, 2]),
+    ],
+)
+def test_filters_select_matching_bookings(session, filterable, filters, expected):
+    bookings, _, _, total = get_all_bookings_cursor(
+        session, limit=100, include_count=True, filters=filters
+    )
+
+    assert [booking.id for booking in bookings] == [
+        filterable[index].id for index in reversed(expected)
+    ]
+    assert total == len(expected)
+
+
+def test_filtered_list_pages_with_the_cursor(client, session, admin, filterable):
+    params = {"status": ["paid", "pending"], "email": "ann", "limit": 1}
+    seen = []
+    cursor = None
+    while True:
+        response = client.get(
+            f"{API_V1_PREFIX}/admin/bookings",
+            params={**params, **({"cursor": cursor} if cursor else {})},
+        )
+        body = response.json()
+        seen += [item["pnr"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["PNR2", "PNR1", "PNR0"]
+
+
+@pytest.fixture
+def analyzed(session):
+    """4000 bookings by 2000 users, analyzed so the planner weighs real sizes."""
+    session.execute(
+        text(
+            "INSERT INTO userindb (id, email, auth_provider, is_active, is_superuser) "
+            "SELECT gen_random_uuid(), 'user' || n || '@example.com', 'email', "
+            "true, false FROM generate_series(0, 1999) n"
+        )
+    )
+    session.execute(
+        text(
+            "INSERT INTO booking (id, user_id, flight_order_id, pnr, status, "
+            "created_at, total_price, passenger_count) "
+            "SELECT gen_random_uuid(), u.id, 'ORDER' || n, 'PNR' || n, "
+            "CASE WHEN n % 100 = 0 THEN :pending "
+            "WHEN n % 100 = 50 THEN :refund_pending ELSE :paid END, "
+            ":start + n * interval '30 minutes', 0, 0 "
+            "FROM generate_series(0, 3999) n "
+            "JOIN userindb u ON u.email = 'user' || n % 2000 || '@example.com'"
+        ),
+        {
+            "pending": BookingStatus.PENDING,
+            "refund_pending": BookingStatus.REFUND_PENDING,
+            "paid": BookingStatus.PAID,
+            "start": datetime(2030, 1, 1, tzinfo=timezone.utc),
+        },
+    )
+    session.execute(text("ANALYZE booking"))
+    session.execute(text("ANALYZE userindb"))
+
+
+def _plan(session, filters: BookingFilters) -> list[str]:
+    with _statements(session, parameters=True) as statements:
+        get_all_bookings_cursor(session, limit=20, filters=filters)
+    ((statement, parameters),) = statements
+    plan = session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [row[0] for row in plan]
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"statuses": [BookingStatus.PENDING]}, "ix_booking_status_cursor"),
+        (
+            {
+                "created_from": datetime(2030, 1, 10, tzinfo=timezone.utc),
+                "created_to": datetime(2030, 1, 11, tzinfo=timezone.utc),
+            },
+            "ix_booking_cursor",
+        ),
+        ({"pnr": "PNR3"}, "ix_booking_pnr"),
+        ({"flight_order_id": "ORDER4"}, "ix_booking_flight_order_id"),
+        ({"email_prefix": "user123"}, "ix_userindb_email_prefix"),
+    ],
+)
+def test_filters_use_their_index(session, analyzed, filters, index):
+    plan = _plan(session, filters)
+
+    assert any(index in row for row in plan), "\n".join(plan)
+    assert not any("Seq Scan on booking" in row for row in plan), "\n".join(plan)
+
+
+def test_status_sets_read_each_status_in_index_order(session, analyzed):
+    filters = {"statuses": [BookingStatus.PENDING, BookingStatus.REFUND_PENDING]}
+
+    plan = _plan(session, filters)
+
+    ordered = "Scan Backward using ix_booking_status_cursor"
+    assert sum(ordered in row for row in plan) == 2, "\n".join(plan)
@@ -0,0 +1,132 @@
+"""
+Tests for the AsyncFlightService adapter.
+
+Uses MockFlightService with injected latency to show that concurrent searches
+overlap on the dedicated executor instead of serialising on the event loop.
+"""
+
+import asyncio
+import time
+
+import pytest
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.interface import AsyncFlightServiceProtocol
+from backend.external_services.mock_flight_service import MockFlightService
+
+UPSTREAM_LATENCY = 0.2
+
+
+class SlowMockFlightService(MockFlightService):
+    """MockFlightService that blocks like a real SDK call would."""
+
+    def search_flights_get(self, request_body: dict) -> dict:
+        time.sleep(UPSTREAM_LATENCY)
+        return super().search_flights_get(request_body)
+
+
+@pytest.fixture
+def slow_service():
+    service = AsyncFlightService(SlowMockFlightService(), max_workers=16)
+    yield service
+    service.shutdown()
+
+
+async def _run_concurrent_searches(service: AsyncFlightService, count: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(service.search_flights_get({}) for _ in range(count))
+    )
+    elapsed = time.perf_counter() - start
+    assert all(isinstance(result, list) and result for result in results)
+    return elapsed
+
+
+def test_async_service_satisfies_protocol():
+    service = AsyncFlightService(MockFlightService())
+    assert isinstance(service, AsyncFlightServiceProtocol)
+
+
+@pytest.mark.asyncio
+async def test_async_service_returns_provider_results():
+    service = AsyncFlightService(MockFlightService())
+    try:
+        order = await service.create_flight_order({"travelers": []})
+        retrieved = await service.get_flight_order(order["id"])
+        assert retrieved["id"] == order["id"]
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_service_propagates_provider_errors():
+    class FailingService(MockFlightService):
+        def confirm_price(self, request_body: dict) -> dict:
+            raise ValueError("pricing unavailable")
+
+    service = AsyncFlightService(FailingService())
+    try:
+        with pytest.raises(ValueError, match="pricing unavailable"):
+            await service.confirm_price({})
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_upstream_calls(slow_service):
+    """A ticker coroutine keeps running while provider calls are in flight."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        await _run_concurrent_searches(slow_service, 4)
+    finally:
+        ticker_task.cancel()
+
+    # A blocked loop would not tick at all until the searches finished
+    assert ticks >= (UPSTREAM_LATENCY / 0.01) / 2
+
+
+@pytest.mark.asyncio
+async def test_throughput_scales_with_in_flight_calls(slow_service):
+    """
+    Load test: N concurrent searches should take roughly one upstream latency,
+    not N of them, as long as N is within the executor's worker cap.
+    """
+    single = await _run_concurrent_searches(slow_service, 1)
+    concurrent = await _run_concurrent_searches(slow_service, 16)
+
+    single_throughput = 1 / single
+    concurrent_throughput = 16 / concurrent
+
+    # Serial execution would take 16 * latency; allow generous scheduling slack
+    assert concurrent < UPSTREAM_LATENCY * 4
+    assert concurrent_throughput > single_throughput * 4
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_bounded_by_max_workers():
+    service = AsyncFlightService(SlowMockFlightService(), max_workers=2)
+    try:
+        elapsed = await _run_concurrent_searches(service, 4)
+    finally:
+        service.shutdown()
+
+    # Four calls through two workers need two rounds of upstream latency
+    assert elapsed >= UPSTREAM_LATENCY * 2
+
+
+@pytest.mark.asyncio
+async def test_shutdown_allows_restart():
+    service = AsyncFlightService(MockFlightService())
+    await service.search_flights_get({})
+    service.shutdown()
+
+    result = await service.search_flights_get({})
+    assert isinstance(result, list)
+    service.shutdown()
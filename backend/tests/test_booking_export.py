@@ -0,0 +1,149 @@
+"""Tests for the streaming booking export."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from backend.crud.bookings import EXPORT_COLUMNS, create_booking, export_bookings
+from backend.models.bookings import Booking, BookingStatus
+from backend.routers import admin as admin_router
+from backend.utils import booking_export
+from conftest import API_V1_PREFIX
+
+
+@pytest.fixture
+def admin(client, session):
+    from backend.crud.permissions import GroupCRUD, UserPermissionCRUD
+    from backend.crud.users import create_user
+    from backend.models.constants import ADMIN_GROUP_NAME
+    from backend.utils.security import get_current_user
+
+    user = create_user(session, "admin@example.com", "password")
+    group = GroupCRUD.create_group(session, ADMIN_GROUP_NAME)
+    UserPermissionCRUD.assign_group_to_user(session, user.id, group.id)
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    return user
+
+
+@pytest.fixture
+def export_engine(mocker, session):
+    """Run the endpoint's own export session on the test transaction."""
+    return mocker.patch("backend.routers.admin.engine", session.connection())
+
+
+@pytest.fixture
+def bookings(session):
+    """Five bookings an hour apart, alternately paid and pending, by two users."""
+    from backend.crud.users import create_user
+
+    users = [
+        create_user(session, email, "pw")
+        for email in ("ann@example.com", "bob@example.com")
+    ]
+    start = datetime(2030, 5, 1, tzinfo=timezone.utc)
+    return [
+        create_booking(
+            session,
+            Booking(
+                user_id=users[index % 2].id,
+                flight_order_id=f"ORDER{index}",
+                pnr=f"PNR{index}",
+                status=BookingStatus.PAID if index % 2 else BookingStatus.PENDING,
+                created_at=start + timedelta(hours=index),
+                total_price=100.0 + index,
+            ),
+        )
+        for index in range(5)
+    ]
+
+
+def test_export_reads_every_batch_newest_first(session, bookings):
+    rows = list(
+        export_bookings(session, ["pnr", "user_email"], filters={}, batch_size=2)
+    )
+
+    assert rows == [
+        ("PNR4", "ann@example.com"),
+        ("PNR3", "bob@example.com"),
+        ("PNR2", "ann@example.com"),
+        ("PNR1", "bob@example.com"),
+        ("PNR0", "ann@example.com"),
+    ]
+
+
+def test_export_applies_filters(session, bookings):
+    filters = {"statuses": [BookingStatus.PAID], "email_prefix": "BOB"}
+
+    rows = list(export_bookings(session, ["pnr"], filters=filters, batch_size=1))
+
+    assert rows == [("PNR3",), ("PNR1",)]
+
+
+def test_csv_endpoint_streams_an_attachment(client, admin, bookings, export_engine):
+    response = client.get(
+        f"{API_V1_PREFIX}/admin/bookings/export",
+        params={"columns": "pnr,created_at,total_price", "status": "paid"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "bookings.csv" in response.headers["content-disposition"]
+    assert list(csv.reader(io.StringIO(response.text))) == [
+        ["pnr", "created_at", "total_price"],
+        ["PNR3", "2030-05-01T03:00:00+00:00", "103.0"],
+        ["PNR1", "2030-05-01T01:00:00+00:00", "101.0"],
+    ]
+
+
+def test_ndjson_endpoint_exports_all_columns_by_default(
+    client, admin, bookings, export_engine
+):
+    response = client.get(
+        f"{API_V1_PREFIX}/admin/bookings/export",
+        params={"format": "ndjson", "pnr": "PNR2"},
+    )
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    (row,) = [json.loads(line) for line in response.text.splitlines()]
+    assert list(row) == list(EXPORT_COLUMNS)
+    assert row["id"] == str(bookings[2].id)
+    assert row["user_email"] == "ann@example.com"
+    assert row["origin"] is None
+
+
+def test_endpoint_exports_through_its_own_session(
+    client, admin, bookings, export_engine, session, mocker
+):
+    export = mocker.spy(admin_router, "crud_export_bookings")
+
+    response = client.get(
+        f"{API_V1_PREFIX}/admin/bookings/export", params={"columns": "pnr"}
+    )
+
+    assert len(response.text.splitlines()) == 6
+    export_session = export.call_args.args[0]
+    assert export_session is not session
+    # Closed once the body is sent
+    assert not export_session.in_transaction()
+
+
+def test_unknown_export_column_is_rejected(client, admin, bookings):
+    response = client.get(
+        f"{API_V1_PREFIX}/admin/bookings/export", params={"columns": "pnr,password"}
+    )
+
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_encoding_yields_bounded_chunks(monkeypatch):
+    monkeypatch.setattr(booking_export, "CHUNK_SIZE", 100)
+    rows = [(f"PNR{index}", index) for index in range(200)]
+
+    chunks = list(booking_export.encode_rows("ndjson", ["pnr", "n"], iter(rows)))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 200 for chunk in chunks)
+    assert len("".join(chunks).splitlines()) == 200
@@ -0,0 +1,171 @@
+"""Tests for the booking stats rollup and the admin stats endpoint."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from backend.crud.booking_stats import (
+    booking_stats_from_bookings,
+    get_booking_stats,
+    rebuild_booking_stats,
+)
+from backend.crud.bookings import create_booking, update_booking_status
+from backend.models.booking_stats import BookingStatsRollup, StatsPeriod
+from backend.models.bookings import Booking, BookingStatus
+from backend.models.users import UserInDB
+from conftest import API_V1_PREFIX, engine
+
+NOW = datetime(2030, 3, 10, 14, 25, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def users(session):
+    from backend.crud.users import create_user
+
+    return [
+        create_user(session, f"stats{index}@example.com", "password")
+        for index in range(3)
+    ]
+
+
+def _book(session, user, ago: timedelta, price: float = 100.0) -> Booking:
+    return create_booking(
+        session,
+        Booking(
+            user_id=user.id,
+            flight_order_id="ORDER1",
+            created_at=NOW - ago,
+            total_price=price,
+        ),
+    )
+
+
+def _rollup(session) -> tuple[list[tuple], int]:
+    """Non-empty rollup rows and the total of new users."""
+    rows = session.exec(select(BookingStatsRollup)).all()
+    counts = sorted(
+        (row.period, row.bucket_start, row.status, row.bookings)
+        for row in rows
+        if row.bookings
+    )
+    return counts, sum(row.new_users for row in rows)
+
+
+@pytest.fixture
+def bookings(session, users):
+    first, second, third = users
+    booked = [
+        _book(session, first, timedelta(minutes=5), 120.0),
+        _book(session, first, timedelta(hours=3), 80.0),
+        _book(session, second, timedelta(days=2), 200.0),
+        # Either side of the seven-day cutoff, inside one hour bucket
+        _book(session, second, timedelta(days=7, minutes=-10)),
+        _book(session, third, timedelta(days=7, minutes=10)),
+        # Within the last seven days but before the first whole day
+        _book(session, third, timedelta(days=6, hours=20), 50.0),
+        _book(session, third, timedelta(days=40), 300.0),
+    ]
+    for booking, status in zip(
+        booked,
+        [BookingStatus.PAID, BookingStatus.PAID, BookingStatus.PENDING],
+    ):
+        update_booking_status(session, str(booking.id), status)
+    update_booking_status(session, str(booked[0].id), BookingStatus.CANCELLED)
+    update_booking_status(session, str(booked[2].id), BookingStatus.PAID)
+    return booked
+
+
+def test_rollup_matches_aggregate_over_bookings(session, bookings):
+    stats = get_booking_stats(session, NOW)
+
+    assert stats == booking_stats_from_bookings(session, NOW)
+    assert stats == {
+        "total_bookings": 7,
+        "total_revenue": 280.0,
+        "active_users": 3,
+        "bookings_today": 2,
+        "bookings_this_week": 5,
+    }
+
+
+def test_status_changes_move_counters_between_statuses(session, bookings):
+    rows = session.exec(
+        select(BookingStatsRollup)
+        .where(BookingStatsRollup.period == StatsPeriod.HOUR)
+        .where(
+            BookingStatsRollup.bucket_start
+            == datetime(2030, 3, 10, 14, tzinfo=timezone.utc)
+        )
+    ).all()
+
+    counts = {row.status: (row.bookings, row.revenue) for row in rows}
+    assert counts[BookingStatus.CANCELLED] == (1, 120.0)
+    assert counts[BookingStatus.PAID] == (0, 0.0)
+    assert counts[BookingStatus.CONFIRMED] == (0, 0.0)
+
+
+def test_rebuild_reproduces_incremental_rollup(session, bookings):
+    incremental = _rollup(session)
+
+    rebuild_booking_stats(session)
+
+    assert _rollup(session) == incremental
+    assert get_booking_stats(session, NOW) == booking_stats_from_bookings(session, NOW)
+
+
+def test_stats_endpoint_reads_rollup(client, session, users, bookings):
+    from backend.crud.permissions import GroupCRUD, UserPermissionCRUD
+    from backend.models.constants import ADMIN_GROUP_NAME
+    from backend.utils.security import get_current_user
+
+    admin = users[0]
+    group = GroupCRUD.create_group(session, ADMIN_GROUP_NAME)
+    UserPermissionCRUD.assign_group_to_user(session, admin.id, group.id)
+    client.app.dependency_overrides[get_current_user] = lambda: admin
+
+    response = client.get(f"{API_V1_PREFIX}/admin/stats/bookings")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_bookings"] == 7
+    assert body["total_revenue"] == 280.0
+    assert body["active_users"] == 3
+
+
+@pytest.fixture
+def committed_booking():
+    """A confirmed booking committed outside the test transaction, and removed."""
+    from backend.crud.users import create_user
+
+    with Session(engine) as session:
+        user = create_user(session, "race@example.com", "password")
+        booking = _book(session, user, timedelta(days=400), 150.0)
+        booking_id, user_id = booking.id, user.id
+    yield booking_id
+    with Session(engine) as session:
+        session.execute(delete(Booking).where(Booking.id == booking_id))
+        session.execute(delete(UserInDB).where(UserInDB.id == user_id))
+        session.execute(delete(BookingStatsRollup))
+        session.commit()
+
+
+def test_status_change_rereads_a_stale_loaded_booking(committed_booking):
+    with Session(engine) as first, Session(engine) as second:
+        # Both load the confirmed booking before either changes it
+        loaded = [
+            first.get(Booking, committed_booking),
+            second.get(Booking, committed_booking),
+        ]
+
+        update_booking_status(first, str(committed_booking), BookingStatus.PAID)
+        update_booking_status(second, str(committed_booking), BookingStatus.PAID)
+
+        counts = {
+            (row.period, row.status): (row.bookings, row.revenue)
+            for row in first.exec(select(BookingStatsRollup)).all()
+        }
+    assert [booking.status for booking in loaded] == [BookingStatus.PAID] * 2
+    for period in (StatsPeriod.HOUR, StatsPeriod.DAY):
+        assert counts[(period, BookingStatus.CONFIRMED)] == (0, 0.0)
+        assert counts[(period, BookingStatus.PAID)] == (1, 150.0)
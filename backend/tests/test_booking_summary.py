@@ -0,0 +1,165 @@
+"""Tests for denormalized booking summary columns and JSON-free list queries."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from backend.crud.bookings import (
+    get_all_bookings_cursor,
+    get_user_bookings_cursor,
+    order_summary,
+    update_stored_flight_orders,
+)
+from backend.external_services.mock_flight_service import _load_fixture
+from backend.models.bookings import Booking
+from conftest import API_V1_PREFIX
+
+
+def _order(reference: str = "PNR001", *airports: str) -> dict:
+    airports = airports or ("NBO", "DXB", "LHR")
+    return {
+        "id": "ORDER1",
+        "associatedRecords": [{"reference": reference}],
+        "flightOffers": [
+            {
+                "itineraries": [
+                    {
+                        "segments": [
+                            {
+                                "departure": {
+                                    "iataCode": origin,
+                                    "at": "2030-01-02T06:00:00",
+                                },
+                                "arrival": {"iataCode": destination},
+                                "carrierCode": "EK",
+                                "number": "720",
+                            }
+                            for origin, destination in zip(airports, airports[1:])
+                        ]
+                    }
+                ],
+            }
+        ],
+        "travelers": [{"id": "1"}, {"id": "2"}],
+    }
+
+
+@pytest.fixture
+def user(session):
+    from backend.crud.users import create_user
+
+    return create_user(session, "summary@example.com", "password")
+
+
+def _booking(session, user, order: dict | None) -> Booking:
+    booking = Booking(
+        user_id=user.id,
+        flight_order_id="ORDER1",
+        amadeus_order_response=order,
+        **order_summary(order),
+    )
+    session.add(booking)
+    session.commit()
+    return booking
+
+
+def test_order_summary_uses_outbound_itinerary_ends():
+    summary = order_summary(_order())
+
+    assert summary == {
+        "pnr": "PNR001",
+        "origin": "NBO",
+        "destination": "LHR",
+        "departure_at": datetime(2030, 1, 2, 6, 0),
+        "carrier_code": "EK",
+        "flight_number": "720",
+        "passenger_count": 2,
+    }
+
+
+def test_order_summary_of_the_mock_order():
+    summary = order_summary(_load_fixture("flight_order.json"))
+
+    assert summary["pnr"] and summary["origin"] and summary["destination"]
+    assert summary["passenger_count"] >= 1
+
+
+def test_order_summary_tolerates_missing_fields():
+    assert order_summary(None) == {
+        "pnr": None,
+        "origin": None,
+        "destination": None,
+        "departure_at": None,
+        "carrier_code": None,
+        "flight_number": None,
+        "passenger_count": 0,
+    }
+    order = _order()
+    order["flightOffers"][0]["itineraries"][0]["segments"][0]["departure"]["at"] = "?"
+    assert order_summary(order)["departure_at"] is None
+
+
+def test_list_queries_never_select_the_order_json(session, user):
+    _booking(session, user, _order())
+    user_id = user.id
+    session.expunge_all()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        (booking,), *_ = get_user_bookings_cursor(session, user_id, include_count=True)
+        get_all_bookings_cursor(session, include_count=True)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert booking.pnr == "PNR001"
+    assert not any("amadeus_order_response" in sql for sql in statements)
+    with pytest.raises(InvalidRequestError):
+        booking.amadeus_order_response
+
+
+def test_refreshed_orders_update_the_summary(session, user):
+    booking = _booking(session, user, _order("OLDPNR"))
+
+    update_stored_flight_orders(session, {"ORDER1": _order("NEWPNR", "JFK", "CDG")})
+
+    session.refresh(booking)
+    assert (booking.pnr, booking.origin, booking.destination) == (
+        "NEWPNR",
+        "JFK",
+        "CDG",
+    )
+
+
+def test_booking_lists_serve_summary_columns(
+    client, session, user, memory_cache, mocker
+):
+    from backend.crud.permissions import GroupCRUD, UserPermissionCRUD
+    from backend.models.constants import ADMIN_GROUP_NAME
+    from backend.utils.security import get_current_user
+
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    group = GroupCRUD.create_group(session, ADMIN_GROUP_NAME)
+    UserPermissionCRUD.assign_group_to_user(session, user.id, group.id)
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    booking = _booking(session, user, _order())
+
+    admin = client.get(f"{API_V1_PREFIX}/admin/bookings").json()["items"][0]
+    mine = client.get(f"{API_V1_PREFIX}/bookings").json()["items"][0]
+    detail = client.get(f"{API_V1_PREFIX}/admin/bookings/{booking.id}").json()
+
+    assert "amadeus_order_response" not in admin
+    assert admin["pnr"] == "PNR001"
+    assert (admin["origin"], admin["destination"]) == ("NBO", "LHR")
+    assert admin["departure_at"] == "2030-01-02T06:00:00"
+    assert (admin["carrier_code"], admin["flight_number"]) == ("EK", "720")
+    assert admin["passenger_count"] == 2
+    assert admin["user"]["email"] == "summary@example.com"
+    assert mine["pnr"] == "PNR001"
+    assert detail["pnr"] == "PNR001"
+    assert detail["amadeus_order_response"]["id"] == "ORDER1"
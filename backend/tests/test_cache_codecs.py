@@ -0,0 +1,130 @@
+"""Tests for Redis cache entry codecs and compression."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services import cache_codecs
+from backend.external_services.cache import RedisCache
+from backend.external_services.cache_codecs import (
+    CODECS,
+    ENTRY_HEADER,
+    CacheCodecError,
+    EntrySerializer,
+    default_serializer,
+)
+
+MOCK_DATA = Path(__file__).resolve().parent.parent / "external_services" / "mock_data"
+FLIGHT_SEARCH = json.loads((MOCK_DATA / "flight_search_results.json").read_text())
+
+
+def _header(entry: bytes) -> tuple:
+    return ENTRY_HEADER.unpack_from(entry)
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+def test_round_trip(codec, compression):
+    serializer = EntrySerializer(codec, compression, threshold=0)
+
+    assert serializer.decode(serializer.encode(FLIGHT_SEARCH)) == (FLIGHT_SEARCH, None)
+
+
+@pytest.mark.parametrize("codec", ["orjson", "msgpack"])
+def test_dependency_codecs_are_available(codec):
+    serializer = EntrySerializer(codec, "zlib", threshold=0)
+
+    assert serializer.decode(serializer.encode(FLIGHT_SEARCH))[0] == FLIGHT_SEARCH
+
+
+def test_stale_at_is_kept_in_header():
+    serializer = EntrySerializer()
+
+    assert serializer.decode(serializer.encode(["v"], stale_at=1060.5)) == (
+        ["v"],
+        1060.5,
+    )
+
+
+def test_only_payloads_above_threshold_are_compressed():
+    serializer = EntrySerializer("json", "zlib", threshold=1024)
+
+    small = serializer.encode({"keyword": "NBO"})
+    large = serializer.encode(FLIGHT_SEARCH)
+
+    assert _header(small)[3] == 0
+    assert _header(large)[3] == cache_codecs.ZlibCompression.id
+    assert len(large) < len(json.dumps(FLIGHT_SEARCH)) / 3
+
+
+def test_entries_decode_whatever_codec_wrote_them():
+    entry = EntrySerializer("json", "zlib", threshold=0).encode(FLIGHT_SEARCH)
+
+    # A reader configured differently still decodes from the header
+    assert EntrySerializer("json", "none").decode(entry)[0] == FLIGHT_SEARCH
+
+
+@pytest.mark.parametrize(
+    "legacy, expected",
+    [
+        ('{"data": [1]}', ({"data": [1]}, None)),
+        (b'["NBO"]', (["NBO"], None)),
+        ('{"__stale_at__": 60.0, "value": ["v"]}', (["v"], 60.0)),
+    ],
+)
+def test_legacy_json_entries_are_readable(legacy, expected):
+    assert EntrySerializer.decode(legacy) == expected
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        ENTRY_HEADER.pack(0, 1, 99, 0, 0.0) + b"{}",
+        ENTRY_HEADER.pack(0, 1, 1, 99, 0.0) + b"{}",
+        ENTRY_HEADER.pack(0, 9, 1, 0, 0.0) + b"{}",
+        ENTRY_HEADER.pack(0, 1, 1, 1, 0.0) + b"not zlib",
+        b"\x00\x01",
+    ],
+)
+def test_undecodable_entries_raise(entry):
+    with pytest.raises(CacheCodecError):
+        EntrySerializer.decode(entry)
+
+
+def test_unavailable_codec_is_rejected():
+    with pytest.raises(ValueError):
+        EntrySerializer("does-not-exist")
+
+
+def test_default_serializer_falls_back_when_codec_missing(monkeypatch):
+    monkeypatch.setattr(cache_codecs, "CACHE_CODEC", "does-not-exist")
+    monkeypatch.setattr(cache_codecs, "CACHE_COMPRESSION", "does-not-exist")
+
+    serializer = default_serializer()
+
+    assert (serializer.codec.name, serializer.compression.name) == ("json", "none")
+
+
+class TestRedisCacheCodecs:
+    @pytest.fixture
+    def cache(self):
+        cache = RedisCache(
+            "localhost", 6379, serializer=EntrySerializer("json", "zlib", threshold=0)
+        )
+        cache.r = AsyncMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_set_stores_encoded_entry(self, cache):
+        await cache.set("k", FLIGHT_SEARCH, 300)
+
+        key, ttl, entry = cache.r.setex.call_args.args
+        assert _header(entry)[2:4] == (1, cache_codecs.ZlibCompression.id)
+        assert EntrySerializer.decode(entry)[0] == FLIGHT_SEARCH
+
+    @pytest.mark.asyncio
+    async def test_undecodable_entry_is_a_miss(self, cache):
+        cache.r.get.return_value = ENTRY_HEADER.pack(0, 1, 99, 0, 0.0) + b"{}"
+
+        assert await cache.get("k") is None
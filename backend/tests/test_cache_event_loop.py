@@ -0,0 +1,119 @@
+"""Tests that cache calls yield the event loop while Redis is slow."""
+
+import asyncio
+import time
+
+import pytest
+from backend.external_services.cache import RedisCache
+
+
+class SlowRedisServer:
+    """
+    Minimal RESP server that answers reads after an injected delay.
+
+    GET and MGET reply with nil values once ``delay`` seconds have passed;
+    every other command (CLIENT SETINFO, SETEX, ...) gets an immediate +OK.
+    Commands received are recorded in ``commands``.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.commands: list[list[bytes]] = []
+        self.server = None
+
+    async def __aenter__(self) -> "SlowRedisServer":
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer) -> None:
+        try:
+            while command := await self._read_command(reader):
+                self.commands.append(command)
+                name = command[0].upper()
+                if name == b"GET":
+                    await asyncio.sleep(self.delay)
+                    writer.write(b"$-1\r\n")
+                elif name == b"MGET":
+                    await asyncio.sleep(self.delay)
+                    writer.write(
+                        b"*%d\r\n" % (len(command) - 1)
+                        + b"$-1\r\n" * (len(command) - 1)
+                    )
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader) -> list[bytes] | None:
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+
+async def _max_loop_lag(until: asyncio.Future, interval: float = 0.005) -> float:
+    """Largest delay beyond ``interval`` seen by a ticker until ``until`` is done."""
+    lag = 0.0
+    while not until.done():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(lag, time.perf_counter() - start - interval)
+    return lag
+
+
+@pytest.mark.asyncio
+async def test_slow_redis_does_not_block_event_loop():
+    async with SlowRedisServer(delay=0.2) as server:
+        cache = RedisCache("127.0.0.1", server.port, socket_timeout=5)
+        start = time.perf_counter()
+        reads = asyncio.gather(*(cache.get(f"k{i}") for i in range(20)))
+        lag = await _max_loop_lag(reads)
+        elapsed = time.perf_counter() - start
+        await cache.close()
+
+    assert await reads == [None] * 20
+    # Reads overlap on pooled connections instead of queueing behind each other
+    assert elapsed < 20 * 0.2 / 4
+    assert lag < 0.1
+
+
+@pytest.mark.asyncio
+async def test_get_many_is_one_round_trip():
+    async with SlowRedisServer(delay=0.05) as server:
+        cache = RedisCache("127.0.0.1", server.port, socket_timeout=5)
+        values = await cache.get_many([f"k{i}" for i in range(100)])
+        await cache.close()
+
+    assert values == [None] * 100
+    reads = [command for command in server.commands if command[0] in (b"GET", b"MGET")]
+    assert len(reads) == 1
+    assert len(reads[0]) == 101
+
+
+@pytest.mark.asyncio
+async def test_read_slower_than_socket_timeout_is_a_miss():
+    async with SlowRedisServer(delay=1) as server:
+        cache = RedisCache("127.0.0.1", server.port, socket_timeout=0.1)
+        start = time.perf_counter()
+        value = await cache.get("k")
+        elapsed = time.perf_counter() - start
+        await cache.close()
+
+    assert value is None
+    assert elapsed < 0.5
@@ -0,0 +1,88 @@
+"""Tests for the namespaced, versioned cache key scheme."""
+
+from fnmatch import fnmatchcase
+
+import pytest
+from backend.utils import cache_keys
+from backend.utils.cache_keys import (
+    KEY_DIGEST_LENGTH,
+    build_cache_key,
+    build_cache_pattern,
+)
+from backend.utils.constants import CacheNamespaces
+
+
+SEARCH_PARAMS = {
+    "originLocationCode": "NBO",
+    "destinationLocationCode": "LHR",
+    "departureDate": "2026-12-01",
+    "adults": 1,
+}
+
+
+class TestBuildCacheKey:
+    def test_key_has_namespace_version_and_digest(self):
+        key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, SEARCH_PARAMS)
+        namespace, version, params_digest = key.split(":")
+
+        assert namespace == CacheNamespaces.FLIGHT_SEARCH
+        assert version == "v1"
+        assert len(params_digest) == KEY_DIGEST_LENGTH
+
+    def test_parameter_order_does_not_change_key(self):
+        reordered = dict(reversed(list(SEARCH_PARAMS.items())))
+        assert build_cache_key(
+            CacheNamespaces.FLIGHT_SEARCH, reordered
+        ) == build_cache_key(CacheNamespaces.FLIGHT_SEARCH, SEARCH_PARAMS)
+
+    def test_none_values_are_ignored(self):
+        with_none = {**SEARCH_PARAMS, "returnDate": None}
+        assert build_cache_key(
+            CacheNamespaces.FLIGHT_SEARCH, with_none
+        ) == build_cache_key(CacheNamespaces.FLIGHT_SEARCH, SEARCH_PARAMS)
+
+    def test_key_length_is_bounded(self):
+        long_params = {**SEARCH_PARAMS, "includedAirlineCodes": "KQ," * 500}
+        assert len(build_cache_key(CacheNamespaces.FLIGHT_SEARCH, long_params)) == len(
+            build_cache_key(CacheNamespaces.FLIGHT_SEARCH, SEARCH_PARAMS)
+        )
+
+    def test_namespaces_do_not_collide(self):
+        params = {"keyword": "NBO"}
+        assert build_cache_key(CacheNamespaces.LOCATIONS, params) != build_cache_key(
+            CacheNamespaces.DESTINATIONS, params
+        )
+
+    def test_schema_version_bump_changes_key(self, monkeypatch):
+        before = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "NBO"})
+        monkeypatch.setitem(
+            cache_keys.CACHE_SCHEMA_VERSIONS, CacheNamespaces.LOCATIONS, 2
+        )
+        after = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "NBO"})
+
+        assert before != after
+        assert after.startswith(f"{CacheNamespaces.LOCATIONS}:v2:")
+
+    def test_unknown_namespace_raises(self):
+        with pytest.raises(ValueError, match="Unknown cache namespace"):
+            build_cache_key("not_a_namespace", {})
+
+
+class TestBuildCachePattern:
+    def test_scoped_pattern_matches_only_that_scope(self):
+        key = build_cache_key(
+            CacheNamespaces.USER_BOOKINGS, {"cursor": None, "limit": 20}, scope="u1"
+        )
+        other = build_cache_key(
+            CacheNamespaces.USER_BOOKINGS, {"cursor": None, "limit": 20}, scope="u2"
+        )
+        pattern = build_cache_pattern(CacheNamespaces.USER_BOOKINGS, scope="u1")
+
+        assert fnmatchcase(key, pattern)
+        assert not fnmatchcase(other, pattern)
+
+    def test_scope_prefix_does_not_match_longer_scope(self):
+        key = build_cache_key(CacheNamespaces.USER_BOOKINGS, {}, scope="u10")
+        pattern = build_cache_pattern(CacheNamespaces.USER_BOOKINGS, scope="u1")
+
+        assert not fnmatchcase(key, pattern)
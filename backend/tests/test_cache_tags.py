@@ -0,0 +1,116 @@
+"""Tests for tag-based cache invalidation."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.crud.bookings import create_booking
+from backend.crud.users import create_user
+from backend.external_services.cache import (
+    DELETE_BATCH_SIZE,
+    RedisCache,
+    TieredCache,
+    decode_entry,
+)
+from backend.external_services.local_cache import LocalCache
+from backend.models.bookings import Booking
+from backend.utils.cache_keys import build_cache_key, build_cache_tag
+from backend.utils.constants import CacheNamespaces, CacheTags
+from conftest import API_V1_PREFIX, async_iter
+
+
+LOCATIONS_KEY = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "NBO"})
+
+
+def test_build_cache_tag():
+    assert build_cache_tag(CacheTags.USER_BOOKINGS, "u1") == "user:u1:bookings"
+
+
+class TestRedisCacheTags:
+    @pytest.fixture
+    def cache(self):
+        cache = RedisCache("localhost", 6379)
+        cache.r = AsyncMock()
+        cache._set_with_tags = AsyncMock()
+        cache._invalidate_tags = AsyncMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_untagged_set_is_a_plain_setex(self, cache):
+        await cache.set("k", ["v"], 60)
+
+        cache.r.setex.assert_called_once()
+        cache._set_with_tags.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tagged_set_registers_entry_under_each_tag(self, cache):
+        await cache.set("k", ["v"], 60, tags=["user:u1:bookings", "all-bookings"])
+
+        kwargs = cache._set_with_tags.call_args.kwargs
+        assert kwargs["keys"] == ["k", "tag:user:u1:bookings", "tag:all-bookings"]
+        ttl, entry = kwargs["args"]
+        assert (ttl, decode_entry(entry)) == (60, (["v"], None))
+        cache.r.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_counts_removed_entries(self, cache):
+        cache._invalidate_tags.return_value = [b"a", b"b"]
+
+        assert await cache.invalidate_tags("user:u1:bookings") == 2
+        cache._invalidate_tags.assert_called_once_with(keys=["tag:user:u1:bookings"])
+
+    @pytest.mark.asyncio
+    async def test_invalidate_without_tags_is_a_no_op(self, cache):
+        assert await cache.invalidate_tags() == 0
+        cache._invalidate_tags.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_unlinks_in_batches(self, cache):
+        keys = [f"k{i}".encode() for i in range(DELETE_BATCH_SIZE * 2 + 1)]
+        cache.r.scan_iter = MagicMock(return_value=async_iter(keys))
+        cache.r.unlink.side_effect = lambda *batch: len(batch)
+
+        assert await cache.delete_pattern("k*") == len(keys)
+        assert cache.r.unlink.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_invalidation_evicts_l1_everywhere(fake_clock):
+    cache = TieredCache(
+        "localhost", 6379, clock=fake_clock, local=LocalCache(10, 10_000, fake_clock)
+    )
+    cache.r = AsyncMock()
+    cache._set_with_tags = AsyncMock()
+    cache._invalidate_tags = AsyncMock(return_value=[LOCATIONS_KEY.encode()])
+    await cache.set(LOCATIONS_KEY, ["NBO"], 60, tags=["locations"])
+    cache.r.publish.reset_mock()
+
+    assert await cache.invalidate_tags("locations") == 1
+
+    assert len(cache.local) == 0
+    assert LOCATIONS_KEY in cache.r.publish.call_args.args[1]
+
+
+def test_user_bookings_are_cached_under_user_tag(client, session, mocker, memory_cache):
+    from backend.utils.security import get_current_user
+
+    user = create_user(session, "tags@example.com", "password")
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+
+    def list_bookings():
+        response = client.get(f"{API_V1_PREFIX}/bookings")
+        assert response.status_code == 200
+        return response.json()["items"]
+
+    assert list_bookings() == []
+    tag = build_cache_tag(CacheTags.USER_BOOKINGS, str(user.id))
+    assert len(memory_cache.tags[tag]) == 1
+
+    create_booking(
+        session, Booking(user_id=user.id, flight_order_id="F1", total_price=10.0)
+    )
+    assert list_bookings() == []
+
+    asyncio.run(memory_cache.invalidate_tags(tag))
+    assert len(list_bookings()) == 1
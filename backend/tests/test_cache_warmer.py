@@ -0,0 +1,171 @@
+"""Tests for the background cache warmer."""
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache_warmer import (
+    CacheWarmer,
+    booked_routes,
+)
+from backend.external_services.location_index import LocationIndex
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.quota_scheduler import QuotaScheduler
+from backend.external_services.single_flight import SingleFlight
+from backend.models.bookings import Booking
+
+TODAY = date(2030, 1, 1)
+
+
+@pytest.fixture
+def booked(session):
+    from backend.crud.users import create_user
+
+    user = create_user(session, "warmer@example.com", "password")
+    routes = [("NBO", "LHR"), ("LHR", "NBO"), ("NBO", "LHR"), ("JFK", "DXB")]
+    for origin, destination in routes:
+        session.add(
+            Booking(
+                user_id=user.id,
+                flight_order_id="X",
+                origin=origin,
+                destination=destination,
+            )
+        )
+    session.add(
+        Booking(
+            user_id=user.id,
+            flight_order_id="OLD",
+            origin="ADD",
+            destination="LOS",
+            created_at=datetime.now(timezone.utc) - timedelta(days=90),
+        )
+    )
+    session.commit()
+    return session
+
+
+def _warmer(memory_cache, scheduler=None, **kwargs) -> CacheWarmer:
+    service = AsyncFlightService(
+        MockFlightService(), scheduler=scheduler or QuotaScheduler(rate_per_second=0)
+    )
+    options = dict(max_routes=3, days_ahead=2, today=lambda: TODAY)
+    options.update(kwargs)
+    return CacheWarmer(
+        service,
+        memory_cache,
+        SingleFlight(memory_cache, poll_seconds=0.01),
+        index=LocationIndex(),
+        **options,
+    )
+
+
+def test_booked_routes_ranks_recent_bookings(booked):
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+
+    routes = booked_routes(booked, since)
+
+    assert [(r["origin"], r["destination"], r["bookings"]) for r in routes] == [
+        ("NBO", "LHR", 2),
+        ("JFK", "DXB", 1),
+        ("LHR", "NBO", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_booked_routes_are_read_off_the_event_loop(booked, memory_cache, mocker):
+    threads = []
+    mocker.patch(
+        "backend.external_services.cache_warmer.booked_routes",
+        side_effect=lambda *args: threads.append(threading.get_ident()) or [],
+    )
+    warmer = _warmer(memory_cache)
+
+    assert await warmer.hot_routes(booked) == []
+    warmer.service.shutdown()
+
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_hot_routes_are_topped_up_from_travelled_destinations(
+    session, memory_cache
+):
+    from backend.crud.users import create_user
+
+    user = create_user(session, "top-up@example.com", "password")
+    session.add(
+        Booking(
+            user_id=user.id,
+            flight_order_id="X",
+            origin="NBO",
+            destination="LHR",
+        )
+    )
+    session.commit()
+    warmer = _warmer(memory_cache)
+
+    routes = await warmer.hot_routes(session)
+    warmer.service.shutdown()
+
+    assert routes[0] == {"origin": "NBO", "destination": "LHR", "bookings": 1}
+    # The mock analytics rank LHR, then DXB; LHR is already booked
+    assert routes[1] == {"origin": "NBO", "destination": "DXB", "bookings": 0}
+    assert len(routes) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_warms_searches_until_they_near_expiry(
+    booked, memory_cache, fake_clock
+):
+    warmer = _warmer(memory_cache, interval_seconds=240)
+
+    first = await warmer.run_once(booked)
+    second = await warmer.run_once(booked)
+    # GET searches are cached for 300s; 61s later they expire before the
+    # next run would see them
+    fake_clock.advance(61)
+    third = await warmer.run_once(booked)
+    warmer.service.shutdown()
+
+    assert (first["searches"], first["warmed"], first["coverage"]) == (6, 6, 1.0)
+    assert first["locations_warmed"] == 4
+    assert (second["fresh"], second["warmed"], second["locations_warmed"]) == (6, 0, 0)
+    assert third["warmed"] == 6
+    route = booked_routes(booked, datetime(2000, 1, 1, tzinfo=timezone.utc))[0]
+    params = next(iter(warmer.planned_searches([route]).values()))
+    assert params["departureDate"] == "2030-01-02"
+
+
+@pytest.mark.asyncio
+async def test_run_stays_within_its_quota_share(booked, memory_cache, fake_clock):
+    scheduler = QuotaScheduler(
+        memory_cache, rate_per_second=1, burst=10, clock=fake_clock
+    )
+    warmer = _warmer(memory_cache, scheduler=scheduler, quota_share=0.2)
+
+    report = await warmer.run_once(booked)
+
+    # A fifth of a full ten-token bucket, then the warmer backs off
+    assert report["warmed"] == 2
+    assert report["quota_exhausted"]
+    assert report["skipped"] == 4
+    assert report["coverage"] == pytest.approx(2 / 6)
+    assert report["locations_warmed"] == 0
+    # Bookings still have the rest of the bucket
+    for _ in range(8):
+        await scheduler.acquire("create_flight_order")
+    warmer.service.shutdown()
+
+
+def test_call_budget_is_quota_share_of_one_interval(memory_cache):
+    scheduler = QuotaScheduler(memory_cache, rate_per_second=10, burst=10)
+    warmer = _warmer(
+        memory_cache, scheduler=scheduler, quota_share=0.2, interval_seconds=240
+    )
+
+    assert warmer.call_budget() == 480
+    scheduler.monthly_quota = 30 * 24 * 3600
+    assert warmer.call_budget() == 48
+    warmer.service.shutdown()
@@ -0,0 +1,141 @@
+"""Tests for concurrent, failure-isolated retrieval of flight order batches."""
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.crud.bookings import get_stored_flight_orders
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.models.bookings import Booking
+from conftest import API_V1_PREFIX
+
+UPSTREAM_LATENCY = 0.1
+
+
+class SlowMockFlightService(MockFlightService):
+    """Order lookups block for UPSTREAM_LATENCY; IDs starting BAD fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls: list[str] = []
+
+    def get_flight_order(self, flight_orderId: str) -> dict:
+        self.calls.append(flight_orderId)
+        time.sleep(UPSTREAM_LATENCY)
+        if flight_orderId.startswith("BAD"):
+            raise ValueError(f"order {flight_orderId} not found")
+        order = super().get_flight_order(flight_orderId)
+        order["id"] = flight_orderId
+        return order
+
+
+@pytest.fixture
+def provider():
+    return SlowMockFlightService()
+
+
+@pytest.fixture
+def service(provider):
+    service = AsyncFlightService(provider, max_workers=16)
+    yield service
+    service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_orders_concurrently(service):
+    order_ids = [f"ORDER{i}" for i in range(16)]
+
+    start = time.perf_counter()
+    batch = await service.get_flight_orders_batch(order_ids, concurrency=8)
+    elapsed = time.perf_counter() - start
+
+    assert list(batch["orders"]) == order_ids
+    assert batch["errors"] == {}
+    # Two rounds of eight, not sixteen sequential calls
+    assert elapsed < UPSTREAM_LATENCY * 8
+
+
+@pytest.mark.asyncio
+async def test_failed_orders_do_not_abort_the_batch(service):
+    batch = await service.get_flight_orders_batch(["ORDER1", "BAD1", "ORDER2"])
+
+    assert list(batch["orders"]) == ["ORDER1", "ORDER2"]
+    assert batch["errors"] == {"BAD1": "order BAD1 not found"}
+
+
+@pytest.mark.asyncio
+async def test_stored_orders_are_not_fetched(service, provider):
+    stored = {"ORDER1": {"id": "ORDER1", "stored": True}}
+
+    batch = await service.get_flight_orders_batch(
+        ["ORDER1", "ORDER2", "ORDER2"], stored=stored
+    )
+
+    assert provider.calls == ["ORDER2"]
+    assert batch["orders"]["ORDER1"] == stored["ORDER1"]
+    assert batch["stored"] == ["ORDER1"]
+
+
+@pytest.mark.asyncio
+async def test_get_flight_orders_keeps_request_order(service):
+    orders = await service.get_flight_orders(["ORDER3", "ORDER1", "ORDER2"])
+
+    assert [order["id"] for order in orders] == ["ORDER3", "ORDER1", "ORDER2"]
+
+
+def _booking(session, user, flight_order_id: str, response: dict | None) -> Booking:
+    booking = Booking(
+        user_id=user.id,
+        flight_order_id=flight_order_id,
+        amadeus_order_response=response,
+    )
+    session.add(booking)
+    session.commit()
+    return booking
+
+
+def test_stored_flight_orders_skip_bookings_without_response(session):
+    from backend.crud.users import create_user
+
+    user = create_user(session, "stored@example.com", "password")
+    _booking(session, user, "ORDER1", {"id": "ORDER1"})
+    _booking(session, user, "ORDER2", None)
+
+    stored = get_stored_flight_orders(session, ["ORDER1", "ORDER2", "ORDER3"])
+
+    assert stored == {"ORDER1": {"id": "ORDER1"}}
+
+
+def test_admin_refresh_updates_stored_responses(client, session, mocker):
+    from backend.crud.permissions import GroupCRUD, UserPermissionCRUD
+    from backend.crud.users import create_user
+    from backend.models.constants import ADMIN_GROUP_NAME
+    from backend.utils.security import get_current_user
+
+    admin = create_user(session, "orders-admin@example.com", "password")
+    group = GroupCRUD.create_group(session, ADMIN_GROUP_NAME)
+    UserPermissionCRUD.assign_group_to_user(session, admin.id, group.id)
+    client.app.dependency_overrides[get_current_user] = lambda: admin
+    booking = _booking(session, admin, "ORDER1", {"id": "ORDER1", "stale": True})
+    mocker.patch(
+        "backend.routers.admin.amadeus_flight_service.get_flight_orders_batch",
+        new=AsyncMock(
+            return_value={
+                "orders": {"ORDER1": {"id": "ORDER1"}},
+                "errors": {"BAD1": "order BAD1 not found"},
+                "stored": [],
+            }
+        ),
+    )
+
+    response = client.post(
+        f"{API_V1_PREFIX}/admin/bookings/flight-orders",
+        json={"flight_order_ids": ["ORDER1", "BAD1"], "refresh": True},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["errors"] == {"BAD1": "order BAD1 not found"}
+    assert response.json()["updated"] == 1
+    session.refresh(booking)
+    assert booking.amadeus_order_response == {"id": "ORDER1"}
@@ -0,0 +1,218 @@
+"""Tests for the POST flight search fingerprint and cache layer."""
+
+import copy
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services.flight_search_cache import (
+    FlightSearchCache,
+    flight_search_cache_requests,
+    search_response_payload,
+)
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.single_flight import SingleFlight
+from backend.schemas.flight_search import FlightSearchRequestPost
+from backend.utils.cache_keys import (
+    canonicalize_flight_search,
+    flight_search_fingerprint,
+)
+from conftest import API_V1_PREFIX
+
+
+SEARCH_BODY = {
+    "currencyCode": "USD",
+    "originDestinations": [
+        {
+            "id": "1",
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "LHR",
+            "departureDateTimeRange": {"date": "2026-12-01", "time": "10:00:00"},
+        },
+        {
+            "id": "2",
+            "originLocationCode": "LHR",
+            "destinationLocationCode": "NBO",
+            "departureDateTimeRange": {"date": "2026-12-10", "time": "10:00:00"},
+        },
+    ],
+    "travelers": [
+        {"id": "1", "travelerType": "ADULT"},
+        {"id": "2", "travelerType": "HELD_INFANT", "associatedAdultId": "1"},
+    ],
+    "sources": ["GDS"],
+    "searchCriteria": {
+        "excludeAllotments": True,
+        "addOneWayOffers": False,
+        "maxFlightOffers": 10,
+        "allowAlternativeFareOptions": True,
+        "oneFlightOfferPerDay": True,
+        "additionalInformation": {
+            "chargeableCheckedBags": True,
+            "brandedFares": True,
+            "fareRules": False,
+        },
+        "pricingOptions": {"includedCheckedBagsOnly": False},
+        "flightFilters": {
+            "crossBorderAllowed": False,
+            "moreOvernightsAllowed": False,
+            "returnToDepartureAirport": False,
+            "railSegmentAllowed": True,
+            "busSegmentAllowed": True,
+            "carrierRestrictions": {
+                "blacklistedInEUAllowed": False,
+                "includedCarrierCodes": ["KQ", "BA"],
+            },
+            "cabinRestrictions": [
+                {
+                    "cabin": "ECONOMY",
+                    "coverage": "MOST_SEGMENTS",
+                    "originDestinationIds": ["2", "1"],
+                }
+            ],
+            "connectionRestriction": {
+                "airportChangeAllowed": False,
+                "technicalStopsAllowed": True,
+            },
+        },
+    },
+}
+
+
+def _reverse_keys(value):
+    """Rebuild nested dicts with their keys in reverse insertion order."""
+    if isinstance(value, dict):
+        return {key: _reverse_keys(value[key]) for key in reversed(list(value))}
+    if isinstance(value, list):
+        return [_reverse_keys(item) for item in value]
+    return value
+
+
+@pytest.fixture
+def search_request():
+    return FlightSearchRequestPost(**SEARCH_BODY)
+
+
+def _counter_value(result: str) -> float:
+    return flight_search_cache_requests.labels(result=result)._value.get()
+
+
+class TestFlightSearchFingerprint:
+    def test_field_order_does_not_change_fingerprint(self, search_request):
+        reordered = FlightSearchRequestPost.model_validate_json(
+            json.dumps(_reverse_keys(SEARCH_BODY))
+        )
+        assert flight_search_fingerprint(reordered) == flight_search_fingerprint(
+            search_request
+        )
+
+    def test_unordered_lists_do_not_change_fingerprint(self, search_request):
+        body = copy.deepcopy(SEARCH_BODY)
+        body["originDestinations"].reverse()
+        body["travelers"].reverse()
+        body["searchCriteria"]["flightFilters"]["carrierRestrictions"][
+            "includedCarrierCodes"
+        ] = ["ba", "KQ"]
+        body["searchCriteria"]["flightFilters"]["cabinRestrictions"][0][
+            "originDestinationIds"
+        ] = ["1", "2"]
+
+        assert flight_search_fingerprint(
+            FlightSearchRequestPost(**body)
+        ) == flight_search_fingerprint(search_request)
+
+    def test_explicit_defaults_do_not_change_fingerprint(self, search_request):
+        body = copy.deepcopy(SEARCH_BODY)
+        body["travelers"][0]["associatedAdultId"] = None
+
+        assert flight_search_fingerprint(
+            FlightSearchRequestPost(**body)
+        ) == flight_search_fingerprint(search_request)
+
+    def test_location_codes_are_case_insensitive(self, search_request):
+        body = copy.deepcopy(SEARCH_BODY)
+        body["originDestinations"][0]["originLocationCode"] = "nbo"
+
+        assert flight_search_fingerprint(
+            FlightSearchRequestPost(**body)
+        ) == flight_search_fingerprint(search_request)
+
+    def test_different_searches_have_different_fingerprints(self, search_request):
+        body = copy.deepcopy(SEARCH_BODY)
+        body["originDestinations"][0]["departureDateTimeRange"]["date"] = "2026-12-02"
+
+        assert flight_search_fingerprint(
+            FlightSearchRequestPost(**body)
+        ) != flight_search_fingerprint(search_request)
+
+    def test_canonical_form_drops_defaults(self, search_request):
+        canonical = canonicalize_flight_search(search_request)
+        assert "associatedAdultId" not in canonical["travelers"][0]
+        assert canonical["travelers"][1]["associatedAdultId"] == "1"
+
+
+class TestFlightSearchCache:
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, search_request, memory_cache):
+        cache = FlightSearchCache(memory_cache, ttl_seconds=120)
+        misses_before = _counter_value("miss")
+        hits_before = _counter_value("hit")
+
+        assert await cache.get(search_request) is None
+        await memory_cache.set(cache.key_for(search_request), {"data": [{"id": "1"}]})
+        assert await cache.get(search_request) == {"data": [{"id": "1"}]}
+
+        assert _counter_value("miss") == misses_before + 1
+        assert _counter_value("hit") == hits_before + 1
+
+    def test_empty_results_are_not_cacheable(self):
+        assert not FlightSearchCache.is_cacheable({"data": []})
+        assert FlightSearchCache.is_cacheable({"data": [{"id": "1"}]})
+
+    @pytest.mark.asyncio
+    async def test_reordered_request_hits_same_entry(
+        self, search_request, memory_cache
+    ):
+        cache = FlightSearchCache(memory_cache)
+        await memory_cache.set(cache.key_for(search_request), {"data": [{"id": "1"}]})
+
+        body = copy.deepcopy(SEARCH_BODY)
+        body["travelers"].reverse()
+        reordered = FlightSearchRequestPost.model_validate_json(
+            json.dumps(_reverse_keys(body))
+        )
+
+        assert await cache.get(reordered) == {"data": [{"id": "1"}]}
+
+
+def test_endpoint_caches_searches_with_the_configured_ttl(
+    client, mocker, memory_cache, search_request
+):
+    cache = FlightSearchCache(memory_cache, ttl_seconds=42)
+    mocker.patch("backend.routers.flights.flight_search_cache", cache)
+    mocker.patch(
+        "backend.routers.flights.upstream_single_flight", SingleFlight(memory_cache)
+    )
+    upstream = mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.search_flights",
+        new=AsyncMock(return_value=MockFlightService().search_flights({})),
+    )
+
+    responses = [
+        client.post(f"{API_V1_PREFIX}/shopping/flight-offers", json=SEARCH_BODY)
+        for _ in range(2)
+    ]
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].json() == responses[1].json()
+    upstream.assert_awaited_once()
+    assert memory_cache.ttls[cache.key_for(search_request)] == 42
+
+
+def test_search_response_payload_from_mock_response():
+    response = MockFlightService().search_flights({})
+    payload = search_response_payload(response)
+
+    assert payload["data"] == response.data
+    assert payload["dictionaries"] is None
+    json.dumps(payload)
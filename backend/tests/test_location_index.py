@@ -0,0 +1,250 @@
+"""Tests for the in-memory airport/city autocomplete index."""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services import location_index as location_index_module
+from backend.external_services.location_index import (
+    LocationIndex,
+    load_location_index,
+    tokenize,
+)
+from conftest import API_V1_PREFIX
+
+
+def _location(
+    location_id,
+    iata,
+    name,
+    city,
+    country,
+    sub_type="AIRPORT",
+    score=None,
+):
+    location = {
+        "type": "location",
+        "subType": sub_type,
+        "name": name,
+        "detailedName": f"{city}/{country[:2]}:{name}",
+        "id": location_id,
+        "self": {"href": f"https://example.test/{location_id}", "methods": ["GET"]},
+        "timeZoneOffset": "+00:00",
+        "iataCode": iata,
+        "geoCode": {"latitude": 0.0, "longitude": 0.0},
+        "address": {
+            "cityName": city,
+            "cityCode": iata,
+            "countryName": country,
+            "countryCode": country[:2],
+            "regionCode": "XX",
+        },
+    }
+    if score is not None:
+        location["analytics"] = {"travelers": {"score": score}}
+    return location
+
+
+LOCATIONS = [
+    _location("ANBO", "NBO", "JOMO KENYATTA INTL", "NAIROBI", "KENYA", score=25),
+    _location("AWIL", "WIL", "WILSON", "NAIROBI", "KENYA", score=3),
+    _location("CNBO", "NBO", "NAIROBI", "NAIROBI", "KENYA", sub_type="CITY"),
+    _location("ALHR", "LHR", "HEATHROW", "LONDON", "UNITED KINGDOM", score=45),
+    _location("ALGW", "LGW", "GATWICK", "LONDON", "UNITED KINGDOM", score=27),
+    _location("AMUC", "MUC", "MÜNCHEN FRANZ JOSEF STRAUSS", "MÜNCHEN", "GERMANY"),
+    _location("ANBE", "NBE", "ENFIDHA", "NABEUL", "TUNISIA"),
+]
+
+
+def _ids(results):
+    return [location["id"] for location in results]
+
+
+@pytest.fixture
+def index():
+    index = LocationIndex()
+    index.load(LOCATIONS)
+    return index
+
+
+def test_tokenize_strips_accents_and_punctuation():
+    assert tokenize("München/DE:Franz-Josef") == ["MUNCHEN", "DE", "FRANZ", "JOSEF"]
+
+
+class TestSearch:
+    def test_exact_iata_code_ranks_first(self, index):
+        results = index.search("nbo")
+
+        assert set(_ids(results)[:2]) == {"ANBO", "CNBO"}
+
+    def test_prefix_matches_city_name(self, index):
+        assert set(_ids(index.search("nair"))) == {"ANBO", "AWIL", "CNBO"}
+
+    def test_popularity_breaks_ties(self, index):
+        assert _ids(index.search("london")) == ["ALHR", "ALGW"]
+
+    def test_every_word_must_match_in_any_order(self, index):
+        assert _ids(index.search("kenyatta nai")) == ["ANBO"]
+        assert index.search("kenyatta london") == []
+
+    @pytest.mark.parametrize("verify_below", [0, 500])
+    def test_multi_word_paths_agree(self, index, monkeypatch, verify_below):
+        monkeypatch.setattr(
+            location_index_module, "VERIFY_CANDIDATES_BELOW", verify_below
+        )
+
+        assert _ids(index.search("nairobi wilson")) == ["AWIL"]
+        assert _ids(index.search("nairobi wilsom")) == ["AWIL"]
+        assert _ids(index.search("kenya nbo", "CITY")) == ["CNBO"]
+
+    def test_accented_names_match_plain_queries(self, index):
+        assert _ids(index.search("munchen")) == ["AMUC"]
+
+    @pytest.mark.parametrize("typo", ["NIAROBI", "NAIROB1", "NAIRBI", "NAIIROBI"])
+    def test_fuzzy_matches_one_edit_away(self, index, typo):
+        assert "ANBO" in _ids(index.search(typo))
+
+    def test_fuzzy_is_not_used_for_short_words(self, index):
+        assert index.search("NBX") == []
+
+    def test_exact_matches_suppress_fuzzy_matches(self, index):
+        index.add_many(
+            [
+                _location("ACIA", "CIA", "CIAMPINO", "ROMA", "ITALY"),
+                _location("AROM", "RMG", "RICHARD B RUSSELL", "ROME", "UNITED STATES"),
+            ]
+        )
+
+        assert _ids(index.search("roma")) == ["ACIA"]
+        assert set(_ids(index.search("romx"))) == {"ACIA", "AROM"}
+
+    def test_sub_type_filter(self, index):
+        assert _ids(index.search("nairobi", "CITY")) == ["CNBO"]
+        assert "CNBO" not in _ids(index.search("nairobi", "AIRPORT"))
+        assert len(index.search("nairobi", "AIRPORT,CITY")) == 3
+
+    def test_limit(self, index):
+        assert len(index.search("nairobi", limit=2)) == 2
+
+    def test_blank_keyword_returns_nothing(self, index):
+        assert index.search("  /- ") == []
+
+
+class TestUpdates:
+    def test_add_many_indexes_new_locations(self, index):
+        added = index.add_many(
+            [_location("AMBA", "MBA", "MOI INTL", "MOMBASA", "KENYA")]
+        )
+
+        assert added == 1
+        assert _ids(index.search("momb")) == ["AMBA"]
+        assert len(index) == len(LOCATIONS) + 1
+
+    def test_unchanged_locations_are_skipped(self, index):
+        assert index.add_many(LOCATIONS) == 0
+
+    def test_update_removes_old_tokens(self, index):
+        renamed = _location("AWIL", "WIL", "WILSON FIELD", "LANGATA", "KENYA")
+
+        assert index.add_many([renamed]) == 1
+        assert "AWIL" not in _ids(index.search("nairobi", "AIRPORT"))
+        assert _ids(index.search("langata field")) == ["AWIL"]
+
+    def test_tokens_of_removed_entries_are_dropped(self):
+        index = LocationIndex()
+        index.add_many([_location("AXYZ", "XYZ", "ZANZIBAR", "ZANZIBAR", "TZ")])
+        index.add_many([_location("AXYZ", "XYZ", "KISAUNI", "KISAUNI", "TZ")])
+
+        assert index.search("zanz") == []
+        assert index.search("zanzibr") == []
+        assert _ids(index.search("kisa")) == ["AXYZ"]
+
+    def test_short_query_memo_is_invalidated_by_updates(self, index):
+        assert _ids(index.search("g")) == ["ALGW", "AMUC"]
+
+        index.add_many([_location("AGOM", "GOM", "GOMA", "GOMA", "DR CONGO")])
+
+        assert "AGOM" in _ids(index.search("g"))
+
+    def test_load_replaces_contents(self, index):
+        index.load(LOCATIONS[:1])
+
+        assert len(index) == 1
+        assert index.search("london") == []
+
+    def test_only_a_loaded_dataset_is_complete(self):
+        index = LocationIndex()
+        index.add_many(LOCATIONS)
+
+        assert not index.complete
+        index.load(LOCATIONS)
+        assert index.complete
+
+
+class TestLoadLocationIndex:
+    def test_loads_dataset_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(location_index_module, "location_index", LocationIndex())
+        dataset = tmp_path / "locations.json"
+        dataset.write_text(json.dumps(LOCATIONS))
+
+        assert load_location_index(str(dataset)) == len(LOCATIONS)
+        assert location_index_module.location_index.search("gatwick")
+
+    def test_missing_dataset_is_ignored(self, tmp_path):
+        assert load_location_index(str(tmp_path / "missing.json")) == 0
+
+    def test_no_dataset_configured(self):
+        assert load_location_index(None) == 0
+
+
+def test_locations_endpoint_is_served_from_index(client, mocker, index):
+    mocker.patch("backend.routers.flights.location_index", index)
+    upstream = mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.airport_city_search",
+        new=AsyncMock(),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/reference-data/locations", params={"keyword": "gatw"}
+    )
+
+    assert response.status_code == 200
+    assert _ids(response.json()) == ["ALGW"]
+    upstream.assert_not_called()
+
+
+def test_locations_endpoint_indexes_upstream_results(client, mocker):
+    index = LocationIndex()
+    mocker.patch("backend.routers.flights.location_index", index)
+    mocker.patch(
+        "backend.routers.flights.upstream_single_flight.load_with_revalidation",
+        new=AsyncMock(return_value=LOCATIONS[3:5]),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/reference-data/locations", params={"keyword": "london"}
+    )
+
+    assert response.status_code == 200
+    assert _ids(index.search("heathrow")) == ["ALHR"]
+
+
+def test_partial_index_does_not_answer_lookups(client, mocker):
+    # Filled by an earlier "LON" lookup
+    index = LocationIndex()
+    index.add_many(LOCATIONS[3:5])
+    mocker.patch("backend.routers.flights.location_index", index)
+    manchester = _location("AMAN", "MAN", "MANCHESTER", "MANCHESTER", "UNITED KINGDOM")
+    upstream = mocker.patch(
+        "backend.routers.flights.upstream_single_flight.load_with_revalidation",
+        new=AsyncMock(return_value=[*LOCATIONS[3:5], manchester]),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/reference-data/locations", params={"keyword": "united"}
+    )
+
+    assert response.status_code == 200
+    assert _ids(response.json()) == ["ALHR", "ALGW", "AMAN"]
+    upstream.assert_awaited_once()
+    assert "AMAN" in _ids(index.search("united"))
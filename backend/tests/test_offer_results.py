@@ -0,0 +1,259 @@
+"""Tests for server-side slicing of cached flight search results."""
+
+import asyncio
+from datetime import time
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services.local_cache import LocalCache
+from backend.external_services.offer_results import (
+    MISSING_MINUTES,
+    OfferResultSet,
+    OfferResultStore,
+    handle_for,
+    parse_duration_minutes,
+)
+from backend.schemas.offer_results import OfferSliceParams
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+from conftest import API_V1_PREFIX
+
+
+def _offer(offer_id, price, duration, departure, arrival, carrier, segments=1):
+    legs = [
+        {
+            "departure": {"iataCode": "NBO", "at": departure},
+            "arrival": {"iataCode": "LHR", "at": arrival},
+            "carrierCode": carrier,
+            "numberOfStops": 0,
+        }
+    ] * segments
+    return {
+        "id": offer_id,
+        "price": {"currency": "USD", "grandTotal": f"{price:.2f}"},
+        "validatingAirlineCodes": [carrier],
+        "itineraries": [{"duration": duration, "segments": legs}],
+    }
+
+
+OFFERS = [
+    _offer("1", 685.5, "PT8H30M", "2026-12-01T06:00:00", "2026-12-01T14:30:00", "KQ"),
+    _offer(
+        "2", 542.3, "PT13H45M", "2026-12-01T22:55:00", "2026-12-02T11:40:00", "EK", 2
+    ),
+    _offer(
+        "3", 823.0, "PT15H20M", "2026-12-01T11:30:00", "2026-12-02T05:50:00", "ET", 2
+    ),
+    _offer("4", 610.0, "PT9H", "2026-12-01T09:15:00", "2026-12-01T18:15:00", "KQ"),
+    {"id": "5", "price": {"grandTotal": "n/a"}, "itineraries": []},
+]
+
+SEARCH_PARAMS = {
+    "originLocationCode": "NBO",
+    "destinationLocationCode": "LHR",
+    "departureDate": "2026-12-01",
+}
+
+
+def _ids(page):
+    return [item["id"] for item in page.items]
+
+
+@pytest.fixture
+def result_set():
+    return OfferResultSet.from_offers("a" * 32, OFFERS)
+
+
+@pytest.fixture
+def store(memory_cache):
+    return OfferResultStore(
+        memory_cache, local=LocalCache(max_entries=8, max_bytes=2**20)
+    )
+
+
+@pytest.mark.parametrize(
+    "duration, minutes",
+    [("PT8H30M", 510), ("PT45M", 45), ("PT2H", 120), ("P1DT1H", 1500)],
+)
+def test_parse_duration_minutes(duration, minutes):
+    assert parse_duration_minutes(duration) == minutes
+
+
+@pytest.mark.parametrize("duration", [None, "", "8h", "P"])
+def test_malformed_durations_are_missing(duration):
+    assert parse_duration_minutes(duration) == MISSING_MINUTES
+
+
+class TestSlice:
+    def test_default_sort_is_cheapest_first(self, result_set):
+        # Offers without a usable price sort last
+        assert _ids(result_set.slice(OfferSliceParams())) == ["2", "4", "1", "3", "5"]
+
+    def test_sort_by_duration_descending(self, result_set):
+        page = result_set.slice(OfferSliceParams(sort="duration", order="desc"))
+
+        assert _ids(page) == ["3", "2", "4", "1", "5"]
+
+    def test_sort_by_departure(self, result_set):
+        page = result_set.slice(OfferSliceParams(sort="departure"))
+
+        assert _ids(page) == ["1", "4", "3", "2", "5"]
+
+    def test_pages(self, result_set):
+        first = result_set.slice(OfferSliceParams(limit=2))
+        second = result_set.slice(OfferSliceParams(offset=2, limit=2))
+
+        assert (_ids(first), first.has_more) == (["2", "4"], True)
+        assert _ids(second) == ["1", "3"]
+        assert second.total_count == second.result_count == 5
+
+    def test_filters_combine(self, result_set):
+        page = result_set.slice(OfferSliceParams(max_stops=0, carriers="kq, BA"))
+
+        assert _ids(page) == ["4", "1"]
+        assert page.total_count == 2
+
+    def test_max_price(self, result_set):
+        assert _ids(result_set.slice(OfferSliceParams(max_price=650))) == ["2", "4"]
+
+    def test_departure_window(self, result_set):
+        page = result_set.slice(
+            OfferSliceParams(departure_after=time(8), departure_before=time(12))
+        )
+
+        assert _ids(page) == ["4", "3"]
+
+    def test_window_past_midnight(self, result_set):
+        page = result_set.slice(
+            OfferSliceParams(departure_after=time(22), departure_before=time(7))
+        )
+
+        assert _ids(page) == ["2", "1"]
+
+    def test_summary_view(self, result_set):
+        page = result_set.slice(OfferSliceParams(view="summary", limit=1))
+
+        assert page.items == [
+            {
+                "id": "2",
+                "price": 542.3,
+                "currency": "USD",
+                "duration_minutes": 825,
+                "departure_at": "2026-12-01T22:55:00",
+                "arrival_at": "2026-12-02T11:40:00",
+                "stops": 1,
+                "carrier": "EK",
+            }
+        ]
+
+
+class TestStore:
+    @pytest.mark.asyncio
+    async def test_ingest_and_get_from_redis(self, store, memory_cache):
+        search_key = build_cache_key(CacheNamespaces.FLIGHT_SEARCH, SEARCH_PARAMS)
+        handle = (await store.ingest(search_key, OFFERS)).handle
+        store.local.clear()
+
+        result_set = await store.get(handle)
+
+        assert handle == handle_for(search_key)
+        assert store.key_for(handle) in memory_cache.store
+        assert _ids(result_set.slice(OfferSliceParams())) == ["2", "4", "1", "3", "5"]
+
+    @pytest.mark.asyncio
+    async def test_get_prefers_local_copy(self, store, memory_cache):
+        result_set = await store.ingest("flight_search:v1:abc", OFFERS)
+        memory_cache.store.clear()
+
+        assert await store.get(result_set.handle) is result_set
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_stored(self, store, memory_cache):
+        result_set = await store.ingest("flight_search:v1:abc", [])
+
+        assert result_set.slice(OfferSliceParams()).total_count == 0
+        assert memory_cache.store == {}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("handle", ["missing", "*", "A" * 32])
+    async def test_unknown_or_malformed_handles(self, store, handle):
+        assert await store.get(handle) is None
+
+
+@pytest.fixture
+def patched_store(mocker, store):
+    mocker.patch("backend.routers.flights.offer_result_store", store)
+    return store
+
+
+def test_search_results_endpoint_reuses_cached_search(
+    client, mocker, memory_cache, patched_store
+):
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    asyncio.run(
+        memory_cache.set(
+            build_cache_key(
+                CacheNamespaces.FLIGHT_SEARCH,
+                {**SEARCH_PARAMS, "adults": 1, "max": 5, "currencyCode": "USD"},
+            ),
+            OFFERS,
+        )
+    )
+    upstream = mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.search_flights_get",
+        new=AsyncMock(),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers/results",
+        params={**SEARCH_PARAMS, "sort": "duration", "limit": 2},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [offer["id"] for offer in body["items"]] == ["1", "4"]
+    assert body["has_more"] is True
+    upstream.assert_not_called()
+
+    # Follow-up page through the handle, never touching the search cache
+    memory_cache.store.clear()
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers/results/{body['handle']}",
+        params={"sort": "duration", "offset": 2, "limit": 2, "view": "summary"},
+    )
+
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()["items"]] == ["2", "3"]
+
+
+def test_search_results_endpoint_searches_on_miss(
+    client, mocker, memory_cache, patched_store
+):
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch(
+        "backend.routers.flights.upstream_single_flight.load",
+        new=AsyncMock(return_value=OFFERS),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers/results",
+        params={**SEARCH_PARAMS, "max_stops": 0},
+    )
+
+    assert response.status_code == 200
+    assert [offer["id"] for offer in response.json()["items"]] == ["4", "1"]
+
+
+def test_expired_handle_returns_404(client, patched_store):
+    response = client.get(f"{API_V1_PREFIX}/shopping/flight-offers/results/{'0' * 32}")
+
+    assert response.status_code == 404
+
+
+def test_slice_params_are_validated(client, patched_store):
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers/results/{'0' * 32}",
+        params={"limit": 500},
+    )
+
+    assert response.status_code == 422
@@ -166,3 +166,54 @@ class TestCursorPaginator:
         assert paginator._cursor_values is not None
         assert paginator._cursor_values["created_at"] == cursor_data["created_at"]
         assert paginator._cursor_values["id"] == cursor_data["id"]
+
+    def test_cursor_filter_compares_row_values(self):
+        """Test that the cursor condition is one row-value comparison."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from backend.models.bookings import Booking
+
+        cursor = encode_cursor(
+            {"created_at": datetime.now(timezone.utc), "id": uuid.uuid4()}
+        )
+        paginator = CursorPaginator(
+            cursor=cursor, limit=10, order_fields=["created_at", "id"]
+        )
+
+        query = paginator.apply_cursor_filter(select(Booking.id), Booking)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        assert "(booking.created_at, booking.id) < (" in sql
+        assert " OR " not in sql
+
+
+def test_cursor_pages_through_tied_timestamps(session):
+    """Test that bookings sharing created_at are each returned once."""
+    from backend.crud.bookings import get_all_bookings_cursor
+    from backend.crud.users import create_user
+    from backend.models.bookings import Booking
+
+    user = create_user(session, "pages@example.com", "password")
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for minutes in (0, 0, 0, 1, 1):
+        session.add(
+            Booking(
+                user_id=user.id,
+                flight_order_id="X",
+                created_at=created_at + timedelta(minutes=minutes),
+            )
+        )
+    session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        bookings, cursor, has_more, _ = get_all_bookings_cursor(
+            session, cursor=cursor, limit=2
+        )
+        seen += [(booking.created_at, booking.id) for booking in bookings]
+        if not has_more:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+    assert seen == sorted(seen, reverse=True)
@@ -0,0 +1,245 @@
+"""Tests for the flexible-date price calendar."""
+
+import asyncio
+import json
+from datetime import date
+
+import pytest
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.price_calendar import (
+    PriceCalendar,
+    cheapest_offer,
+    summarize_day,
+)
+from backend.external_services.single_flight import SingleFlight
+from backend.schemas.price_calendar import PriceCalendarRequest
+from backend.utils.cache_keys import build_cache_key
+from backend.utils.constants import CacheNamespaces
+from conftest import API_V1_PREFIX
+
+
+TODAY = date(2026, 12, 1)
+
+
+def _offer(price, carrier="KQ", segments=1):
+    return {
+        "price": {"currency": "USD", "grandTotal": f"{price:.2f}"},
+        "validatingAirlineCodes": [carrier],
+        "itineraries": [{"segments": [{"carrierCode": carrier}] * segments}],
+    }
+
+
+class FakeSearchService:
+    """Async provider stand-in with per-date prices, delays and failures."""
+
+    def __init__(self, prices=None, delays=None, failures=(), delay=0.01):
+        self.prices = prices or {}
+        self.delays = delays or {}
+        self.failures = set(failures)
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def search_flights_get(self, params):
+        day = params["departureDate"]
+        self.calls.append(day)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(day, self.delay))
+            if day in self.failures:
+                raise RuntimeError("upstream error")
+            return [_offer(self.prices.get(day, 500)), _offer(900)]
+        finally:
+            self.running -= 1
+
+
+def _request(**overrides):
+    params = {
+        "originLocationCode": "nbo",
+        "destinationLocationCode": "LHR",
+        "departureDate": "2026-12-10",
+        "window": 3,
+    }
+    params.update(overrides)
+    return PriceCalendarRequest(**params)
+
+
+def _calendar(service, cache, **kwargs):
+    return PriceCalendar(service, cache, SingleFlight(cache), **kwargs)
+
+
+class TestHelpers:
+    def test_dates_cover_window(self):
+        dates = PriceCalendar.dates(_request(), today=TODAY)
+
+        assert dates[0] == date(2026, 12, 7)
+        assert dates[-1] == date(2026, 12, 13)
+        assert len(dates) == 7
+
+    def test_past_dates_are_skipped(self):
+        dates = PriceCalendar.dates(_request(departureDate="2026-12-02"), today=TODAY)
+
+        assert dates == [date(2026, 12, d) for d in (1, 2, 3, 4, 5)]
+
+    def test_search_params_share_get_search_cache_key(self):
+        params = PriceCalendar.search_params(_request(), date(2026, 12, 10))
+
+        assert params == {
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "LHR",
+            "departureDate": "2026-12-10",
+            "adults": 1,
+            "max": 5,
+            "currencyCode": "USD",
+        }
+
+    def test_cheapest_offer_skips_unpriced_offers(self):
+        offers = [_offer(300), {"price": {}}, _offer(120), {"price": None}]
+
+        assert cheapest_offer(offers)["price"]["grandTotal"] == "120.00"
+
+    def test_summarize_day(self):
+        day = summarize_day(TODAY, [_offer(250, carrier="BA", segments=2)])
+
+        assert (day.status, day.price, day.carrier, day.stops) == ("ok", 250, "BA", 1)
+        assert summarize_day(TODAY, []).status == "no_flights"
+
+
+@pytest.mark.asyncio
+async def test_calendar_reports_cheapest_date(memory_cache):
+    service = FakeSearchService(prices={"2026-12-09": 320, "2026-12-12": 410})
+
+    calendar = await _calendar(service, memory_cache).build(_request(), today=TODAY)
+
+    assert [day.date.day for day in calendar.days] == list(range(7, 14))
+    assert calendar.cheapest_date == date(2026, 12, 9)
+    assert calendar.complete is True
+    assert calendar.origin == "NBO"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(memory_cache):
+    service = FakeSearchService(delay=0.02)
+
+    await _calendar(service, memory_cache, max_concurrency=2).build(
+        _request(), today=TODAY
+    )
+
+    assert len(service.calls) == 7
+    assert service.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_and_failing_dates_do_not_block_the_rest(memory_cache):
+    service = FakeSearchService(delays={"2026-12-08": 1.0}, failures={"2026-12-11"})
+    calendar = _calendar(service, memory_cache, call_timeout=0.1)
+
+    completed = [day async for day in calendar.iter_days(_request(), today=TODAY)]
+    statuses = {day.date.day: day.status for day in completed}
+
+    assert statuses[8] == "timeout"
+    assert statuses[11] == "error"
+    assert [status for status in statuses.values()].count("ok") == 5
+    # The slow date finishes last
+    assert completed[-1].date.day == 8
+    assert calendar.response(_request(), completed).complete is False
+
+
+@pytest.mark.asyncio
+async def test_cached_dates_are_not_searched_again(memory_cache):
+    cached_day = date(2026, 12, 10)
+    key = build_cache_key(
+        CacheNamespaces.FLIGHT_SEARCH,
+        PriceCalendar.search_params(_request(), cached_day),
+    )
+    await memory_cache.set(key, [_offer(99)])
+    service = FakeSearchService()
+
+    calendar = await _calendar(service, memory_cache).build(_request(), today=TODAY)
+
+    assert "2026-12-10" not in service.calls
+    assert calendar.cheapest_date == cached_day
+    # Every other date is now cached for the next calendar or search
+    assert len(memory_cache.store) == 7
+
+
+@pytest.mark.asyncio
+async def test_works_with_mock_provider(memory_cache):
+    calendar = await _calendar(
+        AsyncFlightService(MockFlightService()), memory_cache
+    ).build(_request(window=1), today=TODAY)
+
+    assert [day.status for day in calendar.days] == ["ok"] * 3
+    assert all(day.price for day in calendar.days)
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def fake_calendar(mocker, memory_cache):
+    calendar = _calendar(FakeSearchService(prices={"2026-12-12": 150}), memory_cache)
+    mocker.patch("backend.routers.flights.price_calendar", calendar)
+    mocker.patch(
+        "backend.external_services.price_calendar.date",
+        wraps=date,
+        **{"today.return_value": TODAY},
+    )
+    return calendar
+
+
+def test_price_calendar_endpoint(client, fake_calendar):
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/price-calendar",
+        params={
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "LHR",
+            "departureDate": "2026-12-10",
+            "window": 2,
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cheapest_date"] == "2026-12-12"
+    assert len(body["days"]) == 5
+
+
+def test_price_calendar_window_is_bounded(client, fake_calendar):
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/price-calendar",
+        params={
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "LHR",
+            "departureDate": "2026-12-10",
+            "window": 30,
+        },
+    )
+
+    assert response.status_code == 422
+
+
+def test_price_calendar_stream(client, fake_calendar):
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/price-calendar/stream",
+        params={
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "LHR",
+            "departureDate": "2026-12-10",
+            "window": 1,
+        },
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["day", "day", "day", "complete"]
+    assert events[-1][1]["complete"] is True
+    assert len(events[-1][1]["days"]) == 3
@@ -0,0 +1,199 @@
+"""Tests for the pricing confirmation cache and its reuse when booking."""
+
+import asyncio
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.pricing_cache import (
+    PricingCache,
+    offer_expires_at,
+    pricing_cache_requests,
+    pricing_response_payload,
+)
+from backend.external_services.single_flight import SingleFlight
+from backend.utils.cache_keys import canonicalize_flight_offer
+from conftest import API_V1_PREFIX
+
+# One minute after FakeClock's start time
+TICKETING_DEADLINE = "1970-01-12T13:47:40"
+
+
+@pytest.fixture
+def offer():
+    priced = MockFlightService().confirm_price({}).data["flightOffers"][0]
+    offer = copy.deepcopy(priced)
+    offer["lastTicketingDate"] = "1970-01-12"
+    offer["lastTicketingDateTime"] = TICKETING_DEADLINE
+    return offer
+
+
+@pytest.fixture
+def pricing_cache(memory_cache, fake_clock):
+    return PricingCache(
+        memory_cache,
+        single_flight=SingleFlight(memory_cache, poll_seconds=0.01),
+        clock=fake_clock,
+    )
+
+
+def _priced_payload(offer: dict, total: str = "700.00") -> dict:
+    priced = copy.deepcopy(offer)
+    priced["price"]["grandTotal"] = total
+    return {"data": {"type": "flight-offers-pricing", "flightOffers": [priced]}}
+
+
+def _hits() -> float:
+    return pricing_cache_requests.labels(result="hit")._value.get()
+
+
+class TestOfferFingerprint:
+    def test_price_and_availability_do_not_change_fingerprint(self, offer):
+        priced = copy.deepcopy(offer)
+        priced["price"]["grandTotal"] = "999.99"
+        priced["numberOfBookableSeats"] = 1
+        priced["lastTicketingDate"] = "2030-01-01"
+        priced["travelerPricings"][0]["price"]["total"] = "999.99"
+
+        assert canonicalize_flight_offer(priced) == canonicalize_flight_offer(offer)
+
+    def test_field_order_does_not_change_fingerprint(self, offer):
+        reordered = {key: offer[key] for key in reversed(list(offer))}
+
+        assert canonicalize_flight_offer(reordered) == canonicalize_flight_offer(offer)
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda o: o["itineraries"][0]["segments"][0].update(number="101"),
+            lambda o: o["itineraries"][0]["segments"][0]["departure"].update(
+                at="2026-09-02T06:00:00"
+            ),
+            lambda o: o["travelerPricings"][0]["fareDetailsBySegment"][0].update(
+                fareBasis="QOWKE"
+            ),
+            lambda o: o["price"].update(currency="EUR"),
+            lambda o: o.update(id="2"),
+        ],
+    )
+    def test_pricing_relevant_changes_change_fingerprint(self, offer, change):
+        changed = copy.deepcopy(offer)
+        change(changed)
+
+        assert canonicalize_flight_offer(changed) != canonicalize_flight_offer(offer)
+
+
+class TestPricingCache:
+    def test_ttl_is_capped_by_ticketing_deadline(self, pricing_cache, offer):
+        # FakeClock starts 60 seconds before the deadline
+        assert offer_expires_at(offer) - pricing_cache.clock() == 60
+        assert pricing_cache.ttl_for(offer) == 60
+
+        offer["lastTicketingDateTime"] = None
+        offer["lastTicketingDate"] = "1970-01-13"
+        assert pricing_cache.ttl_for(offer) == pricing_cache.ttl_seconds
+
+    @pytest.mark.asyncio
+    async def test_repeated_confirmation_prices_once(
+        self, pricing_cache, offer, memory_cache
+    ):
+        fetch = AsyncMock(return_value=_priced_payload(offer))
+        hits = _hits()
+
+        first = await pricing_cache.confirm(offer, fetch)
+        second = await pricing_cache.confirm(copy.deepcopy(offer), fetch)
+
+        assert first == second
+        assert fetch.await_count == 1
+        assert _hits() == hits + 1
+        assert memory_cache.ttls[pricing_cache.key_for(offer)] == 60
+
+    @pytest.mark.asyncio
+    async def test_concurrent_confirmations_share_one_call(self, pricing_cache, offer):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _priced_payload(offer)
+
+        results = await asyncio.gather(
+            *(pricing_cache.confirm(offer, fetch) for _ in range(10))
+        )
+
+        assert calls == 1
+        assert all(result == results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_expired_offer_is_not_cached(
+        self, pricing_cache, offer, memory_cache, fake_clock
+    ):
+        fake_clock.advance(61)
+        fetch = AsyncMock(return_value=_priced_payload(offer))
+
+        await pricing_cache.confirm(offer, fetch)
+
+        assert memory_cache.store == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_pricing_is_not_cached(
+        self, pricing_cache, offer, memory_cache
+    ):
+        fetch = AsyncMock(return_value={"data": None})
+
+        await pricing_cache.confirm(offer, fetch)
+
+        assert memory_cache.store == {}
+
+    @pytest.mark.asyncio
+    async def test_priced_offer_is_found_from_search_offer(self, pricing_cache, offer):
+        payload = _priced_payload(offer, total="701.00")
+        await pricing_cache.confirm(offer, AsyncMock(return_value=payload))
+
+        priced = await pricing_cache.priced_offer(offer)
+
+        assert priced["price"]["grandTotal"] == "701.00"
+
+
+def test_pricing_response_payload_from_mock_response():
+    response = MockFlightService().confirm_price({})
+    payload = pricing_response_payload(response)
+
+    assert payload["data"] == response.data
+    assert payload["result"] is None
+
+
+def test_flight_order_books_cached_priced_offer(
+    client, session, mocker, memory_cache, offer
+):
+    from backend.crud.users import create_user
+    from backend.utils.security import get_current_user
+
+    user = create_user(session, "pricing@example.com", "password")
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch("backend.routers.flights.kafka_producer")
+    cache = PricingCache(memory_cache, single_flight=SingleFlight(memory_cache))
+    mocker.patch("backend.routers.flights.pricing_cache", cache)
+    order = MockFlightService().create_flight_order({})
+    create_order = mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.create_flight_order",
+        new=AsyncMock(return_value=order),
+    )
+    offer["lastTicketingDateTime"] = "2099-01-01T00:00:00"
+    asyncio.run(
+        cache.confirm(offer, AsyncMock(return_value=_priced_payload(offer, "701.00")))
+    )
+
+    response = client.post(
+        f"{API_V1_PREFIX}/booking/flight-orders",
+        json={"flight_offer": offer, "travelers": [{"id": "1"}]},
+    )
+
+    assert response.status_code == 200
+    booked_offer = create_order.await_args.args[0]["flight_offer"]
+    assert booked_offer["price"]["grandTotal"] == "701.00"
+    # Booked seats invalidate the confirmation
+    assert asyncio.run(cache.priced_offer(offer)) is None
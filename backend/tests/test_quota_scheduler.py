@@ -0,0 +1,177 @@
+"""Tests for priority scheduling of upstream calls against simulated quotas."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.cache import RedisCache
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.quota_scheduler import (
+    QuotaExceededError,
+    QuotaScheduler,
+    shed_calls,
+)
+from backend.external_services.resilience import CircuitOpenError
+from conftest import API_V1_PREFIX, InMemoryRedisCache
+
+
+def _shed(operation_class: str) -> float:
+    return shed_calls.labels(operation_class=operation_class)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_searches_cannot_use_up_booking_quota(memory_cache, fake_clock):
+    # Ten calls of burst, refilling far slower than the test runs
+    scheduler = QuotaScheduler(
+        memory_cache, rate_per_second=0.1, burst=10, clock=fake_clock
+    )
+    service = AsyncFlightService(MockFlightService(), scheduler=scheduler)
+    shed = _shed("search")
+
+    for _ in range(8):
+        await service.search_flights_get({})
+    with pytest.raises(QuotaExceededError) as error:
+        await service.search_flights_get({})
+
+    price = await service.confirm_price({"data": {"flightOffers": []}})
+    order = await service.create_flight_order({"travelers": []})
+    service.shutdown()
+
+    assert price
+    assert order["id"]
+    assert error.value.retry_after == 10
+    assert _shed("search") == shed + 1
+
+
+@pytest.mark.asyncio
+async def test_refilled_quota_is_available_again(memory_cache, fake_clock):
+    scheduler = QuotaScheduler(
+        memory_cache, rate_per_second=0.5, burst=2, clock=fake_clock
+    )
+    await scheduler.acquire("search_flights_get")
+    with pytest.raises(QuotaExceededError):
+        await scheduler.acquire("get_most_travelled_destinations")
+
+    fake_clock.advance(2)
+
+    await scheduler.acquire("get_most_travelled_destinations")
+
+
+@pytest.mark.asyncio
+async def test_monthly_quota_is_kept_for_bookings(memory_cache, fake_clock):
+    scheduler = QuotaScheduler(
+        memory_cache,
+        rate_per_second=1000,
+        burst=1000,
+        monthly_quota=100,
+        clock=fake_clock,
+    )
+
+    for _ in range(80):
+        await scheduler.acquire("search_flights")
+    with pytest.raises(QuotaExceededError):
+        await scheduler.acquire("search_flights")
+
+    for _ in range(20):
+        await scheduler.acquire("create_flight_order")
+
+
+@pytest.mark.asyncio
+async def test_try_acquire_does_not_wait(memory_cache, fake_clock):
+    scheduler = QuotaScheduler(
+        memory_cache, rate_per_second=0.1, burst=2, clock=fake_clock
+    )
+
+    assert await scheduler.try_acquire("search_flights_get")
+    assert not await scheduler.try_acquire("search_flights_get")
+
+    fake_clock.advance(10)
+
+    assert await scheduler.try_acquire("search_flights_get")
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_calls_are_served_first():
+    cache = InMemoryRedisCache(clock=time.time)
+    scheduler = QuotaScheduler(cache, rate_per_second=10, burst=5, clock=time.time)
+    for _ in range(5):
+        await scheduler.acquire("create_flight_order")
+    served = []
+
+    async def call(operation):
+        await scheduler.acquire(operation)
+        served.append(operation)
+
+    searches = [asyncio.create_task(call("search_flights_get")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    await call("confirm_price")
+    await asyncio.gather(*searches)
+
+    assert served == ["confirm_price"] + ["search_flights_get"] * 3
+    assert scheduler._waiters == []
+
+
+@pytest.mark.asyncio
+async def test_calls_failed_fast_by_an_open_circuit_take_no_quota(
+    memory_cache, fake_clock
+):
+    class FailingProvider(MockFlightService):
+        def search_flights_get(self, request_body: dict) -> dict:
+            raise RuntimeError("provider down")
+
+    scheduler = QuotaScheduler(
+        memory_cache, rate_per_second=0.1, burst=100, clock=fake_clock
+    )
+    scheduler.acquire = AsyncMock(wraps=scheduler.acquire)
+    service = AsyncFlightService(FailingProvider(), scheduler=scheduler)
+
+    for _ in range(20):
+        with pytest.raises((RuntimeError, CircuitOpenError)):
+            await service.search_flights_get({})
+    service.shutdown()
+
+    assert scheduler.acquire.await_count == 10
+
+
+@pytest.mark.asyncio
+async def test_disabled_scheduler_does_not_touch_redis():
+    cache = AsyncMock()
+    scheduler = QuotaScheduler(cache, rate_per_second=0)
+
+    await scheduler.acquire("search_flights_get")
+
+    cache.take_tokens.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_lets_calls_through():
+    cache = RedisCache("127.0.0.1", 1, socket_timeout=0.5)
+    scheduler = QuotaScheduler(cache, rate_per_second=1, burst=1)
+
+    for _ in range(3):
+        await scheduler.acquire("search_flights_get")
+    await cache.close()
+
+
+def test_shed_search_returns_429_with_retry_after(client, mocker, memory_cache):
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch("backend.routers.flights.upstream_single_flight.cache", memory_cache)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.search_flights_get",
+        new=AsyncMock(side_effect=QuotaExceededError("quota exhausted", 3)),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers",
+        params={
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "DXB",
+            "departureDate": "2030-12-01",
+            "adults": 1,
+        },
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
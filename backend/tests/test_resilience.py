@@ -0,0 +1,316 @@
+"""Tests for adaptive timeouts, circuit breaking and hedging of upstream calls."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from amadeus.client.errors import ClientError
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    UpstreamGuard,
+    UpstreamTimeoutError,
+    circuit_state,
+    hedged_requests,
+)
+from conftest import API_V1_PREFIX
+
+
+def _state(operation: str) -> float:
+    return circuit_state.labels(operation=operation)._value.get()
+
+
+def _hedges(operation: str, winner: str) -> float:
+    return hedged_requests.labels(operation=operation, winner=winner)._value.get()
+
+
+def _breaker(fake_clock, operation="op") -> CircuitBreaker:
+    return CircuitBreaker(
+        operation,
+        error_threshold=0.5,
+        min_calls=4,
+        window=10,
+        open_seconds=30,
+        clock=fake_clock,
+    )
+
+
+def _guard(fake_clock=time.monotonic, **kwargs) -> UpstreamGuard:
+    guard = UpstreamGuard(clock=fake_clock, **kwargs)
+    return guard
+
+
+class TestLatencyTracker:
+    def test_default_timeout_until_enough_samples(self):
+        latency = LatencyTracker(window=100, min_samples=10)
+        for _ in range(9):
+            latency.record(0.1)
+
+        assert latency.timeout(default=20) == 20
+
+    def test_timeout_follows_p99(self):
+        latency = LatencyTracker(window=100, min_samples=10)
+        for i in range(100):
+            latency.record(1.0 if i < 98 else 4.0)
+
+        assert latency.percentile(0.95) == 1.0
+        assert latency.timeout(multiplier=3, minimum=1, maximum=30) == 12.0
+
+    def test_timeout_is_clamped(self):
+        latency = LatencyTracker(window=100, min_samples=1)
+        latency.record(0.01)
+
+        assert latency.timeout(multiplier=3, minimum=2, maximum=30) == 2
+
+
+class TestCircuitBreaker:
+    def test_opens_when_error_rate_crosses_threshold(self, fake_clock):
+        breaker = _breaker(fake_clock, "opens")
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert _state("opens") == 2
+
+    def test_needs_min_calls_before_opening(self, fake_clock):
+        breaker = _breaker(fake_clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_lets_one_probe_through(self, fake_clock):
+        breaker = _breaker(fake_clock, "probe")
+        for _ in range(4):
+            breaker.record_failure()
+
+        fake_clock.advance(30)
+
+        assert breaker.allow()
+        assert _state("probe") == 1
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.error_rate == 0
+
+    def test_failed_probe_reopens(self, fake_clock):
+        breaker = _breaker(fake_clock)
+        for _ in range(4):
+            breaker.record_failure()
+        fake_clock.advance(30)
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.retry_after == 30
+
+    def test_released_probe_can_be_retried(self, fake_clock):
+        breaker = _breaker(fake_clock)
+        for _ in range(4):
+            breaker.record_failure()
+        fake_clock.advance(30)
+        breaker.allow()
+
+        breaker.release()
+
+        assert breaker.allow()
+
+
+class TestUpstreamGuard:
+    @pytest.mark.asyncio
+    async def test_slow_call_times_out(self):
+        guard = _guard()
+        latency = guard.latency("slow")
+        for _ in range(latency.min_samples):
+            latency.record(0.01)
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        start = time.perf_counter()
+        with pytest.raises(UpstreamTimeoutError):
+            await guard.call("slow", slow)
+
+        # Clamped to the minimum timeout, not the SDK's own
+        assert time.perf_counter() - start < 3
+        assert guard.breaker("slow").error_rate == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, fake_clock):
+        guard = _guard(fake_clock)
+        upstream = AsyncMock(side_effect=RuntimeError("503 from provider"))
+
+        for _ in range(10):
+            with pytest.raises(RuntimeError):
+                await guard.call("failing", upstream)
+        with pytest.raises(CircuitOpenError) as error:
+            await guard.call("failing", upstream)
+
+        assert upstream.await_count == 10
+        assert error.value.retry_after == 30
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_before_acquiring(self, fake_clock):
+        guard = _guard(fake_clock)
+        upstream = AsyncMock(side_effect=RuntimeError("503 from provider"))
+        acquire = AsyncMock()
+
+        for _ in range(10):
+            with pytest.raises(RuntimeError):
+                await guard.call("unacquired", upstream, acquire=acquire)
+        with pytest.raises(CircuitOpenError):
+            await guard.call("unacquired", upstream, acquire=acquire)
+
+        assert acquire.await_count == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_acquire_releases_the_probe(self, fake_clock):
+        guard = _guard(fake_clock)
+        failing = AsyncMock(side_effect=RuntimeError("503 from provider"))
+        for _ in range(10):
+            with pytest.raises(RuntimeError):
+                await guard.call("probe_quota", failing)
+        fake_clock.advance(30)
+
+        with pytest.raises(RuntimeError, match="no quota"):
+            await guard.call(
+                "probe_quota",
+                failing,
+                acquire=AsyncMock(side_effect=RuntimeError("no quota")),
+            )
+        result = await guard.call("probe_quota", AsyncMock(return_value="ok"))
+
+        assert result == "ok"
+        assert guard.breaker("probe_quota").state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_the_circuit(self, fake_clock):
+        guard = _guard(fake_clock, is_failure=lambda e: not isinstance(e, ValueError))
+        upstream = AsyncMock(side_effect=ValueError("bad request"))
+
+        for _ in range(20):
+            with pytest.raises(ValueError):
+                await guard.call("client", upstream)
+
+        assert guard.breaker("client").state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_calls_are_not_timed_out(self):
+        guard = _guard()
+        latency = guard.latency("order")
+        for _ in range(latency.min_samples):
+            latency.record(0.001)
+
+        async def slow_order():
+            await asyncio.sleep(0.05)
+            return "booked"
+
+        assert await guard.call("order", slow_order, idempotent=False) == "booked"
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_hedged(self):
+        guard = _guard(hedging_enabled=True)
+        latency = guard.latency("hedged")
+        for _ in range(latency.min_samples):
+            latency.record(0.02)
+        delays = iter([1.0, 0.01])
+        before = _hedges("hedged", "hedge")
+
+        async def read():
+            delay = next(delays)
+            await asyncio.sleep(delay)
+            return delay
+
+        start = time.perf_counter()
+        assert await guard.call("hedged", read, hedge=True) == 0.01
+        assert time.perf_counter() - start < 0.5
+        assert _hedges("hedged", "hedge") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_not_hedged_without_spare_quota(self):
+        guard = _guard(hedging_enabled=True)
+        latency = guard.latency("hedge_without_quota")
+        for _ in range(latency.min_samples):
+            latency.record(0.02)
+        try_acquire = AsyncMock(return_value=False)
+        calls = []
+
+        async def read():
+            calls.append(None)
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        result = await guard.call(
+            "hedge_without_quota", read, hedge=True, try_acquire=try_acquire
+        )
+
+        assert result == "ok"
+        assert len(calls) == 1
+        try_acquire.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fast_read_is_not_hedged(self):
+        guard = _guard(hedging_enabled=True)
+        latency = guard.latency("unhedged")
+        for _ in range(latency.min_samples):
+            latency.record(0.5)
+        upstream = AsyncMock(return_value="ok")
+
+        assert await guard.call("unhedged", upstream, hedge=True) == "ok"
+        assert upstream.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_flight_service_stops_calling_a_failing_provider():
+    class FailingProvider(MockFlightService):
+        calls = 0
+
+        def search_flights_get(self, request_body: dict) -> dict:
+            FailingProvider.calls += 1
+            raise RuntimeError("provider down")
+
+        def confirm_price(self, request_body: dict) -> dict:
+            raise ClientError(AsyncMock())
+
+    service = AsyncFlightService(FailingProvider(), max_workers=4)
+    for _ in range(20):
+        with pytest.raises((RuntimeError, CircuitOpenError)):
+            await service.search_flights_get({})
+    service.shutdown()
+
+    assert FailingProvider.calls == 10
+    assert service.guard.breaker("search_flights_get").state == CircuitBreaker.OPEN
+
+
+def test_unavailable_upstream_returns_503_with_retry_after(
+    client, mocker, memory_cache
+):
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch("backend.routers.flights.upstream_single_flight.cache", memory_cache)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.search_flights_get",
+        new=AsyncMock(side_effect=CircuitOpenError("search is down", 17)),
+    )
+
+    response = client.get(
+        f"{API_V1_PREFIX}/shopping/flight-offers",
+        params={
+            "originLocationCode": "NBO",
+            "destinationLocationCode": "DXB",
+            "departureDate": "2030-12-01",
+            "adults": 1,
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "17"
@@ -1,12 +1,25 @@
+import copy
+import json
 import pytest
 import uuid
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from amadeus.client.errors import ClientError
 from backend.main import app
+from backend.benchmarks.seat_maps import synthetic_seat_maps
 from backend.external_services.flight import AmadeusFlightService
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.mock_flight_service import MockFlightService
+from backend.external_services.seat_maps import (
+    _bits,
+    compact_seat_map,
+    expand_seat_map,
+    render_seat_maps,
+    seat_map_offer_key,
+)
 from backend.models.bookings import Booking
 from backend.models.users import UserInDB
 from backend.utils.security import get_current_user
+from conftest import API_V1_PREFIX
 
 
 @pytest.fixture
@@ -37,7 +50,10 @@ def test_view_seat_map_get_direct_id_success(
     authenticated_client, mocker, flight_service
 ):
     # Patch the service used in the router
-    mocker.patch("backend.routers.flights.amadeus_flight_service", flight_service)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service",
+        AsyncFlightService(flight_service),
+    )
 
     # Mock Amadeus response
     mock_response = MagicMock()
@@ -59,7 +75,10 @@ def test_view_seat_map_get_direct_id_success(
 def test_view_seat_map_get_db_uuid_success(
     authenticated_client, session, mocker, flight_service, mock_user
 ):
-    mocker.patch("backend.routers.flights.amadeus_flight_service", flight_service)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service",
+        AsyncFlightService(flight_service),
+    )
 
     # Ensure user exists in DB
     session.add(mock_user)
@@ -99,7 +118,10 @@ def test_view_seat_map_get_db_uuid_success(
 def test_view_seat_map_get_unauthorized_access(
     authenticated_client, session, mocker, flight_service
 ):
-    mocker.patch("backend.routers.flights.amadeus_flight_service", flight_service)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service",
+        AsyncFlightService(flight_service),
+    )
 
     # Create ANOTHER user in DB
     other_user = UserInDB(
@@ -138,7 +160,10 @@ def test_view_seat_map_get_unauthenticated(client):
 def test_view_seat_map_get_amadeus_api_error(
     authenticated_client, mocker, flight_service
 ):
-    mocker.patch("backend.routers.flights.amadeus_flight_service", flight_service)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service",
+        AsyncFlightService(flight_service),
+    )
 
     # Mock Amadeus ClientError
     mock_error_response = MagicMock()
@@ -156,7 +181,10 @@ def test_view_seat_map_get_amadeus_api_error(
 
 
 def test_view_seat_map_post_success(authenticated_client, mocker, flight_service):
-    mocker.patch("backend.routers.flights.amadeus_flight_service", flight_service)
+    mocker.patch(
+        "backend.routers.flights.amadeus_flight_service",
+        AsyncFlightService(flight_service),
+    )
 
     mock_response = MagicMock()
     mock_response.data = [{"id": "offer_seatmap_1"}]
@@ -186,3 +214,114 @@ def test_view_seat_map_post_success(authenticated_client, mocker, flight_service
     assert response.status_code == 200
     assert response.json() == [{"id": "offer_seatmap_1"}]
     flight_service.amadeus.shopping.seatmaps.post.assert_called_once()
+
+
+@pytest.fixture
+def seat_maps():
+    return MockFlightService().view_seat_map_get("ORDER1")
+
+
+def _sorted_seats(seat_map: dict) -> dict:
+    seat_map = copy.deepcopy(seat_map)
+    for deck in seat_map["decks"]:
+        deck["seats"].sort(
+            key=lambda seat: (seat["coordinates"]["x"], seat["coordinates"]["y"])
+        )
+    return seat_map
+
+
+class TestCompactSeatMap:
+    def test_round_trips_mock_fixture(self, seat_maps):
+        compact = compact_seat_map(seat_maps[0])
+
+        assert compact["encoding"] == "grid"
+        assert expand_seat_map(compact) == _sorted_seats(seat_maps[0])
+
+    def test_round_trips_occupied_and_unpriced_seats(self, seat_maps):
+        seat_map = seat_maps[0]
+        seats = seat_map["decks"][0]["seats"]
+        seats[0]["travelerPricing"][0]["seatAvailabilityStatus"] = "OCCUPIED"
+        del seats[1]["travelerPricing"][0]["price"]
+
+        compact = compact_seat_map(seat_map)
+
+        assert expand_seat_map(compact) == _sorted_seats(seat_map)
+
+    def test_is_much_smaller_for_a_full_deck(self):
+        seat_maps = synthetic_seat_maps(30)
+
+        compact = render_seat_maps(seat_maps, "compact")
+
+        assert len(json.dumps(compact)) < len(json.dumps(seat_maps)) / 5
+
+    def test_grid_bitmaps_and_tables(self, seat_maps):
+        compact = compact_seat_map(seat_maps[0])
+        deck = compact["decks"][0]
+        seats = deck["travelers"]["1"]
+
+        assert deck["rows"] == ["10", "11"]
+        assert deck["grid"] == ["ABC DEF", "ABC DEF"]
+        assert "seats" not in deck
+        assert (
+            deck["deckConfiguration"] == seat_maps[0]["decks"][0]["deckConfiguration"]
+        )
+        # Every seat shares one cabin and characteristics entry per distinct value
+        assert len(compact["cabins"]) == 1
+        assert sorted(compact["prices"], key=lambda p: p["total"]) == [
+            {"currency": "USD", "total": "15.00"},
+            {"currency": "USD", "total": "25.00"},
+        ]
+        statuses = {
+            seat["number"]: seat["travelerPricing"][0]["seatAvailabilityStatus"]
+            for seat in seat_maps[0]["decks"][0]["seats"]
+        }
+        numbers = [
+            f"{label}{letter}"
+            for label, line in zip(deck["rows"], deck["grid"])
+            for letter in line
+            if letter != " "
+        ]
+        available = _bits(seats["available"], len(numbers))
+        assert [statuses[n] == "AVAILABLE" for n in numbers] == available
+
+    def test_unencodable_seat_map_is_returned_in_full(self, seat_maps):
+        seat_maps[0]["decks"][0]["seats"][0]["amenities"] = ["POWER"]
+
+        rendered = render_seat_maps(seat_maps, "compact")
+
+        assert rendered == seat_maps
+
+    def test_full_format_is_unchanged(self, seat_maps):
+        assert render_seat_maps(seat_maps, "full") is seat_maps
+
+
+def test_seat_map_post_is_cached_per_offer(client, mocker, memory_cache):
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch("backend.routers.flights.upstream_single_flight.cache", memory_cache)
+    seat_maps = MockFlightService().view_seat_map_get("ORDER1")
+    upstream = mocker.patch(
+        "backend.routers.flights.amadeus_flight_service.view_seat_map_post",
+        new=AsyncMock(return_value=seat_maps),
+    )
+    offer = MockFlightService().confirm_price({}).data["flightOffers"][0]
+
+    full = client.post(f"{API_V1_PREFIX}/shopping/seatmaps", json=offer)
+    compact = client.post(
+        f"{API_V1_PREFIX}/shopping/seatmaps", params={"format": "compact"}, json=offer
+    )
+
+    assert full.status_code == 200
+    assert full.json() == seat_maps
+    assert compact.json()[0]["encoding"] == "grid"
+    assert upstream.await_count == 1
+    assert memory_cache.ttls[seat_map_offer_key(offer)] == 60
+
+
+def test_seat_map_rejects_unknown_format(client):
+    offer = MockFlightService().confirm_price({}).data["flightOffers"][0]
+
+    response = client.post(
+        f"{API_V1_PREFIX}/shopping/seatmaps", params={"format": "bitmap"}, json=offer
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,211 @@
+"""Tests for single-flight coalescing of upstream flight provider calls."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import redis
+from backend.external_services.cache import RedisCache
+from backend.external_services.single_flight import (
+    SingleFlight,
+    upstream_calls,
+    upstream_calls_coalesced,
+)
+
+
+class CountingFetch:
+    """Upstream stand-in that counts calls and takes a while to answer."""
+
+    def __init__(self, result, delay=0.05, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def _coalesced(operation: str, scope: str) -> float:
+    return upstream_calls_coalesced.labels(
+        operation=operation, scope=scope
+    )._value.get()
+
+
+def _upstream(operation: str) -> float:
+    return upstream_calls.labels(operation=operation)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_upstream_call(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+    fetch = CountingFetch([{"iataCode": "NBO"}])
+    coalesced_before = _coalesced("test_local", "local")
+    upstream_before = _upstream("test_local")
+
+    results = await asyncio.gather(
+        *(single_flight.load("k", fetch, operation="test_local") for _ in range(20))
+    )
+
+    assert fetch.calls == 1
+    assert all(result == [{"iataCode": "NBO"}] for result in results)
+    assert _coalesced("test_local", "local") == coalesced_before + 19
+    assert _upstream("test_local") == upstream_before + 1
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+    fetch = CountingFetch(["result"])
+
+    await asyncio.gather(
+        single_flight.load("a", fetch, operation="test"),
+        single_flight.load("b", fetch, operation="test"),
+    )
+
+    assert fetch.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_result_is_cached_with_ttl_and_lease_released(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+
+    await single_flight.load(
+        "k", CountingFetch(["result"]), operation="test", ttl_seconds=60
+    )
+
+    assert memory_cache.store["k"] == ["result"]
+    assert memory_cache.ttls["k"] == 60
+    assert memory_cache.leases == {}
+
+
+@pytest.mark.asyncio
+async def test_non_cacheable_result_is_not_stored(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+
+    result = await single_flight.load("k", CountingFetch([]), operation="test")
+
+    assert result == []
+    assert "k" not in memory_cache.store
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+    failing = CountingFetch(None, error=RuntimeError("upstream down"))
+
+    results = await asyncio.gather(
+        *(single_flight.load("k", failing, operation="test") for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert failing.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "k" not in memory_cache.store
+
+    recovered = CountingFetch(["ok"])
+    assert await single_flight.load("k", recovered, operation="test") == ["ok"]
+    assert recovered.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call(memory_cache):
+    single_flight = SingleFlight(memory_cache)
+    fetch = CountingFetch(["result"], delay=0.1)
+
+    first = asyncio.create_task(single_flight.load("k", fetch, operation="test"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(single_flight.load("k", fetch, operation="test"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == ["result"]
+    assert fetch.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_workers_coalesce_through_redis_lease(memory_cache):
+    """Two SingleFlight instances sharing one cache behave like two workers."""
+    worker_a = SingleFlight(memory_cache, poll_seconds=0.01)
+    worker_b = SingleFlight(memory_cache, poll_seconds=0.01)
+    fetch_a = CountingFetch(["from-a"], delay=0.1)
+    fetch_b = CountingFetch(["from-b"])
+    coalesced_before = _coalesced("test_distributed", "distributed")
+
+    leader = asyncio.create_task(
+        worker_a.load("k", fetch_a, operation="test_distributed")
+    )
+    await asyncio.sleep(0.01)
+    follower = await worker_b.load("k", fetch_b, operation="test_distributed")
+
+    assert await leader == ["from-a"]
+    assert follower == ["from-a"]
+    assert fetch_a.calls == 1
+    assert fetch_b.calls == 0
+    assert _coalesced("test_distributed", "distributed") == coalesced_before + 1
+
+
+@pytest.mark.asyncio
+async def test_follower_fetches_when_leader_has_no_cacheable_result(memory_cache):
+    worker_a = SingleFlight(memory_cache, poll_seconds=0.01)
+    worker_b = SingleFlight(memory_cache, poll_seconds=0.01)
+
+    leader = asyncio.create_task(
+        worker_a.load("k", CountingFetch([], delay=0.05), operation="test")
+    )
+    await asyncio.sleep(0.01)
+    fetch_b = CountingFetch(["from-b"])
+    follower = await worker_b.load("k", fetch_b, operation="test")
+
+    assert await leader == []
+    assert follower == ["from-b"]
+    assert fetch_b.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_stops_waiting_after_timeout(memory_cache):
+    await memory_cache.acquire_lease("lease:k", "stuck-holder", 60)
+    worker = SingleFlight(memory_cache, wait_seconds=0.05, poll_seconds=0.01)
+    fetch = CountingFetch(["fresh"])
+
+    assert await worker.load("k", fetch, operation="test") == ["fresh"]
+    assert fetch.calls == 1
+
+
+class TestRedisCacheLeases:
+    @pytest.fixture
+    def cache(self):
+        cache = RedisCache("localhost", 6379)
+        cache.r = AsyncMock()
+        cache._release_lease = AsyncMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_acquire_uses_set_nx_with_expiry(self, cache):
+        cache.r.set.return_value = True
+
+        assert await cache.acquire_lease("lease:k", "token", 1.5) is True
+        cache.r.set.assert_called_once_with("lease:k", "token", nx=True, px=1500)
+
+    @pytest.mark.asyncio
+    async def test_acquire_fails_when_already_held(self, cache):
+        cache.r.set.return_value = None
+
+        assert await cache.acquire_lease("lease:k", "token", 1) is False
+
+    @pytest.mark.asyncio
+    async def test_acquire_fails_open_when_redis_is_down(self, cache):
+        cache.r.set.side_effect = redis.exceptions.ConnectionError("down")
+
+        assert await cache.acquire_lease("lease:k", "token", 1) is True
+
+    @pytest.mark.asyncio
+    async def test_release_checks_token(self, cache):
+        cache._release_lease.return_value = 1
+
+        assert await cache.release_lease("lease:k", "token") is True
+        cache._release_lease.assert_called_once_with(keys=["lease:k"], args=["token"])
@@ -0,0 +1,221 @@
+"""Tests for stale-while-revalidate caching of reference data."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.external_services.cache import RedisCache, decode_entry
+from backend.external_services.cache_codecs import STALE_AT_FIELD
+from backend.external_services.single_flight import (
+    SingleFlight,
+    background_refresh_failures,
+    stale_cache_reads,
+)
+from backend.utils.cache_keys import CacheTTLPolicy
+
+
+POLICY = CacheTTLPolicy(soft_ttl_seconds=60, hard_ttl_seconds=600)
+
+
+class SequenceFetch:
+    """Upstream stand-in returning (or raising) the queued outcomes in order."""
+
+    def __init__(self, *outcomes, delay=0.01):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+async def _settle(single_flight):
+    """Wait for every background refresh to finish."""
+    await asyncio.gather(*single_flight._refreshing.values())
+
+
+def _counter(counter, operation: str) -> float:
+    return counter.labels(operation=operation)._value.get()
+
+
+@pytest.fixture
+def single_flight(memory_cache):
+    return SingleFlight(memory_cache)
+
+
+async def _load(single_flight, fetch, operation="test_swr"):
+    return await single_flight.load_with_revalidation(
+        "k", fetch, operation=operation, ttl_policy=POLICY
+    )
+
+
+@pytest.mark.asyncio
+async def test_miss_stores_entry_with_soft_and_hard_ttl(single_flight, memory_cache):
+    fetch = SequenceFetch(["v1"])
+
+    assert await _load(single_flight, fetch) == ["v1"]
+
+    assert memory_cache.ttls["k"] == POLICY["hard_ttl_seconds"]
+    assert await memory_cache.get_with_staleness("k") == (["v1"], False)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_upstream_call(single_flight, fake_clock):
+    fetch = SequenceFetch(["v1"], ["v2"])
+    await _load(single_flight, fetch)
+
+    fake_clock.advance(59)
+
+    assert await _load(single_flight, fetch) == ["v1"]
+    assert single_flight._refreshing == {}
+    assert fetch.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refreshed_in_background(
+    single_flight, fake_clock, memory_cache
+):
+    fetch = SequenceFetch(["v1"], ["v2"], delay=0.05)
+    await _load(single_flight, fetch)
+    stale_before = _counter(stale_cache_reads, "test_swr_stale")
+
+    fake_clock.advance(61)
+    results = await asyncio.gather(
+        *(_load(single_flight, fetch, "test_swr_stale") for _ in range(5))
+    )
+
+    # Served immediately from cache; one refresh shared by all stale readers
+    assert results == [["v1"]] * 5
+    assert fetch.calls == 2
+    assert _counter(stale_cache_reads, "test_swr_stale") == stale_before + 5
+
+    await _settle(single_flight)
+    assert await memory_cache.get_with_staleness("k") == (["v2"], False)
+    assert memory_cache.leases == {}
+    assert await _load(single_flight, fetch) == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_stale_entry(
+    single_flight, fake_clock, memory_cache
+):
+    fetch = SequenceFetch(["v1"], RuntimeError("upstream down"), ["v3"])
+    await _load(single_flight, fetch)
+    failures_before = _counter(background_refresh_failures, "test_swr_failure")
+
+    fake_clock.advance(120)
+    assert await _load(single_flight, fetch, "test_swr_failure") == ["v1"]
+    await _settle(single_flight)
+
+    assert _counter(background_refresh_failures, "test_swr_failure") == (
+        failures_before + 1
+    )
+    assert memory_cache.leases == {}
+
+    # Still stale, so the next read serves it again and retries the refresh
+    assert await _load(single_flight, fetch, "test_swr_failure") == ["v1"]
+    await _settle(single_flight)
+
+    assert fetch.calls == 3
+    assert await memory_cache.get_with_staleness("k") == (["v3"], False)
+
+
+@pytest.mark.asyncio
+async def test_entry_is_dropped_at_hard_ttl(single_flight, fake_clock):
+    fetch = SequenceFetch(["v1"], ["v2"])
+    await _load(single_flight, fetch)
+
+    fake_clock.advance(POLICY["hard_ttl_seconds"])
+
+    assert await _load(single_flight, fetch) == ["v2"]
+    assert single_flight._refreshing == {}
+    assert fetch.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_upstream_failure_after_hard_ttl_reaches_caller(
+    single_flight, fake_clock
+):
+    fetch = SequenceFetch(["v1"], RuntimeError("upstream down"))
+    await _load(single_flight, fetch)
+
+    fake_clock.advance(POLICY["hard_ttl_seconds"] + 1)
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await _load(single_flight, fetch)
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_skipped_when_another_worker_holds_lease(
+    single_flight, fake_clock, memory_cache
+):
+    fetch = SequenceFetch(["v1"], ["v2"])
+    await _load(single_flight, fetch)
+    await memory_cache.acquire_lease("lease:k", "other-worker", 60)
+
+    fake_clock.advance(61)
+    assert await _load(single_flight, fetch) == ["v1"]
+    await _settle(single_flight)
+
+    assert fetch.calls == 1
+    assert memory_cache.leases == {"lease:k": "other-worker"}
+
+
+class TestRedisCacheSoftTTL:
+    @pytest.fixture
+    def clock(self):
+        return MagicMock(return_value=1000.0)
+
+    @pytest.fixture
+    def cache(self, clock):
+        cache = RedisCache("localhost", 6379, clock=clock)
+        cache.r = AsyncMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_set_with_soft_ttl_records_stale_at_and_uses_hard_ttl(self, cache):
+        await cache.set("k", ["v"], 600, stale_after_seconds=60)
+
+        key, ttl, payload = cache.r.setex.call_args.args
+        assert (key, ttl) == ("k", 600)
+        assert decode_entry(payload) == (["v"], 1060.0)
+
+    @pytest.mark.asyncio
+    async def test_get_reads_legacy_soft_ttl_envelope(self, cache, clock):
+        cache.r.get.return_value = json.dumps({STALE_AT_FIELD: 1060.0, "value": ["v"]})
+
+        assert await cache.get_with_staleness("k") == (["v"], False)
+
+    @pytest.mark.asyncio
+    async def test_get_with_staleness_compares_against_clock(self, cache, clock):
+        cache.r.get.return_value = cache.serializer.encode(["v"], stale_at=1060.0)
+
+        assert await cache.get_with_staleness("k") == (["v"], False)
+        clock.return_value = 1060.0
+        assert await cache.get_with_staleness("k") == (["v"], True)
+
+    @pytest.mark.asyncio
+    async def test_get_unwraps_soft_ttl_entries(self, cache):
+        cache.r.get.return_value = cache.serializer.encode(["v"], stale_at=0)
+
+        assert await cache.get("k") == ["v"]
+
+    @pytest.mark.asyncio
+    async def test_plain_entries_are_never_stale(self, cache, clock):
+        cache.r.get.return_value = json.dumps({"data": ["v"]})
+        clock.return_value = 10**12
+
+        assert await cache.get_with_staleness("k") == ({"data": ["v"]}, False)
+
+    @pytest.mark.asyncio
+    async def test_missing_key_returns_none(self, cache):
+        cache.r.get.return_value = None
+
+        assert await cache.get_with_staleness("k") is None
+        assert await cache.get("k") is None
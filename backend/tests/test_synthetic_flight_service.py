@@ -0,0 +1,146 @@
+"""Tests for the synthetic high-volume flight provider."""
+
+import pytest
+from amadeus import NetworkError, ServerError
+from backend.external_services.async_flight import AsyncFlightService
+from backend.external_services.synthetic_flight_service import (
+    NO_PROFILE,
+    SyntheticFlightService,
+    _profile,
+    generate_offers,
+    load_profiles,
+)
+from conftest import API_V1_PREFIX
+
+SEARCH = {
+    "originLocationCode": "NBO",
+    "destinationLocationCode": "JFK",
+    "departureDate": "2030-01-05",
+    "adults": 1,
+    "max": 250,
+}
+
+
+def test_offers_are_deterministic_per_seed():
+    assert generate_offers(SEARCH) == generate_offers(SEARCH)
+    assert generate_offers(SEARCH, seed=1) != generate_offers(SEARCH, seed=2)
+
+
+def test_offer_count_scales_by_route_and_honours_max():
+    counts = {
+        destination: len(
+            generate_offers(
+                {**SEARCH, "destinationLocationCode": destination}, base=100
+            )
+        )
+        for destination in ("JFK", "LHR", "DXB", "SIN")
+    }
+
+    assert all(40 <= count <= 160 for count in counts.values())
+    assert len(set(counts.values())) > 1
+    assert len(generate_offers({**SEARCH, "max": 5})) == 5
+
+
+def test_larger_parties_get_a_subset_priced_per_passenger():
+    solo = generate_offers(SEARCH)
+    family = generate_offers({**SEARCH, "adults": 2, "children": 2, "infants": 1})
+
+    assert 0 < len(family) < len(solo)
+    assert all(offer["numberOfBookableSeats"] >= 4 for offer in family)
+    offer = family[0]
+    assert [tp["travelerType"] for tp in offer["travelerPricings"]] == [
+        "ADULT",
+        "ADULT",
+        "CHILD",
+        "CHILD",
+        "HELD_INFANT",
+    ]
+    total = sum(float(tp["price"]["total"]) for tp in offer["travelerPricings"])
+    assert float(offer["price"]["grandTotal"]) == pytest.approx(total, abs=0.05)
+
+
+def test_return_searches_have_connected_multi_segment_itineraries():
+    offers = generate_offers({**SEARCH, "returnDate": "2030-01-12"})
+
+    assert all(len(offer["itineraries"]) == 2 for offer in offers)
+    assert {len(i["segments"]) for o in offers for i in o["itineraries"]} == {1, 2, 3}
+    for offer in offers:
+        outbound, inbound = offer["itineraries"]
+        assert outbound["segments"][0]["departure"]["iataCode"] == "NBO"
+        assert outbound["segments"][-1]["arrival"]["iataCode"] == "JFK"
+        assert inbound["segments"][-1]["arrival"]["iataCode"] == "NBO"
+        for itinerary in offer["itineraries"]:
+            segments = itinerary["segments"]
+            for arriving, leaving in zip(segments, segments[1:]):
+                assert (
+                    arriving["arrival"]["iataCode"] == leaving["departure"]["iataCode"]
+                )
+                assert arriving["arrival"]["at"] < leaving["departure"]["at"]
+        segment_ids = [s["id"] for i in offer["itineraries"] for s in i["segments"]]
+        fare_ids = [
+            fare["segmentId"]
+            for fare in offer["travelerPricings"][0]["fareDetailsBySegment"]
+        ]
+        assert fare_ids == segment_ids
+    prices = [float(offer["price"]["grandTotal"]) for offer in offers]
+    assert prices == sorted(prices)
+
+
+def test_profiles_merge_overrides_into_defaults():
+    profiles = load_profiles('{"search_flights_get": {"error_rate": 0.5}, "x": {}}')
+
+    assert profiles["search_flights_get"]["error_rate"] == 0.5
+    assert profiles["search_flights_get"]["latency_ms"] == 900
+    assert profiles["x"] == NO_PROFILE
+
+
+def _service(**profile) -> tuple[SyntheticFlightService, list[float]]:
+    slept = []
+    service = SyntheticFlightService(
+        profiles={"search_flights_get": _profile(**profile)},
+        latency_scale=0.5,
+        sleep=slept.append,
+    )
+    return service, slept
+
+
+def test_calls_sleep_for_their_sampled_latency():
+    service, slept = _service(latency_ms=200, latency_sigma=0)
+
+    service.search_flights_get(SEARCH)
+    service.get_flight_order("ORDER1")
+
+    assert slept == [pytest.approx(0.1), 0]
+
+
+def test_errors_and_timeouts_raise_sdk_errors():
+    service, _ = _service(latency_ms=200, error_rate=1, timeout_rate=0)
+    with pytest.raises(ServerError, match="500"):
+        service.search_flights_get(SEARCH)
+
+    service, slept = _service(latency_ms=200, timeout_rate=1, timeout_seconds=10)
+    with pytest.raises(NetworkError):
+        service.search_flights_get(SEARCH)
+    assert slept == [5]
+
+
+def test_provider_is_selected_by_env(monkeypatch):
+    from backend.external_services.flight import get_flight_provider
+
+    monkeypatch.setenv("FLIGHT_SERVICE_PROVIDER", "synthetic")
+
+    assert isinstance(get_flight_provider(), SyntheticFlightService)
+
+
+def test_search_endpoint_serves_synthetic_offers(client, mocker, memory_cache):
+    service = AsyncFlightService(SyntheticFlightService(profiles={}))
+    mocker.patch("backend.routers.flights.redis_cache", memory_cache)
+    mocker.patch("backend.routers.flights.upstream_single_flight.cache", memory_cache)
+    mocker.patch("backend.routers.flights.amadeus_flight_service", service)
+
+    params = {**SEARCH, "returnDate": "2030-01-12", "adults": 2}
+    response = client.get(f"{API_V1_PREFIX}/shopping/flight-offers", params=params)
+    service.shutdown()
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(generate_offers(params))
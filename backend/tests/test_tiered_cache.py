@@ -0,0 +1,283 @@
+"""Tests for the in-process L1 cache and the two-tier RedisCache."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.external_services.cache import (
+    INVALIDATION_CHANNEL,
+    INVALIDATION_POLL_SECONDS,
+    TieredCache,
+    cache_lookups,
+    decode_entry,
+    encode_entry,
+)
+from backend.external_services.local_cache import LocalCache
+from backend.utils.cache_keys import L1_TTL_SECONDS, build_cache_key
+from backend.utils.constants import CacheNamespaces
+from conftest import async_iter
+
+
+LOCATIONS_KEY = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "NBO"})
+BOOKINGS_KEY = build_cache_key(CacheNamespaces.USER_BOOKINGS, {}, scope="u1")
+
+
+def _lookups(tier: str, result: str) -> float:
+    return cache_lookups.labels(
+        tier=tier, namespace=CacheNamespaces.LOCATIONS, result=result
+    )._value.get()
+
+
+class TestLocalCache:
+    def test_entry_expires_after_ttl(self, fake_clock):
+        local = LocalCache(10, 1000, clock=fake_clock)
+        local.set("k", "v", ttl_seconds=5, size=1)
+
+        fake_clock.advance(4)
+        assert local.get("k").value == "v"
+        fake_clock.advance(1)
+        assert local.get("k") is None
+        assert local.size_bytes == 0
+
+    def test_least_recently_used_entry_is_evicted(self, fake_clock):
+        local = LocalCache(2, 1000, clock=fake_clock)
+        local.set("a", 1, 60, 1)
+        local.set("b", 2, 60, 1)
+        local.get("a")
+        local.set("c", 3, 60, 1)
+
+        assert local.get("b") is None
+        assert local.get("a").value == 1
+        assert local.get("c").value == 3
+
+    def test_byte_budget_is_enforced(self, fake_clock):
+        local = LocalCache(100, 10, clock=fake_clock)
+        local.set("a", 1, 60, 4)
+        local.set("b", 2, 60, 4)
+        local.set("c", 3, 60, 4)
+
+        assert len(local) == 2
+        assert local.size_bytes == 8
+        assert local.get("a") is None
+
+    def test_oversized_entry_is_not_stored(self, fake_clock):
+        local = LocalCache(100, 10, clock=fake_clock)
+        local.set("small", 1, 60, 4)
+        local.set("big", 2, 60, 11)
+
+        assert local.get("big") is None
+        assert local.get("small").value == 1
+
+    def test_overwrite_updates_size(self, fake_clock):
+        local = LocalCache(100, 100, clock=fake_clock)
+        local.set("k", 1, 60, 40)
+        local.set("k", 2, 60, 10)
+
+        assert local.size_bytes == 10
+
+    def test_delete_pattern(self, fake_clock):
+        local = LocalCache(100, 100, clock=fake_clock)
+        local.set("user_bookings:v1:u1:a", 1, 60, 1)
+        local.set("user_bookings:v1:u10:a", 2, 60, 1)
+
+        assert local.delete_pattern("user_bookings:v1:u1:*") == 1
+        assert local.get("user_bookings:v1:u10:a").value == 2
+
+    def test_hit_ratio(self, fake_clock):
+        local = LocalCache(10, 100, clock=fake_clock)
+        local.set("k", 1, 60, 1)
+        local.get("k")
+        local.get("k")
+        local.get("missing")
+
+        assert local.hit_ratio() == pytest.approx(2 / 3)
+
+
+class TestTieredCache:
+    @pytest.fixture
+    def cache(self, fake_clock):
+        cache = TieredCache(
+            "localhost",
+            6379,
+            clock=fake_clock,
+            local=LocalCache(100, 10_000, clock=fake_clock),
+        )
+        cache.r = AsyncMock()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_l1(self, cache):
+        cache.r.get.return_value = json.dumps(["NBO"])
+        l1_misses = _lookups("l1", "miss")
+        l2_hits = _lookups("l2", "hit")
+
+        assert await cache.get(LOCATIONS_KEY) == ["NBO"]
+        assert await cache.get(LOCATIONS_KEY) == ["NBO"]
+
+        cache.r.get.assert_called_once_with(LOCATIONS_KEY)
+        assert _lookups("l1", "miss") == l1_misses + 1
+        assert _lookups("l2", "hit") == l2_hits + 1
+        assert cache.hit_ratios() == {"l1": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_l1_entry_expires_before_redis(self, cache, fake_clock):
+        cache.r.get.return_value = json.dumps(["NBO"])
+        await cache.get(LOCATIONS_KEY)
+
+        fake_clock.advance(L1_TTL_SECONDS[CacheNamespaces.LOCATIONS])
+        await cache.get(LOCATIONS_KEY)
+
+        assert cache.r.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_namespaces_without_l1_ttl_always_read_redis(self, cache):
+        cache.r.get.return_value = json.dumps({"items": []})
+
+        await cache.get(BOOKINGS_KEY)
+        await cache.get(BOOKINGS_KEY)
+
+        assert cache.r.get.call_count == 2
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_soft_ttl_survives_l1(self, cache, fake_clock):
+        cache.r.get.return_value = encode_entry(["NBO"], stale_at=fake_clock() + 30)
+
+        assert await cache.get_with_staleness(LOCATIONS_KEY) == (["NBO"], False)
+        fake_clock.advance(30)
+        assert await cache.get_with_staleness(LOCATIONS_KEY) == (["NBO"], True)
+        cache.r.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_set_writes_redis_fills_l1_and_broadcasts(self, cache):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+
+        key, ttl, entry = cache.r.setex.call_args.args
+        assert (key, ttl, decode_entry(entry)) == (LOCATIONS_KEY, 600, (["NBO"], None))
+        channel, message = cache.r.publish.call_args.args
+        assert channel == INVALIDATION_CHANNEL
+        assert json.loads(message) == {
+            "origin": cache.instance_id,
+            "keys": [LOCATIONS_KEY],
+        }
+        assert await cache.get(LOCATIONS_KEY) == ["NBO"]
+        cache.r.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_many_reads_only_l1_misses_from_redis(self, cache):
+        other = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "MBA"})
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+        cache.r.mget.return_value = [encode_entry(["MBA"]), None]
+
+        values = await cache.get_many([LOCATIONS_KEY, other, BOOKINGS_KEY])
+
+        assert values == [["NBO"], ["MBA"], None]
+        cache.r.mget.assert_awaited_once_with([other, BOOKINGS_KEY])
+        cache.r.get.assert_not_called()
+        assert cache.local.get(other).value == ["MBA"]
+
+    @pytest.mark.asyncio
+    async def test_set_many_pipelines_writes_and_broadcasts_once(self, cache):
+        pipe = AsyncMock()
+        pipe.__aenter__.return_value = pipe
+        cache.r.pipeline = MagicMock(return_value=pipe)
+
+        await cache.set_many({LOCATIONS_KEY: ["NBO"], BOOKINGS_KEY: {"items": []}}, 600)
+
+        cache.r.pipeline.assert_called_once_with(transaction=False)
+        assert [call.args[0] for call in pipe.setex.call_args_list] == [
+            LOCATIONS_KEY,
+            BOOKINGS_KEY,
+        ]
+        pipe.execute.assert_awaited_once()
+        cache.r.publish.assert_awaited_once()
+        message = json.loads(cache.r.publish.call_args.args[1])
+        assert message["keys"] == [LOCATIONS_KEY, BOOKINGS_KEY]
+        # Only namespaces with an L1 TTL are kept locally
+        assert cache.local.get(LOCATIONS_KEY).value == ["NBO"]
+        assert cache.local.get(BOOKINGS_KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_delete_evicts_l1_and_broadcasts(self, cache):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+        cache.r.delete.return_value = 1
+        cache.r.get.return_value = None
+
+        assert await cache.delete(LOCATIONS_KEY) is True
+        assert await cache.get(LOCATIONS_KEY) is None
+        assert cache.r.publish.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_broadcasts_pattern(self, cache):
+        cache.r.scan_iter = MagicMock(return_value=async_iter([]))
+
+        await cache.delete_pattern("user_bookings:v1:u1:*")
+
+        message = json.loads(cache.r.publish.call_args.args[1])
+        assert message["pattern"] == "user_bookings:v1:u1:*"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_from_other_worker_evicts_l1(self, cache):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+
+        cache._on_invalidation(
+            {"data": json.dumps({"origin": "other", "keys": [LOCATIONS_KEY]})}
+        )
+
+        assert cache.local.get(LOCATIONS_KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_pattern_invalidation_from_other_worker(self, cache):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+
+        cache._on_invalidation(
+            {"data": json.dumps({"origin": "other", "pattern": "locations:*"})}
+        )
+
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_own_invalidation_is_ignored(self, cache):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+
+        cache._on_invalidation({"data": cache.r.publish.call_args.args[1]})
+
+        assert cache.local.get(LOCATIONS_KEY).value == ["NBO"]
+
+    @pytest.mark.asyncio
+    async def test_listener_error_clears_l1(self, cache, mocker):
+        mocker.patch("backend.external_services.cache.asyncio.sleep")
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+
+        await cache._on_listener_error(ConnectionError("gone"))
+
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_quiet_listener_keeps_l1(self, cache, fake_clock):
+        await cache.set(LOCATIONS_KEY, ["NBO"], 600)
+        other_key = build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "MBA"})
+        await cache.set(other_key, ["MBA"], 600)
+        invalidation = json.dumps({"origin": "other", "keys": [other_key]})
+        # Two idle polls, one invalidation, then a channel that stays quiet
+        replies = [None, None, {"type": "message", "data": invalidation}]
+        drained = asyncio.Event()
+
+        async def get_message(timeout):
+            if replies:
+                return replies.pop(0)
+            drained.set()
+            await asyncio.Event().wait()
+
+        pubsub = AsyncMock()
+        pubsub.get_message.side_effect = get_message
+        cache.r.pubsub = MagicMock(return_value=pubsub)
+
+        await cache.start_invalidation_listener()
+        await asyncio.wait_for(drained.wait(), 1)
+        await cache.stop_invalidation_listener()
+
+        assert cache.local.get(LOCATIONS_KEY).value == ["NBO"]
+        assert cache.local.get(other_key) is None
+        pubsub.get_message.assert_called_with(timeout=INVALIDATION_POLL_SECONDS)
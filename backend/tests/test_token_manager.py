@@ -0,0 +1,151 @@
+"""Tests for shared, proactively refreshed provider access tokens."""
+
+import asyncio
+
+import pytest
+from backend.external_services.token_manager import TokenManager, token_refresh_failures
+
+
+class FakeAuthEndpoint:
+    """Issues numbered tokens, optionally slowly or failing."""
+
+    def __init__(self, expires_in: float = 300, delay: float = 0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self.error: Exception | None = None
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+
+def _manager(endpoint, cache, clock, **kwargs) -> TokenManager:
+    return TokenManager(
+        "test",
+        endpoint,
+        cache=cache,
+        refresh_before_seconds=60,
+        poll_seconds=0.01,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def _failures() -> float:
+    return token_refresh_failures.labels(provider="test")._value.get()
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached_until_refresh_window(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+    manager = _manager(endpoint, memory_cache, fake_clock)
+
+    assert await manager.get_token() == "token-1"
+    fake_clock.advance(239)
+    assert await manager.get_token() == "token-1"
+
+    assert endpoint.calls == 1
+    assert manager._refreshing is None
+    assert memory_cache.ttls[manager.key] == 300
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_request(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint(delay=0.05)
+    manager = _manager(endpoint, memory_cache, fake_clock)
+
+    tokens = await asyncio.gather(*(manager.get_token() for _ in range(20)))
+
+    assert set(tokens) == {"token-1"}
+    assert endpoint.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_in_background_before_expiry(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint(delay=0.05)
+    manager = _manager(endpoint, memory_cache, fake_clock)
+    await manager.get_token()
+
+    fake_clock.advance(250)
+    # Callers keep the still-valid token while the refresh runs
+    assert await manager.get_token() == "token-1"
+    assert await manager.get_token() == "token-1"
+    await manager._refreshing
+
+    assert await manager.get_token() == "token-2"
+    assert endpoint.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_token_waits_for_refresh(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+    manager = _manager(endpoint, memory_cache, fake_clock)
+    await manager.get_token()
+
+    fake_clock.advance(300)
+
+    assert await manager.get_token() == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_workers_share_token_through_redis(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+    first = _manager(endpoint, memory_cache, fake_clock)
+    second = _manager(endpoint, memory_cache, fake_clock)
+
+    assert await first.get_token() == "token-1"
+    assert await second.get_token() == "token-1"
+
+    assert endpoint.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_elect_one_refresher(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint(delay=0.05)
+    workers = [_manager(endpoint, memory_cache, fake_clock) for _ in range(5)]
+
+    tokens = await asyncio.gather(*(worker.get_token() for worker in workers))
+
+    assert set(tokens) == {"token-1"}
+    assert endpoint.calls == 1
+    assert memory_cache.leases == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_keeps_current_token(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+    manager = _manager(endpoint, memory_cache, fake_clock)
+    await manager.get_token()
+    failures = _failures()
+
+    endpoint.error = RuntimeError("auth down")
+    fake_clock.advance(250)
+    assert await manager.get_token() == "token-1"
+    with pytest.raises(RuntimeError):
+        await manager._refreshing
+
+    assert await manager.get_token() == "token-1"
+    assert _failures() == failures + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_without_valid_token_raises(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+    endpoint.error = RuntimeError("auth down")
+    manager = _manager(endpoint, memory_cache, fake_clock)
+
+    with pytest.raises(RuntimeError):
+        await manager.get_token()
+
+
+def test_credentials_get_separate_tokens(memory_cache, fake_clock):
+    endpoint = FakeAuthEndpoint()
+
+    first = _manager(endpoint, memory_cache, fake_clock, client_id="a")
+    second = _manager(endpoint, memory_cache, fake_clock, client_id="b")
+
+    assert first.key != second.key
@@ -0,0 +1,74 @@
+"""
+Encoding of booking export rows (crud.bookings.export_bookings) as CSV or
+NDJSON text, in chunks sized for streaming.
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from backend.utils.constants import ExportFormats
+
+MEDIA_TYPES = {
+    ExportFormats.CSV: "text/csv",
+    ExportFormats.NDJSON: "application/x-ndjson",
+}
+# Rows are written out in chunks of about this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _csv_chunks(columns: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_value(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(columns: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, map(_value, row)))) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(lines)
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines)
+
+
+def encode_rows(
+    export_format: str, columns: list[str], rows: Iterable[tuple]
+) -> Iterator[str]:
+    """
+    Encode export rows as CSV (with a header row) or NDJSON
+
+    Args:
+        export_format: ExportFormats.CSV or ExportFormats.NDJSON
+        columns: Column names, in row order
+        rows: Tuples of column values
+
+    Returns:
+        Iterator of text chunks; rows are read only as chunks are taken
+    """
+    if export_format == ExportFormats.NDJSON:
+        return _ndjson_chunks(columns, rows)
+    return _csv_chunks(columns, rows)
@@ -0,0 +1,322 @@
+"""
+Canonical cache key helpers.
+
+Builds stable fingerprints for request payloads so that semantically identical
+requests map to the same cache entry regardless of JSON field order, the order
+of unordered lists, or explicitly-sent default values.
+
+Keys have the shape ``{namespace}:v{version}[:{scope}]:{digest}``:
+- namespace groups one endpoint family (see CacheNamespaces)
+- version is the namespace's payload schema version; bumping it in
+  CACHE_SCHEMA_VERSIONS logically flushes the namespace, because entries
+  written under the old version are never read again and simply expire
+- scope is an optional owner segment (e.g. a user ID) used for invalidation
+- digest is a fixed-length hash of the normalized parameters
+
+Reference data namespaces also carry a soft/hard TTL policy (see
+CACHE_TTL_POLICIES) for stale-while-revalidate caching, and hot namespaces
+an in-process L1 TTL (see L1_TTL_SECONDS).
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, TypedDict
+
+from backend.schemas.flight_search import FlightSearchRequestPost
+from backend.utils.constants import CacheNamespaces
+
+# Length of the parameter digest embedded in keys (128 bits of SHA-256)
+KEY_DIGEST_LENGTH = 32
+
+# Bump a namespace's version whenever the shape of its cached payload changes
+CACHE_SCHEMA_VERSIONS: dict[str, int] = {
+    CacheNamespaces.FLIGHT_SEARCH: 1,
+    CacheNamespaces.FLIGHT_SEARCH_POST: 1,
+    CacheNamespaces.LOCATIONS: 1,
+    CacheNamespaces.USER_BOOKINGS: 1,
+    CacheNamespaces.DESTINATIONS: 1,
+    CacheNamespaces.OFFER_RESULTS: 1,
+    CacheNamespaces.ACCESS_TOKENS: 1,
+    CacheNamespaces.FLIGHT_PRICING: 1,
+    CacheNamespaces.SEAT_MAPS: 1,
+}
+
+
+class CacheTTLPolicy(TypedDict):
+    # Seconds after which the entry is served stale and refreshed in the background
+    soft_ttl_seconds: int
+    # Seconds after which the entry is dropped and callers wait for upstream
+    hard_ttl_seconds: int
+
+
+# Stale-while-revalidate policies for namespaces whose data changes rarely
+CACHE_TTL_POLICIES: dict[str, CacheTTLPolicy] = {
+    CacheNamespaces.LOCATIONS: CacheTTLPolicy(
+        soft_ttl_seconds=int(os.getenv("LOCATIONS_CACHE_SOFT_TTL", 3600)),
+        hard_ttl_seconds=int(os.getenv("LOCATIONS_CACHE_HARD_TTL", 86400)),
+    ),
+    CacheNamespaces.DESTINATIONS: CacheTTLPolicy(
+        soft_ttl_seconds=int(os.getenv("DESTINATIONS_CACHE_SOFT_TTL", 21600)),
+        hard_ttl_seconds=int(os.getenv("DESTINATIONS_CACHE_HARD_TTL", 604800)),
+    ),
+}
+
+# How long hot namespaces may be served from a worker's in-process L1 cache.
+# Kept short because L1 entries do not see the Redis TTL; namespaces not
+# listed here (e.g. per-user bookings) always read from Redis.
+L1_TTL_SECONDS: dict[str, int] = {
+    CacheNamespaces.FLIGHT_SEARCH: 15,
+    CacheNamespaces.FLIGHT_SEARCH_POST: 15,
+    CacheNamespaces.LOCATIONS: 60,
+    CacheNamespaces.DESTINATIONS: 300,
+}
+
+
+def stable_json(value: Any) -> str:
+    """
+    Serialize a value to compact JSON with sorted keys.
+
+    Args:
+        value: Any JSON-serializable value
+
+    Returns:
+        Deterministic JSON string for the value
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def digest(value: Any) -> str:
+    """
+    Compute a SHA-256 hex digest of the stable JSON form of a value.
+
+    Args:
+        value: Any JSON-serializable value
+
+    Returns:
+        64-character hex digest
+    """
+    return hashlib.sha256(stable_json(value).encode("utf-8")).hexdigest()
+
+
+def normalize_params(params: dict) -> dict:
+    """
+    Drop parameters that carry no value so omitted and null fields hash alike.
+
+    Args:
+        params: Request parameters
+
+    Returns:
+        Parameters without None values
+    """
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def namespace_prefix(namespace: str, scope: str | None = None) -> str:
+    """
+    Build the versioned prefix shared by every key in a namespace (and scope).
+
+    Args:
+        namespace: One of CacheNamespaces
+        scope: Optional owner segment, e.g. a user ID
+
+    Returns:
+        Prefix such as "user_bookings:v1:<user_id>"
+
+    Raises:
+        ValueError: If the namespace has no registered schema version
+    """
+    if namespace not in CACHE_SCHEMA_VERSIONS:
+        raise ValueError(f"Unknown cache namespace: {namespace}")
+
+    prefix = f"{namespace}:v{CACHE_SCHEMA_VERSIONS[namespace]}"
+    if scope is not None:
+        prefix = f"{prefix}:{scope}"
+    return prefix
+
+
+def build_cache_key(namespace: str, params: dict, scope: str | None = None) -> str:
+    """
+    Build a namespaced, versioned cache key from request parameters.
+
+    Args:
+        namespace: One of CacheNamespaces
+        params: Request parameters; field order and None values are ignored
+        scope: Optional owner segment, e.g. a user ID
+
+    Returns:
+        Fixed-length cache key
+
+    Example:
+        build_cache_key(CacheNamespaces.LOCATIONS, {"keyword": "NBO"})
+        # "locations:v1:3f5c..."
+    """
+    params_digest = digest(normalize_params(params))[:KEY_DIGEST_LENGTH]
+    return f"{namespace_prefix(namespace, scope)}:{params_digest}"
+
+
+def build_cache_pattern(namespace: str, scope: str | None = None) -> str:
+    """
+    Build a glob pattern matching every current-version key in a namespace.
+
+    Args:
+        namespace: One of CacheNamespaces
+        scope: Optional owner segment, e.g. a user ID
+
+    Returns:
+        Pattern such as "user_bookings:v1:<user_id>:*"
+    """
+    return f"{namespace_prefix(namespace, scope)}:*"
+
+
+def build_cache_tag(tag: str, scope: str) -> str:
+    """
+    Build an invalidation tag for one owner.
+
+    Entries stored with a tag are removed together by
+    RedisCache.invalidate_tags, without scanning the keyspace.
+
+    Args:
+        tag: One of CacheTags
+        scope: Owner the tag applies to, e.g. a user ID
+
+    Returns:
+        Tag such as "user:<user_id>:bookings"
+    """
+    return tag.format(scope=scope)
+
+
+def _sorted_unique(values: list[str]) -> list[str]:
+    return sorted({value.strip().upper() for value in values})
+
+
+def canonicalize_flight_search(request: FlightSearchRequestPost) -> dict:
+    """
+    Normalize a POST flight search body into its canonical form.
+
+    - Fields left at their default values are dropped
+    - IATA, currency and source codes are upper-cased
+    - Lists whose order carries no meaning (legs and travelers keyed by id,
+      sources, carrier codes, cabin restrictions) are sorted
+
+    Args:
+        request: Validated flight search request body
+
+    Returns:
+        Canonical dictionary suitable for hashing
+    """
+    body = request.model_dump(exclude_defaults=True)
+
+    body["currencyCode"] = body["currencyCode"].strip().upper()
+    body["sources"] = _sorted_unique(body.get("sources", []))
+
+    for leg in body.get("originDestinations", []):
+        leg["originLocationCode"] = leg["originLocationCode"].strip().upper()
+        leg["destinationLocationCode"] = leg["destinationLocationCode"].strip().upper()
+    body["originDestinations"] = sorted(
+        body.get("originDestinations", []), key=lambda leg: leg["id"]
+    )
+    body["travelers"] = sorted(
+        body.get("travelers", []), key=lambda traveler: traveler["id"]
+    )
+
+    flight_filters = body.get("searchCriteria", {}).get("flightFilters", {})
+    carrier_restrictions = flight_filters.get("carrierRestrictions")
+    if carrier_restrictions:
+        carrier_restrictions["includedCarrierCodes"] = _sorted_unique(
+            carrier_restrictions.get("includedCarrierCodes", [])
+        )
+
+    cabin_restrictions = flight_filters.get("cabinRestrictions")
+    if cabin_restrictions:
+        for restriction in cabin_restrictions:
+            restriction["originDestinationIds"] = sorted(
+                restriction.get("originDestinationIds", [])
+            )
+        flight_filters["cabinRestrictions"] = sorted(
+            cabin_restrictions, key=stable_json
+        )
+
+    return body
+
+
+def flight_search_fingerprint(request: FlightSearchRequestPost) -> str:
+    """
+    Compute the stable fingerprint of a POST flight search body.
+
+    Args:
+        request: Validated flight search request body
+
+    Returns:
+        Hex digest identifying the canonical search
+    """
+    return digest(canonicalize_flight_search(request))
+
+
+def _canonical_segment(segment: dict) -> dict:
+    departure = segment.get("departure") or {}
+    arrival = segment.get("arrival") or {}
+    return {
+        "carrierCode": segment.get("carrierCode"),
+        "number": segment.get("number"),
+        "departure": [departure.get("iataCode"), departure.get("at")],
+        "arrival": [arrival.get("iataCode"), arrival.get("at")],
+    }
+
+
+def _canonical_traveler_pricing(traveler_pricing: dict) -> dict:
+    fare_details = [
+        {
+            "segmentId": details.get("segmentId"),
+            "cabin": details.get("cabin"),
+            "fareBasis": details.get("fareBasis"),
+            "brandedFare": details.get("brandedFare"),
+            "class": details.get("class"),
+        }
+        for details in traveler_pricing.get("fareDetailsBySegment") or []
+    ]
+    return {
+        "travelerId": traveler_pricing.get("travelerId"),
+        "travelerType": traveler_pricing.get("travelerType"),
+        "fareOption": traveler_pricing.get("fareOption"),
+        "fareDetailsBySegment": sorted(
+            fare_details, key=lambda details: str(details["segmentId"])
+        ),
+    }
+
+
+def canonicalize_flight_offer(offer: dict) -> dict:
+    """
+    Reduce a flight offer to the fields that decide its confirmed price.
+
+    Keeps the offer id, flights (carrier, number, airports and times per
+    segment), fares per traveler and segment, validating carriers and
+    currency. Prices, seat counts and ticketing deadlines are dropped, since
+    pricing is what refreshes them; a search offer and the priced offer
+    returned for it therefore share a fingerprint.
+
+    Args:
+        offer: Flight offer as sent to (or returned by) the pricing API
+
+    Returns:
+        Canonical dictionary suitable for hashing
+    """
+    return {
+        "id": offer.get("id"),
+        "source": offer.get("source"),
+        "currency": (offer.get("price") or {}).get("currency"),
+        "validatingAirlineCodes": _sorted_unique(
+            offer.get("validatingAirlineCodes") or []
+        ),
+        "itineraries": [
+            [_canonical_segment(segment) for segment in itinerary.get("segments") or []]
+            for itinerary in offer.get("itineraries") or []
+        ],
+        "travelerPricings": sorted(
+            (
+                _canonical_traveler_pricing(traveler_pricing)
+                for traveler_pricing in offer.get("travelerPricings") or []
+            ),
+            key=lambda traveler_pricing: str(traveler_pricing["travelerId"]),
+        ),
+    }
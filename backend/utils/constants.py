@@ -21,3 +21,27 @@ class KafkaEventTypes:
     PAYMENT_FAILED = "payment_failed"
     TICKET_UPLOADED = "ticket_uploaded"
     REFUND_REQUESTED = "refund_requested"
+
+
+# REDIS CACHE NAMESPACES
+class CacheNamespaces:
+    FLIGHT_SEARCH = "flight_search"
+    FLIGHT_SEARCH_POST = "flight_search_post"
+    LOCATIONS = "locations"
+    USER_BOOKINGS = "user_bookings"
+    DESTINATIONS = "destinations"
+    OFFER_RESULTS = "offer_results"
+    ACCESS_TOKENS = "access_tokens"
+    FLIGHT_PRICING = "flight_pricing"
+    SEAT_MAPS = "seat_maps"
+
+
+# REDIS CACHE TAGS (see build_cache_tag)
+class CacheTags:
+    USER_BOOKINGS = "user:{scope}:bookings"
+
+
+# BOOKING EXPORT FORMATS (see utils.booking_export)
+class ExportFormats:
+    CSV = "csv"
+    NDJSON = "ndjson"
@@ -154,44 +154,22 @@ class CursorPaginator:
         if not self._cursor_values:
             return query
 
-        # Build cursor condition for multi-field cursor (e.g., created_at, id)
-        # For DESC: (created_at < cursor_created_at) OR
-        #           (created_at == cursor_created_at AND id < cursor_id)
-        from sqlalchemy import or_, and_
-
-        conditions = []
-        for i, field in enumerate(self.order_fields):
-            if field not in self._cursor_values:
-                continue
-
-            cursor_val = self._cursor_values[field]
-            col = getattr(model, field)
-
-            if i == 0:
-                # Primary field: simple less than / greater than
-                if self.order_direction == "desc":
-                    conditions.append(col < cursor_val)
-                else:
-                    conditions.append(col > cursor_val)
-            else:
-                # Secondary fields: equality on all previous + comparison on this
-                eq_conditions = []
-                for prev_field in self.order_fields[:i]:
-                    if prev_field in self._cursor_values:
-                        prev_col = getattr(model, prev_field)
-                        eq_conditions.append(
-                            prev_col == self._cursor_values[prev_field]
-                        )
-
-                if self.order_direction == "desc":
-                    eq_conditions.append(col < cursor_val)
-                else:
-                    eq_conditions.append(col > cursor_val)
-
-                conditions.append(and_(*eq_conditions))
-
-        if conditions:
-            query = query.where(or_(*conditions))
+        # Row-value comparison for multi-field cursors (e.g., created_at, id)
+        # For DESC: (created_at, id) < (cursor_created_at, cursor_id)
+        # Unlike the equivalent OR of per-field conditions, Postgres uses this
+        # as an index condition and starts the scan at the cursor, instead of
+        # filtering every row of the earlier pages again
+        from sqlalchemy import tuple_
+
+        fields = [f for f in self.order_fields if f in self._cursor_values]
+        if not fields:
+            return query
+        columns = tuple_(*(getattr(model, field) for field in fields))
+        values = tuple_(*(self._cursor_values[field] for field in fields))
+        if self.order_direction == "desc":
+            query = query.where(columns < values)
+        else:
+            query = query.where(columns > values)
 
         return query
 
@@ -4,7 +4,7 @@ import { useInfiniteQuery, useQuery } from "@tanstack/react-query";
 import { useRouter } from "next/navigation";
 import { toast } from "sonner";
 import useAuth from "@/store/auth";
-import { Booking, BookingStats, CursorPaginatedBookingsResponse } from "@/types/admin";
+import { BookingStats, CursorPaginatedBookingsResponse } from "@/types/admin";
 import { apiClient, isUnauthorizedError } from "@/lib/api";
 import { queryKeys } from "@/lib/queryKeys";
 import { useNotifications } from "@/hooks/useNotifications";
@@ -68,7 +68,7 @@ export default function AdminDashboard() {
 
   const filteredBookings = bookings.filter((booking) => {
     const matchesFilter = filter === "all" ? true : booking.ticket_url ? "ready" : "processing";
-    const pnr = booking.amadeus_order_response?.associatedRecords?.[0]?.reference || "";
+    const pnr = booking.pnr || "";
     const matchesSearch =
       booking.flight_order_id.toLowerCase().includes(searchTerm.toLowerCase()) ||
       booking.user.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -112,40 +112,6 @@ export default function AdminDashboard() {
     });
   };
 
-  // Helper to extract PNR from amadeus_order_response
-  const extractPNR = (amadeusOrder: Booking['amadeus_order_response']): string => {
-    try {
-      return amadeusOrder?.associatedRecords?.[0]?.reference || 'N/A';
-    } catch {
-      return 'N/A';
-    }
-  };
-
-  // Helper to extract flight details from amadeus_order_response
-  const extractFlightDetails = (amadeusOrder: Booking['amadeus_order_response']) => {
-    try {
-      const flight = amadeusOrder?.flightOffers?.[0];
-      const itinerary = flight?.itineraries?.[0];
-      const segment = itinerary?.segments?.[0];
-
-      return {
-        origin: segment?.departure?.iataCode || 'N/A',
-        destination: segment?.arrival?.iataCode || 'N/A',
-        airline: segment?.carrierCode || 'N/A',
-        flightNumber: segment?.number || 'N/A',
-        departureDate: segment?.departure?.at || 'N/A',
-      };
-    } catch {
-      return {
-        origin: 'N/A',
-        destination: 'N/A',
-        airline: 'N/A',
-        flightNumber: 'N/A',
-        departureDate: 'N/A',
-      };
-    }
-  };
-
   const handleViewDetails = (bookingId: string) => {
     router.push(`/admin/bookings/${bookingId}`);
   };
@@ -452,8 +418,7 @@ export default function AdminDashboard() {
                 </thead>
                 <tbody className="bg-white divide-y divide-gray-200">
                   {filteredBookings.map((booking) => {
-                    const pnr = extractPNR(booking.amadeus_order_response);
-                    const flightDetails = extractFlightDetails(booking.amadeus_order_response);
+                    const pnr = booking.pnr || 'N/A';
                     const ticketStatus = booking.ticket_url ? 'ready' : 'pending';
 
                     return (
@@ -474,13 +439,13 @@ export default function AdminDashboard() {
                         <td className="px-6 py-4 whitespace-nowrap">
                           <div>
                             <p className="text-base font-medium text-gray-900">
-                              {flightDetails.origin} → {flightDetails.destination}
+                              {booking.origin || 'N/A'} → {booking.destination || 'N/A'}
                             </p>
                             <p className="text-base text-gray-500">
-                              {flightDetails.airline} {flightDetails.flightNumber}
+                              {booking.carrier_code || 'N/A'} {booking.flight_number || 'N/A'}
                             </p>
                             <p className="text-base text-gray-500">
-                              {flightDetails.departureDate !== 'N/A' ? formatDate(flightDetails.departureDate) : 'N/A'}
+                              {booking.departure_at ? formatDate(booking.departure_at) : 'N/A'}
                             </p>
                           </div>
                         </td>
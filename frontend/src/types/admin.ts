@@ -37,7 +37,7 @@ export interface AmadeusOrderResponse {
   }>;
 }
 
-export interface Booking {
+export interface BookingSummary {
   id: string;
   flight_order_id: string;
   status: string;
@@ -45,11 +45,21 @@ export interface Booking {
   ticket_url: string | null;
   total_price: number;
   user: BookingUser;
+  pnr: string | null;
+  origin: string | null;
+  destination: string | null;
+  departure_at: string | null;
+  carrier_code: string | null;
+  flight_number: string | null;
+  passenger_count: number;
+}
+
+export interface Booking extends BookingSummary {
   amadeus_order_response: AmadeusOrderResponse;
 }
 
 export interface CursorPaginatedBookingsResponse {
-  items: Booking[];
+  items: BookingSummary[];
   next_cursor: string | null;
   has_more: boolean;
   has_previous: boolean;